@@ -0,0 +1,49 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: record.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-16
+# · Descripción: Graba en `benchmarks/fixtures` las páginas de búsqueda y de detalle de
+# cada web para que el servidor local las reproduzca.
+#
+# Uso (desde `source/`): python -m benchmarks.record "dragon ball"
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import sys
+
+from lib.config.schema import AnimeFlvConfig, AnimeFenixConfig
+from lib.common.network import get_response
+from lib.core.anime_flv.anime import AnimeFlvManager
+from lib.core.anime_fenix.anime import AnimeFenixManager
+
+from benchmarks.server import FIXTURES_DIR
+
+
+# ---- FUNCIONES ---- #
+def record(name:str) -> None:
+    """
+    Descarga la página de búsqueda de `name` y la página del primer resultado de cada web.
+
+    Args:
+        name (str): El nombre del anime a buscar.
+    """
+    for site, manager in (("animeflv", AnimeFlvManager(AnimeFlvConfig())), ("animefenix", AnimeFenixManager(AnimeFenixConfig()))):
+        # Graba la búsqueda.
+        search_url:str = manager._search_url(name=name)
+        results = manager.find_animes(name=name)
+        pages = {"search": search_url, "detail": results[0][1]}
+
+        # Graba las páginas.
+        os.makedirs(os.path.join(FIXTURES_DIR, site), exist_ok=True)
+        for page, url in pages.items():
+            with open(os.path.join(FIXTURES_DIR, site, f"{page}.html"), "wb") as file:
+                file.write(get_response(url=url).content)
+            print(f"{site}/{page}.html <- {url}")
+
+
+# ---- LÓGICA PRINCIPAL ---- #
+if __name__ == "__main__":
+    record(name=" ".join(sys.argv[1:]) or "dragon ball")
@@ -0,0 +1,436 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: run.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-16
+# · Descripción: Benchmarks de procesado, latencia y rendimiento de los managers contra el
+# servidor local de `benchmarks.server`, de descarga de streams HLS, de vigilancia de nuevos
+# episodios, de memoria de los catálogos, de emparejamiento de títulos entre webs y de arranque de la CLI.
+#
+# Uso (desde `source/`):
+#   python -m benchmarks.run --output bench.json
+#   python -m benchmarks.run --compare bench.json
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import sys
+import json
+import random
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+
+from typing import Callable, Dict, List, Optional, Set
+from time import perf_counter
+from argparse import ArgumentParser, Namespace
+from asyncio import Semaphore, gather, run
+from statistics import mean, median, quantiles
+
+from lib.config.schema import HlsConfig, ThrottleConfig, WatchConfig
+from lib.common.hls import download_hls
+from lib.common.network import close_async_session, configure_throttle
+from lib.common.parser import available_backends, parse_html
+from lib.core.anime import Anime, AnimeManager, Episode
+from lib.core.themes import ThemeIndex
+from lib.core.matching import TitleMatcher
+from lib.core.watcher import EpisodeWatcher
+from lib.core.anime_flv.anime import AnimeFlvManager
+from lib.core.anime_fenix.anime import AnimeFenixManager
+
+from benchmarks.server import FIXTURES_DIR, FixtureServer
+
+
+# ---- FUNCIONES ---- #
+def timings(name:str, samples:List[float]) -> Dict:
+    """
+    Genera el resultado de un benchmark de tiempos.
+
+    Args:
+        name (str): Nombre del benchmark.
+        samples (List[float]): Tiempos medidos en segundos.
+
+    Returns:
+        Dict: Resultado con la mediana como valor principal (en milisegundos).
+    """
+    ms:List[float] = [sample * 1000 for sample in samples]
+    return {"name": name, "unit": "ms", "better": "lower", "value": median(ms), "mean": mean(ms),
+            "p95": quantiles(ms, n=20)[-1] if len(ms) > 1 else ms[0], "samples": len(ms)}
+
+
+def measure(function:Callable[[], object], iterations:int) -> List[float]:
+    """
+    Mide el tiempo de varias ejecuciones de una función (tras una de calentamiento).
+
+    Args:
+        function (Callable[[], object]): Función a medir.
+        iterations (int): Número de ejecuciones.
+
+    Returns:
+        List[float]: Tiempo de cada ejecución en segundos.
+    """
+    function()
+    samples:List[float] = []
+    for _ in range(iterations):
+        start:float = perf_counter()
+        function()
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def bench_parse(managers:Dict[str, AnimeManager], iterations:int) -> List[Dict]:
+    """
+    Mide el procesado de cada página grabada (análisis del HTML + extracción) con cada motor.
+
+    Args:
+        managers (Dict[str, AnimeManager]): Managers indexados por web.
+        iterations (int): Número de ejecuciones por caso.
+
+    Returns:
+        List[Dict]: Resultados.
+    """
+    results:List[Dict] = []
+    for site, manager in managers.items():
+        for page, subtrees, extract in (("search", manager._search_subtrees, manager._parse_animes),
+                                        ("detail", manager._anime_subtrees, manager._parse_anime)):
+            with open(os.path.join(FIXTURES_DIR, site, f"{page}.html"), "r", encoding="utf-8") as file:
+                markup:str = file.read()
+            for backend in available_backends():
+                samples = measure(lambda: extract(html=parse_html(markup, subtrees=subtrees, backend=backend)), iterations)
+                results.append(timings(f"parse/{site}/{page}/{backend}", samples))
+    return results
+
+
+def bench_latency(managers:Dict[str, AnimeManager], iterations:int) -> List[Dict]:
+    """
+    Mide la latencia de extremo a extremo de `find_animes` y `load_anime` contra el servidor.
+
+    Args:
+        managers (Dict[str, AnimeManager]): Managers indexados por web.
+        iterations (int): Número de ejecuciones por caso.
+
+    Returns:
+        List[Dict]: Resultados.
+    """
+    results:List[Dict] = []
+    for site, manager in managers.items():
+        url:str = manager.find_animes("dragon ball")[0][1]
+        results.append(timings(f"latency/{site}/find_animes", measure(lambda: manager.find_animes("dragon ball"), iterations)))
+        results.append(timings(f"latency/{site}/load_anime", measure(lambda: manager.load_anime(url), iterations)))
+    return results
+
+
+def bench_throughput(managers:Dict[str, AnimeManager], requests:int, concurrency:int) -> List[Dict]:
+    """
+    Mide cuántas páginas por segundo procesa `async_load_anime` con varias peticiones en vuelo.
+
+    Args:
+        managers (Dict[str, AnimeManager]): Managers indexados por web.
+        requests (int): Número total de páginas a cargar por web.
+        concurrency (int): Número máximo de peticiones simultáneas.
+
+    Returns:
+        List[Dict]: Resultados.
+    """
+    async def load_all(manager:AnimeManager, url:str) -> float:
+        semaphore:Semaphore = Semaphore(concurrency)
+
+        async def load_one() -> None:
+            async with semaphore:
+                await manager.async_load_anime(url)
+
+        try:
+            start:float = perf_counter()
+            await gather(*[load_one() for _ in range(requests)])
+            return perf_counter() - start
+        finally:
+            await close_async_session()
+
+    results:List[Dict] = []
+    for site, manager in managers.items():
+        url:str = manager.find_animes("dragon ball")[0][1]
+        elapsed:float = run(load_all(manager, url))
+        results.append({"name": f"throughput/{site}/load_anime/c{concurrency}", "unit": "pages/s", "better": "higher",
+                        "value": requests / elapsed, "samples": requests})
+    return results
+
+
+def bench_hls(server:FixtureServer, workers:List[int], iterations:int) -> List[Dict]:
+    """
+    Mide la descarga del stream HLS sintético del servidor (variante de mayor calidad) con
+    distinto número de segmentos en paralelo, comprobando el fichero descargado.
+
+    Args:
+        server (FixtureServer): Servidor local.
+        workers (List[int]): Segmentos descargados a la vez en cada caso.
+        iterations (int): Descargas por caso.
+
+    Returns:
+        List[Dict]: Resultados.
+    """
+    expected:bytes = b"".join(server.hls_segment(variant="high", index=index) for index in range(server.hls_segments))
+    results:List[Dict] = []
+    with tempfile.TemporaryDirectory() as folder:
+        for count in workers:
+            cfg:HlsConfig = HlsConfig()
+            cfg.workers = count
+            path:str = os.path.join(folder, f"hls-{count}.ts")
+
+            def download() -> None:
+                download_hls(url=f"{server.Url}/hls/master.m3u8", path=path, cfg=cfg)
+
+            samples:List[float] = measure(download, iterations)
+            with open(path, "rb") as file:
+                valid:bool = file.read() == expected
+            results.append({**timings(f"hls/download/w{count}", samples), "bytes": len(expected), "valid": valid})
+    return results
+
+
+def bench_watch(manager:AnimeManager, base_url:str, titles:int, concurrency:int) -> List[Dict]:
+    """
+    Mide dos pasadas de `EpisodeWatcher.check` sobre `titles` animes seguidos: la primera
+    descarga y procesa cada página y la segunda solo recibe respuestas 304.
+
+    Args:
+        manager (AnimeManager): Manager de la web.
+        base_url (str): URL base de la web en el servidor local.
+        titles (int): Número de animes seguidos.
+        concurrency (int): Páginas comprobadas a la vez.
+
+    Returns:
+        List[Dict]: Resultados.
+    """
+    async def check(watcher:EpisodeWatcher, now:float) -> float:
+        try:
+            start:float = perf_counter()
+            await watcher.check(now=now)
+            return perf_counter() - start
+        finally:
+            await close_async_session()
+
+    results:List[Dict] = []
+    with tempfile.TemporaryDirectory() as folder:
+        cfg:WatchConfig = WatchConfig()
+        cfg.path, cfg.batch, cfg.concurrency = os.path.join(folder, "watch.sqlite3"), titles, concurrency
+        with EpisodeWatcher(managers=[manager], cfg=cfg) as watcher:
+            for index in range(titles):
+                watcher.follow(site=manager.Site, url=f"{base_url}/anime/watched-{index}")
+            now:float = watcher.next_check() + cfg.min_interval
+            for name in ("full", "not-modified"):
+                elapsed:float = run(check(watcher, now))
+                results.append({"name": f"watch/{manager.Site}/{name}/{titles}", "unit": "titles/s", "better": "higher",
+                                "value": titles / elapsed, "samples": titles})
+                now += cfg.max_interval * 2
+    return results
+
+
+def bench_memory(records:int) -> List[Dict]:
+    """
+    Mide la memoria de un catálogo de animes en memoria y de su índice por temas, y el tiempo
+    de un filtro por temas sobre todo el catálogo.
+
+    Args:
+        records (int): Número de animes del catálogo.
+
+    Returns:
+        List[Dict]: Resultados.
+    """
+    genres:List[str] = [f"Genre {index}" for index in range(40)]
+    names:List[str] = [f"Anime {index}" for index in range(records)]
+    descriptions:List[str] = [f"Description of anime {index}" for index in range(records)]
+    urls:List[str] = [f"https://example.com/anime/{index}" for index in range(records)]
+
+    # Memoria de los animes (los temas se generan como cadenas nuevas, como al leer una página).
+    tracemalloc.start()
+    start:int = tracemalloc.get_traced_memory()[0]
+    animes:List[Anime] = [Anime(names[index], descriptions[index], [(genres[(index * step) % 40] + " ")[:-1] for step in (1, 3, 7, 11)],
+                                [Episode(1, urls[index])]) for index in range(records)]
+    animes_size:int = tracemalloc.get_traced_memory()[0] - start
+
+    # Memoria del índice por temas.
+    start = tracemalloc.get_traced_memory()[0]
+    index:ThemeIndex = ThemeIndex()
+    index.extend((anime, anime.ThemeMask) for anime in animes)
+    index.count(all_of=genres[:1])
+    index_size:int = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    return [{"name": f"memory/anime/{records}", "unit": "bytes", "better": "lower", "value": animes_size / records, "samples": records},
+            {"name": f"memory/theme_index/{records}", "unit": "bytes", "better": "lower", "value": index_size / records, "samples": records},
+            timings(f"filter/themes/{records}", measure(lambda: index.filter(all_of=genres[:2], none_of=genres[2:3]), 20))]
+
+
+def bench_matching(records:int) -> List[Dict]:
+    """
+    Mide el emparejamiento de dos catálogos completos de títulos generados: el segundo repite
+    el 70 % de los títulos del primero con otro formato (mayúsculas, puntuación, "(TV)").
+
+    Args:
+        records (int): Número de títulos de cada catálogo.
+
+    Returns:
+        List[Dict]: Resultados (con el número de títulos repetidos encontrados).
+    """
+    # Genera los títulos con sílabas romanizadas y palabras en inglés.
+    generator:random.Random = random.Random(0)
+    syllables:List[str] = [consonant + vowel for consonant in ("", "k", "s", "sh", "t", "ch", "ts", "n", "h", "m", "y", "r", "g", "z", "d", "b", "ky", "ry")
+                           for vowel in "aiueo"]
+    words:List[str] = ("the of a hero academy dragon ball love world sword online girl demon king attack titan life school "
+                       "magic night star moon fire war princess knight ghost game lost city sky sea soul dream legend tale").split()
+
+    def title() -> str:
+        parts:List[str] = [generator.choice(words) if generator.random() < 0.4 else
+                           "".join(generator.choice(syllables) for _ in range(generator.randint(1, 4))) for _ in range(generator.randint(2, 6))]
+        return " ".join(parts).title() + (f" {generator.randint(2, 4)}" if generator.random() < 0.2 else "")
+
+    left:List[str] = [title() for _ in range(records)]
+    shared:int = records * 7 // 10
+    right:List[str] = [generator.choice((str.upper, str.lower, lambda value: value + " (TV)", lambda value: value.replace(" ", ": ", 1)))(value)
+                       for value in left[:shared]] + [title() for _ in range(records - shared)]
+    generator.shuffle(right)
+
+    # Mide el emparejamiento.
+    matcher:TitleMatcher = TitleMatcher()
+    matches:list = []
+
+    def match() -> None:
+        matches[:] = matcher.match(left=left, right=right)
+
+    samples:List[float] = measure(match, 1)
+    return [{**timings(f"match/catalogs/{records}x{records}", samples), "matched": len(matches), "expected": shared}]
+
+
+def top_level_imports(args:List[str]) -> Dict[str, int]:
+    """
+    Ejecuta Python con `-X importtime` y devuelve los módulos importados directamente.
+
+    Args:
+        args (List[str]): Argumentos del intérprete (script o `-c`).
+
+    Returns:
+        Dict[str, int]: Tiempo acumulado (en microsegundos) de cada módulo de primer nivel.
+    """
+    root:str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    stderr:str = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=root, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, text=True, check=True).stderr
+    imports:Dict[str, int] = {}
+    for line in stderr.splitlines():
+        parts:List[str] = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit() and not parts[2].startswith("  "):
+            imports[parts[2].strip()] = int(parts[1])
+    return imports
+
+
+def bench_startup(iterations:int) -> List[Dict]:
+    """
+    Mide el arranque de la línea de comandos: el tiempo del proceso completo y el de los
+    módulos que importa `main.py` (sin contar los del propio intérprete). El resultado de
+    los imports indica además si se cargó la pila de red o de análisis del HTML.
+
+    Args:
+        iterations (int): Número de ejecuciones.
+
+    Returns:
+        List[Dict]: Resultados.
+    """
+    root:str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command:List[str] = [os.path.join(root, "main.py"), "search", "--help"]
+    samples:List[float] = measure(lambda: subprocess.run([sys.executable, *command], cwd=root, stdout=subprocess.DEVNULL, check=True), iterations)
+
+    # Imports propios de la CLI.
+    interpreter:Set[str] = set(top_level_imports(["-c", "pass"]))
+    imports:Dict[str, int] = {name: elapsed for name, elapsed in top_level_imports(command).items() if name not in interpreter}
+    heavy:List[str] = [name for name in ("requests", "aiohttp", "bs4", "selectolax", "lxml") if name in imports]
+    return [timings("startup/cli/search-help", samples),
+            {"name": "startup/cli/imports", "unit": "ms", "better": "lower", "value": sum(imports.values()) / 1000,
+             "samples": 1, "heavy": heavy}]
+
+
+def compare(current:List[Dict], baseline:List[Dict]) -> None:
+    """
+    Imprime la variación de cada benchmark respecto a una ejecución anterior.
+
+    Args:
+        current (List[Dict]): Resultados actuales.
+        baseline (List[Dict]): Resultados anteriores.
+    """
+    previous:Dict[str, Dict] = {result["name"]: result for result in baseline}
+    for result in current:
+        old:Optional[Dict] = previous.get(result["name"])
+        if old is None or not old["value"]:
+            print(f"{result['name']:<48} {result['value']:>10.3f} {result['unit']:<8} (new)")
+            continue
+        change:float = (result["value"] - old["value"]) / old["value"] * 100
+        improved:bool = change < 0 if result["better"] == "lower" else change > 0
+        print(f"{result['name']:<48} {result['value']:>10.3f} {result['unit']:<8} {change:+7.1f}% {'better' if improved else 'worse'}")
+
+
+def main(args:Namespace) -> None:
+    """
+    Ejecuta los benchmarks seleccionados.
+
+    Args:
+        args (Namespace): Argumentos de la línea de comandos.
+    """
+    # Configura el control por host (desactivado salvo que se indique un ritmo).
+    throttle:Optional[ThrottleConfig] = None
+    if args.rate:
+        throttle = ThrottleConfig()
+        throttle.rate, throttle.burst = args.rate, max(1, int(args.rate))
+    configure_throttle(throttle)
+
+    results:List[Dict] = []
+    if "memory" in args.only:
+        results += bench_memory(records=args.records)
+    if "matching" in args.only:
+        results += bench_matching(records=args.titles)
+    if "startup" in args.only:
+        results += bench_startup(iterations=args.iterations)
+    with FixtureServer(latency=args.latency, bandwidth=args.bandwidth) as server:
+        flv_cfg, fenix_cfg = server.configs()
+        managers:Dict[str, AnimeManager] = {"animeflv": AnimeFlvManager(flv_cfg), "animefenix": AnimeFenixManager(fenix_cfg)}
+        if "parse" in args.only:
+            results += bench_parse(managers=managers, iterations=args.iterations)
+        if "latency" in args.only:
+            results += bench_latency(managers=managers, iterations=args.iterations)
+        if "throughput" in args.only:
+            results += bench_throughput(managers=managers, requests=args.requests, concurrency=args.concurrency)
+        if "watch" in args.only:
+            results += bench_watch(manager=managers["animeflv"], base_url=flv_cfg.base_url, titles=args.requests * 5,
+                                   concurrency=args.concurrency)
+        if "hls" in args.only:
+            results += bench_hls(server=server, workers=[1, HlsConfig.workers], iterations=max(1, args.iterations // 10))
+
+    # Genera el informe.
+    report:Dict = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                            "backends": available_backends(), "args": vars(args)}, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    # Muestra los resultados.
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            compare(current=results, baseline=json.load(file)["results"])
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+# ---- LÓGICA PRINCIPAL ---- #
+if __name__ == "__main__":
+    parser:ArgumentParser = ArgumentParser(description="Anime-Downloader benchmarks.")
+    parser.add_argument("--only", nargs="+", default=["parse", "latency", "throughput"], choices=["parse", "latency", "throughput", "watch", "hls", "memory", "matching", "startup"])
+    parser.add_argument("--iterations", type=int, default=50, help="Executions per parse/latency/startup case.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the local server waits before each response.")
+    parser.add_argument("--bandwidth", type=int, default=None, help="Bytes per second the local server sends (default: unlimited).")
+    parser.add_argument("--requests", type=int, default=200, help="Pages loaded per site in the throughput benchmark.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight in the throughput benchmark.")
+    parser.add_argument("--records", type=int, default=100000, help="Animes in the catalog of the memory benchmark.")
+    parser.add_argument("--titles", type=int, default=10000, help="Titles in each catalog of the matching benchmark.")
+    parser.add_argument("--rate", type=float, default=None, help="Per-host requests per second allowed by the throttle (default: throttle disabled).")
+    parser.add_argument("--output", help="Write the machine-readable report to this JSON file.")
+    parser.add_argument("--compare", help="Compare against a previous JSON report instead of printing the raw report.")
+    main(args=parser.parse_args())
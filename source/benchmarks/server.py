@@ -0,0 +1,385 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: server.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-16
+# · Descripción: Servidor HTTP local que sustituye a las webs reproduciendo las páginas
+# grabadas en `benchmarks/fixtures` (y un stream HLS sintético), con latencia y ancho de
+# banda configurables.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import re
+import hashlib
+
+from typing import Dict, List, Optional, Tuple
+from time import sleep
+from threading import Lock, Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lib.config.schema import AnimeFlvConfig, AnimeFenixConfig
+
+
+# ---- VARIABLES ---- #
+FIXTURES_DIR:str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+HLS_VARIANTS:Dict[str, int] = {"low": 800000, "high": 2400000}     # Variante -> ancho de banda (bits/s).
+
+
+# ---- CLASES ---- #
+class _Server(ThreadingHTTPServer):
+    """
+    Servidor HTTP con una cola de conexiones pendientes suficiente para los benchmarks de
+    rendimiento (la de por defecto, 5, provoca reintentos de conexión con mucha concurrencia).
+    """
+    request_queue_size:int = 128
+
+
+class FixtureServer:
+    """
+    Servidor HTTP local que imita a AnimeFlv (bajo `/flv`) y AnimeFenix (bajo `/fenix`)
+    devolviendo las páginas grabadas. Cada respuesta espera `latency` segundos antes de
+    enviarse y el cuerpo se envía a `bandwidth` bytes por segundo. Las respuestas llevan
+    `ETag` y responden 304 a las peticiones condicionales.
+
+    Bajo `/files/video.mp4` sirve un fichero binario de `file_size` bytes (ver `file`). Si
+    `ranges` está activado todas las respuestas llevan `Accept-Ranges` y las peticiones con
+    `Range` (y `If-Range` vigente) responden 206 con la parte pedida; si no, se ignora
+    `Range` y se responde siempre 200 con el cuerpo completo. Las `drops` respuestas
+    siguientes se cortan a mitad del cuerpo para simular conexiones interrumpidas.
+
+    Bajo `/hls` sirve además un stream HLS sintético: una lista maestra
+    (`/hls/master.m3u8`) con las variantes de `HLS_VARIANTS` y, por variante, una lista de
+    `hls_segments` segmentos de `hls_segment_size` bytes (ver `hls_segment`). Con `hls_key`
+    los segmentos se cifran con AES-128 (el vector de inicialización es el número de
+    segmento) y la clave se sirve en `/hls/<variante>/key.bin`.
+
+    Si se asigna `status`, todas las peticiones responden ese estado sin cuerpo (para simular
+    una web caída o sobrecargada).
+
+    Si se asigna `catalog` (títulos, del más reciente al más antiguo), el directorio de
+    AnimeFlv (`/flv/browse?page=N`, sin consulta) se genera a partir de esos títulos en
+    páginas de `catalog_page_size` entradas y responde 404 a partir de la última.
+
+    Las configuraciones devueltas por `configs` apuntan al servidor, por lo que los managers
+    pueden usarse sin cambios.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, host:str="127.0.0.1", port:int=0, latency:float=0.0, bandwidth:Optional[int]=None,
+                 fixtures_dir:str=FIXTURES_DIR, hls_segments:int=50, hls_segment_size:int=256 * 1024,
+                 file_size:int=4 * 1024 * 1024, ranges:bool=True, hls_key:Optional[bytes]=None):
+        """
+        Inicializa la instancia.
+
+        Args:
+            host (str): Dirección en la que escuchar.
+            port (int): Puerto en el que escuchar (0 = uno libre).
+            latency (float): Segundos de espera antes de cada respuesta.
+            bandwidth (Optional[int]): Bytes por segundo al enviar el cuerpo (`None` = sin límite).
+            fixtures_dir (str): Directorio con las páginas grabadas.
+            hls_segments (int): Segmentos de cada variante del stream HLS.
+            hls_segment_size (int): Bytes de cada segmento del stream HLS.
+            file_size (int): Bytes del fichero binario de `/files/video.mp4`.
+            ranges (bool): Si se atienden las peticiones por rangos (`Range`).
+            hls_key (Optional[bytes]): Clave AES-128 (16 bytes) con la que cifrar los segmentos
+                HLS (`None` = sin cifrar). Necesita el paquete `cryptography`.
+        """
+        # Inicializa las propiedades.
+        self.latency:float = latency
+        self.bandwidth:Optional[int] = bandwidth
+        self.requests:int = 0
+        self.hls_segments:int = hls_segments
+        self.hls_segment_size:int = hls_segment_size
+        self.hls_key:Optional[bytes] = hls_key
+        self.ranges:bool = ranges
+        self.drops:int = 0
+        self.status:Optional[int] = None
+        self.catalog:List[str] = []
+        self.catalog_page_size:int = 20
+        self.file:bytes = (bytes(range(251)) * (file_size // 251 + 1))[:file_size]
+        self.__lock:Lock = Lock()
+        self.__pages:Dict[Tuple[str, str], bytes] = {}
+        for site in ("animeflv", "animefenix"):
+            for page in ("search", "detail"):
+                with open(os.path.join(fixtures_dir, site, f"{page}.html"), "rb") as file:
+                    self.__pages[(site, page)] = file.read()
+        self.__server:ThreadingHTTPServer = _Server((host, port), self.__handler())
+        self.__server.daemon_threads = True
+        self.__thread:Optional[Thread] = None
+
+    def __enter__(self) -> "FixtureServer":
+        """
+        Arranca el servidor al entrar en el contexto.
+
+        Returns:
+            FixtureServer: La propia instancia.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Detiene el servidor al salir del contexto.
+        """
+        self.stop()
+
+
+    # -- Propiedades -- #
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL base del servidor.
+
+        Returns:
+            str: URL base (`http://host:puerto`).
+        """
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+    # -- Métodos -- #
+    def start(self) -> None:
+        """
+        Arranca el servidor en un hilo en segundo plano.
+        """
+        self.__thread = Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Detiene el servidor.
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def configs(self) -> Tuple[AnimeFlvConfig, AnimeFenixConfig]:
+        """
+        Genera las configuraciones de las webs apuntando al servidor.
+
+        Returns:
+            Tuple[AnimeFlvConfig, AnimeFenixConfig]: Configuraciones de AnimeFlv y AnimeFenix.
+        """
+        # Configuración de AnimeFlv.
+        flv:AnimeFlvConfig = AnimeFlvConfig()
+        flv.base_url = f"{self.Url}/flv"
+        flv.browse_url = f"{self.Url}/flv/browse"
+        flv.query_url = f"{self.Url}/flv/browse?q="
+        flv.watch_url = f"{self.Url}/flv/ver"
+
+        # Configuración de AnimeFenix.
+        fenix:AnimeFenixConfig = AnimeFenixConfig()
+        fenix.base_url = f"{self.Url}/fenix"
+        fenix.browse_url = f"{self.Url}/fenix/directorio/anime"
+        fenix.query_url = f"{self.Url}/fenix/directorio/anime?q="
+        fenix.watch_url = f"{self.Url}/fenix/ver"
+
+        # Retorna las configuraciones.
+        return flv, fenix
+
+    def page(self, path:str) -> Optional[bytes]:
+        """
+        Devuelve la página grabada que corresponde a una ruta.
+
+        Args:
+            path (str): Ruta de la petición.
+
+        Returns:
+            Optional[bytes]: Cuerpo de la página o `None` si la ruta no existe.
+        """
+        path, _, query = path.partition("?")
+        if path.startswith("/flv/browse") and self.catalog and "q=" not in query:
+            match = re.search(r"(?:^|&)page=(\d+)", query)
+            return self.__catalog(page=int(match.group(1)) if match else 1)
+        if path.startswith("/flv/browse"):
+            return self.__pages[("animeflv", "search")]
+        if path.startswith("/flv/anime/"):
+            return self.__pages[("animeflv", "detail")]
+        if path.startswith("/fenix/directorio/anime"):
+            return self.__pages[("animefenix", "search")]
+        if path.startswith("/fenix/") and not path.startswith("/fenix/ver/"):
+            return self.__pages[("animefenix", "detail")]
+        if path.startswith("/hls/"):
+            return self.__hls(path=path[len("/hls/"):])
+        if path == "/files/video.mp4":
+            return self.file
+        return None
+
+    def hls_segment(self, variant:str, index:int) -> bytes:
+        """
+        Genera un segmento del stream HLS sintético (su contenido depende de la variante y del
+        número de segmento, para poder comprobar el fichero descargado).
+
+        Args:
+            variant (str): Variante (clave de `HLS_VARIANTS`).
+            index (int): Número de segmento.
+
+        Returns:
+            bytes: Contenido del segmento.
+        """
+        header:bytes = f"{variant}:{index}:".encode("ascii")
+        return (header + bytes([index % 256]) * self.hls_segment_size)[:self.hls_segment_size]
+
+    def consume_drop(self) -> bool:
+        """
+        Consume una de las respuestas que deben cortarse.
+
+        Returns:
+            bool: Si la respuesta actual debe cortarse a mitad del cuerpo.
+        """
+        with self.__lock:
+            if self.drops > 0:
+                self.drops -= 1
+                return True
+            return False
+
+
+    # -- Métodos privados -- #
+    def __hls(self, path:str) -> Optional[bytes]:
+        """
+        Genera las listas y los segmentos del stream HLS sintético.
+
+        Args:
+            path (str): Ruta de la petición sin el prefijo `/hls/`.
+
+        Returns:
+            Optional[bytes]: Cuerpo o `None` si la ruta no existe.
+        """
+        if path == "master.m3u8":
+            lines:List[str] = ["#EXTM3U"]
+            for variant, bandwidth in HLS_VARIANTS.items():
+                lines += [f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},CODECS=\"avc1.4d401f,mp4a.40.2\"", f"{variant}/index.m3u8"]
+            return "\n".join(lines).encode("ascii") + b"\n"
+        variant, _, name = path.partition("/")
+        if variant not in HLS_VARIANTS:
+            return None
+        if name == "index.m3u8":
+            lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:4", "#EXT-X-MEDIA-SEQUENCE:0"]
+            if self.hls_key is not None:
+                lines.append('#EXT-X-KEY:METHOD=AES-128,URI="key.bin"')
+            for index in range(self.hls_segments):
+                lines += ["#EXTINF:4.000,", f"{index}.ts"]
+            return "\n".join(lines + ["#EXT-X-ENDLIST"]).encode("ascii") + b"\n"
+        if name == "key.bin" and self.hls_key is not None:
+            return self.hls_key
+        number:str = name[:-len(".ts")] if name.endswith(".ts") else ""
+        if number.isdigit() and int(number) < self.hls_segments:
+            segment:bytes = self.hls_segment(variant=variant, index=int(number))
+            return segment if self.hls_key is None else self.__encrypt(data=segment, iv=int(number).to_bytes(16, "big"))
+        return None
+
+    def __catalog(self, page:int) -> Optional[bytes]:
+        """
+        Genera una página del directorio de AnimeFlv con los títulos de `catalog`.
+
+        Args:
+            page (int): Número de página (desde 1).
+
+        Returns:
+            Optional[bytes]: Cuerpo o `None` si la página no existe.
+        """
+        titles:List[str] = self.catalog[(page - 1) * self.catalog_page_size:page * self.catalog_page_size]
+        if page < 1 or not titles:
+            return None
+        items:List[str] = []
+        for title in titles:
+            slug:str = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+            items.append(f'<li><article class="Anime alt B"><a href="/anime/{slug}"><h3 class="Title">{title}</h3></a></article></li>')
+        return f'<html><body><ul class="ListAnimes">{"".join(items)}</ul></body></html>'.encode("utf-8")
+
+    def __encrypt(self, data:bytes, iv:bytes) -> bytes:
+        """
+        Cifra un segmento con AES-128 (CBC con relleno PKCS#7), como los streams HLS cifrados.
+
+        Args:
+            data (bytes): Contenido del segmento.
+            iv (bytes): Vector de inicialización.
+
+        Returns:
+            bytes: Contenido cifrado.
+        """
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        padding:int = 16 - len(data) % 16
+        encryptor = Cipher(algorithms.AES(self.hls_key), modes.CBC(iv)).encryptor()
+        return encryptor.update(data + bytes([padding]) * padding) + encryptor.finalize()
+
+    def __handler(self) -> type:
+        """
+        Genera la clase que atiende las peticiones del servidor.
+
+        Returns:
+            type: Subclase de `BaseHTTPRequestHandler`.
+        """
+        server:FixtureServer = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                server.requests += 1
+                if server.latency:
+                    sleep(server.latency)
+
+                # Busca la página.
+                body:Optional[bytes] = server.page(path=self.path)
+                if body is None or server.status is not None:
+                    self.send_response(server.status or 404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                # Responde 304 si el cliente ya tiene la página.
+                etag:str = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                # Responde solo la parte pedida si se atienden rangos y el `If-Range` coincide.
+                size:int = len(body)
+                status:int = 200
+                match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", "").strip())
+                if server.ranges and match and self.headers.get("If-Range", etag) == etag:
+                    if match.group(1):
+                        first, last = int(match.group(1)), min(int(match.group(2) or size - 1), size - 1)
+                    else:
+                        first, last = max(0, size - int(match.group(2) or 0)), size - 1
+                    if first > last:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{size}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    status, body = 206, body[first:last + 1]
+
+                # Envía la página respetando el ancho de banda.
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {first}-{last}/{size}")
+                self.end_headers()
+                step:int = 16 * 1024
+                end:int = len(body) // 2 if len(body) > 1 and server.consume_drop() else len(body)
+                try:
+                    for start in range(0, end, step):
+                        self.wfile.write(body[start:min(start + step, end)])
+                        if server.bandwidth:
+                            sleep(min(step, end - start) / server.bandwidth)
+                except (BrokenPipeError, ConnectionResetError):
+                    # El cliente cerró la conexión sin leer el resto (`get_html(until=...)`).
+                    self.close_connection = True
+                if end < len(body):
+                    # Corta la conexión sin enviar el resto del cuerpo.
+                    self.close_connection = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return _Handler
@@ -0,0 +1,333 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: cache.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-04
+# · Descripción: Módulo con la caché HTTP persistente usada por las peticiones de red.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import re
+import json
+import sqlite3
+
+from typing import Dict, List, Optional, Pattern, Tuple
+from time import time
+from threading import Lock
+
+from lib.config.schema import CacheConfig
+
+
+# ---- CLASES ---- #
+class CacheEntry:
+    """
+    Respuesta almacenada en la caché.
+
+    Attributes:
+        Url (str): URL de la respuesta.
+        Content (bytes): Cuerpo de la respuesta.
+        Headers (Dict[str, str]): Cabeceras de la respuesta.
+        FetchedAt (float): Momento (timestamp) en el que se validó por última vez.
+        Ttl (float): Tiempo (en segundos) que la respuesta se considera vigente.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, url:str, content:bytes, headers:Dict[str, str], fetched_at:float, ttl:float):
+        """
+        Inicializa la instancia.
+
+        Args:
+            url (str): URL de la respuesta.
+            content (bytes): Cuerpo de la respuesta.
+            headers (Dict[str, str]): Cabeceras de la respuesta.
+            fetched_at (float): Momento (timestamp) en el que se validó por última vez.
+            ttl (float): Tiempo (en segundos) que la respuesta se considera vigente.
+        """
+        # Inicializa las propiedades.
+        self.__url:str = url
+        self.__content:bytes = content
+        self.__headers:Dict[str, str] = headers
+        self.__fetchedAt:float = fetched_at
+        self.__ttl:float = ttl
+
+
+    # -- Propiedades -- #
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL de la respuesta.
+
+        Returns:
+            str: URL de la respuesta.
+        """
+        return self.__url
+
+    @property
+    def Content(self) -> bytes:
+        """
+        Devuelve el cuerpo de la respuesta.
+
+        Returns:
+            bytes: Cuerpo de la respuesta.
+        """
+        return self.__content
+
+    @property
+    def Headers(self) -> Dict[str, str]:
+        """
+        Devuelve las cabeceras de la respuesta.
+
+        Returns:
+            Dict[str, str]: Cabeceras de la respuesta.
+        """
+        return self.__headers
+
+    @property
+    def FetchedAt(self) -> float:
+        """
+        Devuelve el momento en el que la respuesta se validó por última vez.
+
+        Returns:
+            float: Timestamp de la última validación.
+        """
+        return self.__fetchedAt
+
+    @property
+    def Fresh(self) -> bool:
+        """
+        Indica si la respuesta sigue vigente y puede usarse sin consultar al servidor.
+
+        Returns:
+            bool: `True` si la respuesta está vigente.
+        """
+        return time() - self.__fetchedAt < self.__ttl
+
+    @property
+    def Validators(self) -> Dict[str, str]:
+        """
+        Devuelve las cabeceras de una petición condicional para revalidar la respuesta.
+
+        Returns:
+            Dict[str, str]: Cabeceras `If-None-Match` / `If-Modified-Since` disponibles.
+        """
+        return validators_of(headers=self.__headers)
+
+
+class HttpCache:
+    """
+    Caché HTTP persistente en un fichero SQLite. Cada URL guarda el cuerpo, las cabeceras
+    (incluidos `ETag`/`Last-Modified`) y el momento de la descarga. El tiempo de vigencia se
+    decide por patrones de URL y, una vez caducada, la entrada se revalida con una petición
+    condicional. El tamaño total se mantiene por debajo de `max_bytes` expulsando las
+    entradas usadas hace más tiempo (LRU).
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, path:str=CacheConfig.path, max_bytes:int=CacheConfig.max_bytes,
+                 ttl_rules:Optional[List[Tuple[str, float]]]=None, default_ttl:float=CacheConfig.default_ttl):
+        """
+        Inicializa la instancia.
+
+        Args:
+            path (str): Ruta del fichero de la caché.
+            max_bytes (int): Tamaño máximo (en bytes) de los cuerpos almacenados.
+            ttl_rules (Optional[List[Tuple[str, float]]]): Reglas (expresión regular, segundos)
+                evaluadas en orden. Se usa la primera cuya expresión coincide con el inicio de la URL.
+            default_ttl (float): Tiempo de vigencia si ninguna regla coincide.
+        """
+        # Inicializa las propiedades.
+        self.__maxBytes:int = max_bytes
+        self.__defaultTtl:float = default_ttl
+        self.__rules:List[Tuple[Pattern, float]] = [(re.compile(pattern), ttl) for pattern, ttl in (ttl_rules or [])]
+        self.__lock:Lock = Lock()
+
+        # Abre (o crea) la base de datos.
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.__db:sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url         TEXT PRIMARY KEY,
+                content     BLOB NOT NULL,
+                headers     TEXT NOT NULL,
+                fetched_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size        INTEGER NOT NULL
+            )""")
+        self.__db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self.__db.commit()
+
+
+    # -- Métodos -- #
+    def ttl_for(self, url:str) -> float:
+        """
+        Devuelve el tiempo de vigencia que corresponde a una URL.
+
+        Args:
+            url (str): URL a comprobar.
+
+        Returns:
+            float: Tiempo de vigencia en segundos.
+        """
+        for pattern, ttl in self.__rules:
+            if pattern.match(url):
+                return ttl
+        return self.__defaultTtl
+
+    def get(self, url:str) -> Optional[CacheEntry]:
+        """
+        Obtiene la entrada de una URL (vigente o no) y la marca como usada.
+
+        Args:
+            url (str): URL a buscar.
+
+        Returns:
+            Optional[CacheEntry]: La entrada o `None` si no existe.
+        """
+        with self.__lock:
+            row = self.__db.execute("SELECT content, headers, fetched_at FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self.__db.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time(), url))
+            self.__db.commit()
+
+        # Retorna la entrada.
+        return CacheEntry(url=url, content=row[0], headers=json.loads(row[1]), fetched_at=row[2], ttl=self.ttl_for(url))
+
+    def put(self, url:str, content:bytes, headers:Dict[str, str]) -> None:
+        """
+        Almacena una respuesta y expulsa entradas antiguas si se supera el tamaño máximo.
+        Las respuestas marcadas con `Cache-Control: no-store` o mayores que el tamaño
+        máximo no se almacenan.
+
+        Args:
+            url (str): URL de la respuesta.
+            content (bytes): Cuerpo de la respuesta.
+            headers (Dict[str, str]): Cabeceras de la respuesta.
+        """
+        # Comprueba si la respuesta se puede almacenar.
+        headers = dict(headers)
+        cache_control:str = next((value for key, value in headers.items() if key.lower() == "cache-control"), "")
+        if "no-store" in cache_control.lower() or len(content) > self.__maxBytes:
+            return
+
+        # Almacena la respuesta.
+        now:float = time()
+        with self.__lock:
+            self.__db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                              (url, content, json.dumps(headers), now, now, len(content)))
+            self.__evict()
+            self.__db.commit()
+
+    def touch(self, url:str, headers:Optional[Dict[str, str]]=None) -> None:
+        """
+        Marca una entrada como revalidada (el servidor respondió 304) actualizando su momento
+        de descarga y, si se indican, las cabeceras recibidas.
+
+        Args:
+            url (str): URL de la entrada.
+            headers (Optional[Dict[str, str]]): Cabeceras de la respuesta 304.
+        """
+        now:float = time()
+        with self.__lock:
+            if headers:
+                row = self.__db.execute("SELECT headers FROM entries WHERE url = ?", (url,)).fetchone()
+                if row is not None:
+                    merged:Dict[str, str] = json.loads(row[0])
+                    merged.update(headers)
+                    self.__db.execute("UPDATE entries SET headers = ? WHERE url = ?", (json.dumps(merged), url))
+            self.__db.execute("UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self.__db.commit()
+
+    def delete(self, url:str) -> None:
+        """
+        Elimina la entrada de una URL.
+
+        Args:
+            url (str): URL de la entrada.
+        """
+        with self.__lock:
+            self.__db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self.__db.commit()
+
+    def size(self) -> int:
+        """
+        Devuelve el tamaño total de los cuerpos almacenados.
+
+        Returns:
+            int: Tamaño en bytes.
+        """
+        with self.__lock:
+            return self.__db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Cierra la base de datos.
+        """
+        with self.__lock:
+            self.__db.close()
+
+
+    # -- Métodos privados -- #
+    def __evict(self) -> None:
+        """
+        Expulsa las entradas usadas hace más tiempo hasta que el tamaño total no supere el
+        máximo. Debe llamarse con el bloqueo adquirido.
+        """
+        total:int = self.__db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.__maxBytes:
+            return
+        for url, size in self.__db.execute("SELECT url, size FROM entries ORDER BY accessed_at ASC").fetchall():
+            self.__db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            if total <= self.__maxBytes:
+                break
+
+
+# ---- FUNCIONES ---- #
+def ttl_rules_for(*site_cfgs, cfg:CacheConfig=CacheConfig()) -> List[Tuple[str, float]]:
+    """
+    Genera las reglas de vigencia de las webs dadas: las páginas de búsqueda (`query_url`)
+    caducan pronto y el resto de páginas de la web (`base_url`) tardan más en caducar.
+
+    Args:
+        site_cfgs: Configuraciones de las webs (`AnimeFlvConfig`, `AnimeFenixConfig`, ...).
+        cfg (CacheConfig): Configuración de la caché.
+
+    Returns:
+        List[Tuple[str, float]]: Reglas (expresión regular, segundos) para `HttpCache`.
+    """
+    # Variable a devolver.
+    rules:List[Tuple[str, float]] = []
+
+    # Las reglas de búsqueda deben ir antes porque `query_url` empieza por `base_url`.
+    rules += [(re.escape(site_cfg.query_url), cfg.search_ttl) for site_cfg in site_cfgs]
+    rules += [(re.escape(site_cfg.base_url), cfg.detail_ttl) for site_cfg in site_cfgs]
+
+    # Retorna las reglas.
+    return rules
+
+
+def validators_of(headers:Dict[str, str]) -> Dict[str, str]:
+    """
+    Genera las cabeceras de una petición condicional a partir de las de una respuesta.
+
+    Args:
+        headers (Dict[str, str]): Cabeceras de la respuesta.
+
+    Returns:
+        Dict[str, str]: Cabeceras `If-None-Match` / `If-Modified-Since` disponibles.
+    """
+    # Variable a devolver.
+    validators:Dict[str, str] = {}
+
+    # Añade los validadores que haya enviado el servidor.
+    headers = {key.lower(): value for key, value in headers.items()}
+    if "etag" in headers:
+        validators["If-None-Match"] = headers["etag"]
+    if "last-modified" in headers:
+        validators["If-Modified-Since"] = headers["last-modified"]
+
+    # Retorna las cabeceras.
+    return validators
@@ -0,0 +1,348 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: download.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-13
+# · Descripción: Módulo con el motor de descarga de ficheros por rangos en paralelo.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import re
+import json
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from time import monotonic, sleep
+from threading import Lock
+from http import HTTPStatus
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import RequestException, Response
+
+from lib.config.schema import DownloadConfig
+from lib.common.network import NetworkBadResponseError, get_session, get_timeout
+from lib.common.retry import RetryPolicy
+from lib.common.throttle import BandwidthLimiter
+
+
+# ---- CLASES ---- #
+class DownloadError(Exception):
+    """
+    Excepción causada cuando una descarga no puede completarse.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, *args):
+        """
+        Inicializa la instancia.
+        """
+        # Inicializa las propiedades.
+        super().__init__(*args)
+
+
+class _DownloadState:
+    """
+    Progreso de una descarga por rangos. Se guarda periódicamente junto al fichero parcial
+    (`<destino>.part.json`) para poder reanudar la descarga tras una interrupción.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, path:str, url:str, size:int, validator:Optional[str], segments:List[List[int]], interval:float):
+        """
+        Inicializa la instancia.
+
+        Args:
+            path (str): Ruta del fichero de estado.
+            url (str): URL descargada.
+            size (int): Tamaño total del fichero.
+            validator (Optional[str]): `ETag`/`Last-Modified` del fichero remoto.
+            segments (List[List[int]]): Rangos `[inicio, fin, bytes descargados]`.
+            interval (float): Cada cuántos segundos se guarda el estado.
+        """
+        # Inicializa las propiedades.
+        self.path:str = path
+        self.url:str = url
+        self.size:int = size
+        self.validator:Optional[str] = validator
+        self.segments:List[List[int]] = segments
+        self.__interval:float = interval
+        self.__lastSave:float = 0.0
+        self.__lock:Lock = Lock()
+
+
+    # -- Propiedades -- #
+    @property
+    def Downloaded(self) -> int:
+        """
+        Devuelve el número de bytes descargados.
+
+        Returns:
+            int: Bytes descargados.
+        """
+        return sum(segment[2] for segment in self.segments)
+
+
+    # -- Métodos -- #
+    def advance(self, segment:List[int], length:int) -> None:
+        """
+        Registra los bytes descargados de un rango y guarda el estado si toca.
+
+        Args:
+            segment (List[int]): Rango descargado.
+            length (int): Número de bytes escritos.
+        """
+        with self.__lock:
+            segment[2] += length
+            if monotonic() - self.__lastSave >= self.__interval:
+                self.__save()
+
+    def save(self) -> None:
+        """
+        Guarda el estado en disco.
+        """
+        with self.__lock:
+            self.__save()
+
+    @classmethod
+    def load(cls, path:str, interval:float) -> Optional["_DownloadState"]:
+        """
+        Carga el estado guardado de una descarga.
+
+        Args:
+            path (str): Ruta del fichero de estado.
+            interval (float): Cada cuántos segundos se guarda el estado.
+
+        Returns:
+            Optional[_DownloadState]: El estado o `None` si no existe o no es válido.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data:Dict = json.load(file)
+            return cls(path=path, url=data["url"], size=data["size"], validator=data.get("validator"),
+                       segments=data["segments"], interval=interval)
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+    # -- Métodos privados -- #
+    def __save(self) -> None:
+        """
+        Escribe el estado en disco. Debe llamarse con el bloqueo adquirido.
+        """
+        with open(f"{self.path}.tmp", "w", encoding="utf-8") as file:
+            json.dump({"url": self.url, "size": self.size, "validator": self.validator, "segments": self.segments}, file)
+        os.replace(f"{self.path}.tmp", self.path)
+        self.__lastSave = monotonic()
+
+
+# ---- FUNCIONES ---- #
+def download_file(url:str, path:str, cfg:DownloadConfig=DownloadConfig(),
+                  progress:Optional[Callable[[int, Optional[int]], None]]=None,
+                  limiters:Sequence[BandwidthLimiter]=()) -> str:
+    """
+    Descarga un fichero escribiendo directamente en disco. Si el servidor admite rangos
+    (`Accept-Ranges`/206), el fichero se divide en `cfg.connections` rangos que se descargan
+    en paralelo sobre el mismo fichero parcial (`<destino>.part`); el progreso de cada rango
+    se guarda en `<destino>.part.json`, de forma que si el proceso se interrumpe la siguiente
+    llamada continúa donde se quedó. Si el servidor no admite rangos se descarga con una
+    única conexión.
+
+    Args:
+        url (str): URL del fichero.
+        path (str): Ruta de destino.
+        cfg (DownloadConfig): Configuración de la descarga.
+        progress (Optional[Callable[[int, Optional[int]], None]]): Función llamada con los bytes
+            descargados y el tamaño total (si se conoce) tras cada bloque.
+        limiters (Sequence[BandwidthLimiter]): Límites de ancho de banda que se aplican a cada
+            bloque recibido (por ejemplo, uno global y otro del host).
+
+    Raises:
+        NetworkBadResponseError: Si el servidor responde con un estado de error.
+        DownloadError: Si el fichero remoto cambia durante la descarga o no llega completo.
+
+    Returns:
+        str: La ruta de destino.
+    """
+    # Variables.
+    part_path:str = f"{path}.part"
+    state_path:str = f"{path}.part.json"
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Consulta el tamaño del fichero y si el servidor admite rangos.
+    size, ranges, validator = _probe(url=url)
+    if not ranges or not size:
+        _download_single(url=url, part_path=part_path, cfg=cfg, progress=progress, limiters=limiters)
+        os.replace(part_path, path)
+        return path
+
+    # Reanuda la descarga anterior si corresponde al mismo fichero remoto.
+    state:Optional[_DownloadState] = _DownloadState.load(path=state_path, interval=cfg.state_interval)
+    if (state is None or state.url != url or state.size != size or state.validator != validator
+            or not os.path.exists(part_path) or os.path.getsize(part_path) != size):
+        state = _DownloadState(path=state_path, url=url, size=size, validator=validator,
+                               segments=_split(size=size, cfg=cfg), interval=cfg.state_interval)
+        with open(part_path, "wb") as file:
+            file.truncate(size)
+        state.save()
+
+    # Descarga los rangos pendientes en paralelo.
+    pending:List[List[int]] = [segment for segment in state.segments if segment[2] < segment[1] - segment[0] + 1]
+    policy:RetryPolicy = RetryPolicy()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(cfg.connections, len(pending)))) as executor:
+            for future in [executor.submit(_download_segment, url, part_path, segment, state, cfg, progress, limiters, policy) for segment in pending]:
+                future.result()
+    finally:
+        state.save()
+
+    # Comprueba que el fichero esté completo y lo mueve a su destino.
+    if state.Downloaded != size:
+        raise DownloadError(f"Incomplete download of '{url}': {state.Downloaded}/{size} bytes.")
+    os.replace(part_path, path)
+    os.remove(state_path)
+
+    # Retorna la ruta.
+    return path
+
+
+def _probe(url:str) -> Tuple[Optional[int], bool, Optional[str]]:
+    """
+    Consulta el tamaño del fichero remoto y si admite descargas por rangos pidiendo su
+    primer byte.
+
+    Args:
+        url (str): URL del fichero.
+
+    Raises:
+        NetworkBadResponseError: Si el servidor responde con un estado de error.
+
+    Returns:
+        Tuple[Optional[int], bool, Optional[str]]: Tamaño, si admite rangos y validador
+            (`ETag` o `Last-Modified`).
+    """
+    with get_session().get(url, headers={"Range": "bytes=0-0", "Accept-Encoding": "identity"}, timeout=get_timeout(), stream=True) as response:
+        validator:Optional[str] = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        if response.status_code == 206:
+            total = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+            return (int(total.group(1)) if total else None), total is not None, validator
+        if response.status_code == 200:
+            length:Optional[str] = response.headers.get("Content-Length")
+            return (int(length) if length else None), False, validator
+        raise NetworkBadResponseError(status_code=response.status_code, reason=HTTPStatus(value=response.status_code).phrase)
+
+
+def _split(size:int, cfg:DownloadConfig) -> List[List[int]]:
+    """
+    Divide el fichero en rangos de tamaño similar.
+
+    Args:
+        size (int): Tamaño del fichero.
+        cfg (DownloadConfig): Configuración de la descarga.
+
+    Returns:
+        List[List[int]]: Rangos `[inicio, fin (incluido), 0]`.
+    """
+    count:int = max(1, min(cfg.connections, size // max(1, cfg.min_segment_size)))
+    length:int = -(-size // count)
+    return [[start, min(start + length, size) - 1, 0] for start in range(0, size, length)]
+
+
+def _download_segment(url:str, part_path:str, segment:List[int], state:_DownloadState, cfg:DownloadConfig,
+                      progress:Optional[Callable[[int, Optional[int]], None]], limiters:Sequence[BandwidthLimiter],
+                      policy:RetryPolicy) -> None:
+    """
+    Descarga lo que falta de un rango y lo escribe en su posición del fichero parcial. Si la
+    conexión se corta (o el servidor responde con un error 5xx), vuelve a pedir el resto del
+    rango; tras `cfg.retries` intentos seguidos sin recibir datos abandona.
+
+    Args:
+        url (str): URL del fichero.
+        part_path (str): Ruta del fichero parcial.
+        segment (List[int]): Rango `[inicio, fin, bytes descargados]`.
+        state (_DownloadState): Progreso de la descarga.
+        cfg (DownloadConfig): Configuración de la descarga.
+        progress (Optional[Callable[[int, Optional[int]], None]]): Función de progreso.
+        limiters (Sequence[BandwidthLimiter]): Límites de ancho de banda.
+        policy (RetryPolicy): Política con la espera entre reintentos.
+
+    Raises:
+        DownloadError: Si el servidor no respeta el rango o no envía datos tras los reintentos.
+    """
+    start, end = segment[0], segment[1]
+    attempts:int = 0
+    error:str = ""
+    while segment[2] < end - start + 1:
+        # Tras un corte sin avance se espera antes de reintentar, hasta agotar los reintentos.
+        if attempts:
+            if attempts > cfg.retries:
+                raise DownloadError(f"Could not download range {start + segment[2]}-{end} of '{url}' ({error}).")
+            sleep(policy.backoff(attempt=attempts - 1))
+
+        # Pide el resto del rango. `If-Range` evita mezclar datos si el fichero remoto ha cambiado.
+        offset:int = start + segment[2]
+        headers:Dict[str, str] = {"Range": f"bytes={offset}-{end}", "Accept-Encoding": "identity"}
+        if state.validator:
+            headers["If-Range"] = state.validator
+        before:int = segment[2]
+        try:
+            response:Response
+            with get_session().get(url, headers=headers, timeout=get_timeout(), stream=True) as response:
+                if response.status_code >= 500:
+                    error = f"status {response.status_code}"
+                elif response.status_code != 206:
+                    raise DownloadError(f"Server did not honour range {offset}-{end} of '{url}' (status {response.status_code}).")
+                else:
+                    # Escribe los bloques en su posición. Sin búfer, para que el progreso guardado
+                    # nunca incluya bytes que solo estaban en memoria si el proceso muere.
+                    error = "no data received"
+                    with open(part_path, "r+b", buffering=0) as file:
+                        file.seek(offset)
+                        for chunk in response.iter_content(chunk_size=cfg.chunk_size):
+                            chunk = chunk[:end - start + 1 - segment[2]]
+                            for limiter in limiters:
+                                limiter.consume(amount=len(chunk))
+                            file.write(chunk)
+                            state.advance(segment=segment, length=len(chunk))
+                            if progress is not None:
+                                progress(state.Downloaded, state.size)
+        except RequestException as e:
+            # Conexión cortada o sin respuesta a mitad del rango: se pide lo que falta.
+            error = repr(e)
+
+        # Los reintentos solo se consumen si la conexión no aportó datos.
+        attempts = attempts + 1 if segment[2] == before else 0
+
+
+def _download_single(url:str, part_path:str, cfg:DownloadConfig, progress:Optional[Callable[[int, Optional[int]], None]],
+                     limiters:Sequence[BandwidthLimiter]) -> None:
+    """
+    Descarga el fichero con una única conexión (el servidor no admite rangos).
+
+    Args:
+        url (str): URL del fichero.
+        part_path (str): Ruta del fichero parcial.
+        cfg (DownloadConfig): Configuración de la descarga.
+        progress (Optional[Callable[[int, Optional[int]], None]]): Función de progreso.
+        limiters (Sequence[BandwidthLimiter]): Límites de ancho de banda.
+
+    Raises:
+        NetworkBadResponseError: Si el servidor responde con un estado de error.
+        DownloadError: Si el fichero no llega completo.
+    """
+    with get_session().get(url, headers={"Accept-Encoding": "identity"}, timeout=get_timeout(), stream=True) as response:
+        if response.status_code != 200:
+            raise NetworkBadResponseError(status_code=response.status_code, reason=HTTPStatus(value=response.status_code).phrase)
+        length:Optional[str] = response.headers.get("Content-Length")
+        downloaded:int = 0
+        with open(part_path, "wb") as file:
+            for chunk in response.iter_content(chunk_size=cfg.chunk_size):
+                for limiter in limiters:
+                    limiter.consume(amount=len(chunk))
+                file.write(chunk)
+                downloaded += len(chunk)
+                if progress is not None:
+                    progress(downloaded, int(length) if length else None)
+
+    # Comprueba que el fichero esté completo.
+    if length and downloaded != int(length):
+        raise DownloadError(f"Incomplete download of '{url}': {downloaded}/{length} bytes.")
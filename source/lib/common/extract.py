@@ -0,0 +1,453 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: extract.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-24
+# · Descripción: Módulo con los esquemas de extracción declarativos: un conjunto de campos
+# (selector CSS + qué tomar de cada nodo) que se compila una vez y se aplica al documento
+# en un único recorrido, con cualquier motor de `lib.common.parser`.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import re
+
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from bs4 import Tag
+
+from lib.common.parser import HtmlDocument, LexborNode
+
+
+# ---- VARIABLES ---- #
+FIRST:str = "first"         # Toma el primer nodo (en orden del documento).
+LAST:str = "last"           # Toma el último nodo.
+ALL:str = "all"             # Toma todos los nodos.
+
+_ITEM:int = -1              # Destino de los estados del selector `item` (el resto son índices de campos).
+_COMPOUND:Pattern = re.compile(r"""
+    (?P<tag>\*|[a-zA-Z][\w-]*)
+    | \.(?P<cls>[\w-]+)
+    | \#(?P<id>[\w-]+)
+    | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$]?=)\s*(?P<value>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+""", re.VERBOSE)
+
+# Selector compuesto compilado: etiqueta, clases y condiciones de atributos (nombre, operador, valor).
+Compound = Tuple[Optional[str], Tuple[str, ...], Tuple[Tuple[str, Optional[str], Optional[str]], ...]]
+
+
+# ---- CLASES ---- #
+class SchemaError(Exception):
+    """
+    Excepción causada cuando un campo de un esquema de extracción no es válido.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, *args):
+        """
+        Inicializa la instancia.
+        """
+        # Inicializa las propiedades.
+        super().__init__(*args)
+
+
+class Field:
+    """
+    Campo de un esquema de extracción. Se declara como `[all:|last:]selector[@atributo]`:
+    por defecto se toma el texto del primer nodo que cumple el selector, `all:` toma todos
+    (lista) y `last:` el último; `@atributo` toma el valor de ese atributo en lugar del texto.
+
+    El selector admite etiquetas, clases, identificadores y atributos (`[a]`, `[a=v]`,
+    `[a*=v]`, `[a^=v]`, `[a$=v]`) unidos por el combinador descendiente (espacio).
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, name:str, spec:str):
+        """
+        Inicializa la instancia.
+
+        Args:
+            name (str): Nombre del campo.
+            spec (str): Declaración del campo.
+
+        Raises:
+            SchemaError: Si la declaración no es válida.
+        """
+        # Separa el modo, el selector y el atributo.
+        mode:str = FIRST
+        if spec.startswith((f"{ALL}:", f"{LAST}:")):
+            mode, _, spec = spec.partition(":")
+        selector, _, attr = spec.rpartition("@") if re.search(r"@[\w-]+$", spec) else (spec, "", "")
+
+        # Inicializa las propiedades.
+        self.__name:str = name
+        self.__mode:str = mode
+        self.__css:str = selector.strip()
+        self.__compounds:Tuple[Compound, ...] = compile_selector(selector=self.__css)
+        self.__attr:Optional[str] = attr or None
+
+
+    # -- Propiedades -- #
+    @property
+    def Name(self) -> str:
+        """
+        Devuelve el nombre del campo.
+
+        Returns:
+            str: Nombre del campo.
+        """
+        return self.__name
+
+    @property
+    def Mode(self) -> str:
+        """
+        Devuelve qué nodos se toman.
+
+        Returns:
+            str: `first`, `last` o `all`.
+        """
+        return self.__mode
+
+    @property
+    def Css(self) -> str:
+        """
+        Devuelve el selector CSS del campo.
+
+        Returns:
+            str: Selector CSS.
+        """
+        return self.__css
+
+    @property
+    def Compounds(self) -> Tuple[Compound, ...]:
+        """
+        Devuelve el selector compilado del campo.
+
+        Returns:
+            Tuple[Compound, ...]: Selectores compuestos, del ancestro más lejano al nodo.
+        """
+        return self.__compounds
+
+    @property
+    def Attr(self) -> Optional[str]:
+        """
+        Devuelve el atributo que se toma de cada nodo.
+
+        Returns:
+            Optional[str]: Nombre del atributo o `None` si se toma el texto.
+        """
+        return self.__attr
+
+
+class Extractor:
+    """
+    Esquema de extracción compilado. Se aplica con un único recorrido del documento:
+
+    - Con BeautifulSoup, el recorrido se hace en Python y cada selector avanza como un
+      autómata: un nodo que cumple la parte `k` de un selector activa la parte `k + 1` para
+      todos sus descendientes, de forma que no se recorre el documento por cada campo ni se
+      suben los ancestros de cada nodo. Los atributos solo se leen si la etiqueta coincide.
+    - Con selectolax, todos los selectores se unen en una lista que Lexbor resuelve en C con
+      un solo recorrido (el árbol no está recortado y recorrerlo en Python sería más lento);
+      cada nodo encontrado se asigna después a sus campos.
+
+    Con `item`, el esquema extrae un registro por cada nodo que cumple `item` (por ejemplo,
+    cada resultado de una búsqueda) y los selectores de los campos son relativos a él. Los
+    nodos `item` no deben estar anidados entre sí.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, fields:Dict[str, str], item:Optional[str]=None):
+        """
+        Inicializa la instancia.
+
+        Args:
+            fields (Dict[str, str]): Campos, como nombre -> declaración (ver `Field`).
+            item (Optional[str]): Selector de cada registro (`None` = un registro por documento).
+
+        Raises:
+            SchemaError: Si algún campo no es válido.
+        """
+        # Inicializa las propiedades.
+        self.__fields:List[Field] = [Field(name=name, spec=spec) for name, spec in fields.items()]
+        self.__item:Optional[Tuple[Compound, ...]] = compile_selector(selector=item) if item else None
+        self.__fieldStates:Tuple[Tuple[int, int], ...] = tuple((index, 0) for index in range(len(self.__fields)))
+
+        # Genera la lista de selectores para selectolax.
+        prefix:str = f"{item} " if item else ""
+        selectors:List[str] = ([item] if item else []) + [prefix + field.Css for field in self.__fields]
+        self.__css:str = ", ".join(dict.fromkeys(selectors))
+
+
+    # -- Métodos -- #
+    def extract(self, html:HtmlDocument) -> Dict[str, Any]:
+        """
+        Extrae los campos de un documento (esquemas sin `item`).
+
+        Args:
+            html (HtmlDocument): Documento procesado.
+
+        Returns:
+            Dict[str, Any]: Valor de cada campo (`None` o lista vacía si no hay nodos).
+        """
+        record:Dict[str, Any] = {}
+        self.__walk(html=html, states=self.__fieldStates, record=record, records=[])
+        return self.__complete(record=record)
+
+    def extract_items(self, html:HtmlDocument) -> List[Dict[str, Any]]:
+        """
+        Extrae un registro por cada nodo `item` del documento.
+
+        Args:
+            html (HtmlDocument): Documento procesado.
+
+        Returns:
+            List[Dict[str, Any]]: Registros, en orden del documento.
+        """
+        if self.__item is None:
+            raise SchemaError("This schema has no item selector; use extract().")
+        records:List[Dict[str, Any]] = []
+        self.__walk(html=html, states=((_ITEM, 0),), record=None, records=records)
+        return [self.__complete(record=record) for record in records]
+
+
+    # -- Métodos privados -- #
+    def __walk(self, html:HtmlDocument, states:Tuple[Tuple[int, int], ...], record:Optional[Dict[str, Any]],
+               records:List[Dict[str, Any]]) -> None:
+        """
+        Recorre el documento con el motor que lo generó.
+
+        Args:
+            html (HtmlDocument): Documento procesado.
+            states (Tuple[Tuple[int, int], ...]): Estados iniciales (destino, parte del selector).
+            record (Optional[Dict[str, Any]]): Registro inicial (`None` hasta el primer `item`).
+            records (List[Dict[str, Any]]): Registros de los nodos `item`.
+        """
+        if isinstance(html, LexborNode):
+            self.__dispatch(nodes=html.node.css(self.__css), record=record, records=records)
+        else:
+            self.__visit(children=_soup_children(html), states=states, record=record, records=records)
+
+    def __visit(self, children:List[Tag], states:Tuple[Tuple[int, int], ...], record:Optional[Dict[str, Any]],
+                records:List[Dict[str, Any]]) -> None:
+        """
+        Procesa los hijos de un nodo de BeautifulSoup y sus descendientes en orden del
+        documento. El recorrido usa una pila explícita en lugar de recursión, porque las
+        páginas mal formadas (miles de etiquetas sin cerrar) generan árboles muy profundos.
+
+        Args:
+            children (List[Tag]): Etiquetas hijas.
+            states (Tuple[Tuple[int, int], ...]): Partes de selector activas para los hijos.
+            record (Optional[Dict[str, Any]]): Registro al que pertenecen los hijos.
+            records (List[Dict[str, Any]]): Registros de los nodos `item`.
+        """
+        # Pila de nodos pendientes con sus partes de selector activas y su registro (los hijos
+        # se apilan en orden inverso para sacarlos en orden del documento).
+        stack:List[Tuple[Tag, Tuple[Tuple[int, int], ...], Optional[Dict[str, Any]]]] = [(node, states, record) for node in reversed(children)]
+        while stack:
+            # Variables del nodo.
+            node, states, record = stack.pop()
+            name:str = node.name
+            attrs:Optional[dict] = None
+            node_states:Tuple[Tuple[int, int], ...] = states
+            node_record:Optional[Dict[str, Any]] = record
+
+            # Comprueba cada parte de selector activa.
+            for target, position in states:
+                if target == _ITEM:
+                    compounds:Tuple[Compound, ...] = self.__item
+                else:
+                    field:Field = self.__fields[target]
+                    if field.Mode == FIRST and field.Name in record:
+                        continue
+                    compounds = field.Compounds
+                tag, classes, conditions = compounds[position]
+                if tag is not None and tag != name:
+                    continue
+                if classes or conditions:
+                    if attrs is None:
+                        attrs = node.attrs
+                    if not _match_attrs(classes=classes, conditions=conditions, attrs=attrs):
+                        continue
+
+                # Avanza el selector o, si es la última parte, el nodo es del selector.
+                if position + 1 < len(compounds):
+                    if (target, position + 1) not in node_states:
+                        node_states += ((target, position + 1),)
+                elif target == _ITEM:
+                    node_record = {}
+                    records.append(node_record)
+                    node_states += self.__fieldStates
+                elif field.Mode == ALL:
+                    record.setdefault(field.Name, []).append(node.text if field.Attr is None else node.get(field.Attr))
+                else:
+                    record[field.Name] = node.text if field.Attr is None else node.get(field.Attr)
+
+            # Apila los descendientes.
+            stack.extend((child, node_states, node_record) for child in reversed(_soup_children(node)))
+
+    def __dispatch(self, nodes:list, record:Optional[Dict[str, Any]], records:List[Dict[str, Any]]) -> None:
+        """
+        Asigna a sus registros y campos los nodos de selectolax encontrados con la lista de
+        selectores (en orden del documento).
+
+        Args:
+            nodes (list): Nodos de selectolax.
+            record (Optional[Dict[str, Any]]): Registro inicial (`None` hasta el primer `item`).
+            records (List[Dict[str, Any]]): Registros de los nodos `item`.
+        """
+        previous:Optional[int] = None
+        for node in nodes:
+            # Lexbor repite el nodo si cumple varios selectores de la lista.
+            if node.mem_id == previous:
+                continue
+            previous = node.mem_id
+            attrs:dict = node.attributes
+
+            # Un nodo `item` abre un registro nuevo.
+            if self.__item is not None and _match_path(compounds=self.__item, node=node, attrs=attrs):
+                record = {}
+                records.append(record)
+                continue
+            if record is None:
+                continue
+
+            # Asigna el nodo a los campos que cumple.
+            for field in self.__fields:
+                if field.Mode == FIRST and field.Name in record:
+                    continue
+                if not _match_path(compounds=field.Compounds, node=node, attrs=attrs):
+                    continue
+                value:Optional[str] = node.text(deep=True) if field.Attr is None else attrs.get(field.Attr)
+                if field.Mode == ALL:
+                    record.setdefault(field.Name, []).append(value)
+                else:
+                    record[field.Name] = value
+
+    def __complete(self, record:Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Completa los campos sin nodos de un registro.
+
+        Args:
+            record (Dict[str, Any]): Registro extraído.
+
+        Returns:
+            Dict[str, Any]: El mismo registro.
+        """
+        for field in self.__fields:
+            if field.Name not in record:
+                record[field.Name] = [] if field.Mode == ALL else None
+        return record
+
+
+# ---- FUNCIONES ---- #
+def compile_selector(selector:str) -> Tuple[Compound, ...]:
+    """
+    Compila un selector CSS con combinadores descendientes.
+
+    Args:
+        selector (str): Selector CSS, por ejemplo `div.mb-6 a[href*='/ver/']`.
+
+    Raises:
+        SchemaError: Si usa algo no admitido (otros combinadores, pseudoclases o listas).
+
+    Returns:
+        Tuple[Compound, ...]: Selectores compuestos, del ancestro más lejano al nodo.
+    """
+    if re.search(r"[>+~,:](?![^\[]*\])", selector):
+        raise SchemaError(f"Unsupported selector '{selector}' (only the descendant combinator is allowed).")
+
+    # Compila cada selector compuesto.
+    compounds:List[Compound] = []
+    for part in re.findall(r"(?:\[[^\]]*\]|[^\s\[])+", selector):
+        tag:Optional[str] = None
+        classes:List[str] = []
+        conditions:List[Tuple[str, Optional[str], Optional[str]]] = []
+        position:int = 0
+        while position < len(part):
+            match = _COMPOUND.match(part, position)
+            if match is None or (match.group("tag") and position):
+                raise SchemaError(f"Unsupported selector '{selector}' (only tags, classes, ids, attributes and descendants).")
+            if match.group("tag"):
+                tag = None if match.group("tag") == "*" else match.group("tag").lower()
+            elif match.group("cls"):
+                classes.append(match.group("cls"))
+            elif match.group("id"):
+                conditions.append(("id", "=", match.group("id")))
+            else:
+                value:Optional[str] = match.group("value")
+                if value is not None and value[:1] in "'\"":
+                    value = value[1:-1]
+                conditions.append((match.group("attr"), match.group("op"), value))
+            position = match.end()
+        compounds.append((tag, tuple(classes), tuple(conditions)))
+
+    if not compounds:
+        raise SchemaError(f"Empty selector '{selector}'.")
+    return tuple(compounds)
+
+
+def _match_attrs(classes:Tuple[str, ...], conditions:Tuple, attrs:dict) -> bool:
+    """
+    Comprueba las clases y condiciones de atributos de un selector compuesto.
+
+    Args:
+        classes (Tuple[str, ...]): Clases requeridas.
+        conditions (Tuple): Condiciones (nombre, operador, valor).
+        attrs (dict): Atributos del nodo.
+
+    Returns:
+        bool: `True` si las cumple.
+    """
+    if classes:
+        value = attrs.get("class") or ()
+        names = value.split() if isinstance(value, str) else value
+        for name in classes:
+            if name not in names:
+                return False
+    for attr, op, expected in conditions:
+        value = attrs.get(attr)
+        if isinstance(value, list):
+            value = " ".join(value)
+        if value is None or (op == "=" and value != expected) or (op == "*=" and expected not in value) \
+                or (op == "^=" and not value.startswith(expected)) or (op == "$=" and not value.endswith(expected)):
+            return False
+    return True
+
+
+def _match_path(compounds:Tuple[Compound, ...], node, attrs:dict) -> bool:
+    """
+    Comprueba si un nodo de selectolax cumple un selector subiendo por sus ancestros.
+
+    Args:
+        compounds (Tuple[Compound, ...]): Selector compilado.
+        node: Nodo de selectolax.
+        attrs (dict): Atributos del nodo.
+
+    Returns:
+        bool: `True` si lo cumple.
+    """
+    # El nodo debe cumplir la última parte.
+    tag, classes, conditions = compounds[-1]
+    if (tag is not None and tag != node.tag) or not _match_attrs(classes=classes, conditions=conditions, attrs=attrs):
+        return False
+
+    # Sus ancestros deben cumplir el resto, en orden.
+    index:int = len(compounds) - 2
+    node = node.parent
+    while index >= 0 and node is not None:
+        tag, classes, conditions = compounds[index]
+        if (tag is None or tag == node.tag) and _match_attrs(classes=classes, conditions=conditions, attrs=node.attributes):
+            index -= 1
+        node = node.parent
+    return index < 0
+
+
+def _soup_children(node:Tag) -> List[Tag]:
+    """
+    Devuelve las etiquetas hijas de un nodo de BeautifulSoup.
+
+    Args:
+        node (Tag): Nodo de BeautifulSoup.
+
+    Returns:
+        List[Tag]: Etiquetas hijas (sin textos ni comentarios).
+    """
+    return [child for child in node.contents if isinstance(child, Tag)]
@@ -0,0 +1,759 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: hls.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-27
+# · Descripción: Módulo con la descarga de streams HLS: lectura de las listas `m3u8`
+# (maestras y de segmentos), elección de la variante y descarga de los segmentos en
+# paralelo escribiéndolos en orden en un único fichero.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import re
+import json
+
+from typing import Callable, Deque, Dict, List, Optional, Pattern, Sequence, Tuple
+from time import monotonic, sleep
+from hashlib import sha1
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+from http import HTTPStatus
+
+from requests import RequestException
+
+from lib.config.schema import HlsConfig
+from lib.common.download import DownloadError
+from lib.common.network import NetworkBadResponseError, get_session, get_timeout
+from lib.common.retry import RetryPolicy
+from lib.common.throttle import BandwidthLimiter
+
+
+# ---- VARIABLES ---- #
+_ATTRIBUTE:Pattern = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+# ---- CLASES ---- #
+class HlsVariant:
+    """
+    Representa una variante (calidad) de una lista maestra.
+
+    Attributes:
+        Url (str): URL de la lista de segmentos de la variante.
+        Bandwidth (int): Ancho de banda (bits/s) declarado.
+        Resolution (Optional[str]): Resolución declarada (`1920x1080`).
+    """
+    __slots__ = ("__url", "__bandwidth", "__resolution")
+
+
+    # -- Métodos por defecto -- #
+    def __init__(self, url:str, bandwidth:int, resolution:Optional[str]=None):
+        """
+        Inicializa la instancia.
+
+        Args:
+            url (str): URL de la lista de segmentos de la variante.
+            bandwidth (int): Ancho de banda (bits/s) declarado.
+            resolution (Optional[str]): Resolución declarada.
+        """
+        # Inicializa las propiedades.
+        self.__url:str = url
+        self.__bandwidth:int = bandwidth
+        self.__resolution:Optional[str] = resolution
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        return f"HlsVariant({self.Bandwidth}, {self.Resolution}, {self.Url})"
+
+
+    # -- Propiedades -- #
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL de la lista de segmentos de la variante.
+
+        Returns:
+            str: URL absoluta.
+        """
+        return self.__url
+
+    @property
+    def Bandwidth(self) -> int:
+        """
+        Devuelve el ancho de banda declarado de la variante.
+
+        Returns:
+            int: Bits por segundo (0 si no se declara).
+        """
+        return self.__bandwidth
+
+    @property
+    def Resolution(self) -> Optional[str]:
+        """
+        Devuelve la resolución declarada de la variante.
+
+        Returns:
+            Optional[str]: Resolución (`1920x1080`) o `None` si no se declara.
+        """
+        return self.__resolution
+
+
+class HlsSegment:
+    """
+    Representa un segmento de una lista de segmentos.
+
+    Attributes:
+        Url (str): URL del segmento.
+        Duration (float): Duración en segundos.
+        Range (Optional[Tuple[int, int]]): Rango de bytes (inicio, longitud) dentro del fichero.
+        Key (Optional[str]): URL de la clave AES-128 con la que está cifrado.
+        Iv (Optional[bytes]): Vector de inicialización del cifrado.
+    """
+    __slots__ = ("__url", "__duration", "__range", "__key", "__iv")
+
+
+    # -- Métodos por defecto -- #
+    def __init__(self, url:str, duration:float, byterange:Optional[Tuple[int, int]]=None, key:Optional[str]=None,
+                 iv:Optional[bytes]=None):
+        """
+        Inicializa la instancia.
+
+        Args:
+            url (str): URL del segmento.
+            duration (float): Duración en segundos.
+            byterange (Optional[Tuple[int, int]]): Rango de bytes (inicio, longitud) o `None` si el
+                segmento es el fichero completo.
+            key (Optional[str]): URL de la clave AES-128 o `None` si no está cifrado.
+            iv (Optional[bytes]): Vector de inicialización (16 bytes) del cifrado.
+        """
+        # Inicializa las propiedades.
+        self.__url:str = url
+        self.__duration:float = duration
+        self.__range:Optional[Tuple[int, int]] = byterange
+        self.__key:Optional[str] = key
+        self.__iv:Optional[bytes] = iv
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        return f"HlsSegment({self.Duration}, {self.Url}{'' if self.Range is None else f' @{self.Range}'})"
+
+
+    # -- Propiedades -- #
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL del segmento.
+
+        Returns:
+            str: URL absoluta.
+        """
+        return self.__url
+
+    @property
+    def Duration(self) -> float:
+        """
+        Devuelve la duración del segmento.
+
+        Returns:
+            float: Segundos (0 para el segmento de inicialización).
+        """
+        return self.__duration
+
+    @property
+    def Range(self) -> Optional[Tuple[int, int]]:
+        """
+        Devuelve el rango de bytes del segmento (`#EXT-X-BYTERANGE`).
+
+        Returns:
+            Optional[Tuple[int, int]]: Inicio y longitud, o `None` si es el fichero completo.
+        """
+        return self.__range
+
+    @property
+    def Key(self) -> Optional[str]:
+        """
+        Devuelve la URL de la clave con la que está cifrado el segmento (`#EXT-X-KEY`).
+
+        Returns:
+            Optional[str]: URL de la clave AES-128 o `None` si no está cifrado.
+        """
+        return self.__key
+
+    @property
+    def Iv(self) -> Optional[bytes]:
+        """
+        Devuelve el vector de inicialización del cifrado del segmento.
+
+        Returns:
+            Optional[bytes]: El del atributo `IV` o, si no lo lleva, su número de secuencia.
+        """
+        return self.__iv
+
+
+class _HlsState:
+    """
+    Progreso de una descarga HLS. Se guarda periódicamente junto al fichero parcial
+    (`<destino>.part.json`): como los segmentos se escriben en orden, basta con el número de
+    segmentos escritos y los bytes que ocupan.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, path:str, fingerprint:str, done:int, size:int, interval:float):
+        """
+        Inicializa la instancia.
+
+        Args:
+            path (str): Ruta del fichero de estado.
+            fingerprint (str): Huella de la lista de segmentos descargada.
+            done (int): Segmentos escritos.
+            size (int): Bytes escritos.
+            interval (float): Cada cuántos segundos se guarda el estado.
+        """
+        # Inicializa las propiedades.
+        self.path:str = path
+        self.fingerprint:str = fingerprint
+        self.done:int = done
+        self.size:int = size
+        self.__interval:float = interval
+        self.__lastSave:float = 0.0
+
+
+    # -- Métodos -- #
+    def advance(self, length:int) -> None:
+        """
+        Registra un segmento escrito y guarda el estado si toca.
+
+        Args:
+            length (int): Bytes del segmento.
+        """
+        self.done += 1
+        self.size += length
+        if monotonic() - self.__lastSave >= self.__interval:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Guarda el estado en disco.
+        """
+        with open(f"{self.path}.tmp", "w", encoding="utf-8") as file:
+            json.dump({"fingerprint": self.fingerprint, "done": self.done, "size": self.size}, file)
+        os.replace(f"{self.path}.tmp", self.path)
+        self.__lastSave = monotonic()
+
+    @classmethod
+    def load(cls, path:str, interval:float) -> Optional["_HlsState"]:
+        """
+        Carga el estado guardado de una descarga.
+
+        Args:
+            path (str): Ruta del fichero de estado.
+            interval (float): Cada cuántos segundos se guarda el estado.
+
+        Returns:
+            Optional[_HlsState]: El estado o `None` si no existe o no es válido.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data:Dict = json.load(file)
+            return cls(path=path, fingerprint=data["fingerprint"], done=data["done"], size=data["size"], interval=interval)
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+# ---- FUNCIONES ---- #
+def is_master(text:str) -> bool:
+    """
+    Indica si una lista `m3u8` es una lista maestra (de variantes).
+
+    Args:
+        text (str): Contenido de la lista.
+
+    Returns:
+        bool: `True` si declara variantes (`#EXT-X-STREAM-INF`).
+    """
+    return "#EXT-X-STREAM-INF" in text
+
+
+def parse_master(text:str, url:str) -> List[HlsVariant]:
+    """
+    Extrae las variantes de una lista maestra.
+
+    Args:
+        text (str): Contenido de la lista.
+        url (str): URL de la lista (para resolver las URLs relativas).
+
+    Raises:
+        DownloadError: Si el contenido no es una lista `m3u8`.
+
+    Returns:
+        List[HlsVariant]: Variantes en el orden de la lista.
+    """
+    variants:List[HlsVariant] = []
+    attributes:Optional[Dict[str, str]] = None
+    for line in _lines(text=text, url=url):
+        if line.startswith("#EXT-X-STREAM-INF:"):
+            attributes = _attributes(value=line.split(":", 1)[1])
+        elif not line.startswith("#") and attributes is not None:
+            bandwidth:str = attributes.get("BANDWIDTH", "0")
+            variants.append(HlsVariant(url=urljoin(url, line), bandwidth=int(bandwidth) if bandwidth.isdigit() else 0,
+                                       resolution=attributes.get("RESOLUTION")))
+            attributes = None
+    return variants
+
+
+def parse_media(text:str, url:str) -> List[HlsSegment]:
+    """
+    Extrae los segmentos de una lista de segmentos, incluido el segmento de inicialización
+    (`#EXT-X-MAP`) de los streams fMP4. Los segmentos cifrados con AES-128 (`#EXT-X-KEY`)
+    llevan la URL de su clave y su vector de inicialización.
+
+    Args:
+        text (str): Contenido de la lista.
+        url (str): URL de la lista (para resolver las URLs relativas).
+
+    Raises:
+        DownloadError: Si el contenido no es una lista `m3u8` o usa otro cifrado.
+
+    Returns:
+        List[HlsSegment]: Segmentos en orden de reproducción.
+    """
+    segments:List[HlsSegment] = []
+    duration:float = 0.0
+    byterange:Optional[Tuple[int, Optional[int]]] = None
+    ends:Dict[str, int] = {}                # Fin del último rango de cada URL (para rangos sin inicio).
+    init:Optional[str] = None
+    sequence:int = 0                        # Número de secuencia del siguiente segmento.
+    key:Optional[str] = None
+    iv:Optional[bytes] = None
+    for line in _lines(text=text, url=url):
+        if line.startswith("#EXTINF:"):
+            value:str = line.split(":", 1)[1].split(",", 1)[0].strip()
+            duration = float(value) if value else 0.0
+        elif line.startswith("#EXT-X-BYTERANGE:"):
+            byterange = _byterange(value=line.split(":", 1)[1])
+        elif line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
+            value = line.split(":", 1)[1].strip()
+            sequence = int(value) if value.isdigit() else 0
+        elif line.startswith("#EXT-X-KEY:"):
+            # La clave se aplica a los segmentos siguientes hasta la próxima `#EXT-X-KEY`.
+            attributes:Dict[str, str] = _attributes(value=line.split(":", 1)[1])
+            method:str = attributes.get("METHOD", "NONE")
+            if method == "NONE":
+                key, iv = None, None
+            elif method == "AES-128" and attributes.get("URI"):
+                key, iv = urljoin(url, attributes["URI"]), _iv(value=attributes.get("IV"), url=url)
+            else:
+                raise DownloadError(f"Encrypted HLS streams ({method}) are not supported: '{url}'.")
+        elif line.startswith("#EXT-X-MAP:"):
+            # El segmento de inicialización se añade cada vez que cambia.
+            attributes = _attributes(value=line.split(":", 1)[1])
+            name:str = f"{attributes.get('URI')}@{attributes.get('BYTERANGE')}"
+            if attributes.get("URI") and name != init:
+                init = name
+                segments.append(_segment(url=urljoin(url, attributes["URI"]), duration=0.0, ends=ends,
+                                         byterange=_byterange(value=attributes["BYTERANGE"]) if attributes.get("BYTERANGE") else None,
+                                         key=key, iv=iv or sequence.to_bytes(16, "big")))
+        elif not line.startswith("#"):
+            # Sin atributo `IV`, el vector de inicialización es el número de secuencia.
+            segments.append(_segment(url=urljoin(url, line), duration=duration, byterange=byterange, ends=ends,
+                                     key=key, iv=iv or sequence.to_bytes(16, "big")))
+            duration, byterange = 0.0, None
+            sequence += 1
+    return segments
+
+
+def select_variant(variants:Sequence[HlsVariant], max_bandwidth:int=0) -> HlsVariant:
+    """
+    Elige la variante de mayor ancho de banda que no supere el máximo indicado (o la de
+    menor ancho de banda si todas lo superan).
+
+    Args:
+        variants (Sequence[HlsVariant]): Variantes de la lista maestra.
+        max_bandwidth (int): Ancho de banda (bits/s) máximo (0 = sin máximo).
+
+    Raises:
+        DownloadError: Si no hay variantes.
+
+    Returns:
+        HlsVariant: La variante elegida.
+    """
+    if not variants:
+        raise DownloadError("The HLS master playlist has no variants.")
+    allowed:List[HlsVariant] = [variant for variant in variants if not max_bandwidth or variant.Bandwidth <= max_bandwidth]
+    if not allowed:
+        return min(variants, key=lambda variant: variant.Bandwidth)
+    return max(allowed, key=lambda variant: variant.Bandwidth)
+
+
+def load_playlist(url:str, max_bandwidth:int=0, retries:int=HlsConfig.retries) -> Tuple[str, List[HlsSegment]]:
+    """
+    Descarga una lista `m3u8` y devuelve sus segmentos. Si es una lista maestra, elige una
+    variante con `select_variant` y descarga su lista de segmentos.
+
+    Args:
+        url (str): URL de la lista.
+        max_bandwidth (int): Ancho de banda (bits/s) máximo de la variante (0 = sin máximo).
+        retries (int): Reintentos de cada lista si la conexión falla o el servidor responde
+            con un error 5xx.
+
+    Raises:
+        NetworkBadResponseError: Si el servidor responde con un estado 4xx.
+        DownloadError: Si la lista no es válida o no se puede descargar tras los reintentos.
+
+    Returns:
+        Tuple[str, List[HlsSegment]]: URL de la lista de segmentos y sus segmentos.
+    """
+    policy:RetryPolicy = RetryPolicy()
+    text:str = _fetch_text(url=url, retries=retries, policy=policy)
+    if is_master(text=text):
+        url = select_variant(variants=parse_master(text=text, url=url), max_bandwidth=max_bandwidth).Url
+        text = _fetch_text(url=url, retries=retries, policy=policy)
+    return url, parse_media(text=text, url=url)
+
+
+def download_hls(url:str, path:str, cfg:HlsConfig=HlsConfig(),
+                 progress:Optional[Callable[[int, Optional[int]], None]]=None,
+                 limiters:Sequence[BandwidthLimiter]=()) -> str:
+    """
+    Descarga un stream HLS en un único fichero. Los segmentos se descargan con
+    `cfg.workers` hilos y se escriben en orden en cuanto llega el siguiente que falta: como
+    mucho hay `cfg.window` segmentos descargados o en curso por delante de él, por lo que la
+    memoria no depende de la duración del episodio. El progreso se guarda en
+    `<destino>.part.json`, de forma que si el proceso se interrumpe la siguiente llamada
+    continúa tras el último segmento escrito (si la lista de segmentos no ha cambiado).
+
+    Los segmentos cifrados con AES-128 se descifran antes de escribirse; para ello se
+    necesita el paquete opcional `cryptography`.
+
+    Args:
+        url (str): URL de la lista `m3u8` (maestra o de segmentos).
+        path (str): Ruta de destino.
+        cfg (HlsConfig): Configuración de la descarga.
+        progress (Optional[Callable[[int, Optional[int]], None]]): Función llamada con los
+            segmentos escritos y el total de segmentos tras cada segmento.
+        limiters (Sequence[BandwidthLimiter]): Límites de ancho de banda que se aplican a cada
+            bloque recibido.
+
+    Raises:
+        NetworkBadResponseError: Si el servidor responde con un estado de error.
+        DownloadError: Si la lista no es válida, un segmento no llega completo o no se puede
+            descifrar.
+
+    Returns:
+        str: La ruta de destino.
+    """
+    # Variables.
+    part_path:str = f"{path}.part"
+    state_path:str = f"{path}.part.json"
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Obtiene los segmentos de la variante elegida.
+    _, segments = load_playlist(url=url, max_bandwidth=cfg.max_bandwidth, retries=cfg.retries)
+    if not segments:
+        raise DownloadError(f"The HLS playlist '{url}' has no segments.")
+
+    # Reanuda la descarga anterior si corresponde a la misma lista. La huella no incluye la
+    # query de las URLs, que suele llevar tokens que cambian en cada resolución.
+    fingerprint:str = sha1("\n".join(f"{urlsplit(segment.Url).path}@{segment.Range}" for segment in segments).encode("utf-8")).hexdigest()
+    state:Optional[_HlsState] = _HlsState.load(path=state_path, interval=cfg.state_interval)
+    if (state is None or state.fingerprint != fingerprint or state.done > len(segments)
+            or not os.path.exists(part_path) or os.path.getsize(part_path) < state.size):
+        state = _HlsState(path=state_path, fingerprint=fingerprint, done=0, size=0, interval=cfg.state_interval)
+        open(part_path, "wb").close()
+        state.save()
+
+    # Descarga las claves de cifrado de los segmentos pendientes.
+    policy:RetryPolicy = RetryPolicy()
+    keys:Dict[str, bytes] = {}
+    for segment in segments[state.done:]:
+        if segment.Key is not None and segment.Key not in keys:
+            keys[segment.Key] = _fetch(url=segment.Key, retries=cfg.retries, policy=policy)
+            if len(keys[segment.Key]) != 16:
+                raise DownloadError(f"Invalid AES-128 key '{segment.Key}' ({len(keys[segment.Key])} bytes).")
+
+    # Descarga los segmentos pendientes en paralelo y los escribe en orden.
+    window:int = max(1, cfg.workers, cfg.window)
+    futures:Deque[Future] = deque()
+    submitted:int = state.done
+    with ThreadPoolExecutor(max_workers=max(1, cfg.workers)) as executor, open(part_path, "r+b") as file:
+        # Descarta lo que se escribió después del último estado guardado.
+        file.truncate(state.size)
+        file.seek(state.size)
+        try:
+            while state.done < len(segments):
+                # Mantiene la ventana llena.
+                while submitted < len(segments) and len(futures) < window:
+                    futures.append(executor.submit(_fetch_segment, segments[submitted], cfg, policy, limiters, keys))
+                    submitted += 1
+
+                # Espera al siguiente segmento y lo escribe.
+                data:bytes = futures.popleft().result()
+                file.write(data)
+                file.flush()
+                state.advance(length=len(data))
+                if progress is not None:
+                    progress(state.done, len(segments))
+        finally:
+            for future in futures:
+                future.cancel()
+            state.save()
+
+    # Mueve el fichero a su destino.
+    os.replace(part_path, path)
+    os.remove(state_path)
+
+    # Retorna la ruta.
+    return path
+
+
+def _lines(text:str, url:str) -> List[str]:
+    """
+    Devuelve las líneas no vacías de una lista `m3u8`.
+
+    Args:
+        text (str): Contenido de la lista.
+        url (str): URL de la lista.
+
+    Raises:
+        DownloadError: Si el contenido no es una lista `m3u8`.
+
+    Returns:
+        List[str]: Líneas sin espacios en los extremos.
+    """
+    lines:List[str] = [line.strip() for line in text.lstrip("\ufeff").splitlines() if line.strip()]
+    if not lines or lines[0] != "#EXTM3U":
+        raise DownloadError(f"'{url}' is not an HLS playlist.")
+    return lines
+
+
+def _attributes(value:str) -> Dict[str, str]:
+    """
+    Extrae la lista de atributos de una etiqueta (`CLAVE=valor,CLAVE="valor"`).
+
+    Args:
+        value (str): Texto tras los dos puntos de la etiqueta.
+
+    Returns:
+        Dict[str, str]: Atributos (sin comillas).
+    """
+    return {key: raw.strip('"') for key, raw in _ATTRIBUTE.findall(value)}
+
+
+def _byterange(value:str) -> Tuple[int, Optional[int]]:
+    """
+    Lee un rango de bytes `<longitud>[@<inicio>]`.
+
+    Args:
+        value (str): Rango.
+
+    Returns:
+        Tuple[int, Optional[int]]: Longitud e inicio (`None` si no se indica).
+    """
+    length, _, start = value.strip().partition("@")
+    return int(length), int(start) if start else None
+
+
+def _segment(url:str, duration:float, byterange:Optional[Tuple[int, Optional[int]]], ends:Dict[str, int],
+             key:Optional[str], iv:Optional[bytes]) -> HlsSegment:
+    """
+    Crea un segmento. Un rango sin inicio empieza donde acabó el anterior de la misma URL.
+
+    Args:
+        url (str): URL absoluta del segmento.
+        duration (float): Duración en segundos.
+        byterange (Optional[Tuple[int, Optional[int]]]): Longitud e inicio del rango.
+        ends (Dict[str, int]): Fin del último rango de cada URL (se actualiza).
+        key (Optional[str]): URL de la clave AES-128 o `None` si no está cifrado.
+        iv (Optional[bytes]): Vector de inicialización (se descarta si no está cifrado).
+
+    Returns:
+        HlsSegment: El segmento.
+    """
+    iv = iv if key is not None else None
+    if byterange is None:
+        return HlsSegment(url=url, duration=duration, key=key, iv=iv)
+    length, start = byterange
+    start = ends.get(url, 0) if start is None else start
+    ends[url] = start + length
+    return HlsSegment(url=url, duration=duration, byterange=(start, length), key=key, iv=iv)
+
+
+def _iv(value:Optional[str], url:str) -> Optional[bytes]:
+    """
+    Lee el atributo `IV` de una etiqueta `#EXT-X-KEY` (número hexadecimal de 128 bits).
+
+    Args:
+        value (Optional[str]): Valor del atributo (`0x...`).
+        url (str): URL de la lista.
+
+    Raises:
+        DownloadError: Si el valor no es un número hexadecimal de 128 bits.
+
+    Returns:
+        Optional[bytes]: Los 16 bytes o `None` si la etiqueta no lo lleva.
+    """
+    if not value:
+        return None
+    digits:str = value[2:] if value.lower().startswith("0x") else value
+    try:
+        if len(digits) > 32:
+            raise ValueError(digits)
+        return bytes.fromhex(digits.rjust(32, "0"))
+    except ValueError:
+        raise DownloadError(f"Invalid HLS key IV '{value}' in '{url}'.") from None
+
+
+def _fetch_text(url:str, retries:int, policy:RetryPolicy) -> str:
+    """
+    Descarga una lista `m3u8`.
+
+    Args:
+        url (str): URL de la lista.
+        retries (int): Reintentos si la conexión falla o el servidor responde con un error 5xx.
+        policy (RetryPolicy): Política con la espera entre reintentos.
+
+    Raises:
+        NetworkBadResponseError: Si el servidor responde con un estado 4xx.
+        DownloadError: Si la lista no se puede descargar tras los reintentos.
+
+    Returns:
+        str: Contenido de la lista.
+    """
+    return _fetch(url=url, retries=retries, policy=policy).decode("utf-8", errors="replace")
+
+
+def _fetch(url:str, retries:int, policy:RetryPolicy) -> bytes:
+    """
+    Descarga un recurso pequeño (lista o clave), reintentándolo como los segmentos si la
+    conexión falla o el servidor responde con un error 5xx.
+
+    Args:
+        url (str): URL del recurso.
+        retries (int): Reintentos antes de abandonar.
+        policy (RetryPolicy): Política con la espera entre reintentos.
+
+    Raises:
+        NetworkBadResponseError: Si el servidor responde con un estado 4xx.
+        DownloadError: Si el recurso no se puede descargar tras los reintentos.
+
+    Returns:
+        bytes: Contenido del recurso.
+    """
+    error:str = ""
+    for attempt in range(retries + 1):
+        if attempt:
+            sleep(policy.backoff(attempt=attempt - 1))
+        try:
+            with get_session().get(url, timeout=get_timeout()) as response:
+                if response.status_code >= 500:
+                    error = f"status {response.status_code}"
+                    continue
+                if response.status_code != 200:
+                    raise NetworkBadResponseError(status_code=response.status_code, reason=HTTPStatus(value=response.status_code).phrase)
+                return response.content
+        except RequestException as e:
+            error = repr(e)
+    raise DownloadError(f"Could not download '{url}' ({error}).")
+
+
+def _fetch_segment(segment:HlsSegment, cfg:HlsConfig, policy:RetryPolicy, limiters:Sequence[BandwidthLimiter],
+                   keys:Dict[str, bytes]) -> bytes:
+    """
+    Descarga un segmento completo, reintentándolo si la conexión falla, el servidor responde
+    con un error 5xx o el cuerpo no llega completo, y lo descifra si está cifrado.
+
+    Args:
+        segment (HlsSegment): Segmento a descargar.
+        cfg (HlsConfig): Configuración de la descarga.
+        policy (RetryPolicy): Política con la espera entre reintentos.
+        limiters (Sequence[BandwidthLimiter]): Límites de ancho de banda.
+        keys (Dict[str, bytes]): Claves AES-128 por URL.
+
+    Raises:
+        NetworkBadResponseError: Si el servidor responde con un estado 4xx.
+        DownloadError: Si el segmento no llega completo tras los reintentos o no se puede
+            descifrar.
+
+    Returns:
+        bytes: Contenido (descifrado) del segmento.
+    """
+    headers:Dict[str, str] = {"Accept-Encoding": "identity"}
+    if segment.Range is not None:
+        headers["Range"] = f"bytes={segment.Range[0]}-{segment.Range[0] + segment.Range[1] - 1}"
+    error:str = ""
+    for attempt in range(cfg.retries + 1):
+        if attempt:
+            sleep(policy.backoff(attempt=attempt - 1))
+        try:
+            with get_session().get(segment.Url, headers=headers, timeout=get_timeout(), stream=True) as response:
+                if response.status_code >= 500:
+                    error = f"status {response.status_code}"
+                    continue
+                if response.status_code not in (200, 206):
+                    raise NetworkBadResponseError(status_code=response.status_code, reason=HTTPStatus(value=response.status_code).phrase)
+
+                # Lee el cuerpo por bloques aplicando los límites de ancho de banda.
+                chunks:List[bytes] = []
+                for chunk in response.iter_content(chunk_size=cfg.chunk_size):
+                    for limiter in limiters:
+                        limiter.consume(amount=len(chunk))
+                    chunks.append(chunk)
+                data:bytes = b"".join(chunks)
+                length:Optional[str] = response.headers.get("Content-Length")
+                if length and len(data) != int(length):
+                    error = f"{len(data)}/{length} bytes"
+                    continue
+
+                # Si el servidor ignora el rango, se recorta el segmento del fichero completo.
+                if segment.Range is not None:
+                    if response.status_code == 200:
+                        data = data[segment.Range[0]:segment.Range[0] + segment.Range[1]]
+                    if len(data) != segment.Range[1]:
+                        error = f"{len(data)}/{segment.Range[1]} bytes"
+                        continue
+                return data if segment.Key is None else _decrypt(data=data, key=keys[segment.Key], segment=segment)
+        except RequestException as e:
+            error = repr(e)
+    raise DownloadError(f"Could not download HLS segment '{segment.Url}' ({error}).")
+
+
+def _decrypt(data:bytes, key:bytes, segment:HlsSegment) -> bytes:
+    """
+    Descifra un segmento AES-128 (CBC con relleno PKCS#7) con el paquete opcional
+    `cryptography`.
+
+    Args:
+        data (bytes): Contenido cifrado del segmento.
+        key (bytes): Clave de 16 bytes.
+        segment (HlsSegment): Segmento (con su vector de inicialización).
+
+    Raises:
+        DownloadError: Si `cryptography` no está instalado o el segmento no se puede descifrar.
+
+    Returns:
+        bytes: Contenido descifrado.
+    """
+    try:
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    except ImportError:
+        raise DownloadError("Encrypted HLS streams (AES-128) need the 'cryptography' package.") from None
+    if not data or len(data) % 16:
+        raise DownloadError(f"Encrypted HLS segment '{segment.Url}' is not a whole number of AES blocks.")
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(segment.Iv)).decryptor()
+    plain:bytes = decryptor.update(data) + decryptor.finalize()
+    padding:int = plain[-1]
+    if not 1 <= padding <= 16 or plain[-padding:] != bytes([padding]) * padding:
+        raise DownloadError(f"Could not decrypt HLS segment '{segment.Url}' (bad padding).")
+    return plain[:-padding]
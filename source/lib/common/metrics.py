@@ -0,0 +1,431 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: metrics.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-20
+# · Descripción: Módulo con las métricas (contadores e histogramas) de las fases de descarga
+# y procesado, su exportación en formato de texto de Prometheus y la traza por llamada.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Dict, Iterator, List, Optional, Tuple
+from time import perf_counter
+from threading import Lock, Thread
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# ---- VARIABLES ---- #
+DEFAULT_BUCKETS:Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_labels:ContextVar[Tuple[str, str]] = ContextVar("metrics_labels", default=("", ""))     # (web, operación) en curso.
+_trace:ContextVar[Optional[List["Span"]]] = ContextVar("metrics_trace", default=None)     # Traza activa (si la hay).
+
+
+# ---- CLASES ---- #
+class Span:
+    """
+    Fase medida dentro de una traza.
+
+    Attributes:
+        Name (str): Nombre de la fase (`connect`, `ttfb`, `body`, `parse`, `extract`, ...).
+        Site (str): Web de la operación.
+        Operation (str): Operación (`find_animes`, `load_anime`, ...).
+        Seconds (float): Duración de la fase.
+        Detail (Dict[str, object]): Datos adicionales (URL, bytes, estado, ...).
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, name:str, site:str, operation:str, seconds:float, detail:Dict[str, object]):
+        """
+        Inicializa la instancia.
+
+        Args:
+            name (str): Nombre de la fase.
+            site (str): Web de la operación.
+            operation (str): Operación.
+            seconds (float): Duración de la fase.
+            detail (Dict[str, object]): Datos adicionales.
+        """
+        # Inicializa las propiedades.
+        self.Name:str = name
+        self.Site:str = site
+        self.Operation:str = operation
+        self.Seconds:float = seconds
+        self.Detail:Dict[str, object] = detail
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación de la fase.
+
+        Returns:
+            str: Representación de la fase.
+        """
+        detail:str = " ".join(f"{key}={value}" for key, value in self.Detail.items())
+        return f"{self.Site or '-'}/{self.Operation or '-'} {self.Name:<8} {self.Seconds * 1000:9.3f} ms {detail}".rstrip()
+
+
+class Counter:
+    """
+    Contador con etiquetas.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, name:str, help:str, labels:Tuple[str, ...]):
+        """
+        Inicializa la instancia.
+
+        Args:
+            name (str): Nombre de la métrica.
+            help (str): Descripción de la métrica.
+            labels (Tuple[str, ...]): Nombres de las etiquetas.
+        """
+        # Inicializa las propiedades.
+        self.name:str = name
+        self.help:str = help
+        self.labels:Tuple[str, ...] = labels
+        self.__values:Dict[Tuple[str, ...], float] = {}
+        self.__lock:Lock = Lock()
+
+
+    # -- Métodos -- #
+    def inc(self, *values:str, amount:float=1) -> None:
+        """
+        Incrementa el contador de una combinación de etiquetas.
+
+        Args:
+            values (str): Valores de las etiquetas (en el orden de `labels`).
+            amount (float): Cantidad a sumar.
+        """
+        with self.__lock:
+            self.__values[values] = self.__values.get(values, 0) + amount
+
+    def value(self, *values:str) -> float:
+        """
+        Devuelve el valor de una combinación de etiquetas.
+
+        Args:
+            values (str): Valores de las etiquetas.
+
+        Returns:
+            float: Valor del contador.
+        """
+        return self.__values.get(values, 0)
+
+    def render(self) -> List[str]:
+        """
+        Genera las líneas del contador en formato de texto de Prometheus.
+
+        Returns:
+            List[str]: Líneas generadas.
+        """
+        lines:List[str] = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.__lock:
+            for values, total in sorted(self.__values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {_format_number(total)}")
+        return lines
+
+
+class Histogram:
+    """
+    Histograma con etiquetas (cubos acumulados, suma y número de observaciones).
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, name:str, help:str, labels:Tuple[str, ...], buckets:Tuple[float, ...]=DEFAULT_BUCKETS):
+        """
+        Inicializa la instancia.
+
+        Args:
+            name (str): Nombre de la métrica.
+            help (str): Descripción de la métrica.
+            labels (Tuple[str, ...]): Nombres de las etiquetas.
+            buckets (Tuple[float, ...]): Límites superiores de los cubos.
+        """
+        # Inicializa las propiedades.
+        self.name:str = name
+        self.help:str = help
+        self.labels:Tuple[str, ...] = labels
+        self.buckets:Tuple[float, ...] = tuple(sorted(buckets))
+        self.__values:Dict[Tuple[str, ...], List[float]] = {}     # Cuenta por cubo + [suma, número].
+        self.__lock:Lock = Lock()
+
+
+    # -- Métodos -- #
+    def observe(self, value:float, *values:str) -> None:
+        """
+        Registra una observación.
+
+        Args:
+            value (float): Valor observado.
+            values (str): Valores de las etiquetas (en el orden de `labels`).
+        """
+        with self.__lock:
+            counts:Optional[List[float]] = self.__values.get(values)
+            if counts is None:
+                counts = self.__values[values] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            counts[-2] += value
+            counts[-1] += 1
+
+    def count(self, *values:str) -> int:
+        """
+        Devuelve el número de observaciones de una combinación de etiquetas.
+
+        Args:
+            values (str): Valores de las etiquetas.
+
+        Returns:
+            int: Número de observaciones.
+        """
+        counts:Optional[List[float]] = self.__values.get(values)
+        return int(counts[-1]) if counts is not None else 0
+
+    def total(self, *values:str) -> float:
+        """
+        Devuelve la suma de las observaciones de una combinación de etiquetas.
+
+        Args:
+            values (str): Valores de las etiquetas.
+
+        Returns:
+            float: Suma de las observaciones.
+        """
+        counts:Optional[List[float]] = self.__values.get(values)
+        return counts[-2] if counts is not None else 0.0
+
+    def render(self) -> List[str]:
+        """
+        Genera las líneas del histograma en formato de texto de Prometheus.
+
+        Returns:
+            List[str]: Líneas generadas.
+        """
+        lines:List[str] = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.__lock:
+            for values, counts in sorted(self.__values.items()):
+                cumulative:float = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels + ('le',), values + (_format_number(bound),))} {_format_number(cumulative)}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels + ('le',), values + ('+Inf',))} {_format_number(counts[-1])}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {_format_number(counts[-2])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {_format_number(counts[-1])}")
+        return lines
+
+
+# ---- MÉTRICAS ---- #
+PHASE_SECONDS:Histogram = Histogram("anime_phase_seconds", "Duration of each fetch/parse phase (connect, ttfb, body, parse, extract).",
+                                    ("site", "operation", "phase"))
+OPERATION_SECONDS:Histogram = Histogram("anime_operation_seconds", "End-to-end duration of manager operations.",
+                                        ("site", "operation"))
+HTTP_REQUESTS:Counter = Counter("anime_http_requests_total", "HTTP requests sent, by response status ('error' if none).",
+                                ("site", "operation", "status"))
+HTTP_BYTES:Counter = Counter("anime_http_bytes_total", "Response body bytes received.", ("site", "operation"))
+CACHE_LOOKUPS:Counter = Counter("anime_cache_lookups_total", "Cache lookups by layer (http, store, catalog) and result (hit, miss, revalidated).",
+                                ("site", "operation", "layer", "result"))
+REGISTRY:List = [OPERATION_SECONDS, PHASE_SECONDS, HTTP_REQUESTS, HTTP_BYTES, CACHE_LOOKUPS]
+
+
+# ---- FUNCIONES ---- #
+@contextmanager
+def labels(site:str, operation:str) -> Iterator[None]:
+    """
+    Etiqueta con la web y la operación las métricas registradas dentro del bloque (en el hilo o
+    tarea actual).
+
+    Args:
+        site (str): Web de la operación.
+        operation (str): Operación.
+    """
+    token = _labels.set((site, operation))
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+@contextmanager
+def operation(site:str, operation:str) -> Iterator[None]:
+    """
+    Etiqueta las métricas del bloque como `labels` y registra su duración total en
+    `anime_operation_seconds`.
+
+    Args:
+        site (str): Web de la operación.
+        operation (str): Operación.
+    """
+    with labels(site=site, operation=operation):
+        start:float = perf_counter()
+        try:
+            yield
+        finally:
+            observe_operation(seconds=perf_counter() - start)
+
+
+def current_labels() -> Tuple[str, str]:
+    """
+    Devuelve las etiquetas activas.
+
+    Returns:
+        Tuple[str, str]: Web y operación en curso.
+    """
+    return _labels.get()
+
+
+@contextmanager
+def trace() -> Iterator[List[Span]]:
+    """
+    Activa la traza por llamada: todas las fases medidas dentro del bloque (en el hilo o tarea
+    actual) se añaden a la lista devuelta.
+
+    Yields:
+        List[Span]: Fases medidas, en orden.
+    """
+    spans:List[Span] = []
+    token = _trace.set(spans)
+    try:
+        yield spans
+    finally:
+        _trace.reset(token)
+
+
+def observe_phase(phase:str, seconds:float, **detail) -> None:
+    """
+    Registra la duración de una fase con las etiquetas activas y la añade a la traza si la hay.
+
+    Args:
+        phase (str): Nombre de la fase.
+        seconds (float): Duración.
+        detail: Datos adicionales para la traza.
+    """
+    site, operation = _labels.get()
+    PHASE_SECONDS.observe(seconds, site, operation, phase)
+    spans:Optional[List[Span]] = _trace.get()
+    if spans is not None:
+        spans.append(Span(name=phase, site=site, operation=operation, seconds=seconds, detail=detail))
+
+
+def observe_operation(seconds:float) -> None:
+    """
+    Registra la duración total de la operación activa.
+
+    Args:
+        seconds (float): Duración.
+    """
+    site, operation = _labels.get()
+    OPERATION_SECONDS.observe(seconds, site, operation)
+    spans:Optional[List[Span]] = _trace.get()
+    if spans is not None:
+        spans.append(Span(name="total", site=site, operation=operation, seconds=seconds, detail={}))
+
+
+def count_request(status:Optional[int], size:int) -> None:
+    """
+    Cuenta una petición HTTP y los bytes recibidos con las etiquetas activas.
+
+    Args:
+        status (Optional[int]): Estado de la respuesta (`None` si falló sin respuesta).
+        size (int): Bytes del cuerpo.
+    """
+    site, operation = _labels.get()
+    HTTP_REQUESTS.inc(site, operation, str(status) if status is not None else "error")
+    if size:
+        HTTP_BYTES.inc(site, operation, amount=size)
+
+
+def count_cache(layer:str, result:str) -> None:
+    """
+    Cuenta una consulta a una caché con las etiquetas activas.
+
+    Args:
+        layer (str): Caché consultada (`http`, `store`, `catalog`, `resolver`).
+        result (str): Resultado (`hit`, `miss`, `revalidated`, `refreshed`).
+    """
+    site, operation = _labels.get()
+    CACHE_LOOKUPS.inc(site, operation, layer, result)
+
+
+def render_metrics() -> str:
+    """
+    Genera todas las métricas en formato de texto de Prometheus.
+
+    Returns:
+        str: Texto de las métricas.
+    """
+    lines:List[str] = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+def dump_metrics(path:str) -> None:
+    """
+    Escribe las métricas en un fichero (por ejemplo, para el textfile collector de node_exporter).
+
+    Args:
+        path (str): Ruta del fichero.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(render_metrics())
+
+
+def serve_metrics(port:int=9464, host:str="127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Expone las métricas en `http://host:port/metrics` desde un hilo en segundo plano.
+
+    Args:
+        port (int): Puerto en el que escuchar.
+        host (str): Dirección en la que escuchar.
+
+    Returns:
+        ThreadingHTTPServer: El servidor (`shutdown()` lo detiene).
+    """
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body:bytes = render_metrics().encode("utf-8")
+            self.send_response(200 if self.path.split("?")[0] in ("/", "/metrics") else 404)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server:ThreadingHTTPServer = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _format_labels(names:Tuple[str, ...], values:Tuple[str, ...]) -> str:
+    """
+    Genera el bloque de etiquetas de una línea (`{a="1",b="2"}`).
+
+    Args:
+        names (Tuple[str, ...]): Nombres de las etiquetas.
+        values (Tuple[str, ...]): Valores de las etiquetas.
+
+    Returns:
+        str: Bloque de etiquetas.
+    """
+    pairs:List[str] = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value:float) -> str:
+    """
+    Formatea un número para Prometheus (enteros sin decimales).
+
+    Args:
+        value (float): Número.
+
+    Returns:
+        str: Número formateado.
+    """
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
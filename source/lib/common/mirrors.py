@@ -0,0 +1,420 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: mirrors.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-26
+# · Descripción: Módulo con los dominios alternativos (mirrors) de cada web: la salud y la
+# latencia de cada uno, la elección del más rápido disponible para cada petición y la
+# sonda en segundo plano que los comprueba periódicamente.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Dict, Iterable, List, Optional
+from time import monotonic
+from threading import Event, Lock, Thread
+from urllib.parse import urlsplit
+
+from lib.config.schema import MirrorConfig
+
+
+# ---- VARIABLES ---- #
+_groups:Dict[str, "MirrorGroup"] = {}       # Origen (esquema + host) de cada mirror -> su grupo.
+_groups_lock:Lock = Lock()
+_prober:Optional["MirrorProber"] = None     # Sonda en segundo plano (se arranca con el primer grupo con mirrors).
+
+
+# ---- CLASES ---- #
+class Mirror:
+    """
+    Estado de un dominio de una web: latencia media, tasa de errores y, tras varios fallos
+    seguidos, el momento hasta el que se considera caído.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, origin:str, cfg:MirrorConfig):
+        """
+        Inicializa la instancia.
+
+        Args:
+            origin (str): Origen del mirror (`https://host`).
+            cfg (MirrorConfig): Configuración de los mirrors.
+        """
+        # Inicializa las propiedades.
+        self.__origin:str = origin
+        self.__cfg:MirrorConfig = cfg
+        self.__latency:Optional[float] = None
+        self.__errorRate:float = 0.0
+        self.__failures:int = 0
+        self.__downUntil:float = 0.0
+        self.__lock:Lock = Lock()
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        latency:str = f"{self.Latency * 1000:.0f} ms" if self.Latency is not None else "?"
+        return f"{self.Origin} ({latency}, {self.ErrorRate:.0%} errors{'' if self.Healthy else ', down'})"
+
+
+    # -- Propiedades -- #
+    @property
+    def Origin(self) -> str:
+        """
+        Devuelve el origen del mirror.
+
+        Returns:
+            str: Esquema y host (`https://host`).
+        """
+        return self.__origin
+
+    @property
+    def Latency(self) -> Optional[float]:
+        """
+        Devuelve la latencia media (exponencial) del mirror.
+
+        Returns:
+            Optional[float]: Segundos o `None` si aún no hay medidas.
+        """
+        return self.__latency
+
+    @property
+    def ErrorRate(self) -> float:
+        """
+        Devuelve la tasa de errores (media exponencial) del mirror.
+
+        Returns:
+            float: Parte (0-1) de peticiones recientes fallidas.
+        """
+        return self.__errorRate
+
+    @property
+    def Healthy(self) -> bool:
+        """
+        Indica si el mirror está disponible (no está en el tiempo de espera tras fallar).
+
+        Returns:
+            bool: `True` si se le pueden enviar peticiones.
+        """
+        return monotonic() >= self.__downUntil
+
+    @property
+    def DownUntil(self) -> float:
+        """
+        Devuelve el momento (`time.monotonic`) hasta el que el mirror se considera caído.
+
+        Returns:
+            float: Momento o 0 si nunca ha caído.
+        """
+        return self.__downUntil
+
+    @property
+    def Score(self) -> float:
+        """
+        Devuelve la puntuación del mirror (menor es mejor): su latencia penalizada por su tasa
+        de errores.
+
+        Returns:
+            float: Puntuación (infinito si aún no hay medidas).
+        """
+        if self.__latency is None:
+            return float("inf")
+        return self.__latency * (1.0 + self.__cfg.error_penalty * self.__errorRate)
+
+
+    # -- Métodos -- #
+    def record(self, latency:Optional[float], ok:bool, reachable:bool=True) -> None:
+        """
+        Registra el resultado de una petición o sonda al mirror.
+
+        Args:
+            latency (Optional[float]): Segundos que tardó (`None` si no se midió).
+            ok (bool): Si el mirror respondió correctamente (estado menor que 500).
+            reachable (bool): Si se pudo conectar. Un fallo de conexión o un tiempo agotado
+                marca el mirror como caído sin esperar más fallos.
+        """
+        alpha:float = self.__cfg.alpha
+        with self.__lock:
+            if ok:
+                if latency is not None:
+                    self.__latency = latency if self.__latency is None else (1 - alpha) * self.__latency + alpha * latency
+                self.__errorRate *= 1 - alpha
+                self.__failures = 0
+                self.__downUntil = 0.0
+                return
+
+            # Tras varios fallos seguidos, el mirror se aparta un tiempo que crece con cada fallo.
+            self.__errorRate = (1 - alpha) * self.__errorRate + alpha
+            self.__failures = max(self.__failures + 1, 1 if reachable else self.__cfg.failures_to_down)
+            if self.__failures >= self.__cfg.failures_to_down:
+                cooldown:float = self.__cfg.cooldown * 2 ** (self.__failures - self.__cfg.failures_to_down)
+                self.__downUntil = monotonic() + min(cooldown, self.__cfg.max_cooldown)
+
+
+class MirrorGroup:
+    """
+    Dominios de una misma web. Las URLs se guardan y se comparan siempre con el dominio
+    canónico (`base_url`) y cada petición se envía al mirror disponible más rápido.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, canonical:str, mirrors:Iterable[str], cfg:MirrorConfig=MirrorConfig()):
+        """
+        Inicializa la instancia.
+
+        Args:
+            canonical (str): URL base canónica de la web.
+            mirrors (Iterable[str]): URLs base alternativas.
+            cfg (MirrorConfig): Configuración de los mirrors.
+        """
+        # Inicializa las propiedades.
+        self.__canonical:str = origin_of(url=canonical)
+        origins:List[str] = list(dict.fromkeys([self.__canonical] + [origin_of(url=mirror) for mirror in mirrors]))
+        self.__mirrors:List[Mirror] = [Mirror(origin=origin, cfg=cfg) for origin in origins]
+        self.__byOrigin:Dict[str, Mirror] = {mirror.Origin: mirror for mirror in self.__mirrors}
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        return f"{self.Canonical} -> {self.ranked()}"
+
+
+    # -- Propiedades -- #
+    @property
+    def Canonical(self) -> str:
+        """
+        Devuelve el origen canónico de la web.
+
+        Returns:
+            str: Esquema y host canónicos.
+        """
+        return self.__canonical
+
+    @property
+    def Mirrors(self) -> List[Mirror]:
+        """
+        Devuelve los mirrors de la web.
+
+        Returns:
+            List[Mirror]: Mirrors, empezando por el canónico.
+        """
+        return list(self.__mirrors)
+
+
+    # -- Métodos -- #
+    def ranked(self) -> List[Mirror]:
+        """
+        Ordena los mirrors por preferencia: primero los disponibles que aún no tienen medidas
+        (en el orden de la configuración, para medirlos con la siguiente petición), después
+        el resto de disponibles, del más rápido al más lento, y por último los caídos, del que
+        antes vuelve a estar disponible.
+
+        Returns:
+            List[Mirror]: Mirrors ordenados.
+        """
+        healthy:List[Mirror] = [mirror for mirror in self.__mirrors if mirror.Healthy]
+        down:List[Mirror] = [mirror for mirror in self.__mirrors if not mirror.Healthy]
+        return sorted(healthy, key=lambda mirror: (mirror.Latency is not None, mirror.Score)) + sorted(down, key=lambda mirror: mirror.DownUntil)
+
+    def route(self, url:str) -> str:
+        """
+        Reescribe una URL de la web para enviarla al mejor mirror.
+
+        Args:
+            url (str): URL en cualquiera de los dominios de la web.
+
+        Returns:
+            str: URL en el mejor mirror.
+        """
+        return self.ranked()[0].Origin + url[len(origin_of(url=url)):]
+
+    def canonical(self, url:str) -> str:
+        """
+        Reescribe una URL de la web con el dominio canónico.
+
+        Args:
+            url (str): URL en cualquiera de los dominios de la web.
+
+        Returns:
+            str: URL en el dominio canónico.
+        """
+        return self.__canonical + url[len(origin_of(url=url)):]
+
+    def record(self, url:str, latency:Optional[float], ok:bool, reachable:bool=True) -> None:
+        """
+        Registra el resultado de una petición a uno de los mirrors.
+
+        Args:
+            url (str): URL a la que se envió la petición.
+            latency (Optional[float]): Segundos que tardó.
+            ok (bool): Si el mirror respondió correctamente.
+            reachable (bool): Si se pudo conectar.
+        """
+        mirror:Optional[Mirror] = self.__byOrigin.get(origin_of(url=url))
+        if mirror is not None:
+            mirror.record(latency=latency, ok=ok, reachable=reachable)
+
+    def probe(self, timeout:float) -> None:
+        """
+        Comprueba todos los mirrors pidiendo su página principal (sin leer el cuerpo).
+
+        Args:
+            timeout (float): Segundos máximos de espera de cada mirror.
+        """
+        from requests import RequestException
+        from lib.common.network import get_session
+
+        for mirror in self.__mirrors:
+            start:float = monotonic()
+            try:
+                with get_session().get(mirror.Origin + "/", timeout=timeout, stream=True) as response:
+                    mirror.record(latency=monotonic() - start, ok=response.status_code < 500)
+            except RequestException:
+                mirror.record(latency=None, ok=False, reachable=False)
+
+
+class MirrorProber:
+    """
+    Hilo en segundo plano que sondea periódicamente los mirrors de todas las webs
+    registradas, de forma que un mirror caído vuelve a usarse cuando se recupera y las
+    latencias se conocen antes de la primera petición.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, cfg:MirrorConfig=MirrorConfig()):
+        """
+        Inicializa la instancia.
+
+        Args:
+            cfg (MirrorConfig): Configuración de los mirrors.
+        """
+        # Inicializa las propiedades.
+        self.__cfg:MirrorConfig = cfg
+        self.__stop:Event = Event()
+        self.__thread:Thread = Thread(target=self.__run, name="mirror-prober", daemon=True)
+
+
+    # -- Métodos -- #
+    def start(self) -> None:
+        """
+        Arranca el hilo de la sonda.
+        """
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Detiene el hilo de la sonda (sin esperar a la sonda en curso).
+        """
+        self.__stop.set()
+
+
+    # -- Métodos privados -- #
+    def __run(self) -> None:
+        """
+        Sondea los mirrors cada `probe_interval` segundos hasta que se detiene la sonda.
+        """
+        while not self.__stop.is_set():
+            for group in groups():
+                if self.__stop.is_set():
+                    return
+                if len(group.Mirrors) > 1:
+                    group.probe(timeout=self.__cfg.probe_timeout)
+            self.__stop.wait(self.__cfg.probe_interval)
+
+
+# ---- FUNCIONES ---- #
+def origin_of(url:str) -> str:
+    """
+    Devuelve el origen (esquema y host en minúsculas) de una URL.
+
+    Args:
+        url (str): URL.
+
+    Returns:
+        str: Origen, por ejemplo `https://www3.animeflv.net`.
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def register_mirrors(canonical:str, mirrors:Iterable[str], cfg:MirrorConfig=MirrorConfig()) -> "MirrorGroup":
+    """
+    Registra los dominios de una web. Si la web tiene mirrors, arranca la sonda en segundo
+    plano (una sola para todas las webs).
+
+    Args:
+        canonical (str): URL base canónica de la web (`base_url` de su configuración).
+        mirrors (Iterable[str]): URLs base alternativas.
+        cfg (MirrorConfig): Configuración de los mirrors.
+
+    Returns:
+        MirrorGroup: Grupo de la web (el ya registrado si no cambian sus dominios).
+    """
+    global _prober
+    with _groups_lock:
+        # Reutiliza el grupo si ya estaba registrado con los mismos dominios.
+        group:Optional[MirrorGroup] = _groups.get(origin_of(url=canonical))
+        origins:List[str] = list(dict.fromkeys([origin_of(url=canonical)] + [origin_of(url=mirror) for mirror in mirrors]))
+        if group is None or [mirror.Origin for mirror in group.Mirrors] != origins:
+            group = MirrorGroup(canonical=canonical, mirrors=origins[1:], cfg=cfg)
+            for origin in origins:
+                _groups[origin] = group
+
+        # Arranca la sonda si hace falta.
+        if len(origins) > 1 and _prober is None and cfg.probe_interval > 0:
+            _prober = MirrorProber(cfg=cfg)
+            _prober.start()
+    return group
+
+
+def mirror_group(url:str) -> Optional[MirrorGroup]:
+    """
+    Devuelve el grupo de mirrors al que pertenece una URL.
+
+    Args:
+        url (str): URL.
+
+    Returns:
+        Optional[MirrorGroup]: Grupo o `None` si su dominio no tiene mirrors registrados.
+    """
+    return _groups.get(origin_of(url=url)) if _groups else None
+
+
+def canonical_url(url:str) -> str:
+    """
+    Reescribe una URL con el dominio canónico de su web (si tiene mirrors registrados).
+
+    Args:
+        url (str): URL.
+
+    Returns:
+        str: URL canónica (la misma URL si su dominio no tiene mirrors).
+    """
+    group:Optional[MirrorGroup] = mirror_group(url=url)
+    return group.canonical(url=url) if group is not None else url
+
+
+def groups() -> List[MirrorGroup]:
+    """
+    Devuelve los grupos de mirrors registrados.
+
+    Returns:
+        List[MirrorGroup]: Grupos, uno por web.
+    """
+    with _groups_lock:
+        return list({id(group): group for group in _groups.values()}.values())
+
+
+def stop_prober() -> None:
+    """
+    Detiene la sonda en segundo plano (se vuelve a arrancar al registrar otra web con mirrors).
+    """
+    global _prober
+    with _groups_lock:
+        if _prober is not None:
+            _prober.stop()
+            _prober = None
@@ -8,11 +8,49 @@
 
 
 # ---- MÓDULOS ---- #
-from requests import get
+from typing import Dict, List, Optional, Set, Tuple
+from time import monotonic, perf_counter, sleep
+from threading import RLock, local
+from contextvars import copy_context
+from urllib.parse import urlsplit
+from asyncio import AbstractEventLoop, Task, TimeoutError as AsyncTimeoutError, ensure_future, get_running_loop
+from asyncio import sleep as async_sleep, wait as async_wait
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from requests import Session
 from requests import Response
-from bs4 import BeautifulSoup
+from requests import RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 from http import HTTPStatus
 
+from lib.config.schema import NetworkConfig, RetryConfig, ThrottleConfig
+from lib.common.cache import CacheEntry, HttpCache
+from lib.common.retry import LatencyWindow, RetryPolicy
+from lib.common.throttle import HostLimiter, parse_retry_after
+from lib.common.metrics import count_cache, count_request, observe_phase
+from lib.common.mirrors import MirrorGroup, canonical_url, mirror_group
+from lib.common.parser import HtmlDocument, parse_html
+
+
+# ---- VARIABLES ---- #
+_session:Optional[Session] = None       # Sesión compartida por todas las peticiones.
+_session_lock:RLock = RLock()           # Protege la creación/reemplazo de la sesión.
+_cfg:NetworkConfig = NetworkConfig()    # Configuración activa de la capa de red.
+_async_session = None                   # Cliente asíncrono compartido (aiohttp.ClientSession).
+_async_loop:Optional[AbstractEventLoop] = None      # Bucle de eventos al que pertenece el cliente asíncrono.
+_cache:Optional[HttpCache] = None       # Caché HTTP persistente (desactivada por defecto).
+_throttle_cfg:Optional[ThrottleConfig] = ThrottleConfig()   # Configuración del control por host (`None` = desactivado).
+_limiters:Dict[str, HostLimiter] = {}   # Control de ritmo y concurrencia de cada host.
+_retry:RetryPolicy = RetryPolicy()      # Política de reintentos por defecto.
+_latency_windows:Dict[str, LatencyWindow] = {}      # Latencias recientes de cada host (para duplicar peticiones).
+_hedge_pool:Optional[ThreadPoolExecutor] = None     # Hilos de las peticiones duplicadas.
+_connect_time:local = local()           # Segundos dedicados a abrir conexiones en la petición en curso de cada hilo.
+_PARTIAL_HEADER:str = "X-Partial-Until"   # Cabecera con la que se guardan en la caché los cuerpos cortados.
+
 
 # ---- CLASES ---- #
 class NetworkError (Exception):
@@ -69,13 +107,851 @@ class NetworkBadResponseError(Exception):
         return self.__reason
 
 
+class AsyncResponse:
+    """
+    Respuesta obtenida por el cliente asíncrono. El cuerpo se lee completo antes de liberar la
+    conexión, por lo que la instancia puede usarse fuera del contexto de la petición. Expone los
+    mismos atributos que `requests.Response` que usa el resto del módulo.
+
+    Attributes:
+        url (str): URL final de la respuesta.
+        status_code (int): Estado de la respuesta.
+        headers (Dict[str, str]): Cabeceras de la respuesta.
+        content (bytes): Cuerpo de la respuesta.
+        encoding (Optional[str]): Codificación declarada por el servidor.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, url:str, status_code:int, headers:Dict[str, str], content:bytes, encoding:Optional[str]=None):
+        """
+        Inicializa la instancia.
+
+        Args:
+            url (str): URL final de la respuesta.
+            status_code (int): Estado de la respuesta.
+            headers (Dict[str, str]): Cabeceras de la respuesta.
+            content (bytes): Cuerpo de la respuesta.
+            encoding (Optional[str]): Codificación declarada por el servidor.
+        """
+        # Inicializa las propiedades.
+        self.url:str = url
+        self.status_code:int = status_code
+        self.headers:Dict[str, str] = headers
+        self.content:bytes = content
+        self.encoding:Optional[str] = encoding
+
+
+    # -- Propiedades -- #
+    @property
+    def text(self) -> str:
+        """
+        Devuelve el cuerpo de la respuesta decodificado.
+
+        Returns:
+            str: Cuerpo de la respuesta.
+        """
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class _StopScanner:
+    """
+    Busca en el cuerpo de una respuesta, según llegan sus bloques, una secuencia de marcadores
+    en orden. Cuando aparece el último, el resto de la página no hace falta.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, until:Tuple[str, ...]):
+        """
+        Inicializa la instancia.
+
+        Args:
+            until (Tuple[str, ...]): Marcadores, en el orden en que aparecen en la página.
+        """
+        # Inicializa las propiedades.
+        self.__markers:List[bytes] = [marker.encode("utf-8") for marker in until]
+        self.__index:int = 0
+        self.__position:int = 0
+        self.__body:bytearray = bytearray()
+
+
+    # -- Propiedades -- #
+    @property
+    def Done(self) -> bool:
+        """
+        Indica si ya han aparecido todos los marcadores.
+
+        Returns:
+            bool: `True` si el resto del cuerpo no hace falta.
+        """
+        return self.__index >= len(self.__markers)
+
+    @property
+    def Body(self) -> bytes:
+        """
+        Devuelve el cuerpo leído (hasta el final del último marcador si han aparecido todos).
+
+        Returns:
+            bytes: Cuerpo leído.
+        """
+        return bytes(self.__body[:self.__position] if self.Done else self.__body)
+
+
+    # -- Métodos -- #
+    def feed(self, chunk:bytes) -> bool:
+        """
+        Añade un bloque del cuerpo y busca los marcadores pendientes.
+
+        Args:
+            chunk (bytes): Bloque recibido.
+
+        Returns:
+            bool: `True` si ya han aparecido todos los marcadores.
+        """
+        self.__body += chunk
+        while not self.Done:
+            marker:bytes = self.__markers[self.__index]
+            found:int = self.__body.find(marker, self.__position)
+            if found < 0:
+                # El marcador puede empezar al final de este bloque.
+                self.__position = max(self.__position, len(self.__body) - len(marker) + 1)
+                return False
+            self.__position = found + len(marker)
+            self.__index += 1
+        return True
+
+
+class _TimedConnectionMixin:
+    """
+    Mide el tiempo de apertura de las conexiones (TCP + TLS) y lo acumula en `_connect_time`
+    del hilo que hace la petición.
+    """
+    # -- Métodos -- #
+    def connect(self) -> None:
+        """
+        Abre la conexión midiendo su duración.
+        """
+        start:float = perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_time.value = getattr(_connect_time, "value", 0.0) + perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    """
+    Conexión HTTP que mide su apertura.
+    """
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """
+    Conexión HTTPS que mide su apertura.
+    """
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    """
+    Pool de conexiones HTTP que miden su apertura.
+    """
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    """
+    Pool de conexiones HTTPS que miden su apertura.
+    """
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """
+    Adaptador de `requests` cuyos pools miden la apertura de las conexiones.
+    """
+    # -- Métodos -- #
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        """
+        Crea el gestor de pools con las clases que miden la apertura de las conexiones.
+        """
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+
 # ---- FUNCIONES ---- #
-def get_response(url:str) -> Response:
+def configure_session(cfg:NetworkConfig=NetworkConfig(), headers:Optional[Dict[str, str]]=None) -> Session:
     """
-    Realiza una petición GET a la URL dada.
+    Crea (o reemplaza) la sesión HTTP compartida. La sesión mantiene un pool de conexiones
+    keep-alive por host, de forma que las peticiones sucesivas a la misma web reutilizan la
+    conexión TCP/TLS en lugar de repetir el handshake.
+
+    Args:
+        cfg (NetworkConfig): Configuración de la capa de red.
+        headers (Optional[Dict[str, str]]): Cabeceras adicionales que se añaden a las de `cfg`.
+
+    Returns:
+        Session: La sesión creada.
+    """
+    global _session, _cfg
+
+    # Crea la sesión con el adaptador de pools.
+    session:Session = Session()
+    adapter:HTTPAdapter = _TimedAdapter(pool_connections=cfg.pool_connections, pool_maxsize=cfg.pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Añade las cabeceras por defecto.
+    session.headers.update(cfg.headers)
+    if headers:
+        session.headers.update(headers)
+
+    # Reemplaza la sesión compartida cerrando la anterior.
+    with _session_lock:
+        old:Optional[Session] = _session
+        _session = session
+        _cfg = cfg
+    if old is not None:
+        old.close()
+
+    # Retorna la sesión.
+    return session
+
+
+def get_session() -> Session:
+    """
+    Devuelve la sesión HTTP compartida, creándola con la configuración por defecto si aún
+    no existe.
+
+    Returns:
+        Session: La sesión compartida.
+    """
+    # Comprueba si la sesión ya existe.
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                configure_session()
+    
+    # Retorna la sesión.
+    return _session
+
+
+def get_timeout() -> float:
+    """
+    Devuelve el tiempo máximo de espera de cada petición de la configuración activa (el que
+    usa `get_response`), para las peticiones hechas directamente con `get_session()`.
+
+    Returns:
+        float: Segundos máximos de espera.
+    """
+    return _cfg.timeout
+
+
+def close_session() -> None:
+    """
+    Cierra la sesión HTTP compartida y libera sus conexiones.
+    """
+    global _session
+
+    # Cierra la sesión.
+    with _session_lock:
+        old:Optional[Session] = _session
+        _session = None
+    if old is not None:
+        old.close()
+
+
+async def get_async_session():
+    """
+    Devuelve el cliente HTTP asíncrono compartido (`aiohttp.ClientSession`) del bucle de
+    eventos actual, creándolo si no existe. El cliente mantiene un pool de conexiones
+    keep-alive con los límites de `NetworkConfig`, de forma que un mismo bucle puede tener
+    cientos de peticiones en vuelo.
+
+    Returns:
+        aiohttp.ClientSession: El cliente compartido.
+    """
+    global _async_session, _async_loop
+
+    # Importa aiohttp solo cuando se usa la API asíncrona.
+    from aiohttp import ClientSession, ClientTimeout, TCPConnector, TraceConfig
+
+    # Comprueba si hay que crear el cliente (no existe, está cerrado o es de otro bucle).
+    loop:AbstractEventLoop = get_running_loop()
+    if _async_session is None or _async_session.closed or _async_loop is not loop:
+        connector = TCPConnector(limit=_cfg.async_limit, limit_per_host=_cfg.async_limit_per_host)
+        _async_session = ClientSession(connector=connector, headers=_cfg.headers, timeout=ClientTimeout(total=_cfg.timeout),
+                                       trace_configs=[_phase_trace(TraceConfig())])
+        _async_loop = loop
+    
+    # Retorna el cliente.
+    return _async_session
+
+
+def _phase_trace(trace_config):
+    """
+    Configura el trazado del cliente asíncrono para medir las fases de cada petición. Los
+    instantes se guardan en el diccionario pasado como `trace_request_ctx` a la petición.
+
+    Args:
+        trace_config (aiohttp.TraceConfig): Configuración de trazado a completar.
+
+    Returns:
+        aiohttp.TraceConfig: La misma configuración.
+    """
+    async def on_connection_create_start(session, context, params) -> None:
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx["connect_start"] = perf_counter()
+
+    async def on_connection_create_end(session, context, params) -> None:
+        if context.trace_request_ctx is not None and "connect_start" in context.trace_request_ctx:
+            context.trace_request_ctx["connect"] = perf_counter() - context.trace_request_ctx["connect_start"]
+
+    async def on_request_end(session, context, params) -> None:
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx["headers"] = perf_counter()
+
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+async def close_async_session() -> None:
+    """
+    Cierra el cliente HTTP asíncrono compartido y libera sus conexiones. Debe llamarse desde
+    el mismo bucle de eventos que lo creó.
+    """
+    global _async_session, _async_loop
+
+    # Cierra el cliente.
+    session, _async_session, _async_loop = _async_session, None, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def configure_cache(cache:Optional[HttpCache]) -> None:
+    """
+    Activa la caché HTTP persistente en `get_response` y `async_get_response`. Con `None`
+    se desactiva.
+
+    Args:
+        cache (Optional[HttpCache]): Caché a usar.
+    """
+    global _cache
+    _cache = cache
+
+
+def forget_cached(url:str) -> None:
+    """
+    Elimina una URL de la caché HTTP (si está activa), para que la siguiente petición vaya
+    al servidor. Sirve para páginas cuyo contenido caduca antes que su TTL (por ejemplo,
+    las que enlazan URLs firmadas).
+
+    Args:
+        url (str): URL a eliminar.
+    """
+    if _cache is not None:
+        _cache.delete(url=canonical_url(url=url))
+
+
+def configure_throttle(cfg:Optional[ThrottleConfig]) -> None:
+    """
+    Configura el control de ritmo y concurrencia por host de `get_response` y
+    `async_get_response`. Con `None` se desactiva. Los límites ya aprendidos se descartan.
+
+    Args:
+        cfg (Optional[ThrottleConfig]): Configuración a usar.
+    """
+    global _throttle_cfg
+    with _session_lock:
+        _throttle_cfg = cfg
+        _limiters.clear()
+
+
+def get_limiter(url:str) -> Optional[HostLimiter]:
+    """
+    Devuelve el control de ritmo y concurrencia del host de una URL, creándolo si no existe.
+
+    Args:
+        url (str): URL de la petición.
+
+    Returns:
+        Optional[HostLimiter]: El control del host o `None` si está desactivado.
+    """
+    # Comprueba si el control está desactivado.
+    if _throttle_cfg is None:
+        return None
+
+    # Obtiene (o crea) el control del host.
+    host:str = urlsplit(url).netloc
+    limiter:Optional[HostLimiter] = _limiters.get(host)
+    if limiter is None:
+        with _session_lock:
+            limiter = _limiters.setdefault(host, HostLimiter(host=host, cfg=_throttle_cfg))
+
+    # Retorna el control.
+    return limiter
+
+
+def configure_retry(cfg:RetryConfig) -> None:
+    """
+    Configura la política de reintentos y de peticiones duplicadas por defecto de
+    `get_response`, `get_html` y sus versiones asíncronas.
+
+    Args:
+        cfg (RetryConfig): Configuración de la política.
+    """
+    global _retry
+    _retry = RetryPolicy(cfg=cfg)
+
+
+def _latencies(url:str) -> LatencyWindow:
+    """
+    Devuelve el registro de latencias del host de una URL, creándolo si no existe.
+
+    Args:
+        url (str): URL de la petición.
+
+    Returns:
+        LatencyWindow: Latencias recientes del host.
+    """
+    host:str = urlsplit(url).netloc
+    window:Optional[LatencyWindow] = _latency_windows.get(host)
+    if window is None:
+        with _session_lock:
+            window = _latency_windows.setdefault(host, LatencyWindow(size=_retry.Config.hedge_samples))
+    return window
+
+
+def _hedge_delay(url:str, policy:RetryPolicy) -> Optional[float]:
+    """
+    Calcula tras cuántos segundos sin respuesta se duplica una petición (percentil 95 de
+    las latencias del host).
+
+    Args:
+        url (str): URL de la petición.
+        policy (RetryPolicy): Política de la petición.
+
+    Returns:
+        Optional[float]: Segundos o `None` si no se duplica (desactivado o sin latencias suficientes).
+    """
+    if not policy.Config.hedge:
+        return None
+    p95:Optional[float] = _latencies(url=url).quantile(q=0.95, min_samples=policy.Config.hedge_min_samples)
+    return max(p95, policy.Config.hedge_min_delay) if p95 is not None else None
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    """
+    Devuelve el pool de hilos donde se ejecutan las peticiones duplicadas, creándolo si no existe.
+
+    Returns:
+        ThreadPoolExecutor: El pool de hilos.
+    """
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _session_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(max_workers=max(32, 2 * _cfg.pool_maxsize), thread_name_prefix="hedge")
+    return _hedge_pool
+
+
+def _attempt(url:str, headers:Optional[Dict[str, str]], timeout:float, until:Optional[Tuple[str, ...]]=None) -> Response:
+    """
+    Envía una petición GET respetando el control del host y registra su latencia.
+
+    Args:
+        url (str): URL a la que hacer la petición.
+        headers (Optional[Dict[str, str]]): Cabeceras adicionales.
+        timeout (float): Segundos máximos de espera.
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se deja de leer el cuerpo y
+            se cierra la conexión (ver `get_html`).
+
+    Returns:
+        Response: La respuesta obtenida.
+    """
+    # Espera su turno en el host.
+    limiter:Optional[HostLimiter] = get_limiter(url=url)
+    if limiter is not None:
+        limiter.acquire()
+
+    # Envía la petición.
+    _connect_time.value = 0.0
+    start:float = monotonic()
+    response:Optional[Response] = None
+    try:
+        response = get_session().get(url=url, headers=headers, timeout=timeout, stream=until is not None)
+        if until is not None and response.status_code == 200:
+            _read_until(response=response, until=until)
+    finally:
+        latency:float = monotonic() - start
+        if limiter is not None:
+            limiter.release(status=response.status_code if response is not None else None, latency=latency,
+                            retry_after=response.headers.get("Retry-After") if response is not None else None)
+        if response is None:
+            count_request(status=None, size=0)
+
+    # Registra las fases (`elapsed` llega hasta las cabeceras e incluye la conexión).
+    connect:float = _connect_time.value
+    headers_at:float = min(latency, response.elapsed.total_seconds())
+    if connect:
+        observe_phase("connect", connect, url=url)
+    observe_phase("ttfb", max(0.0, headers_at - connect), url=url, status=response.status_code)
+    observe_phase("body", max(0.0, latency - headers_at), url=url, bytes=len(response.content))
+    count_request(status=response.status_code, size=len(response.content))
+
+    # Registra la latencia y retorna la respuesta.
+    if response.status_code < 500:
+        _latencies(url=url).add(latency=latency)
+    return response
+
+
+def _hedged(url:str, headers:Optional[Dict[str, str]], timeout:float, policy:RetryPolicy,
+            until:Optional[Tuple[str, ...]]=None) -> Response:
+    """
+    Envía una petición GET y, si no ha respondido tras el percentil 95 del host, envía una
+    segunda. Se devuelve la primera que termine correctamente.
+
+    Args:
+        url (str): URL a la que hacer la petición.
+        headers (Optional[Dict[str, str]]): Cabeceras adicionales.
+        timeout (float): Segundos máximos de espera de cada petición.
+        policy (RetryPolicy): Política de la petición.
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se corta el cuerpo.
+
+    Raises:
+        RequestException: Si todas las peticiones fallan.
+
+    Returns:
+        Response: La respuesta obtenida.
+    """
+    # Comprueba si hay que duplicar la petición.
+    delay:Optional[float] = _hedge_delay(url=url, policy=policy)
+    if delay is None:
+        return _attempt(url=url, headers=headers, timeout=timeout, until=until)
+
+    # Envía la petición y la duplica si tarda demasiado.
+    executor:ThreadPoolExecutor = _hedge_executor()
+    done, pending = wait({executor.submit(copy_context().run, _attempt, url, headers, timeout, until)}, timeout=delay)
+    if not done:
+        pending.add(executor.submit(copy_context().run, _attempt, url, headers, timeout, until))
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    # Devuelve la primera respuesta (la otra petición termina en segundo plano).
+    while True:
+        error:Optional[BaseException] = None
+        for future in done:
+            error = future.exception()
+            if error is None:
+                return future.result()
+        if not pending:
+            raise error
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+
+def _send(url:str, headers:Optional[Dict[str, str]], policy:RetryPolicy, until:Optional[Tuple[str, ...]]=None) -> Response:
+    """
+    Envía una petición GET reintentándola según la política: cada resultado (estado o fallo
+    de conexión) tiene sus propios reintentos, las esperas siguen un backoff exponencial con
+    jitter (o el `Retry-After` del servidor) y no se empieza un reintento que no acabe antes
+    del plazo total.
+
+    Si la web tiene mirrors (ver `lib.common.mirrors`), cada intento se envía al mejor mirror
+    disponible y su resultado actualiza la salud del mirror: tras un fallo, el reintento va
+    directamente (sin esperar) al siguiente mirror.
+
+    Args:
+        url (str): URL a la que hacer la petición.
+        headers (Optional[Dict[str, str]]): Cabeceras adicionales.
+        policy (RetryPolicy): Política de la petición.
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se corta el cuerpo.
+
+    Raises:
+        RequestException: Si la última petición falla sin respuesta.
+
+    Returns:
+        Response: La última respuesta obtenida.
+    """
+    group:Optional[MirrorGroup] = mirror_group(url=url)
+    start:float = monotonic()
+    attempt:int = 0
+    while True:
+        # Envía la petición (al mejor mirror, si la web tiene).
+        target:str = group.route(url=url) if group is not None else url
+        response:Optional[Response] = None
+        error:Optional[RequestException] = None
+        sent:float = monotonic()
+        try:
+            timeout:float = max(0.1, min(_cfg.timeout, policy.Config.deadline - (monotonic() - start)))
+            response = _hedged(url=target, headers=headers, timeout=timeout, policy=policy, until=until)
+        except RequestException as e:
+            error = e
+
+        # Comprueba si se reintenta.
+        status:Optional[int] = response.status_code if response is not None else None
+        if group is not None:
+            group.record(url=target, latency=monotonic() - sent, ok=status is not None and status < 500, reachable=status is not None)
+        if attempt >= policy.retries_for(status=status):
+            break
+        delay:float = policy.backoff(attempt=attempt, retry_after=parse_retry_after(response.headers.get("Retry-After")) if response is not None else None)
+        if group is not None and group.route(url=url) != target:
+            delay = 0.0
+        if monotonic() - start + delay >= policy.Config.deadline:
+            break
+        sleep(delay)
+        attempt += 1
+
+    # Retorna la respuesta o lanza el último error.
+    if error is not None:
+        raise error
+    return response
+
+
+async def _async_attempt(url:str, headers:Optional[Dict[str, str]], timeout:float, until:Optional[Tuple[str, ...]]=None) -> AsyncResponse:
+    """
+    Envía una petición GET asíncrona respetando el control del host y registra su latencia.
+
+    Args:
+        url (str): URL a la que hacer la petición.
+        headers (Optional[Dict[str, str]]): Cabeceras adicionales.
+        timeout (float): Segundos máximos de espera.
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se deja de leer el cuerpo y
+            se cierra la conexión (ver `get_html`).
+
+    Returns:
+        AsyncResponse: La respuesta obtenida.
+    """
+    from aiohttp import ClientTimeout
+
+    # Espera su turno en el host.
+    limiter:Optional[HostLimiter] = get_limiter(url=url)
+    if limiter is not None:
+        await limiter.async_acquire()
+
+    # Envía la petición.
+    start:float = monotonic()
+    timings:Dict[str, float] = {"start": perf_counter()}
+    response:Optional[AsyncResponse] = None
+    try:
+        session = await get_async_session()
+        async with session.get(url, headers=headers, timeout=ClientTimeout(total=timeout), trace_request_ctx=timings) as resp:
+            resp_headers:Dict[str, str] = dict(resp.headers)
+            if until is not None and resp.status == 200:
+                # Lee el cuerpo por bloques y cierra la conexión en cuanto aparecen los marcadores.
+                scanner:_StopScanner = _StopScanner(until=until)
+                async for chunk in resp.content.iter_chunked(_cfg.stream_chunk_size):
+                    if scanner.feed(chunk=chunk):
+                        resp_headers[_PARTIAL_HEADER] = _until_key(until=until)
+                        resp.close()
+                        break
+                content:bytes = scanner.Body
+            else:
+                content = await resp.read()
+            response = AsyncResponse(url=str(resp.url), status_code=resp.status, headers=resp_headers,
+                                     content=content, encoding=resp.charset)
+    finally:
+        latency:float = monotonic() - start
+        if limiter is not None:
+            limiter.release(status=response.status_code if response is not None else None, latency=latency,
+                            retry_after=response.headers.get("Retry-After") if response is not None else None)
+        if response is None:
+            count_request(status=None, size=0)
+
+    # Registra las fases.
+    connect:float = timings.get("connect", 0.0)
+    headers_at:float = timings.get("headers", timings["start"] + latency) - timings["start"]
+    if connect:
+        observe_phase("connect", connect, url=url)
+    observe_phase("ttfb", max(0.0, headers_at - connect), url=url, status=response.status_code)
+    observe_phase("body", max(0.0, latency - headers_at), url=url, bytes=len(response.content))
+    count_request(status=response.status_code, size=len(response.content))
+
+    # Registra la latencia y retorna la respuesta.
+    if response.status_code < 500:
+        _latencies(url=url).add(latency=latency)
+    return response
+
+
+async def _async_hedged(url:str, headers:Optional[Dict[str, str]], timeout:float, policy:RetryPolicy,
+                        until:Optional[Tuple[str, ...]]=None) -> AsyncResponse:
+    """
+    Versión asíncrona de `_hedged`. La petición que pierde se cancela.
+
+    Args:
+        url (str): URL a la que hacer la petición.
+        headers (Optional[Dict[str, str]]): Cabeceras adicionales.
+        timeout (float): Segundos máximos de espera de cada petición.
+        policy (RetryPolicy): Política de la petición.
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se corta el cuerpo.
+
+    Returns:
+        AsyncResponse: La respuesta obtenida.
+    """
+    # Comprueba si hay que duplicar la petición.
+    delay:Optional[float] = _hedge_delay(url=url, policy=policy)
+    if delay is None:
+        return await _async_attempt(url=url, headers=headers, timeout=timeout, until=until)
+
+    # Envía la petición y la duplica si tarda demasiado.
+    pending:Set[Task] = {ensure_future(_async_attempt(url=url, headers=headers, timeout=timeout, until=until))}
+    try:
+        done, pending = await async_wait(pending, timeout=delay)
+        if not done:
+            pending.add(ensure_future(_async_attempt(url=url, headers=headers, timeout=timeout, until=until)))
+            done, pending = await async_wait(pending, return_when=FIRST_COMPLETED)
+
+        # Devuelve la primera respuesta correcta.
+        while True:
+            error:Optional[BaseException] = None
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    return task.result()
+            if not pending:
+                raise error
+            done, pending = await async_wait(pending, return_when=FIRST_COMPLETED)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _async_send(url:str, headers:Optional[Dict[str, str]], policy:RetryPolicy,
+                      until:Optional[Tuple[str, ...]]=None) -> AsyncResponse:
+    """
+    Envía una petición GET asíncrona reintentándola según la política. Ver `_send`.
+
+    Args:
+        url (str): URL a la que hacer la petición.
+        headers (Optional[Dict[str, str]]): Cabeceras adicionales.
+        policy (RetryPolicy): Política de la petición.
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se corta el cuerpo.
+
+    Raises:
+        aiohttp.ClientError | asyncio.TimeoutError: Si la última petición falla sin respuesta.
+
+    Returns:
+        AsyncResponse: La última respuesta obtenida.
+    """
+    from aiohttp import ClientError
+
+    group:Optional[MirrorGroup] = mirror_group(url=url)
+    start:float = monotonic()
+    attempt:int = 0
+    while True:
+        # Envía la petición (al mejor mirror, si la web tiene).
+        target:str = group.route(url=url) if group is not None else url
+        response:Optional[AsyncResponse] = None
+        error:Optional[Exception] = None
+        sent:float = monotonic()
+        try:
+            timeout:float = max(0.1, min(_cfg.timeout, policy.Config.deadline - (monotonic() - start)))
+            response = await _async_hedged(url=target, headers=headers, timeout=timeout, policy=policy, until=until)
+        except (ClientError, AsyncTimeoutError) as e:
+            error = e
+
+        # Comprueba si se reintenta.
+        status:Optional[int] = response.status_code if response is not None else None
+        if group is not None:
+            group.record(url=target, latency=monotonic() - sent, ok=status is not None and status < 500, reachable=status is not None)
+        if attempt >= policy.retries_for(status=status):
+            break
+        delay:float = policy.backoff(attempt=attempt, retry_after=parse_retry_after(response.headers.get("Retry-After")) if response is not None else None)
+        if group is not None and group.route(url=url) != target:
+            delay = 0.0
+        if monotonic() - start + delay >= policy.Config.deadline:
+            break
+        await async_sleep(delay)
+        attempt += 1
+
+    # Retorna la respuesta o lanza el último error.
+    if error is not None:
+        raise error
+    return response
+
+
+def _until_key(until:Tuple[str, ...]) -> str:
+    """
+    Genera el valor de `_PARTIAL_HEADER` de unos marcadores.
+
+    Args:
+        until (Tuple[str, ...]): Marcadores.
+
+    Returns:
+        str: Marcadores como una sola cadena (con códigos de escape para que sea una cabecera válida).
+    """
+    return "|".join(until).encode("unicode_escape").decode("ascii")
+
+
+def _read_until(response:Response, until:Tuple[str, ...]) -> None:
+    """
+    Lee por bloques el cuerpo de una respuesta en streaming y, en cuanto aparecen los
+    marcadores, cierra la conexión sin leer el resto. El cuerpo leído queda en `content` y
+    una respuesta cortada se marca con `_PARTIAL_HEADER`.
+
+    Args:
+        response (Response): Respuesta abierta con `stream=True`.
+        until (Tuple[str, ...]): Marcadores, en el orden en que aparecen en la página.
+    """
+    scanner:_StopScanner = _StopScanner(until=until)
+    try:
+        for chunk in response.iter_content(chunk_size=_cfg.stream_chunk_size):
+            if scanner.feed(chunk=chunk):
+                response.headers[_PARTIAL_HEADER] = _until_key(until=until)
+                break
+    finally:
+        response._content = scanner.Body
+        response._content_consumed = True
+        response.close()
+
+
+def _usable(entry:Optional[CacheEntry], until:Optional[Tuple[str, ...]]) -> Optional[CacheEntry]:
+    """
+    Descarta una entrada de la caché con un cuerpo cortado que no sirve para la petición (la
+    petición necesita la página completa o la cortó con otros marcadores).
+
+    Args:
+        entry (Optional[CacheEntry]): Entrada de la caché.
+        until (Optional[Tuple[str, ...]]): Marcadores de la petición.
+
+    Returns:
+        Optional[CacheEntry]: La entrada o `None` si no sirve.
+    """
+    if entry is None:
+        return None
+    partial:Optional[str] = entry.Headers.get(_PARTIAL_HEADER)
+    return entry if partial is None or (until is not None and partial == _until_key(until=until)) else None
+
+
+def _cached_response(entry:CacheEntry) -> Response:
+    """
+    Genera una respuesta a partir de una entrada de la caché.
+
+    Args:
+        entry (CacheEntry): Entrada de la caché.
+
+    Returns:
+        Response: La respuesta generada.
+    """
+    # Genera la respuesta.
+    response:Response = Response()
+    response.url = entry.Url
+    response.status_code = 200
+    response.reason = HTTPStatus.OK.phrase
+    response.headers = CaseInsensitiveDict(entry.Headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = entry.Content
+
+    # Retorna la respuesta.
+    return response
+
+
+def get_response(url:str, retry:Optional[RetryConfig]=None, until:Optional[Tuple[str, ...]]=None) -> Response:
+    """
+    Realiza una petición GET a la URL dada. La petición respeta el control de ritmo y
+    concurrencia del host (ver `configure_throttle`) y se reintenta según la política de
+    reintentos (ver `configure_retry`).
 
     Args:
         url (str): URl a la que hacer la petición.
+        retry (Optional[RetryConfig]): Política de reintentos de esta petición (`None` = la configurada).
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se deja de descargar el cuerpo
+            (ver `get_html`).
     
     Raises:
         NetworkBadResponseError: Causada si el estado de la respuesta no es 200.
@@ -83,33 +959,198 @@ def get_response(url:str) -> Response:
     Returns:
         Response: La respuesta obtenida del servidor.
     """
-    # Realiza la petición GET.
-    response = get(url=url)
+    # Comprueba si la respuesta está en la caché y sigue vigente (con la URL canónica).
+    url = canonical_url(url=url)
+    entry:Optional[CacheEntry] = _usable(entry=_cache.get(url=url), until=until) if _cache is not None else None
+    if entry is not None and entry.Fresh:
+        count_cache(layer="http", result="hit")
+        return _cached_response(entry=entry)
+
+    # Realiza la petición GET con la sesión compartida (condicional si hay entrada caducada).
+    response = _send(url=url, headers=entry.Validators if entry else None, policy=RetryPolicy(cfg=retry) if retry else _retry,
+                     until=until)
+
+    # El servidor confirma que la entrada caducada sigue siendo válida.
+    if entry is not None and response.status_code == 304:
+        count_cache(layer="http", result="revalidated")
+        _cache.touch(url=url, headers=dict(response.headers))
+        return _cached_response(entry=entry)
+    if _cache is not None:
+        count_cache(layer="http", result="miss")
 
     # Comprueba el estado de la respuesta.
     if response.status_code != 200:
         raise NetworkBadResponseError(status_code=response.status_code, reason=HTTPStatus(value=response.status_code).phrase)
 
+    # Almacena la respuesta en la caché.
+    if _cache is not None:
+        _cache.put(url=url, content=response.content, headers=dict(response.headers))
+
     # Retorna la respuesta obtenida.
     return response
 
 
-def get_html(url:str) -> BeautifulSoup:
+def get_html(url:str, subtrees:Optional[List[Tuple[str, str]]]=None, retry:Optional[RetryConfig]=None,
+             until:Optional[Tuple[str, ...]]=None) -> HtmlDocument:
     """
     Obtiene el HTMl para una URL dada.
 
+    Con `until`, el cuerpo se descarga por bloques y, en cuanto aparecen los marcadores (en
+    orden), se cierra la conexión y se procesa solo lo recibido: en páginas largas (listados
+    de episodios, comentarios, pie) se ahorran bytes y tiempo. Si algún marcador no aparece
+    se lee la página completa. Los cuerpos cortados se guardan en la caché marcados y solo
+    se reutilizan en peticiones con los mismos marcadores.
+
+    Args:
+        url (str): URl a la que hacer la petición.
+        subtrees (Optional[List[Tuple[str, str]]]): Pares (etiqueta, clase) de los únicos
+            subárboles que se necesitan. Ver `lib.common.parser.parse_html`.
+        retry (Optional[RetryConfig]): Política de reintentos de esta petición (`None` = la configurada).
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que ya está todo lo que se necesita.
+    
+    Raises:
+        NetworkBadResponseError: En caso de que el estado de la petición no sea 200.
+
+    Returns:
+        HtmlDocument: HTML obtenido.
+    """
+    # Obtiene el HTML.
+    response:Response = get_response(url=url, retry=retry, until=until)     # Hace la petición GET.
+    start:float = perf_counter()
+    soup:HtmlDocument = parse_html(response.text, subtrees=subtrees)
+    observe_phase("parse", perf_counter() - start, url=url)
+
+    # Retorna el HTMl obtenido.
+    return soup
+
+
+def _cached_async_response(entry:CacheEntry) -> AsyncResponse:
+    """
+    Genera una respuesta asíncrona a partir de una entrada de la caché.
+
+    Args:
+        entry (CacheEntry): Entrada de la caché.
+
+    Returns:
+        AsyncResponse: La respuesta generada.
+    """
+    return AsyncResponse(url=entry.Url, status_code=200, headers=entry.Headers, content=entry.Content,
+                         encoding=get_encoding_from_headers(CaseInsensitiveDict(entry.Headers)))
+
+
+async def async_get_response(url:str, retry:Optional[RetryConfig]=None, until:Optional[Tuple[str, ...]]=None) -> AsyncResponse:
+    """
+    Realiza una petición GET asíncrona a la URL dada. La petición respeta el control de
+    ritmo y concurrencia del host (ver `configure_throttle`) y se reintenta según la
+    política de reintentos (ver `configure_retry`).
+
+    Args:
+        url (str): URl a la que hacer la petición.
+        retry (Optional[RetryConfig]): Política de reintentos de esta petición (`None` = la configurada).
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se deja de descargar el cuerpo
+            (ver `get_html`).
+    
+    Raises:
+        NetworkBadResponseError: Causada si el estado de la respuesta no es 200.
+    
+    Returns:
+        AsyncResponse: La respuesta obtenida del servidor.
+    """
+    # Comprueba si la respuesta está en la caché y sigue vigente (con la URL canónica).
+    url = canonical_url(url=url)
+    entry:Optional[CacheEntry] = _usable(entry=_cache.get(url=url), until=until) if _cache is not None else None
+    if entry is not None and entry.Fresh:
+        count_cache(layer="http", result="hit")
+        return _cached_async_response(entry=entry)
+
+    # Realiza la petición GET con el cliente compartido (condicional si hay entrada caducada).
+    response:AsyncResponse = await _async_send(url=url, headers=entry.Validators if entry else None,
+                                               policy=RetryPolicy(cfg=retry) if retry else _retry, until=until)
+
+    # El servidor confirma que la entrada caducada sigue siendo válida.
+    if entry is not None and response.status_code == 304:
+        count_cache(layer="http", result="revalidated")
+        _cache.touch(url=url, headers=response.headers)
+        return _cached_async_response(entry=entry)
+    if _cache is not None:
+        count_cache(layer="http", result="miss")
+
+    # Comprueba el estado de la respuesta.
+    if response.status_code != 200:
+        raise NetworkBadResponseError(status_code=response.status_code, reason=HTTPStatus(value=response.status_code).phrase)
+
+    # Almacena la respuesta en la caché.
+    if _cache is not None:
+        _cache.put(url=url, content=response.content, headers=response.headers)
+
+    # Retorna la respuesta obtenida.
+    return response
+
+
+async def async_get_conditional(url:str, validators:Optional[Dict[str, str]]=None, retry:Optional[RetryConfig]=None,
+                                until:Optional[Tuple[str, ...]]=None) -> AsyncResponse:
+    """
+    Realiza una petición GET asíncrona condicional con los validadores dados (ver
+    `lib.common.cache.validators_of`), sin consultar la caché HTTP: sirve para vigilar
+    cambios en una página guardando solo sus validadores. Si la respuesta es completa, se
+    guarda en la caché (si está activa).
+
+    Args:
+        url (str): URl a la que hacer la petición.
+        validators (Optional[Dict[str, str]]): Cabeceras `If-None-Match` / `If-Modified-Since`.
+        retry (Optional[RetryConfig]): Política de reintentos de esta petición (`None` = la configurada).
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que se deja de descargar el cuerpo
+            (ver `get_html`).
+
+    Raises:
+        NetworkBadResponseError: Causada si el estado de la respuesta no es 200 ni 304.
+
+    Returns:
+        AsyncResponse: La respuesta obtenida del servidor (304 si la página no ha cambiado).
+    """
+    # Realiza la petición GET condicional.
+    url = canonical_url(url=url)
+    response:AsyncResponse = await _async_send(url=url, headers=validators or None,
+                                               policy=RetryPolicy(cfg=retry) if retry else _retry, until=until)
+
+    # Comprueba el estado de la respuesta.
+    if response.status_code == 304:
+        return response
+    if response.status_code != 200:
+        raise NetworkBadResponseError(status_code=response.status_code, reason=HTTPStatus(value=response.status_code).phrase)
+
+    # Almacena la respuesta en la caché.
+    if _cache is not None:
+        _cache.put(url=url, content=response.content, headers=response.headers)
+
+    # Retorna la respuesta obtenida.
+    return response
+
+
+async def async_get_html(url:str, subtrees:Optional[List[Tuple[str, str]]]=None, retry:Optional[RetryConfig]=None,
+                         until:Optional[Tuple[str, ...]]=None) -> HtmlDocument:
+    """
+    Obtiene de forma asíncrona el HTMl para una URL dada.
+
     Args:
         url (str): URl a la que hacer la petición.
+        subtrees (Optional[List[Tuple[str, str]]]): Pares (etiqueta, clase) de los únicos
+            subárboles que se necesitan. Ver `lib.common.parser.parse_html`.
+        retry (Optional[RetryConfig]): Política de reintentos de esta petición (`None` = la configurada).
+        until (Optional[Tuple[str, ...]]): Marcadores tras los que ya está todo lo que se necesita
+            (ver `get_html`).
     
     Raises:
         NetworkBadResponseError: En caso de que el estado de la petición no sea 200.
 
     Returns:
-        BeautifulSoup: HTML obtenido.
+        HtmlDocument: HTML obtenido.
     """
     # Obtiene el HTML.
-    response:Response = get_response(url=url)   # Hace la petición GET.
-    soup:BeautifulSoup = BeautifulSoup(response.text, "html.parser")
+    response:AsyncResponse = await async_get_response(url=url, retry=retry, until=until)     # Hace la petición GET.
+    start:float = perf_counter()
+    soup:HtmlDocument = parse_html(response.text, subtrees=subtrees)
+    observe_phase("parse", perf_counter() - start, url=url)
 
     # Retorna el HTMl obtenido.
     return soup
@@ -117,7 +1158,8 @@ def get_html(url:str) -> BeautifulSoup:
 
 def url_join(*args) -> str:
     """
-    Genera una URL a partir de los argumentos dados.
+    Genera una URL a partir de los argumentos dados. Si la URL es de un mirror de una web,
+    se reescribe con su dominio canónico (las peticiones se envían igualmente al mejor mirror).
 
     Args:
         args: Argumentos a añadir en la URL.
@@ -126,7 +1168,7 @@ def url_join(*args) -> str:
         URL: La URL generada.
     """
     # Genera la URL.
-    url:str = '/'.join(str(arg).strip('/') for arg in args if arg).strip('/')
+    url:str = canonical_url(url='/'.join(str(arg).strip('/') for arg in args if arg).strip('/'))
 
     # Devuelve la URL generada.
     return url
\ No newline at end of file
@@ -0,0 +1,274 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: parser.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-09
+# · Descripción: Módulo con los motores disponibles para procesar el HTML descargado.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import List, Optional, Tuple, Union
+from importlib.util import find_spec
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+# ---- VARIABLES ---- #
+HTML_PARSER:str = "html.parser"         # Motor de Python puro incluido en la librería estándar.
+LXML:str = "lxml"                       # Motor de libxml2 (requiere `lxml`).
+SELECTOLAX:str = "selectolax"           # Motor Lexbor con selectores CSS en C (requiere `selectolax`).
+AUTO:str = "auto"                       # El motor más rápido de los instalados.
+
+_backend:str = AUTO                     # Motor usado por defecto.
+_installed:Optional[Tuple[str, ...]] = None     # Motores instalados (se buscan solo la primera vez).
+
+
+# ---- CLASES ---- #
+class ParserError(Exception):
+    """
+    Excepción causada cuando el motor solicitado no existe o no está instalado.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, *args):
+        """
+        Inicializa la instancia.
+        """
+        # Inicializa las propiedades.
+        super().__init__(*args)
+
+
+class LexborNode:
+    """
+    Adaptador de un nodo de `selectolax` con la parte de la API de `BeautifulSoup` que usan
+    los managers (`select`, `select_one`, `text` y acceso a atributos), de forma que el
+    mismo código de extracción funciona con cualquier motor.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, node):
+        """
+        Inicializa la instancia.
+
+        Args:
+            node: Nodo de `selectolax` a adaptar.
+        """
+        # Inicializa las propiedades.
+        self.__node = node
+
+    def __getitem__(self, attr:str) -> str:
+        """
+        Devuelve el valor de un atributo.
+
+        Args:
+            attr (str): Nombre del atributo.
+
+        Raises:
+            KeyError: Si el nodo no tiene el atributo.
+
+        Returns:
+            str: Valor del atributo.
+        """
+        return self.__node.attributes[attr]
+
+
+    # -- Propiedades -- #
+    @property
+    def node(self):
+        """
+        Devuelve el nodo de `selectolax` adaptado (lo usan los esquemas de extracción para
+        recorrer el documento sin crear un adaptador por nodo).
+
+        Returns:
+            Nodo de `selectolax`.
+        """
+        return self.__node
+
+    @property
+    def text(self) -> str:
+        """
+        Devuelve el texto del nodo y sus descendientes.
+
+        Returns:
+            str: Texto del nodo.
+        """
+        return self.__node.text(deep=True)
+
+
+    # -- Métodos -- #
+    def get(self, attr:str, default:Optional[str]=None) -> Optional[str]:
+        """
+        Devuelve el valor de un atributo o el valor por defecto si no existe.
+
+        Args:
+            attr (str): Nombre del atributo.
+            default (Optional[str]): Valor por defecto.
+
+        Returns:
+            Optional[str]: Valor del atributo.
+        """
+        return self.__node.attributes.get(attr, default)
+
+    def select(self, selector:str) -> List["LexborNode"]:
+        """
+        Devuelve los nodos que cumplen el selector CSS.
+
+        Args:
+            selector (str): Selector CSS.
+
+        Returns:
+            List[LexborNode]: Nodos encontrados.
+        """
+        return [LexborNode(node) for node in self.__node.css(selector)]
+
+    def select_one(self, selector:str) -> Optional["LexborNode"]:
+        """
+        Devuelve el primer nodo que cumple el selector CSS.
+
+        Args:
+            selector (str): Selector CSS.
+
+        Returns:
+            Optional[LexborNode]: Nodo encontrado o `None`.
+        """
+        node = self.__node.css_first(selector)
+        return LexborNode(node) if node is not None else None
+
+
+class SubtreeStrainer(SoupStrainer):
+    """
+    Filtro de `BeautifulSoup` que solo materializa los subárboles indicados. Cada subárbol se
+    indica con un par (etiqueta, clase); con clase `None` se conservan todas las etiquetas de
+    ese nombre (por ejemplo `("script", None)`).
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, subtrees:List[Tuple[str, Optional[str]]]):
+        """
+        Inicializa la instancia.
+
+        Args:
+            subtrees (List[Tuple[str, Optional[str]]]): Pares (etiqueta, clase) de los nodos raíz a conservar.
+        """
+        # Inicializa las propiedades.
+        super().__init__()
+        self.__subtrees:List[Tuple[str, Optional[str]]] = list(subtrees)
+
+
+    # -- Métodos -- #
+    def matches_subtree(self, name:str, attrs) -> bool:
+        """
+        Indica si una etiqueta es la raíz de alguno de los subárboles.
+
+        Args:
+            name (str): Nombre de la etiqueta.
+            attrs: Atributos de la etiqueta tal y como los entrega el motor.
+
+        Returns:
+            bool: `True` si hay que conservar la etiqueta.
+        """
+        # Durante el análisis la clase suele llegar como cadena ("ListAnimes AX Rows").
+        value = (attrs or {}).get("class") or ""
+        classes:List[str] = value.split() if isinstance(value, str) else list(value)
+        return any(name == tag and (cls is None or cls in classes) for tag, cls in self.__subtrees)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        """
+        Decide si se crea una etiqueta de primer nivel (bs4 >= 4.13).
+        """
+        return self.matches_subtree(name=name, attrs=attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        """
+        Descarta el texto de primer nivel (bs4 >= 4.13).
+        """
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        """
+        Decide si se crea una etiqueta de primer nivel (bs4 < 4.13).
+        """
+        return self.matches_subtree(name=markup_name, attrs=markup_attrs)
+
+
+# Documento HTML devuelto por `parse_html`, independiente del motor.
+HtmlDocument = Union[BeautifulSoup, LexborNode]
+
+
+# ---- FUNCIONES ---- #
+def available_backends() -> List[str]:
+    """
+    Devuelve los motores instalados, del más rápido al más lento.
+
+    Returns:
+        List[str]: Motores disponibles.
+    """
+    return list(_installed_backends())
+
+
+def _installed_backends() -> Tuple[str, ...]:
+    """
+    Busca los motores instalados la primera vez y después devuelve el resultado guardado
+    (`parse_html` lo consulta en cada página con `auto`).
+
+    Returns:
+        Tuple[str, ...]: Motores disponibles, del más rápido al más lento.
+    """
+    global _installed
+    if _installed is None:
+        _installed = tuple(backend for backend, module in ((SELECTOLAX, "selectolax"), (LXML, "lxml"), (HTML_PARSER, "html"))
+                           if find_spec(module) is not None)
+    return _installed
+
+
+def configure_parser(backend:str=AUTO) -> None:
+    """
+    Selecciona el motor usado por defecto en `parse_html`.
+
+    Args:
+        backend (str): `html.parser`, `lxml`, `selectolax` o `auto`.
+
+    Raises:
+        ParserError: Si el motor no existe o no está instalado.
+    """
+    global _backend
+
+    # Comprueba el motor.
+    if backend != AUTO and backend not in _installed_backends():
+        raise ParserError(f"Parser backend '{backend}' is not available. Installed: {available_backends()}")
+
+    # Selecciona el motor.
+    _backend = backend
+
+
+def parse_html(markup:Union[str, bytes], subtrees:Optional[List[Tuple[str, Optional[str]]]]=None, backend:Optional[str]=None) -> HtmlDocument:
+    """
+    Procesa el HTML dado con el motor indicado.
+
+    Args:
+        markup (Union[str, bytes]): HTML a procesar.
+        subtrees (Optional[List[Tuple[str, Optional[str]]]]): Pares (etiqueta, clase) de los
+            únicos subárboles que se necesitan (ver `SubtreeStrainer`). Con los motores de
+            `BeautifulSoup` el resto del documento no llega a construirse; `selectolax`
+            construye el árbol completo en C.
+        backend (Optional[str]): Motor a usar. Si es `None` se usa el configurado.
+
+    Raises:
+        ParserError: Si el motor no existe o no está instalado.
+
+    Returns:
+        HtmlDocument: Documento procesado.
+    """
+    # Selecciona el motor.
+    backend = backend or _backend
+    if backend == AUTO:
+        backend = _installed_backends()[0]
+
+    # Procesa el HTML con selectolax.
+    if backend == SELECTOLAX:
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborNode(LexborHTMLParser(markup).root)
+
+    # Procesa el HTML con BeautifulSoup.
+    if backend not in (LXML, HTML_PARSER):
+        raise ParserError(f"Unknown parser backend '{backend}'.")
+    strainer:Optional[SoupStrainer] = SubtreeStrainer(subtrees=subtrees) if subtrees else None
+    return BeautifulSoup(markup, backend, parse_only=strainer)
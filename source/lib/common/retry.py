@@ -0,0 +1,126 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: retry.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-18
+# · Descripción: Módulo con la política de reintentos y el registro de latencias por host
+# usado para duplicar (hedging) las peticiones lentas.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Deque, Optional
+from random import uniform
+from threading import Lock
+from collections import deque
+
+from lib.config.schema import RetryConfig
+
+
+# ---- CLASES ---- #
+class RetryPolicy:
+    """
+    Decide si se reintenta una petición y cuánto se espera antes de hacerlo, según las
+    reglas de `RetryConfig`.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, cfg:RetryConfig=RetryConfig()):
+        """
+        Inicializa la instancia.
+
+        Args:
+            cfg (RetryConfig): Configuración de la política.
+        """
+        # Inicializa las propiedades.
+        self.__cfg:RetryConfig = cfg
+
+
+    # -- Propiedades -- #
+    @property
+    def Config(self) -> RetryConfig:
+        """
+        Devuelve la configuración de la política.
+
+        Returns:
+            RetryConfig: Configuración.
+        """
+        return self.__cfg
+
+
+    # -- Métodos -- #
+    def retries_for(self, status:Optional[int]) -> int:
+        """
+        Devuelve cuántos reintentos se permiten para un resultado.
+
+        Args:
+            status (Optional[int]): Estado de la respuesta o `None` si la petición falló sin respuesta.
+
+        Returns:
+            int: Número de reintentos permitidos.
+        """
+        rules:dict = self.__cfg.rules
+        if status is None:
+            return rules.get("error", 0)
+        return rules.get(str(status), rules.get(f"{status // 100}xx", 0))
+
+    def backoff(self, attempt:int, retry_after:Optional[float]=None) -> float:
+        """
+        Calcula la espera antes de un reintento (backoff exponencial con jitter completo). Si el
+        servidor indicó un `Retry-After` se espera al menos ese tiempo.
+
+        Args:
+            attempt (int): Número del reintento (0 para el primero).
+            retry_after (Optional[float]): Segundos indicados por el servidor.
+
+        Returns:
+            float: Segundos a esperar.
+        """
+        delay:float = uniform(0, min(self.__cfg.backoff_max, self.__cfg.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+
+class LatencyWindow:
+    """
+    Latencias más recientes de un host, usadas para calcular cuándo una petición tarda lo
+    suficiente como para merecer una petición duplicada.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, size:int=RetryConfig.hedge_samples):
+        """
+        Inicializa la instancia.
+
+        Args:
+            size (int): Número de latencias que se conservan.
+        """
+        # Inicializa las propiedades.
+        self.__samples:Deque[float] = deque(maxlen=size)
+        self.__lock:Lock = Lock()
+
+
+    # -- Métodos -- #
+    def add(self, latency:float) -> None:
+        """
+        Registra una latencia.
+
+        Args:
+            latency (float): Segundos que tardó la petición.
+        """
+        with self.__lock:
+            self.__samples.append(latency)
+
+    def quantile(self, q:float, min_samples:int=1) -> Optional[float]:
+        """
+        Devuelve un cuantil de las latencias registradas.
+
+        Args:
+            q (float): Cuantil (0-1).
+            min_samples (int): Latencias necesarias para calcularlo.
+
+        Returns:
+            Optional[float]: El cuantil o `None` si no hay suficientes latencias.
+        """
+        with self.__lock:
+            if len(self.__samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self.__samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
@@ -0,0 +1,309 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: throttle.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-17
+# · Descripción: Módulo con el control de ritmo (token bucket) y de concurrencia adaptativa
+# (AIMD) de las peticiones a cada host, y con el límite de ancho de banda de las descargas.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import List, Optional, Tuple
+from time import monotonic, sleep, time
+from threading import Condition, Lock
+from asyncio import AbstractEventLoop, Future, get_running_loop, sleep as async_sleep
+from email.utils import parsedate_to_datetime
+
+from lib.config.schema import ThrottleConfig
+
+
+# ---- VARIABLES ---- #
+THROTTLED_STATUS:Tuple[int, ...] = (429, 503)     # Estados con los que un servidor pide que se reduzca el ritmo.
+
+
+# ---- CLASES ---- #
+class HostLimiter:
+    """
+    Limita las peticiones a un host combinando dos mecanismos:
+
+    - Un token bucket que fija el ritmo máximo (`rate` peticiones por segundo con ráfagas de
+      hasta `burst`).
+    - Una ventana de concurrencia adaptativa (AIMD): crece de forma aditiva con cada ventana
+      de respuestas correctas y se reduce de forma multiplicativa ante un 429/503 o cuando la
+      latencia media se dispara respecto a la mínima observada. Un `Retry-After` bloquea el
+      host hasta la fecha indicada.
+
+    De esta forma el número de peticiones en vuelo converge al máximo que tolera cada web. Se
+    puede usar desde hilos (`acquire`) y desde corrutinas (`async_acquire`); cada petición
+    adquirida debe liberarse con `release`.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, host:str, cfg:ThrottleConfig=ThrottleConfig()):
+        """
+        Inicializa la instancia.
+
+        Args:
+            host (str): Host al que se aplica el límite.
+            cfg (ThrottleConfig): Configuración del límite.
+        """
+        # Inicializa las propiedades.
+        self.__host:str = host
+        self.__cfg:ThrottleConfig = cfg
+        self.__condition:Condition = Condition()
+        self.__waiters:List[Tuple[AbstractEventLoop, Future]] = []
+        self.__tokens:float = float(cfg.burst)
+        self.__refilledAt:float = monotonic()
+        self.__window:float = cfg.initial_window
+        self.__inFlight:int = 0
+        self.__blockedUntil:float = 0.0
+        self.__latency:float = 0.0          # Media móvil de la latencia.
+        self.__baseLatency:float = 0.0      # Latencia mínima observada (con deriva lenta al alza).
+        self.__decreasedAt:float = 0.0
+
+
+    # -- Propiedades -- #
+    @property
+    def Host(self) -> str:
+        """
+        Devuelve el host al que se aplica el límite.
+
+        Returns:
+            str: Host.
+        """
+        return self.__host
+
+    @property
+    def Window(self) -> float:
+        """
+        Devuelve el número de peticiones simultáneas permitidas actualmente.
+
+        Returns:
+            float: Tamaño de la ventana de concurrencia.
+        """
+        return self.__window
+
+    @property
+    def InFlight(self) -> int:
+        """
+        Devuelve el número de peticiones en vuelo.
+
+        Returns:
+            int: Peticiones adquiridas y aún no liberadas.
+        """
+        return self.__inFlight
+
+    @property
+    def Latency(self) -> float:
+        """
+        Devuelve la latencia media observada.
+
+        Returns:
+            float: Latencia media en segundos (0 si aún no hay respuestas).
+        """
+        return self.__latency
+
+
+    # -- Métodos -- #
+    def acquire(self) -> None:
+        """
+        Espera (bloqueando el hilo) hasta que se pueda enviar una petición al host.
+        """
+        with self.__condition:
+            while True:
+                delay:Optional[float] = self.__try_acquire()
+                if delay == 0:
+                    return
+                self.__condition.wait(timeout=delay)
+
+    async def async_acquire(self) -> None:
+        """
+        Espera (sin bloquear el bucle de eventos) hasta que se pueda enviar una petición al host.
+        """
+        loop:AbstractEventLoop = get_running_loop()
+        while True:
+            waiter:Optional[Future] = None
+            with self.__condition:
+                delay:Optional[float] = self.__try_acquire()
+                if delay is None:
+                    waiter = loop.create_future()
+                    self.__waiters.append((loop, waiter))
+            if delay == 0:
+                return
+            if waiter is not None:
+                await waiter
+            else:
+                await async_sleep(delay)
+
+    def release(self, status:Optional[int], latency:float, retry_after:Optional[str]=None) -> None:
+        """
+        Libera una petición adquirida y ajusta la ventana según su resultado.
+
+        Args:
+            status (Optional[int]): Estado de la respuesta (`None` si la petición falló sin respuesta).
+            latency (float): Segundos que tardó la petición.
+            retry_after (Optional[str]): Valor de la cabecera `Retry-After` de la respuesta.
+        """
+        with self.__condition:
+            self.__inFlight -= 1
+            now:float = monotonic()
+            if status in THROTTLED_STATUS:
+                # El servidor pide que se baje el ritmo.
+                self.__decrease(now=now)
+                delay:Optional[float] = parse_retry_after(value=retry_after)
+                if delay:
+                    self.__blockedUntil = max(self.__blockedUntil, now + min(delay, self.__cfg.max_retry_after))
+            elif status is not None and status < 500:
+                # Actualiza las latencias y comprueba si el host se está saturando.
+                self.__observe(latency=latency)
+                if self.__baseLatency and self.__latency > self.__baseLatency * self.__cfg.latency_factor:
+                    self.__decrease(now=now)
+                else:
+                    self.__window = min(self.__cfg.max_window, self.__window + self.__cfg.increase / self.__window)
+
+            # Despierta a las peticiones que esperan.
+            self.__condition.notify_all()
+            waiters, self.__waiters = self.__waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+
+    # -- Métodos privados -- #
+    def __try_acquire(self) -> Optional[float]:
+        """
+        Intenta adquirir una petición. Debe llamarse con el bloqueo adquirido.
+
+        Returns:
+            Optional[float]: 0 si se adquirió, los segundos a esperar antes de volver a intentarlo
+                o `None` si hay que esperar a que se libere una petición.
+        """
+        # Comprueba si el host está bloqueado por un `Retry-After`.
+        now:float = monotonic()
+        if now < self.__blockedUntil:
+            return self.__blockedUntil - now
+
+        # Comprueba la ventana de concurrencia.
+        if self.__inFlight >= max(1, int(self.__window)):
+            return None
+
+        # Repone y consume un token.
+        self.__tokens = min(float(self.__cfg.burst), self.__tokens + (now - self.__refilledAt) * self.__cfg.rate)
+        self.__refilledAt = now
+        if self.__tokens < 1:
+            return (1 - self.__tokens) / self.__cfg.rate
+        self.__tokens -= 1
+        self.__inFlight += 1
+        return 0
+
+    def __decrease(self, now:float) -> None:
+        """
+        Reduce la ventana de forma multiplicativa, como mucho una vez por latencia media (las
+        respuestas de las peticiones que ya estaban en vuelo no la vuelven a reducir).
+
+        Args:
+            now (float): Instante actual.
+        """
+        if now - self.__decreasedAt >= self.__latency:
+            self.__window = max(self.__cfg.min_window, self.__window * self.__cfg.decrease)
+            self.__decreasedAt = now
+
+    def __observe(self, latency:float) -> None:
+        """
+        Actualiza la latencia media y la mínima observada.
+
+        Args:
+            latency (float): Latencia de la última respuesta.
+        """
+        self.__latency = latency if not self.__latency else 0.8 * self.__latency + 0.2 * latency
+        if not self.__baseLatency or latency < self.__baseLatency:
+            self.__baseLatency = latency
+        else:
+            self.__baseLatency += (latency - self.__baseLatency) * 0.01
+
+
+class BandwidthLimiter:
+    """
+    Token bucket de bytes que limita el ancho de banda compartido por varias descargas. Cada
+    hilo llama a `consume` con los bytes que acaba de recibir y se bloquea el tiempo necesario
+    para no superar el ritmo. Los bytes consumidos por encima del saldo quedan como deuda que
+    paga quien la genera, de forma que los bloques grandes no bloquean a los pequeños.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, rate:float, burst:Optional[float]=None):
+        """
+        Inicializa la instancia.
+
+        Args:
+            rate (float): Bytes por segundo.
+            burst (Optional[float]): Bytes que pueden pasar de golpe (`None` = un segundo de ritmo).
+        """
+        # Inicializa las propiedades.
+        self.__rate:float = rate
+        self.__burst:float = burst if burst is not None else rate
+        self.__tokens:float = self.__burst
+        self.__refilledAt:float = monotonic()
+        self.__lock:Lock = Lock()
+
+
+    # -- Propiedades -- #
+    @property
+    def Rate(self) -> float:
+        """
+        Devuelve el ritmo máximo.
+
+        Returns:
+            float: Bytes por segundo.
+        """
+        return self.__rate
+
+
+    # -- Métodos -- #
+    def consume(self, amount:int) -> None:
+        """
+        Descuenta bytes del saldo, esperando si se ha superado el ritmo.
+
+        Args:
+            amount (int): Bytes recibidos.
+        """
+        with self.__lock:
+            now:float = monotonic()
+            self.__tokens = min(self.__burst, self.__tokens + (now - self.__refilledAt) * self.__rate)
+            self.__refilledAt = now
+            self.__tokens -= amount
+            delay:float = -self.__tokens / self.__rate if self.__tokens < 0 else 0.0
+        if delay:
+            sleep(delay)
+
+
+# ---- FUNCIONES ---- #
+def parse_retry_after(value:Optional[str]) -> Optional[float]:
+    """
+    Interpreta una cabecera `Retry-After` (segundos o fecha HTTP).
+
+    Args:
+        value (Optional[str]): Valor de la cabecera.
+
+    Returns:
+        Optional[float]: Segundos a esperar o `None` si no hay cabecera o no es válida.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _wake(waiter:Future) -> None:
+    """
+    Despierta a una corrutina que espera a que se libere una petición.
+
+    Args:
+        waiter (Future): Futuro por el que espera.
+    """
+    if not waiter.done():
+        waiter.set_result(None)
@@ -4,30 +4,379 @@ class AnimeFlvConfig:
     Almacena la configuración de `AnimeFlv`.
 
     Attributes:
+        name (str): Identificador de la web.
         base_url (str): URL base de animeFlv.
+        mirrors (tuple): URLs base de otros dominios de la web. Cada petición se envía al más
+            rápido disponible, pero las URLs se guardan siempre con `base_url`.
         browse_url (str): URL base para listar los animes disponibles.
         query_url (str): URL base para buscar animes.
         base_watch_url (str): URL base para ver episodios.
     """
     # -- Atributos -- #
+    name:str        = "animeflv"
     base_url:str    = "https://www3.animeflv.net"
+    mirrors:tuple   = ()
     browse_url:str  = "https://www3.animeflv.net/browse"
     query_url:str   = "https://www3.animeflv.net/browse?q="
     watch_url:str   = "https://www3.animeflv.net/ver"
 
 
+class AnimeFlvSchema:
+    """
+    Almacena el esquema de extracción de las páginas de `AnimeFlv`. Cada campo se declara como
+    `[all:|last:]selector[@atributo]` (ver `lib.common.extract.Field`).
+
+    Attributes:
+        search_item (str): Selector de cada resultado de la página de búsqueda.
+        search (dict): Campos de cada resultado (relativos a `search_item`).
+        anime (dict): Campos de la página inicial de un anime.
+        anime_until (tuple): Marcadores que aparecen, en orden, tras el último campo de `anime`:
+            la descarga de la página se corta tras ellos.
+    """
+    # -- Atributos -- #
+    search_item:str = "ul.ListAnimes li"
+    search:dict     = {"name": "h3.Title", "url": "article.Anime a@href"}
+    anime:dict      = {"name": "h1.Title", "description": "div.Description p", "themes": "all:nav.Nvgnrs a",
+                       "scripts": "all:script"}
+    anime_until:tuple = ("var episodes", "</script>")
+
+
 class AnimeFenixConfig:
     """
     Almacena la configuración de `Anime Fenix`.
 
     Attributes:
+        name (str): Identificador de la web.
         base_url (str): URL base de animeFlv.
+        mirrors (tuple): URLs base de otros dominios de la web. Cada petición se envía al más
+            rápido disponible, pero las URLs se guardan siempre con `base_url`.
         browse_url (str): URL base para listar los animes disponibles.
         query_url (str): URL base para buscar animes.
         base_watch_url (str): URL base para ver episodios.
     """
     # -- Atributos -- #
+    name:str        = "animefenix"
     base_url:str    = "https://animefenix2.tv"
+    mirrors:tuple   = ()
     browse_url:str  = "https://animefenix2.tv/directorio/anime"
     query_url:str   = "https://animefenix2.tv/directorio/anime?q="
-    watch_url:str   = "https://animefenix2.tv/ver"
\ No newline at end of file
+    watch_url:str   = "https://animefenix2.tv/ver"
+
+
+class AnimeFenixSchema:
+    """
+    Almacena el esquema de extracción de las páginas de `Anime Fenix`. Cada campo se declara
+    como `[all:|last:]selector[@atributo]` (ver `lib.common.extract.Field`).
+
+    Attributes:
+        search_item (str): Selector de cada resultado de la página de búsqueda.
+        search (dict): Campos de cada resultado (relativos a `search_item`).
+        anime (dict): Campos de la página inicial de un anime.
+        anime_until (tuple): Marcadores que aparecen, en orden, tras el último campo de `anime`:
+            la descarga de la página se corta tras ellos.
+    """
+    # -- Atributos -- #
+    search_item:str = "ul.grid-animes li"
+    search:dict     = {"name": "last:article a p", "url": "article a@href"}
+    anime:dict      = {"name": "h1.text-orange-500", "description": "div.mb-6 p.text-gray-300",
+                       "themes": "all:div.mb-6 div a.duration-300", "episodes": "all:a[href*='/ver/']@href"}
+    anime_until:tuple = ('<ul class="divide-y divide-gray-800"', "</ul>")
+
+
+class NetworkConfig:
+    """
+    Almacena la configuración de la capa de red.
+
+    Attributes:
+        pool_connections (int): Número de hosts distintos cuyo pool de conexiones se mantiene.
+        pool_maxsize (int): Número máximo de conexiones keep-alive por host.
+        async_limit (int): Número máximo de conexiones simultáneas del cliente asíncrono.
+        async_limit_per_host (int): Número máximo de conexiones simultáneas del cliente asíncrono por host.
+        timeout (float): Tiempo máximo (en segundos) de espera de cada petición.
+        stream_chunk_size (int): Tamaño (en bytes) de los bloques leídos al descargar una página
+            que puede cortarse antes del final (ver `get_html(until=...)`).
+        headers (Dict[str, str]): Cabeceras enviadas por defecto en cada petición.
+    """
+    # -- Atributos -- #
+    pool_connections:int    = 8
+    pool_maxsize:int        = 16
+    async_limit:int         = 256
+    async_limit_per_host:int = 64
+    timeout:float           = 30.0
+    stream_chunk_size:int   = 16 * 1024
+    headers:dict            = {
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+        "Connection": "keep-alive",
+    }
+
+
+class MirrorConfig:
+    """
+    Almacena la configuración de los dominios alternativos (mirrors) de las webs.
+
+    Attributes:
+        alpha (float): Peso de cada nueva medida en la latencia y la tasa de errores medias.
+        error_penalty (float): Cuánto empeora la tasa de errores la puntuación de un mirror
+            (puntuación = latencia * (1 + error_penalty * tasa de errores)).
+        failures_to_down (int): Fallos seguidos (estados 5xx) tras los que un mirror se aparta.
+            Un fallo de conexión o un tiempo agotado lo aparta directamente.
+        cooldown (float): Segundos que se aparta un mirror la primera vez; se duplica con cada
+            fallo seguido.
+        max_cooldown (float): Máximo de segundos que se aparta un mirror.
+        probe_interval (float): Segundos entre sondas en segundo plano (0 = sin sonda).
+        probe_timeout (float): Segundos máximos de espera de cada sonda.
+    """
+    # -- Atributos -- #
+    alpha:float             = 0.3
+    error_penalty:float     = 4.0
+    failures_to_down:int    = 3
+    cooldown:float          = 30.0
+    max_cooldown:float      = 600.0
+    probe_interval:float    = 120.0
+    probe_timeout:float     = 5.0
+
+
+class ThrottleConfig:
+    """
+    Almacena la configuración del control de ritmo y concurrencia por host.
+
+    Attributes:
+        rate (float): Peticiones por segundo que repone el token bucket de cada host.
+        burst (int): Número máximo de peticiones que pueden salir de golpe (capacidad del bucket).
+        initial_window (float): Peticiones simultáneas permitidas al empezar con un host.
+        min_window (float): Mínimo de peticiones simultáneas por host.
+        max_window (float): Máximo de peticiones simultáneas por host.
+        increase (float): Peticiones que se suman a la ventana por cada ventana completa de éxitos.
+        decrease (float): Factor por el que se multiplica la ventana ante un 429/503 o una subida de latencia.
+        latency_factor (float): Veces que la latencia media puede superar a la mínima observada antes
+            de considerarse congestión.
+        max_retry_after (float): Máximo de segundos que el host queda bloqueado por un `Retry-After`.
+    """
+    # -- Atributos -- #
+    rate:float              = 20.0
+    burst:int               = 10
+    initial_window:float    = 4.0
+    min_window:float        = 1.0
+    max_window:float        = 64.0
+    increase:float          = 1.0
+    decrease:float          = 0.5
+    latency_factor:float    = 3.0
+    max_retry_after:float   = 120.0
+
+
+class RetryConfig:
+    """
+    Almacena la política de reintentos y de peticiones duplicadas (hedging) de las peticiones GET.
+
+    Attributes:
+        rules (Dict[str, int]): Reintentos permitidos según el resultado. Las claves son un estado
+            concreto (`"429"`), una clase de estados (`"5xx"`) o `"error"` (fallo de conexión o
+            tiempo agotado); se usa la más específica. Los resultados sin regla no se reintentan.
+        backoff_base (float): Segundos de espera base; el n-ésimo reintento espera un tiempo
+            aleatorio entre 0 y `backoff_base * 2^n`.
+        backoff_max (float): Máximo de segundos de espera entre intentos (salvo `Retry-After`).
+        deadline (float): Segundos máximos desde el primer intento; no se inicia un reintento
+            que no pueda acabar antes.
+        hedge (bool): Si se envía una segunda petición cuando la primera tarda más que el
+            percentil 95 del host.
+        hedge_samples (int): Latencias recientes por host usadas para el percentil 95.
+        hedge_min_samples (int): Latencias necesarias antes de empezar a duplicar peticiones.
+        hedge_min_delay (float): Segundos mínimos de espera antes de duplicar una petición.
+    """
+    # -- Atributos -- #
+    rules:dict              = {"429": 5, "503": 5, "5xx": 3, "408": 3, "error": 3}
+    backoff_base:float      = 0.5
+    backoff_max:float       = 10.0
+    deadline:float          = 60.0
+    hedge:bool              = False
+    hedge_samples:int       = 200
+    hedge_min_samples:int   = 20
+    hedge_min_delay:float   = 0.05
+
+
+class CacheConfig:
+    """
+    Almacena la configuración de la caché HTTP en disco.
+
+    Attributes:
+        path (str): Ruta del fichero de la caché.
+        max_bytes (int): Tamaño máximo (en bytes) de los cuerpos almacenados.
+        search_ttl (float): Tiempo (en segundos) que una página de búsqueda se considera vigente.
+        detail_ttl (float): Tiempo (en segundos) que una página de un anime se considera vigente.
+        default_ttl (float): Tiempo (en segundos) para el resto de URLs.
+    """
+    # -- Atributos -- #
+    path:str            = ".cache/http.sqlite3"
+    max_bytes:int       = 256 * 1024 * 1024
+    search_ttl:float    = 15 * 60
+    detail_ttl:float    = 24 * 60 * 60
+    default_ttl:float   = 60 * 60
+
+
+
+class StoreConfig:
+    """
+    Almacena la configuración del almacén local de resultados.
+
+    Attributes:
+        path (str): Ruta del fichero del almacén.
+        anime_max_age (float): Tiempo (en segundos) que un anime almacenado se considera vigente.
+        search_max_age (float): Tiempo (en segundos) que una búsqueda almacenada se considera vigente.
+    """
+    # -- Atributos -- #
+    path:str                = ".cache/store.sqlite3"
+    anime_max_age:float     = 7 * 24 * 60 * 60
+    search_max_age:float    = 60 * 60
+
+
+class CatalogConfig:
+    """
+    Almacena la configuración del catálogo local.
+
+    Attributes:
+        index_path (str): Ruta del índice de títulos.
+        state_path (str): Ruta del estado del rastreo (entradas de cada página del directorio).
+        stop_after_unchanged (int): Páginas consecutivas que terminan en un título ya rastreado
+            tras las que se da por terminado un rastreo incremental.
+        min_score (float): Parte mínima (0-1) de la consulta que debe contener un título para aparecer en una búsqueda.
+    """
+    # -- Atributos -- #
+    index_path:str              = ".cache/catalog.idx"
+    state_path:str              = ".cache/catalog.json"
+    stop_after_unchanged:int    = 2
+    min_score:float             = 0.6
+
+
+class MatchConfig:
+    """
+    Almacena la configuración del emparejamiento de títulos entre webs.
+
+    Attributes:
+        min_similarity (float): Similitud mínima (coseno 0-1 de los trigramas ponderados por
+            TF-IDF) para considerar que dos títulos son el mismo anime.
+        ignored_words (tuple): Palabras que algunas webs añaden al título y no se comparan.
+    """
+    # -- Atributos -- #
+    min_similarity:float        = 0.85
+    ignored_words:tuple         = ("tv", "sub", "hd", "anime", "serie", "online")
+
+
+class DownloadConfig:
+    """
+    Almacena la configuración de las descargas de ficheros.
+
+    Attributes:
+        connections (int): Número de conexiones simultáneas (rangos) por fichero.
+        chunk_size (int): Tamaño (en bytes) de cada bloque leído y escrito en disco.
+        min_segment_size (int): Tamaño mínimo (en bytes) de cada rango.
+        retries (int): Reintentos seguidos sin recibir datos de un rango antes de abandonar.
+        state_interval (float): Cada cuántos segundos se guarda el progreso para poder reanudar.
+    """
+    # -- Atributos -- #
+    connections:int         = 4
+    chunk_size:int          = 256 * 1024
+    min_segment_size:int    = 1024 * 1024
+    retries:int             = 3
+    state_interval:float    = 1.0
+
+
+class HlsConfig:
+    """
+    Almacena la configuración de las descargas de streams HLS (listas `m3u8`).
+
+    Attributes:
+        workers (int): Número de segmentos que se descargan a la vez.
+        window (int): Máximo de segmentos descargados o en curso por delante del siguiente que
+            se escribe (limita la memoria del búfer de reordenación).
+        max_bandwidth (int): Ancho de banda (bits/s) máximo de la variante elegida de una lista
+            maestra (0 = la de mayor calidad).
+        retries (int): Reintentos de cada segmento antes de abandonar la descarga.
+        chunk_size (int): Tamaño (en bytes) de cada bloque leído de un segmento.
+        state_interval (float): Cada cuántos segundos se guarda el progreso para poder reanudar.
+    """
+    # -- Atributos -- #
+    workers:int             = 4
+    window:int              = 16
+    max_bandwidth:int       = 0
+    retries:int             = 3
+    chunk_size:int          = 64 * 1024
+    state_interval:float    = 1.0
+
+
+class ResolverConfig:
+    """
+    Almacena la configuración de la resolución de las URLs de vídeo de los episodios.
+
+    Attributes:
+        max_hops (int): Páginas enlazadas (`iframe`) que se siguen desde la del episodio hasta
+            encontrar el fichero de vídeo.
+        default_ttl (float): Segundos que se considera vigente una URL resuelta cuya caducidad
+            no se puede deducir de sus parámetros.
+        expiry_margin (float): Segundos antes de su caducidad en los que una URL ya se da por
+            caducada (para que la descarga no empiece con la URL a punto de caducar).
+        max_entries (int): URLs resueltas que se guardan como máximo.
+        workers (int): Hilos que resuelven episodios por adelantado.
+    """
+    # -- Atributos -- #
+    max_hops:int            = 3
+    default_ttl:float       = 30 * 60
+    expiry_margin:float     = 60.0
+    max_entries:int         = 1024
+    workers:int             = 2
+
+
+class SchedulerConfig:
+    """
+    Almacena la configuración de la cola de descargas.
+
+    Attributes:
+        path (str): Ruta del fichero de la cola.
+        output_dir (str): Directorio donde se guardan los episodios (uno por anime).
+        workers (int): Número de episodios que se descargan a la vez.
+        bandwidth (int): Bytes por segundo máximos entre todas las descargas (0 = sin límite).
+        host_bandwidth (int): Bytes por segundo máximos por host (0 = sin límite).
+        max_attempts (int): Intentos de cada episodio antes de darlo por fallido.
+        prefetch (int): Episodios en cola que se resuelven por adelantado (0 = ninguno).
+    """
+    # -- Atributos -- #
+    path:str            = ".cache/queue.sqlite3"
+    output_dir:str      = "downloads"
+    workers:int         = 2
+    bandwidth:int       = 0
+    host_bandwidth:int  = 0
+    max_attempts:int    = 3
+    prefetch:int        = 2
+
+
+class WatchConfig:
+    """
+    Almacena la configuración de la vigilancia de nuevos episodios.
+
+    Attributes:
+        path (str): Ruta del fichero con los animes seguidos y sus episodios conocidos.
+        concurrency (int): Páginas que se comprueban a la vez.
+        batch (int): Máximo de animes que se comprueban en cada pasada (el resto, en la siguiente).
+        initial_interval (float): Segundos entre comprobaciones de un anime sin ritmo de
+            estrenos conocido.
+        min_interval (float): Mínimo de segundos entre comprobaciones de un anime.
+        max_interval (float): Máximo de segundos entre comprobaciones de un anime.
+        release_window (float): Parte del ritmo de estrenos, alrededor del siguiente estreno
+            esperado, en la que un anime se comprueba cada `min_interval`.
+        backoff (float): Factor por el que crece el intervalo mientras no hay episodios nuevos
+            (fuera de la ventana de estreno).
+        alpha (float): Peso de cada nuevo tiempo entre estrenos en el ritmo medio.
+        jitter (float): Variación aleatoria (parte del intervalo) para repartir las comprobaciones.
+    """
+    # -- Atributos -- #
+    path:str                = ".cache/watch.sqlite3"
+    concurrency:int         = 16
+    batch:int               = 500
+    initial_interval:float  = 60 * 60
+    min_interval:float      = 15 * 60
+    max_interval:float      = 24 * 60 * 60
+    release_window:float    = 0.1
+    backoff:float           = 1.5
+    alpha:float             = 0.3
+    jitter:float            = 0.1
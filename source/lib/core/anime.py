@@ -1,41 +1,149 @@
 # ---- MÓDULOS ---- #
 from abc import ABC
-from typing import List, Tuple
-
-from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING, TypeVar, Union
+from time import perf_counter
+from contextvars import copy_context
+from urllib.parse import urljoin
+from asyncio import Task, create_task, wait as async_wait
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 from abc import abstractmethod
 
+from lib.config.schema import ResolverConfig, StoreConfig
+from lib.common.network import get_html, async_get_conditional, async_get_html
+from lib.common.network import NetworkBadResponseError
+from lib.common.cache import validators_of
+from lib.common.parser import HtmlDocument, parse_html
+from lib.common.metrics import count_cache, observe_phase, operation
+from lib.core.themes import THEMES
+
+if TYPE_CHECKING:
+    from lib.core.store import AnimeStore
+    from lib.core.catalog import CatalogIndex
+
+
+# ---- VARIABLES ---- #
+MEDIA_EXTENSIONS:Tuple[str, ...] = (".mp4", ".mkv", ".webm", ".avi", ".m3u8")     # Extensiones de los ficheros de vídeo.
+T = TypeVar("T")
+
 
 # ---- CLASES ---- #
-@dataclass
+class EpisodeSourceError(Exception):
+    """
+    Excepción causada cuando no se encuentra ningún fichero de vídeo para un episodio.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, *args):
+        """
+        Inicializa la instancia.
+        """
+        # Inicializa las propiedades.
+        super().__init__(*args)
+
+
+class Episode:
+    """
+    Representa un episodio de un anime.
+
+    Attributes:
+        Number (int): Número del episodio.
+        Url (str): URL de la página del episodio.
+    """
+    __slots__ = ("__number", "__url")
+
+
+    # -- Métodos por defecto -- #
+    def __init__(self, number:int, url:str):
+        """
+        Inicializa la instancia.
+
+        Args:
+            number (int): Número del episodio.
+            url (str): URL de la página del episodio.
+        """
+        # Inicializa las propiedades.
+        self.__number:int = number
+        self.__url:str = url
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        return f"Episode({self.Number}, {self.Url})"
+
+    def __eq__(self, other) -> bool:
+        """
+        Compara dos episodios por número y URL.
+
+        Returns:
+            bool: `True` si son el mismo episodio.
+        """
+        return isinstance(other, Episode) and (self.Number, self.Url) == (other.Number, other.Url)
+
+
+    # -- Propiedades -- #
+    @property
+    def Number(self) -> int:
+        """
+        Devuelve el número del episodio.
+
+        Returns:
+            int: Número del episodio.
+        """
+        return self.__number
+
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL de la página del episodio.
+
+        Returns:
+            str: URL de la página del episodio.
+        """
+        return self.__url
+
+
 class Anime:
     """
     Clase base que representa un anime. Contiene la información y métodos base.
 
+    Para que los catálogos grandes quepan en memoria la clase no tiene `__dict__` (usa
+    `__slots__`), los temas se guardan como un bitset de `THEMES` (cada nombre existe una sola
+    vez) y los episodios como tupla. Si el orden de los temas en la página no es el de sus
+    identificadores, se guardan además los identificadores en ese orden (un byte por tema).
+
     Attributes:
         Name (str): Nombre del anime.
         Description (str): Descripción del anime.
+        Themes (List[str]): Listado con los temas del anime, en el orden de la página.
+        Episodes (Tuple[Episode, ...]): Episodios del anime, ordenados por número.
     """
-    # -- Propiedades -- #
-    __name:str = field(init=False, repr=False)
-    __description:str = field(init=False, repr=False)
+    __slots__ = ("__name", "__description", "__themes", "__order", "__episodes")
 
 
     # -- Métodos por defecto -- #
-    def __init__(self, name:str, description:str, themes:List[str]):
+    def __init__(self, name:str, description:str, themes:Iterable[str], episodes:Optional[Iterable[Episode]]=None):
         """
         Inicializa la instancia.
 
         Args:
             name (str): Nombre del anime.
             description (str): Descripción del anime.
-            themes (List[str]): Listado con los temas del anime.
+            themes (Iterable[str]): Temas del anime.
+            episodes (Optional[Iterable[Episode]]): Episodios del anime.
         """
         # Inicializa las propiedades.
         self.__name:str = name
         self.__description:str = description
-        self.__themes:List[str] = themes
+        ids:Tuple[int, ...] = THEMES.ids(names=themes)
+        self.__themes:int = sum(1 << theme_id for theme_id in ids)
+        self.__order:Union[None, bytes, Tuple[int, ...]] = None
+        if list(ids) != sorted(ids):
+            self.__order = bytes(ids) if max(ids) < 256 else ids
+        self.__episodes:Tuple[Episode, ...] = tuple(sorted(episodes, key=lambda episode: episode.Number)) if episodes else ()
     
     def __repr__(self) -> str:
         """
@@ -46,19 +154,33 @@ class Anime:
         """
         # Variable a devolver.
         strfmt:str = f"· Name: {self.Name}\n· Description: {self.Description}\n· Temas: "
+        themes:List[str] = self.Themes
         
         # Comrpueba que haya algún tema en el anime.
-        if len(self.Themes):
-            strfmt += f" {self.Themes[0]}"      # Añade el tema.
+        if len(themes):
+            strfmt += f" {themes[0]}"           # Añade el tema.
             # Comprueba que haya más de un tema que añadir.
-            if len(self.Themes) > 1:
+            if len(themes) > 1:
                 # Para cada tema restante.
-                for theme in self.Themes[1:]:
+                for theme in themes[1:]:
                     strfmt += f" | {theme}"     # Añade el tema.
+
+        # Añade el número de episodios.
+        strfmt += f"\n· Episodios: {len(self.Episodes)}"
         
         # Retorna la cadena.
         return strfmt
 
+    def __eq__(self, other) -> bool:
+        """
+        Compara dos animes por nombre, descripción, temas y episodios.
+
+        Returns:
+            bool: `True` si son el mismo anime.
+        """
+        return isinstance(other, Anime) and (self.Name, self.Description, self.ThemeMask, self.Episodes) == \
+            (other.Name, other.Description, other.ThemeMask, other.Episodes)
+
 
     # -- Propiedades -- #
     @property
@@ -88,26 +210,259 @@ class Anime:
         Devuelve el listado con los temas del anime.
 
         Returns:
-            List[str]: Listado con los temas del anime.
+            List[str]: Listado con los temas del anime, en el orden de la página.
+        """
+        if self.__order is None:
+            return THEMES.names(mask=self.__themes)
+        return [THEMES.name(theme_id=theme_id) for theme_id in self.__order]
+
+    @property
+    def ThemeMask(self) -> int:
+        """
+        Devuelve el bitset con los temas del anime.
+
+        Returns:
+            int: Bitset de temas (un bit por identificador de `THEMES`).
         """
         return self.__themes
 
+    @property
+    def Episodes(self) -> Tuple[Episode, ...]:
+        """
+        Devuelve los episodios del anime.
+
+        Returns:
+            Tuple[Episode, ...]: Episodios del anime, ordenados por número.
+        """
+        return self.__episodes
+
+
+    # -- Métodos -- #
+    def has_themes(self, *themes:str) -> bool:
+        """
+        Comprueba si el anime tiene todos los temas indicados.
+
+        Args:
+            themes (str): Temas a comprobar.
+
+        Returns:
+            bool: `True` si tiene todos los temas.
+        """
+        mask:int = self.ThemeMask
+        for theme in themes:
+            theme_id:Optional[int] = THEMES.find(name=theme)
+            if theme_id is None or not mask >> theme_id & 1:
+                return False
+        return True
+
+
+class LazyAnime(Anime):
+    """
+    Anime de un listado de resultados del que solo se conocen el nombre y la URL. La página
+    del anime se descarga la primera vez que se lee su descripción, sus temas o sus episodios,
+    de forma que mostrar un listado cuesta una sola petición.
+
+    Attributes:
+        Name (str): Nombre del anime (el del listado).
+        Url (str): URL de la página inicial del anime.
+        Loaded (bool): Si ya se ha descargado la página del anime.
+    """
+    __slots__ = ("__name", "__url", "__loader", "__anime")
+
+
+    # -- Métodos por defecto -- #
+    def __init__(self, name:str, url:str, loader:Callable[[str], Anime]):
+        """
+        Inicializa la instancia.
+
+        Args:
+            name (str): Nombre del anime.
+            url (str): URL de la página inicial del anime.
+            loader (Callable[[str], Anime]): Función que carga el anime a partir de su URL
+                (normalmente `AnimeManager.load_anime`).
+        """
+        # Inicializa las propiedades.
+        self.__name:str = name
+        self.__url:str = url
+        self.__loader:Callable[[str], Anime] = loader
+        self.__anime:Optional[Anime] = None
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto (sin descargar la página).
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        return repr(self.__anime) if self.__anime is not None else f"LazyAnime({self.__name}, {self.__url})"
+
+
+    # -- Propiedades -- #
+    @property
+    def Name(self) -> str:
+        """
+        Devuelve el nombre del anime.
+
+        Returns:
+            str: El nombre del anime (el del listado).
+        """
+        return self.__name
+
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL de la página inicial del anime.
+
+        Returns:
+            str: URL de la página inicial del anime.
+        """
+        return self.__url
+
+    @property
+    def Loaded(self) -> bool:
+        """
+        Devuelve si ya se ha descargado la página del anime.
+
+        Returns:
+            bool: `True` si el detalle ya está disponible.
+        """
+        return self.__anime is not None
+
+    @property
+    def Description(self) -> str:
+        """
+        Devuelve la descripción del anime (descargando la página si hace falta).
+
+        Returns:
+            str: Descripción del anime.
+        """
+        return self.load().Description
+
+    @property
+    def Themes(self) -> List[str]:
+        """
+        Devuelve el listado con los temas del anime (descargando la página si hace falta).
+
+        Returns:
+            List[str]: Listado con los temas del anime.
+        """
+        return self.load().Themes
+
+    @property
+    def ThemeMask(self) -> int:
+        """
+        Devuelve el bitset con los temas del anime (descargando la página si hace falta).
+
+        Returns:
+            int: Bitset de temas.
+        """
+        return self.load().ThemeMask
+
+    @property
+    def Episodes(self) -> Tuple[Episode, ...]:
+        """
+        Devuelve los episodios del anime (descargando la página si hace falta).
+
+        Returns:
+            Tuple[Episode, ...]: Episodios del anime, ordenados por número.
+        """
+        return self.load().Episodes
+
+
+    # -- Métodos -- #
+    def load(self) -> Anime:
+        """
+        Descarga la página del anime si aún no se ha hecho. Si dos hilos lo leen a la vez la
+        página puede pedirse dos veces, pero la segunda la responde la caché HTTP.
+
+        Returns:
+            Anime: El anime completo.
+        """
+        anime:Optional[Anime] = self.__anime
+        if anime is None:
+            anime = self.__anime = self.__loader(self.__url)
+        return anime
+
 
 class AnimeManager:
     """
     Clase base que representa un manager. Los managers son clases que contienen funciones
     para listar, descargar, etc. animes de páginas web.
+
+    La descarga de las páginas es común a todos los managers y existe en versión síncrona
+    (`find_animes`, `load_anime`, `load_animes`) y asíncrona (`async_find_animes`,
+    `async_load_anime`, `async_load_animes`).
+    Cada manager solo implementa cómo se genera la URL de búsqueda y cómo se extrae la
+    información del HTML.
+
+    Si se indica un `AnimeStore`, los animes y búsquedas ya procesados se responden desde el
+    almacén mientras no superen su antigüedad máxima, sin acceder a la red. Si se indica un
+    `CatalogIndex` con entradas de la web, `find_animes` responde desde el catálogo local.
+
+    Attributes:
+        Site (str): Identificador de la web.
+        Store (Optional[AnimeStore]): Almacén local de resultados.
+        Catalog (Optional[CatalogIndex]): Catálogo local de títulos.
     """
+    # -- Atributos -- #
+    _search_subtrees:Optional[List[Tuple[str, str]]] = None     # Subárboles (etiqueta, clase) que usa `_parse_animes`.
+    _anime_subtrees:Optional[List[Tuple[str, str]]] = None      # Subárboles (etiqueta, clase) que usa `_parse_anime`.
+    _anime_until:Optional[Tuple[str, ...]] = None               # Marcadores tras los que `_parse_anime` ya tiene todo (ver `get_html`).
+    _page_param:str = "page"                                    # Parámetro de la URL de búsqueda con el número de página.
+
+
     # -- Métodos por defecto -- #
-    def __init__(self):
+    def __init__(self, site:str="", store:Optional["AnimeStore"]=None, cfg:StoreConfig=StoreConfig(),
+                 catalog:Optional["CatalogIndex"]=None):
         """
         Inicializa la instancia.
+
+        Args:
+            site (str): Identificador de la web.
+            store (Optional[AnimeStore]): Almacén local de resultados.
+            cfg (StoreConfig): Configuración del almacén (antigüedad máxima de las entradas).
+            catalog (Optional[CatalogIndex]): Catálogo local de títulos.
         """
-        pass
+        # Inicializa las propiedades.
+        self.__site:str = site
+        self.__store:Optional["AnimeStore"] = store
+        self.__storeCfg:StoreConfig = cfg
+        self.__catalog:Optional["CatalogIndex"] = catalog
 
 
-    # -- Metodos abstractos -- #
-    @abstractmethod
+    # -- Propiedades -- #
+    @property
+    def Site(self) -> str:
+        """
+        Devuelve el identificador de la web.
+
+        Returns:
+            str: Identificador de la web.
+        """
+        return self.__site
+
+    @property
+    def Store(self) -> Optional["AnimeStore"]:
+        """
+        Devuelve el almacén local de resultados.
+
+        Returns:
+            Optional[AnimeStore]: Almacén local o `None` si no se usa.
+        """
+        return self.__store
+
+    @property
+    def Catalog(self) -> Optional["CatalogIndex"]:
+        """
+        Devuelve el catálogo local de títulos.
+
+        Returns:
+            Optional[CatalogIndex]: Catálogo local o `None` si no se usa.
+        """
+        return self.__catalog
+
+
+    # -- Métodos -- #
     def find_animes(self, name:str) -> List[Tuple[str, str]]:
         """
         Busca los animes disponibles a partir de un nombre dado. Devuelve un listado con tuplas.
@@ -121,9 +476,79 @@ class AnimeManager:
         Returns:
             List[Tuple[str,str]]: El listado con la información encontrada.
         """
-        pass
+        with operation(site=self.__site, operation="find_animes"):
+            # Responde desde el catálogo local si contiene la web.
+            if self.__catalog is not None and self.__catalog.has_site(site=self.__site):
+                count_cache(layer="catalog", result="hit")
+                return self.__catalog.search(name=name, site=self.__site)
+
+            # Obtiene la primera página de resultados.
+            return self.__search_page(url=self._search_url(name=name))
+
+    def find_lazy_animes(self, name:str) -> List[LazyAnime]:
+        """
+        Igual que `find_animes`, pero devuelve animes cuya página solo se descarga la primera
+        vez que se lee su descripción, sus temas o sus episodios.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+
+        Returns:
+            List[LazyAnime]: Los animes encontrados.
+        """
+        return [LazyAnime(name=title, url=url, loader=self.load_anime) for title, url in self.find_animes(name=name)]
+
+    def iter_animes(self, name:str, max_pages:Optional[int]=None) -> Iterator[Tuple[str, str]]:
+        """
+        Recorre todas las páginas de resultados de una búsqueda de forma perezosa. Mientras
+        se consumen los resultados de una página, la siguiente se descarga en segundo plano;
+        si se deja de iterar, las páginas restantes no se llegan a pedir.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+            max_pages (Optional[int]): Número máximo de páginas a recorrer. Si es `None` se
+                recorren hasta que una página no aporta resultados nuevos.
+
+        Yields:
+            Tuple[str, str]: Nombre y URL de cada anime encontrado.
+        """
+        # Variables.
+        seen:Set[str] = set()
+        page:int = 1
+        executor:ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        future:Optional[Future] = executor.submit(copy_context().run, self.__iter_page, self._page_url(name=name, page=page))
+
+        try:
+            while future is not None:
+                # Espera la página actual. Una página inexistente marca el final de la búsqueda.
+                try:
+                    results:List[Tuple[str, str]] = future.result()
+                except NetworkBadResponseError as ex:
+                    if page > 1 and ex.StatusCode == 404:
+                        return
+                    raise
+
+                # Descarta los resultados repetidos. Si no queda ninguno no hay más páginas.
+                results = [result for result in results if result[1] not in seen]
+                if not results:
+                    return
+
+                # Pide la siguiente página antes de entregar los resultados de la actual.
+                page += 1
+                future = None
+                if max_pages is None or page <= max_pages:
+                    future = executor.submit(copy_context().run, self.__iter_page, self._page_url(name=name, page=page))
+
+                # Entrega los resultados.
+                for result in results:
+                    seen.add(result[1])
+                    yield result
+        finally:
+            # Cancela la descarga pendiente si el consumidor deja de iterar.
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
 
-    @abstractmethod
     def load_anime(self, url:str) -> Anime:
         """
         A partir de la URL de la página inicial de un Anime. Carga todos los datos del mismo.
@@ -131,6 +556,477 @@ class AnimeManager:
         Args:
             url (str): URL de la página inicial del Anime.
         
+        Returns:
+            Anime: Instancia con la información del Anime.
+        """
+        with operation(site=self.__site, operation="load_anime"):
+            # Comprueba si el anime está almacenado.
+            anime:Optional[Anime] = self.__stored_anime(url=url)
+            if anime is None:
+                # Obtiene el HTML y extrae el anime.
+                html:HtmlDocument = get_html(url=url, subtrees=self._anime_subtrees, until=self._anime_until)
+                anime = self.__save_anime(url=url, anime=self.__extract(parse=self._parse_anime, html=html))
+
+            # Retorna el anime.
+            return anime
+
+    def load_animes(self, urls:Iterable[str], concurrency:int=8, return_exceptions:bool=False,
+                    ordered:bool=False) -> Iterator[Tuple[str, Union[Anime, Exception]]]:
+        """
+        Carga varios animes a la vez, con como mucho `concurrency` cargas en vuelo, y los
+        entrega según terminan (o en el orden de `urls` con `ordered`). Las URLs se leen de
+        forma perezosa, por lo que `urls` puede ser un generador; si se deja de iterar, las
+        cargas pendientes se cancelan.
+
+        Args:
+            urls (Iterable[str]): URLs de las páginas iniciales de los animes.
+            concurrency (int): Número máximo de cargas simultáneas.
+            return_exceptions (bool): Si es `True`, el error de una carga se entrega en lugar
+                del anime; si es `False`, se propaga e interrumpe la iteración.
+            ordered (bool): Si es `True`, los animes se entregan en el orden de `urls` (una
+                carga lenta retrasa la entrega de las siguientes, pero no su carga).
+
+        Yields:
+            Tuple[str, Union[Anime, Exception]]: URL y anime (o error) de cada carga.
+        """
+        # Variables.
+        iterator:Iterator[str] = iter(urls)
+        pending:Dict[Future, str] = {}
+        executor:ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+
+        try:
+            while True:
+                # Mantiene el número de cargas en vuelo.
+                while len(pending) < max(1, concurrency):
+                    url:Optional[str] = next(iterator, None)
+                    if url is None:
+                        break
+                    pending[executor.submit(copy_context().run, self.load_anime, url)] = url
+                if not pending:
+                    return
+
+                # Entrega las cargas terminadas (con `ordered`, solo la más antigua).
+                if ordered:
+                    done, _ = wait([next(iter(pending))])
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    try:
+                        anime:Anime = future.result()
+                    except Exception as ex:
+                        if not return_exceptions:
+                            raise
+                        yield url, ex
+                    else:
+                        yield url, anime
+        finally:
+            # Cancela las cargas pendientes si el consumidor deja de iterar.
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    async def async_find_animes(self, name:str) -> List[Tuple[str, str]]:
+        """
+        Versión asíncrona de `find_animes`.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+
+        Returns:
+            List[Tuple[str,str]]: El listado con la información encontrada.
+        """
+        with operation(site=self.__site, operation="find_animes"):
+            # Responde desde el catálogo local si contiene la web.
+            if self.__catalog is not None and self.__catalog.has_site(site=self.__site):
+                count_cache(layer="catalog", result="hit")
+                return self.__catalog.search(name=name, site=self.__site)
+
+            # Comprueba si la búsqueda está almacenada.
+            url:str = self._search_url(name=name)
+            results:Optional[List[Tuple[str, str]]] = self.__stored_search(url=url)
+            if results is None:
+                # Obtiene el HTML y extrae los resultados.
+                html:HtmlDocument = await async_get_html(url=url, subtrees=self._search_subtrees)
+                results = self.__save_search(url=url, results=self.__extract(parse=self._parse_animes, html=html))
+
+            # Retorna el resultado.
+            return results
+
+    async def async_load_anime(self, url:str) -> Anime:
+        """
+        Versión asíncrona de `load_anime`.
+
+        Args:
+            url (str): URL de la página inicial del Anime.
+        
+        Returns:
+            Anime: Instancia con la información del Anime.
+        """
+        with operation(site=self.__site, operation="load_anime"):
+            # Comprueba si el anime está almacenado.
+            anime:Optional[Anime] = self.__stored_anime(url=url)
+            if anime is None:
+                # Obtiene el HTML y extrae el anime.
+                html:HtmlDocument = await async_get_html(url=url, subtrees=self._anime_subtrees, until=self._anime_until)
+                anime = self.__save_anime(url=url, anime=self.__extract(parse=self._parse_anime, html=html))
+
+            # Retorna el anime.
+            return anime
+
+    async def async_poll_anime(self, url:str, validators:Optional[Dict[str, str]]=None) -> Tuple[Optional[Anime], Dict[str, str]]:
+        """
+        Comprueba si la página de un anime ha cambiado con una petición condicional (sin
+        consultar el almacén ni la caché HTTP). Si ha cambiado, carga el anime y actualiza el
+        almacén.
+
+        Args:
+            url (str): URL de la página inicial del Anime.
+            validators (Optional[Dict[str, str]]): Validadores de la última comprobación.
+
+        Returns:
+            Tuple[Optional[Anime], Dict[str, str]]: El anime (`None` si la página no ha
+                cambiado, 304) y los validadores para la siguiente comprobación.
+        """
+        with operation(site=self.__site, operation="poll_anime"):
+            # Hace la petición condicional.
+            response = await async_get_conditional(url=url, validators=validators, until=self._anime_until)
+            if response.status_code == 304:
+                return None, dict(validators or {})
+
+            # Extrae el anime.
+            start:float = perf_counter()
+            html:HtmlDocument = parse_html(response.text, subtrees=self._anime_subtrees)
+            observe_phase("parse", perf_counter() - start, url=url)
+            anime:Anime = self.__save_anime(url=url, anime=self.__extract(parse=self._parse_anime, html=html))
+
+            # Retorna el anime y los nuevos validadores.
+            return anime, validators_of(headers=response.headers)
+
+    async def async_load_animes(self, urls:Iterable[str], concurrency:int=8, return_exceptions:bool=False,
+                                ordered:bool=False) -> AsyncIterator[Tuple[str, Union[Anime, Exception]]]:
+        """
+        Versión asíncrona de `load_animes`.
+
+        Args:
+            urls (Iterable[str]): URLs de las páginas iniciales de los animes.
+            concurrency (int): Número máximo de cargas simultáneas.
+            return_exceptions (bool): Si es `True`, el error de una carga se entrega en lugar
+                del anime; si es `False`, se propaga e interrumpe la iteración.
+            ordered (bool): Si es `True`, los animes se entregan en el orden de `urls`.
+
+        Yields:
+            Tuple[str, Union[Anime, Exception]]: URL y anime (o error) de cada carga.
+        """
+        # Variables.
+        iterator:Iterator[str] = iter(urls)
+        pending:Dict[Task, str] = {}
+
+        try:
+            while True:
+                # Mantiene el número de cargas en vuelo.
+                while len(pending) < max(1, concurrency):
+                    url:Optional[str] = next(iterator, None)
+                    if url is None:
+                        break
+                    pending[create_task(self.async_load_anime(url))] = url
+                if not pending:
+                    return
+
+                # Entrega las cargas terminadas (con `ordered`, solo la más antigua).
+                if ordered:
+                    done, _ = await async_wait([next(iter(pending))])
+                else:
+                    done, _ = await async_wait(pending, return_when=FIRST_COMPLETED)
+                for task in done:
+                    url = pending.pop(task)
+                    try:
+                        anime:Anime = task.result()
+                    except Exception as ex:
+                        if not return_exceptions:
+                            raise
+                        yield url, ex
+                    else:
+                        yield url, anime
+        finally:
+            # Cancela las cargas pendientes si el consumidor deja de iterar.
+            for task in pending:
+                task.cancel()
+
+    def resolve_episode(self, episode:Episode) -> str:
+        """
+        Obtiene la URL del fichero de vídeo de un episodio a partir de su página (siguiendo
+        los reproductores enlazados, ver `resolve_link`).
+
+        Args:
+            episode (Episode): Episodio a resolver.
+
+        Raises:
+            EpisodeSourceError: Si la página no lleva a ningún fichero de vídeo.
+
+        Returns:
+            str: URL del fichero de vídeo.
+        """
+        try:
+            return self.resolve_link(url=episode.Url)[0]
+        except EpisodeSourceError:
+            raise EpisodeSourceError(f"No video source found for episode {episode.Number} ({episode.Url}).") from None
+
+    def resolve_link(self, url:str, hops:int=ResolverConfig.max_hops) -> Tuple[str, str]:
+        """
+        Busca el fichero de vídeo al que lleva una página: si la página no enlaza ninguno
+        (`_parse_sources`), se siguen en orden las páginas que incrusta (`_parse_embeds`, por
+        ejemplo la lista de servidores y el reproductor) hasta `hops` saltos.
+
+        Args:
+            url (str): URL de la página (la del episodio o una intermedia).
+            hops (int): Saltos que aún se pueden dar desde la página (0 = solo la página).
+
+        Raises:
+            EpisodeSourceError: Si no se encuentra ningún fichero de vídeo.
+
+        Returns:
+            Tuple[str, str]: URL del fichero de vídeo y de la página que lo enlaza (el último
+                salto, que es el único que hay que repetir cuando la URL caduca).
+        """
+        # Obtiene el HTML y busca los ficheros enlazados.
+        html:HtmlDocument = get_html(url=url)
+        sources:List[str] = self._parse_sources(html=html, url=url)
+        if sources:
+            return sources[0], url
+
+        # Sigue las páginas incrustadas.
+        if hops > 0:
+            for embed in self._parse_embeds(html=html, url=url):
+                try:
+                    return self.resolve_link(url=embed, hops=hops - 1)
+                except (EpisodeSourceError, NetworkBadResponseError):
+                    continue
+        raise EpisodeSourceError(f"No video source found in {url}.")
+
+
+    # -- Métodos privados -- #
+    def __search_page(self, url:str) -> List[Tuple[str, str]]:
+        """
+        Obtiene los resultados de una página de búsqueda, desde el almacén si es posible.
+
+        Args:
+            url (str): URL de la página de búsqueda.
+
+        Returns:
+            List[Tuple[str, str]]: El listado con la información encontrada.
+        """
+        # Comprueba si la búsqueda está almacenada.
+        results:Optional[List[Tuple[str, str]]] = self.__stored_search(url=url)
+        if results is None:
+            # Obtiene el HTML y extrae los resultados.
+            html:HtmlDocument = get_html(url=url, subtrees=self._search_subtrees)
+            results = self.__save_search(url=url, results=self.__extract(parse=self._parse_animes, html=html))
+
+        # Retorna el resultado.
+        return results
+
+    def __iter_page(self, url:str) -> List[Tuple[str, str]]:
+        """
+        Obtiene una página de resultados de `iter_animes` (en el hilo de descarga anticipada).
+
+        Args:
+            url (str): URL de la página de búsqueda.
+
+        Returns:
+            List[Tuple[str, str]]: El listado con la información encontrada.
+        """
+        with operation(site=self.__site, operation="iter_animes"):
+            return self.__search_page(url=url)
+
+    def __extract(self, parse:Callable[..., T], html:HtmlDocument) -> T:
+        """
+        Extrae la información de un HTML midiendo la duración de la extracción.
+
+        Args:
+            parse (Callable[..., T]): Método de extracción (`_parse_animes` o `_parse_anime`).
+            html (HtmlDocument): HTML de la página.
+
+        Returns:
+            T: La información extraída.
+        """
+        start:float = perf_counter()
+        try:
+            return parse(html=html)
+        finally:
+            observe_phase("extract", perf_counter() - start)
+
+    def __stored_search(self, url:str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Obtiene una búsqueda del almacén si existe y es vigente.
+
+        Args:
+            url (str): URL de la búsqueda.
+
+        Returns:
+            Optional[List[Tuple[str, str]]]: El listado o `None`.
+        """
+        if self.__store is None:
+            return None
+        results:Optional[List[Tuple[str, str]]] = self.__store.get_search(site=self.__site, url=url, max_age=self.__storeCfg.search_max_age)
+        count_cache(layer="store", result="hit" if results is not None else "miss")
+        return results
+
+    def __save_search(self, url:str, results:List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Guarda una búsqueda en el almacén (si existe) y la devuelve.
+
+        Args:
+            url (str): URL de la búsqueda.
+            results (List[Tuple[str, str]]): Listado obtenido.
+
+        Returns:
+            List[Tuple[str, str]]: El mismo listado.
+        """
+        if self.__store is not None:
+            self.__store.put_search(site=self.__site, url=url, results=results)
+        return results
+
+    def __stored_anime(self, url:str) -> Optional[Anime]:
+        """
+        Obtiene un anime del almacén si existe y es vigente.
+
+        Args:
+            url (str): URL de la página inicial del Anime.
+
+        Returns:
+            Optional[Anime]: El anime o `None`.
+        """
+        if self.__store is None:
+            return None
+        anime:Optional[Anime] = self.__store.get_anime(site=self.__site, url=url, max_age=self.__storeCfg.anime_max_age)
+        count_cache(layer="store", result="hit" if anime is not None else "miss")
+        return anime
+
+    def __save_anime(self, url:str, anime:Anime) -> Anime:
+        """
+        Guarda un anime en el almacén (si existe) y lo devuelve.
+
+        Args:
+            url (str): URL de la página inicial del Anime.
+            anime (Anime): Anime cargado.
+
+        Returns:
+            Anime: El mismo anime.
+        """
+        if self.__store is not None:
+            self.__store.put_anime(site=self.__site, url=url, anime=anime)
+        return anime
+
+
+    # -- Métodos sobrescribibles -- #
+    def _page_url(self, name:str, page:int) -> str:
+        """
+        Genera la URL de una página concreta de resultados. Por defecto añade el parámetro
+        `_page_param` a la URL de búsqueda.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+            page (int): Número de página (empezando en 1).
+
+        Returns:
+            str: La URL de la página.
+        """
+        url:str = self._search_url(name=name)
+        return url if page == 1 else f"{url}&{self._page_param}={page}"
+
+    def _parse_sources(self, html:HtmlDocument, url:str) -> List[str]:
+        """
+        Extrae las URLs de los ficheros de vídeo de la página de un episodio. Por defecto
+        devuelve las fuentes de las etiquetas `video` y los enlaces a ficheros con extensión
+        de vídeo (`MEDIA_EXTENSIONS`).
+
+        Args:
+            html (HtmlDocument): HTML de la página del episodio.
+            url (str): URL de la página del episodio (para resolver enlaces relativos).
+
+        Returns:
+            List[str]: URLs encontradas, en orden de aparición.
+        """
+        # Variable a devolver.
+        sources:List[str] = []
+
+        # Recorre las fuentes de vídeo y los enlaces.
+        for node in html.select("video[src], video source[src], a[href]"):
+            link:Optional[str] = node.get("src") or node.get("href")
+            if not link or not link.split("?")[0].lower().endswith(MEDIA_EXTENSIONS):
+                continue
+            link = urljoin(url, link)
+            if link not in sources:
+                sources.append(link)
+
+        # Retorna las URLs.
+        return sources
+
+    def _parse_embeds(self, html:HtmlDocument, url:str) -> List[str]:
+        """
+        Extrae las URLs de las páginas que incrusta una página (reproductores o listas de
+        servidores) y que `resolve_link` sigue si la página no enlaza ningún fichero de vídeo.
+        Por defecto devuelve los `iframe` de la página.
+
+        Args:
+            html (HtmlDocument): HTML de la página.
+            url (str): URL de la página (para resolver enlaces relativos).
+
+        Returns:
+            List[str]: URLs encontradas, en orden de aparición.
+        """
+        # Variable a devolver.
+        embeds:List[str] = []
+
+        # Recorre los iframes.
+        for node in html.select("iframe[src]"):
+            link:Optional[str] = node.get("src")
+            if not link or link.startswith(("about:", "javascript:")):
+                continue
+            link = urljoin(url, link)
+            if link not in embeds and link != url:
+                embeds.append(link)
+
+        # Retorna las URLs.
+        return embeds
+
+
+    # -- Metodos abstractos -- #
+    @abstractmethod
+    def _search_url(self, name:str) -> str:
+        """
+        Genera la URL de búsqueda para el nombre dado.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+
+        Returns:
+            str: La URL de búsqueda.
+        """
+        pass
+
+    @abstractmethod
+    def _parse_animes(self, html:HtmlDocument) -> List[Tuple[str, str]]:
+        """
+        Extrae los resultados de una página de búsqueda.
+
+        Args:
+            html (HtmlDocument): HTML de la página de búsqueda.
+
+        Returns:
+            List[Tuple[str,str]]: El listado con la información encontrada.
+        """
+        pass
+
+    @abstractmethod
+    def _parse_anime(self, html:HtmlDocument) -> Anime:
+        """
+        Extrae la información de la página inicial de un Anime.
+
+        Args:
+            html (HtmlDocument): HTML de la página inicial del Anime.
+        
         Returns:
             Anime: Instancia con la información del Anime.
         """
@@ -1,12 +1,20 @@
 # ---- MÓDULOS ---- #
-from typing import List, Tuple
+import re
 
-from lib.config.schema import AnimeFenixConfig
+from typing import List, Optional, Set, Tuple
+from urllib.parse import urlparse
 
-from lib.core.anime import Anime, AnimeManager
+from lib.config.schema import AnimeFenixConfig, AnimeFenixSchema
+from lib.core.store import AnimeStore
+from lib.core.catalog import CatalogIndex
+
+from lib.core.anime import Anime, AnimeManager, Episode
 from lib.core.anime import query_from_name
 
-from lib.common.network import get_html, url_join
+from lib.common.mirrors import register_mirrors
+from lib.common.network import url_join
+from lib.common.extract import Extractor
+from lib.common.parser import HtmlDocument
 from lib.common.types.string import clear_str
 
 from dataclasses import field
@@ -22,37 +30,43 @@ class AnimeFenixManager(AnimeManager):
     """
     # -- Propiedades -- #
     __cfg:AnimeFenixConfig = field(init=False, repr=False)
+    _search_subtrees:List[Tuple[str, str]] = [("ul", "grid-animes")]
+    _anime_subtrees:List[Tuple[str, Optional[str]]] = [("h1", "text-orange-500"), ("div", "mb-6"), ("a", None)]
+    _anime_until:Tuple[str, ...] = AnimeFenixSchema.anime_until
+    _search_schema:Extractor = Extractor(fields=AnimeFenixSchema.search, item=AnimeFenixSchema.search_item)
+    _anime_schema:Extractor = Extractor(fields=AnimeFenixSchema.anime)
 
 
     # -- Métodos por defecto -- #
-    def __init__(self, cfg:AnimeFenixConfig=AnimeFenixConfig()):
+    def __init__(self, cfg:AnimeFenixConfig=AnimeFenixConfig(), store:Optional[AnimeStore]=None, catalog:Optional[CatalogIndex]=None):
         """
         Inicializa la instancia.
 
         Args:
             cfg (AnimeFenixConfig): Configuración de AnimeFlv.
+            store (Optional[AnimeStore]): Almacén local de resultados.
+            catalog (Optional[CatalogIndex]): Catálogo local de títulos.
         """
         # Inicializa las propiedades.
+        super().__init__(site=cfg.name, store=store, catalog=catalog)
         self.__cfg = cfg
+
+        # Registra los mirrors de la web (las peticiones se envían al más rápido).
+        if cfg.mirrors:
+            register_mirrors(canonical=cfg.base_url, mirrors=cfg.mirrors)
     
 
     # -- Métodos de AnimeManager -- #
-    def find_animes(self, name) -> List[Tuple[str, str]]:
+    def _search_url(self, name:str) -> str:
         """
-        Busca los animes disponibles a partir de un nombre dado. Devuelve un listado con tuplas.
-            Cada tupla esta formada por:
-            - index 0 = Nombre del anime.
-            - index 1 = URL del anime.
+        Genera la URL de búsqueda para el nombre dado.
 
         Args:
             name (str): El nombre del anime a buscar.
 
         Returns:
-            List[Tuple[str,str]]: El listado con la información encontrada.
+            str: La URL de búsqueda.
         """
-        # Variable a devolver.
-        results:List[Tuple[str, str]] = []
-
         # Preprocesa el nombre.
         name = clear_str(value=name).lower()        # Limpia el nombre y lo pone en minúsculas.
 
@@ -60,57 +74,66 @@ class AnimeFenixManager(AnimeManager):
         query = query_from_name(name=name)
 
         # Genera la URL para la query.
-        url:str = self.__cfg.query_url + query
-
-        # Obtiene el HTML.
-        html = get_html(url=url)
-
-        # Obtiene los componentes donde esta la información de los animes.
-        anime_comp_list = html.select("ul.grid-animes li")
-        # Para cada componente encontrado.
-        for anime_comp in anime_comp_list:
-            # Obtiene el nombre y la URL base.
-            comp = anime_comp.select("article a p")
-            title:str = comp[len(comp)-1].text                              # El último <p> es el título.
-            base_url:str = anime_comp.select_one("article a")["href"]
-
-            # Añade la tupla a la lista.
-            results.append((title, url_join(self.__cfg.base_url, base_url)))
-    
-        # Retorna el resultado.
-        return results
+        return self.__cfg.query_url + query
 
-    def load_anime(self, url:str):
+    def _parse_animes(self, html:HtmlDocument) -> List[Tuple[str, str]]:
         """
-        A partir de la URL de la página inicial de un Anime. Carga todos los datos del mismo.
+        Extrae los resultados de una página de búsqueda. Devuelve un listado con tuplas.
+            Cada tupla esta formada por:
+            - index 0 = Nombre del anime.
+            - index 1 = URL del anime.
 
         Args:
-            url (str): URL de la página inicial del Anime.
+            html (HtmlDocument): HTML de la página de búsqueda.
+
+        Returns:
+            List[Tuple[str,str]]: El listado con la información encontrada.
+        """
+        # Extrae los resultados en un único recorrido (el título es el último <p> de cada
+        # resultado) y genera la URL absoluta de cada uno.
+        return [(item["name"], url_join(self.__cfg.base_url, item["url"]))
+                for item in self._search_schema.extract_items(html=html) if item["name"] is not None and item["url"]]
+
+    def _parse_anime(self, html:HtmlDocument) -> Anime:
+        """
+        Extrae la información de la página inicial de un Anime.
+
+        Args:
+            html (HtmlDocument): HTML de la página inicial del Anime.
         
         Returns:
             Anime: Instancia con la información del Anime.
         """
-        # Variable a devolver.
-        anime:Anime = None
+        # Extrae todos los campos en un único recorrido.
+        fields:dict = self._anime_schema.extract(html=html)
 
-        # Obtiene el HTML.
-        html = get_html(url=url)
+        # Crea el anime con los datos.
+        return Anime(name=fields["name"], description=fields["description"],
+                     themes=[clear_str(theme) for theme in fields["themes"]], episodes=self._parse_episodes(links=fields["episodes"]))
 
-        # Obtiene el nombre del anime.
-        title:str = html.select_one("h1.text-orange-500").text
+    def _parse_episodes(self, links:List[str]) -> List[Episode]:
+        """
+        Extrae los episodios de la página inicial de un Anime: los enlaces que apuntan a
+        `watch_url` y terminan en `-número`.
 
-        # Obtiene la descripción del anime.
-        description:str = html.select_one("div.mb-6 p.text-gray-300").text
+        Args:
+            links (List[str]): Enlaces a páginas de episodios de la página.
 
-        # Obtiene los temas del anime.
-        themes:List[str] = []           # Genera el listado inicial.
-        theme_comp_list = html.select("div.mb-6 div a.duration-300")
-        # Para cada componente encontrado.
-        for theme_comp in theme_comp_list:
-            themes.append(clear_str(theme_comp.text))  # Añade el tema.
-        
-        # Crea el anime con los datos.
-        anime = Anime(name=title, description=description, themes=themes)
-        
-        # Retorna el anime.
-        return anime
\ No newline at end of file
+        Returns:
+            List[Episode]: Listado con los episodios encontrados.
+        """
+        # Variables.
+        episodes:List[Episode] = []
+        seen:Set[int] = set()
+        watch_path:str = urlparse(self.__cfg.watch_url).path.rstrip("/") + "/"
+
+        # Recorre los enlaces a episodios.
+        for link in links:
+            number = re.search(r"-(\d+)/?$", link) if watch_path in link else None
+            if number is None or int(number.group(1)) in seen:
+                continue
+            seen.add(int(number.group(1)))
+            episodes.append(Episode(number=int(number.group(1)), url=url_join(self.__cfg.base_url, urlparse(link).path)))
+
+        # Retorna los episodios.
+        return episodes
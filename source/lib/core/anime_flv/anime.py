@@ -1,12 +1,20 @@
 # ---- MÓDULOS ---- #
-from typing import List, Tuple
+import re
+import json
 
-from lib.config.schema import AnimeFlvConfig
+from typing import List, Optional, Tuple
 
-from lib.core.anime import Anime, AnimeManager
+from lib.config.schema import AnimeFlvConfig, AnimeFlvSchema
+from lib.core.store import AnimeStore
+from lib.core.catalog import CatalogIndex
+
+from lib.core.anime import Anime, AnimeManager, Episode
 from lib.core.anime import query_from_name
 
-from lib.common.network import get_html, url_join
+from lib.common.mirrors import register_mirrors
+from lib.common.network import url_join
+from lib.common.extract import Extractor
+from lib.common.parser import HtmlDocument
 from lib.common.types.string import clear_str
 
 from dataclasses import field
@@ -22,37 +30,43 @@ class AnimeFlvManager(AnimeManager):
     """
     # -- Propiedades -- #
     __cfg:AnimeFlvConfig = field(init=False, repr=False)
+    _search_subtrees:List[Tuple[str, str]] = [("ul", "ListAnimes")]
+    _anime_subtrees:List[Tuple[str, Optional[str]]] = [("h1", "Title"), ("div", "Description"), ("nav", "Nvgnrs"), ("script", None)]
+    _anime_until:Tuple[str, ...] = AnimeFlvSchema.anime_until
+    _search_schema:Extractor = Extractor(fields=AnimeFlvSchema.search, item=AnimeFlvSchema.search_item)
+    _anime_schema:Extractor = Extractor(fields=AnimeFlvSchema.anime)
 
 
     # -- Métodos por defecto -- #
-    def __init__(self, cfg:AnimeFlvConfig=AnimeFlvConfig()):
+    def __init__(self, cfg:AnimeFlvConfig=AnimeFlvConfig(), store:Optional[AnimeStore]=None, catalog:Optional[CatalogIndex]=None):
         """
         Inicializa la instancia.
 
         Args:
             cfg (AnimeFlvConfig): Configuración de AnimeFlv.
+            store (Optional[AnimeStore]): Almacén local de resultados.
+            catalog (Optional[CatalogIndex]): Catálogo local de títulos.
         """
         # Inicializa las propiedades.
+        super().__init__(site=cfg.name, store=store, catalog=catalog)
         self.__cfg = cfg
+
+        # Registra los mirrors de la web (las peticiones se envían al más rápido).
+        if cfg.mirrors:
+            register_mirrors(canonical=cfg.base_url, mirrors=cfg.mirrors)
     
 
     # -- Métodos de AnimeManager -- #
-    def find_animes(self, name) -> List[Tuple[str, str]]:
+    def _search_url(self, name:str) -> str:
         """
-        Busca los animes disponibles a partir de un nombre dado. Devuelve un listado con tuplas.
-            Cada tupla esta formada por:
-            - index 0 = Nombre del anime.
-            - index 1 = URL del anime.
+        Genera la URL de búsqueda para el nombre dado.
 
         Args:
             name (str): El nombre del anime a buscar.
 
         Returns:
-            List[Tuple[str,str]]: El listado con la información encontrada.
+            str: La URL de búsqueda.
         """
-        # Variable a devolver.
-        results:List[Tuple[str, str]] = []
-
         # Preprocesa el nombre.
         name = clear_str(value=name).lower()        # Limpia el nombre y lo pone en minúsculas.
 
@@ -60,56 +74,69 @@ class AnimeFlvManager(AnimeManager):
         query = query_from_name(name=name)
 
         # Genera la URL para la query.
-        url:str = self.__cfg.query_url + query
-
-        # Obtiene el HTML.
-        html = get_html(url=url)
-
-        # Obtiene los componentes donde esta la información de los animes.
-        anime_comp_list = html.select("ul.ListAnimes li")
-        # Para cada componente encontrado.
-        for anime_comp in anime_comp_list:
-            # Obtiene el nombre y la URL base.
-            title:str = anime_comp.select_one("h3.Title").text
-            base_url:str = anime_comp.select_one("article.Anime a")["href"]
-            
-            # Añade la tupla a la lista.
-            results.append((title, url_join(self.__cfg.base_url, base_url)))
-    
-        # Retorna el resultado.
-        return results
+        return self.__cfg.query_url + query
+
+    def _parse_animes(self, html:HtmlDocument) -> List[Tuple[str, str]]:
+        """
+        Extrae los resultados de una página de búsqueda. Devuelve un listado con tuplas.
+            Cada tupla esta formada por:
+            - index 0 = Nombre del anime.
+            - index 1 = URL del anime.
+
+        Args:
+            html (HtmlDocument): HTML de la página de búsqueda.
+
+        Returns:
+            List[Tuple[str,str]]: El listado con la información encontrada.
+        """
+        # Extrae los resultados en un único recorrido y genera la URL absoluta de cada uno.
+        return [(item["name"], url_join(self.__cfg.base_url, item["url"]))
+                for item in self._search_schema.extract_items(html=html) if item["name"] is not None and item["url"]]
 
-    def load_anime(self, url:str):
+    def _parse_anime(self, html:HtmlDocument) -> Anime:
         """
-        A partir de la URL de la página inicial de un Anime. Carga todos los datos del mismo.
+        Extrae la información de la página inicial de un Anime.
 
         Args:
-            url (str): URL de la página inicial del Anime.
+            html (HtmlDocument): HTML de la página inicial del Anime.
         
         Returns:
             Anime: Instancia con la información del Anime.
         """
-        # Variable a devolver.
-        anime = None
+        # Extrae todos los campos en un único recorrido.
+        fields:dict = self._anime_schema.extract(html=html)
 
-        # Obtiene el HTML.
-        html = get_html(url=url)
+        # Crea el anime con los datos.
+        return Anime(name=fields["name"], description=fields["description"], themes=fields["themes"],
+                     episodes=self._parse_episodes(scripts=fields["scripts"]))
 
-        # Obtiene el nombre del anime.
-        title:str = html.select_one("h1.Title").text
+    def _parse_episodes(self, scripts:List[str]) -> List[Episode]:
+        """
+        Extrae los episodios de la página inicial de un Anime. AnimeFlv no los incluye en el
+        HTML sino en un script (`var anime_info = [id, título, slug, ...]` y
+        `var episodes = [[número, id], ...]`); la URL de cada episodio es `watch_url/slug-número`.
 
-        # Obtiene la descripción del anime.
-        description:str = html.select_one("div.Description p").text
+        Args:
+            scripts (List[str]): Texto de los scripts de la página.
 
-        # Obtiene los temas del anime.
-        themes:List[str] = []               # Genera el listado inicial.
-        theme_comp_list = html.select("nav.Nvgnrs a")
-        # Para cada componente encontrado.
-        for theme_comp in theme_comp_list:
-            themes.append(theme_comp.text)  # Añade el tema.
-        
-        # Crea el anime con los datos.
-        anime = Anime(name=title, description=description, themes=themes)
-        
-        # Retorna el anime.
-        return anime
\ No newline at end of file
+        Returns:
+            List[Episode]: Listado con los episodios encontrados.
+        """
+        # Variable a devolver.
+        episodes:List[Episode] = []
+
+        # Busca el script con la información de los episodios.
+        for script in scripts:
+            info = re.search(r"var\s+anime_info\s*=\s*(\[.*?\]);", script)
+            numbers = re.search(r"var\s+episodes\s*=\s*(\[.*?\]);", script)
+            if info is None or numbers is None:
+                continue
+
+            # Genera la URL de cada episodio.
+            slug:str = json.loads(info.group(1))[2]
+            for number, _ in json.loads(numbers.group(1)):
+                episodes.append(Episode(number=int(number), url=url_join(self.__cfg.watch_url, f"{slug}-{number}")))
+            break
+
+        # Retorna los episodios.
+        return episodes
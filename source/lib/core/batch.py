@@ -0,0 +1,187 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: batch.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-23
+# · Descripción: Módulo con el procesado por lotes: cada línea de la entrada (un título o la
+# URL de un anime) pasa por `find_animes` → `load_anime` y produce un registro en cuanto
+# termina, con un número acotado de elementos en vuelo.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from contextvars import copy_context
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from lib.common.types.string import clear_str
+from lib.core.anime import Anime, AnimeManager
+from lib.core.sites import site_for_url
+
+
+# ---- CLASES ---- #
+class BatchRunner:
+    """
+    Procesa una secuencia de títulos o URLs de animes con como mucho `concurrency` elementos
+    en vuelo. Los registros se entregan según terminan (no en el orden de la entrada) con el
+    índice de su línea, y un elemento que falla produce un registro con el error en lugar de
+    interrumpir el lote. La entrada se lee a medida que quedan huecos libres, por lo que la
+    memoria no depende de su tamaño.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, managers:Dict[str, AnimeManager], concurrency:int=8):
+        """
+        Inicializa la instancia.
+
+        Args:
+            managers (Dict[str, AnimeManager]): Managers indexados por web. Los títulos se buscan
+                en las webs en este orden.
+            concurrency (int): Número máximo de elementos en vuelo.
+        """
+        # Inicializa las propiedades.
+        self.__managers:Dict[str, AnimeManager] = managers
+        self.__concurrency:int = max(1, concurrency)
+
+
+    # -- Métodos -- #
+    def run(self, items:Iterable[Tuple[int, str]]) -> Iterator[Dict]:
+        """
+        Procesa los elementos y entrega un registro por cada uno en cuanto termina.
+
+        Args:
+            items (Iterable[Tuple[int, str]]): Pares (índice, título o URL), por ejemplo de `read_items`.
+
+        Yields:
+            Dict: Registro del elemento (ver `process`).
+        """
+        # Variables.
+        iterator:Iterator[Tuple[int, str]] = iter(items)
+        pending:Dict[Future, Tuple[int, str]] = {}
+        executor:ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.__concurrency, thread_name_prefix="batch")
+
+        try:
+            while True:
+                # Lee la entrada solo mientras haya huecos libres.
+                while len(pending) < self.__concurrency:
+                    item:Optional[Tuple[int, str]] = next(iterator, None)
+                    if item is None:
+                        break
+                    pending[executor.submit(copy_context().run, self.process, *item)] = item
+                if not pending:
+                    return
+
+                # Entrega los elementos terminados.
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, text = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as ex:
+                        yield error_record(index=index, text=text, error=ex)
+        finally:
+            # Cancela los elementos pendientes si el consumidor deja de iterar.
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def process(self, index:int, text:str) -> Dict:
+        """
+        Procesa un elemento: si es una URL carga el anime de su web y si es un título lo busca
+        en las webs (en orden) y carga el resultado cuyo nombre coincide o, si no hay ninguno,
+        el primero.
+
+        Args:
+            index (int): Índice del elemento en la entrada.
+            text (str): Título o URL del anime.
+
+        Returns:
+            Dict: Registro con el anime (`anime_record`) o con el error (`error_record`).
+        """
+        try:
+            site, url = self.__locate(text=text)
+            anime:Anime = self.__managers[site].load_anime(url)
+            return {"index": index, "input": text, **anime_record(site=site, url=url, anime=anime)}
+        except Exception as ex:
+            return error_record(index=index, text=text, error=ex)
+
+
+    # -- Métodos privados -- #
+    def __locate(self, text:str) -> Tuple[str, str]:
+        """
+        Obtiene la web y la URL del anime de un elemento.
+
+        Args:
+            text (str): Título o URL del anime.
+
+        Raises:
+            LookupError: Si la URL no pertenece a ninguna web o el título no se encuentra.
+
+        Returns:
+            Tuple[str, str]: Web y URL del anime.
+        """
+        # Las URLs se cargan directamente.
+        if text.startswith(("http://", "https://")):
+            site:Optional[str] = site_for_url(url=text)
+            if site is None or site not in self.__managers:
+                raise LookupError(f"No site for URL {text}.")
+            return site, text
+
+        # Los títulos se buscan en cada web hasta encontrar resultados.
+        wanted:str = clear_str(text).casefold()
+        for site, manager in self.__managers.items():
+            results:List[Tuple[str, str]] = manager.find_animes(text)
+            if results:
+                for name, url in results:
+                    if clear_str(name).casefold() == wanted:
+                        return site, url
+                return site, results[0][1]
+        raise LookupError(f"No results for '{text}'.")
+
+
+# ---- FUNCIONES ---- #
+def read_items(file:TextIO) -> Iterator[Tuple[int, str]]:
+    """
+    Lee los elementos de un fichero de texto de forma perezosa (uno por línea, ignorando las
+    líneas vacías).
+
+    Args:
+        file (TextIO): Fichero o entrada estándar.
+
+    Yields:
+        Tuple[int, str]: Índice de la línea (desde 0) y su contenido sin espacios.
+    """
+    for index, line in enumerate(file):
+        line = line.strip()
+        if line:
+            yield index, line
+
+
+def anime_record(site:str, url:str, anime:Anime) -> Dict:
+    """
+    Genera el registro serializable de un anime.
+
+    Args:
+        site (str): Identificador de la web.
+        url (str): URL de la página inicial del anime.
+        anime (Anime): Anime cargado.
+
+    Returns:
+        Dict: Web, URL, nombre, descripción, temas y episodios del anime.
+    """
+    return {"site": site, "url": url, "name": anime.Name, "description": anime.Description, "themes": anime.Themes,
+            "episodes": [{"number": episode.Number, "url": episode.Url} for episode in anime.Episodes]}
+
+
+def error_record(index:int, text:str, error:BaseException) -> Dict:
+    """
+    Genera el registro de un elemento que ha fallado.
+
+    Args:
+        index (int): Índice del elemento en la entrada.
+        text (str): Título o URL del anime.
+        error (BaseException): Error producido.
+
+    Returns:
+        Dict: Índice, entrada, tipo y mensaje del error.
+    """
+    return {"index": index, "input": text, "error": type(error).__name__, "message": str(error)}
@@ -0,0 +1,476 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: catalog.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-11
+# · Descripción: Módulo con el catálogo local de animes construido a partir de los
+# directorios de cada web.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import json
+import mmap
+import struct
+import unicodedata
+
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+from array import array
+from bisect import bisect_left
+
+from lib.config.schema import CatalogConfig
+from lib.common.network import NetworkBadResponseError, get_html
+from lib.common.types.string import clear_str
+
+if TYPE_CHECKING:
+    from lib.core.anime import AnimeManager
+
+
+# ---- VARIABLES ---- #
+_MAGIC:bytes = b"ADCAT\x00\x00\x01"     # Identificador y versión del formato del índice.
+_HEADER:struct.Struct = struct.Struct("<8sIII")     # Magic, nº de entradas, nº de trigramas, tamaño de los postings.
+_ENTRY:struct.Struct = struct.Struct("<7I")         # Offsets/longitudes de web, título y URL + nº de trigramas.
+
+
+# ---- CLASES ---- #
+class CatalogIndex:
+    """
+    Índice invertido de trigramas sobre los títulos normalizados del catálogo. Cada entrada
+    guarda la web, el título y la URL del anime.
+
+    En disco se guarda en un formato binario de tablas de tamaño fijo (trigramas ordenados,
+    offsets de postings, postings y cadenas), de forma que `load` solo mapea el fichero en
+    memoria sin deserializar nada y las búsquedas leen directamente del mapa.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, entries:List[Tuple[str, str, str]], grams, offsets, postings, grams_count, mapped:Optional[mmap.mmap]=None):
+        """
+        Inicializa la instancia. Usar `build` o `load` para crear el índice.
+
+        Args:
+            entries (List[Tuple[str, str, str]]): Entradas (web, título, URL) o lector de entradas.
+            grams: Secuencia ordenada de trigramas codificados.
+            offsets: Offsets de los postings de cada trigrama (`len(grams) + 1` elementos).
+            postings: Identificadores de las entradas de cada trigrama.
+            grams_count: Número de trigramas de cada entrada.
+            mapped (Optional[mmap.mmap]): Fichero mapeado en memoria, si el índice viene de disco.
+        """
+        # Inicializa las propiedades.
+        self.__entries = entries
+        self.__grams = grams
+        self.__offsets = offsets
+        self.__postings = postings
+        self.__gramsCount = grams_count
+        self.__mapped:Optional[mmap.mmap] = mapped
+        self.__sites:Optional[Set[str]] = None
+
+    def __len__(self) -> int:
+        """
+        Devuelve el número de entradas del índice.
+
+        Returns:
+            int: Número de entradas.
+        """
+        return len(self.__gramsCount)
+
+
+    # -- Métodos de clase -- #
+    @classmethod
+    def build(cls, entries:List[Tuple[str, str, str]]) -> "CatalogIndex":
+        """
+        Construye el índice en memoria.
+
+        Args:
+            entries (List[Tuple[str, str, str]]): Entradas (web, título, URL).
+
+        Returns:
+            CatalogIndex: El índice construido.
+        """
+        # Agrupa las entradas de cada trigrama.
+        inverted:Dict[int, List[int]] = {}
+        grams_count:array = array("I")
+        for entry_id, (_, title, _) in enumerate(entries):
+            grams:Set[int] = title_grams(title=title)
+            grams_count.append(len(grams))
+            for gram in grams:
+                inverted.setdefault(gram, []).append(entry_id)
+
+        # Genera las tablas ordenadas.
+        sorted_grams:array = array("Q", sorted(inverted))
+        offsets:array = array("I", [0])
+        postings:array = array("I")
+        for gram in sorted_grams:
+            postings.extend(inverted[gram])
+            offsets.append(len(postings))
+
+        # Retorna el índice.
+        return cls(entries=list(entries), grams=sorted_grams, offsets=offsets, postings=postings, grams_count=grams_count)
+
+    @classmethod
+    def load(cls, path:str=CatalogConfig.index_path) -> "CatalogIndex":
+        """
+        Abre un índice guardado mapeándolo en memoria.
+
+        Args:
+            path (str): Ruta del índice.
+
+        Raises:
+            ValueError: Si el fichero no es un índice válido.
+
+        Returns:
+            CatalogIndex: El índice.
+        """
+        # Mapea el fichero.
+        with open(path, "rb") as file:
+            mapped:mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_entries, n_grams, n_postings = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC:
+            mapped.close()
+            raise ValueError(f"'{path}' is not a catalog index.")
+
+        # Genera las vistas de cada tabla sin copiar los datos.
+        view:memoryview = memoryview(mapped)
+        position:int = _HEADER.size
+        grams = view[position:position + 8 * n_grams].cast("Q")
+        position += 8 * n_grams
+        offsets = view[position:position + 4 * (n_grams + 1)].cast("I")
+        position += 4 * (n_grams + 1)
+        postings = view[position:position + 4 * n_postings].cast("I")
+        position += 4 * n_postings
+        entries = _MappedEntries(view=view[position:], count=n_entries)
+
+        # Retorna el índice.
+        return cls(entries=entries, grams=grams, offsets=offsets, postings=postings, grams_count=entries.GramsCount, mapped=mapped)
+
+
+    # -- Métodos -- #
+    def search(self, name:str, site:Optional[str]=None, limit:int=50, min_score:float=CatalogConfig.min_score) -> List[Tuple[str, str]]:
+        """
+        Busca los títulos más parecidos al nombre dado.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+            site (Optional[str]): Si se indica, solo se devuelven entradas de esa web.
+            limit (int): Número máximo de resultados.
+            min_score (float): Parte mínima (0-1) de los trigramas de la consulta que debe contener el título.
+
+        Returns:
+            List[Tuple[str, str]]: Títulos y URLs encontrados, del más al menos parecido.
+        """
+        # Cuenta los trigramas compartidos con cada entrada.
+        query_grams:Set[int] = title_grams(title=name)
+        hits:Dict[int, int] = {}
+        for gram in query_grams:
+            position:int = bisect_left(self.__grams, gram)
+            if position < len(self.__grams) and self.__grams[position] == gram:
+                for entry_id in self.__postings[self.__offsets[position]:self.__offsets[position + 1]]:
+                    hits[entry_id] = hits.get(entry_id, 0) + 1
+
+        # Calcula la similitud de cada entrada candidata: la parte de la consulta que aparece en
+        # el título y, para desempatar, el índice de Jaccard (penaliza títulos mucho más largos).
+        scored:List[Tuple[float, float, int]] = []
+        for entry_id, shared in hits.items():
+            coverage:float = shared / len(query_grams)
+            if coverage >= min_score:
+                scored.append((coverage, shared / (len(query_grams) + self.__gramsCount[entry_id] - shared), entry_id))
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+
+        # Genera el resultado.
+        results:List[Tuple[str, str]] = []
+        for _, _, entry_id in scored:
+            entry_site, title, url = self.__entries[entry_id]
+            if site is None or entry_site == site:
+                results.append((title, url))
+                if len(results) >= limit:
+                    break
+
+        # Retorna el resultado.
+        return results
+
+    def has_site(self, site:str) -> bool:
+        """
+        Indica si el índice contiene alguna entrada de la web dada.
+
+        Args:
+            site (str): Identificador de la web.
+
+        Returns:
+            bool: `True` si hay alguna entrada de la web.
+        """
+        # Calcula las webs del índice la primera vez.
+        if self.__sites is None:
+            self.__sites = {self.__entries[entry_id][0] for entry_id in range(len(self))}
+        return site in self.__sites
+
+    def save(self, path:str=CatalogConfig.index_path) -> None:
+        """
+        Guarda el índice en disco. El fichero se escribe aparte y se renombra al terminar para
+        que los procesos que lo tienen mapeado no vean un índice a medias.
+
+        Args:
+            path (str): Ruta del índice.
+        """
+        # Genera la tabla de entradas y el bloque de cadenas.
+        strings:bytearray = bytearray()
+        table:bytearray = bytearray()
+        for entry_id in range(len(self)):
+            fields:List[int] = []
+            for value in self.__entries[entry_id]:
+                encoded:bytes = value.encode("utf-8")
+                fields += [len(strings), len(encoded)]
+                strings += encoded
+            table += _ENTRY.pack(*fields, self.__gramsCount[entry_id])
+
+        # Escribe el fichero.
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, len(self), len(self.__grams), len(self.__postings)))
+            file.write(array("Q", self.__grams).tobytes())
+            file.write(array("I", self.__offsets).tobytes())
+            file.write(array("I", self.__postings).tobytes())
+            file.write(table)
+            file.write(strings)
+        os.replace(f"{path}.tmp", path)
+
+    def close(self) -> None:
+        """
+        Libera el fichero mapeado en memoria (si lo hay).
+        """
+        if self.__mapped is not None:
+            self.__grams = self.__offsets = self.__postings = self.__entries = self.__gramsCount = None
+            self.__mapped.close()
+            self.__mapped = None
+
+
+class _MappedEntries:
+    """
+    Lector de la tabla de entradas de un índice mapeado en memoria. Las cadenas solo se
+    decodifican cuando se accede a la entrada.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, view:memoryview, count:int):
+        """
+        Inicializa la instancia.
+
+        Args:
+            view (memoryview): Vista desde el inicio de la tabla de entradas.
+            count (int): Número de entradas.
+        """
+        # Inicializa las propiedades.
+        self.__table:memoryview = view[:count * _ENTRY.size]
+        self.__strings:memoryview = view[count * _ENTRY.size:]
+        self.__count:int = count
+
+    def __len__(self) -> int:
+        """
+        Devuelve el número de entradas.
+
+        Returns:
+            int: Número de entradas.
+        """
+        return self.__count
+
+    def __getitem__(self, entry_id:int) -> Tuple[str, str, str]:
+        """
+        Devuelve una entrada.
+
+        Args:
+            entry_id (int): Identificador de la entrada.
+
+        Returns:
+            Tuple[str, str, str]: Web, título y URL.
+        """
+        fields = _ENTRY.unpack_from(self.__table, entry_id * _ENTRY.size)
+        return tuple(bytes(self.__strings[fields[i]:fields[i] + fields[i + 1]]).decode("utf-8") for i in (0, 2, 4))
+
+
+    # -- Propiedades -- #
+    @property
+    def GramsCount(self) -> memoryview:
+        """
+        Devuelve el número de trigramas de cada entrada (última columna de la tabla).
+
+        Returns:
+            memoryview: Vista con un entero por entrada.
+        """
+        return self.__table.cast("I")[_ENTRY.size // 4 - 1::_ENTRY.size // 4]
+
+
+class CatalogCrawler:
+    """
+    Rastreador del directorio (`browse_url`) de una web. Recorre todas sus páginas con el
+    parser de búsqueda del manager. Los rastreos siguientes son incrementales: el directorio
+    lista primero los títulos más recientes, así que se recorren las páginas desde el
+    principio y, cuando varias seguidas terminan en títulos ya rastreados, se reutilizan las
+    entradas guardadas para el resto (un título nuevo desplaza todas las posiciones, por lo
+    que se comparan URLs y no páginas).
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, manager:"AnimeManager", cfg, page_param:str="page"):
+        """
+        Inicializa la instancia.
+
+        Args:
+            manager (AnimeManager): Manager de la web.
+            cfg: Configuración de la web (`AnimeFlvConfig`, `AnimeFenixConfig`, ...).
+            page_param (str): Parámetro de la URL del directorio con el número de página.
+        """
+        # Inicializa las propiedades.
+        self.__manager:"AnimeManager" = manager
+        self.__cfg = cfg
+        self.__pageParam:str = page_param
+
+
+    # -- Métodos -- #
+    def crawl(self, state:Optional[Dict]=None, stop_after_unchanged:int=CatalogConfig.stop_after_unchanged,
+              max_pages:Optional[int]=None) -> Dict:
+        """
+        Rastrea el directorio de la web.
+
+        Args:
+            state (Optional[Dict]): Estado del rastreo anterior de la web (resultado de una llamada
+                previa). Si es `None` se rastrea el directorio completo.
+            stop_after_unchanged (int): Páginas consecutivas que terminan en un título ya rastreado
+                tras las que se reutiliza el estado anterior para el resto del directorio.
+            max_pages (Optional[int]): Número máximo de páginas a recorrer.
+
+        Returns:
+            Dict: Estado del rastreo: `{"pages": [{"entries": [[título, URL], ...]}, ...]}`.
+        """
+        # Variables.
+        previous:List[Dict] = (state or {}).get("pages", [])
+        known:Set[str] = {url for page in previous for _, url in page["entries"]}
+        seen:Set[str] = set()
+        pages:List[Dict] = []
+        unchanged:int = 0
+
+        # Recorre las páginas del directorio.
+        page:int = 1
+        while max_pages is None or page <= max_pages:
+            # Obtiene los resultados de la página.
+            try:
+                html = get_html(url=f"{self.__cfg.browse_url}?{self.__pageParam}={page}", subtrees=self.__manager._search_subtrees)
+            except NetworkBadResponseError as ex:
+                if page > 1 and ex.StatusCode == 404:
+                    break
+                raise
+            entries:List[Tuple[str, str]] = self.__manager._parse_animes(html=html)
+            if not entries:
+                break
+
+            # Guarda la página y comprueba si ya llega a los títulos del rastreo anterior.
+            pages.append({"entries": [list(entry) for entry in entries]})
+            seen.update(url for _, url in entries)
+            unchanged = unchanged + 1 if entries[-1][1] in known else 0
+
+            # Si varias páginas seguidas llegan a títulos ya rastreados, el resto del directorio
+            # son las entradas anteriores que no se han vuelto a ver.
+            if stop_after_unchanged and unchanged >= stop_after_unchanged:
+                for old in previous:
+                    rest:List[List[str]] = [entry for entry in old["entries"] if entry[1] not in seen]
+                    if rest:
+                        pages.append({"entries": rest})
+                break
+            page += 1
+
+        # Retorna el estado.
+        return {"pages": pages}
+
+
+# ---- FUNCIONES ---- #
+def normalize_title(title:str) -> str:
+    """
+    Normaliza un título para compararlo: minúsculas, sin acentos y solo letras, números y
+    espacios simples.
+
+    Args:
+        title (str): Título a normalizar.
+
+    Returns:
+        str: Título normalizado.
+
+    Examples:
+        - 'Dragon Ball: Súper!' -> 'dragon ball super'.
+    """
+    # Elimina los acentos.
+    title = unicodedata.normalize("NFKD", title.lower())
+    title = ''.join(char for char in title if not unicodedata.combining(char))
+
+    # Sustituye los signos de puntuación por espacios y limpia los espacios.
+    title = ''.join(char if char.isalnum() else ' ' for char in title)
+    return clear_str(value=title)
+
+
+def title_grams(title:str) -> Set[int]:
+    """
+    Devuelve los trigramas del título normalizado, codificados como enteros (tres puntos de
+    código de 21 bits).
+
+    Args:
+        title (str): Título.
+
+    Returns:
+        Set[int]: Trigramas codificados.
+    """
+    # Añade espacios para que el inicio y el final de cada palabra generen trigramas propios.
+    padded:str = f"  {normalize_title(title=title)} "
+    return {(ord(padded[i]) << 42) | (ord(padded[i + 1]) << 21) | ord(padded[i + 2]) for i in range(len(padded) - 2)}
+
+
+def build_catalog(states:Dict[str, Dict]) -> CatalogIndex:
+    """
+    Construye el índice a partir del estado del rastreo de cada web.
+
+    Args:
+        states (Dict[str, Dict]): Estado del rastreo indexado por identificador de la web.
+
+    Returns:
+        CatalogIndex: El índice construido.
+    """
+    # Variables.
+    entries:List[Tuple[str, str, str]] = []
+    seen:Set[str] = set()
+
+    # Añade las entradas de cada web sin repetir URLs.
+    for site, state in states.items():
+        for page in state.get("pages", []):
+            for title, url in page["entries"]:
+                if url not in seen:
+                    seen.add(url)
+                    entries.append((site, title, url))
+
+    # Retorna el índice.
+    return CatalogIndex.build(entries=entries)
+
+
+def load_states(path:str=CatalogConfig.state_path) -> Dict[str, Dict]:
+    """
+    Carga el estado de los rastreos anteriores.
+
+    Args:
+        path (str): Ruta del estado.
+
+    Returns:
+        Dict[str, Dict]: Estado indexado por identificador de la web (vacío si no existe).
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_states(states:Dict[str, Dict], path:str=CatalogConfig.state_path) -> None:
+    """
+    Guarda el estado de los rastreos.
+
+    Args:
+        states (Dict[str, Dict]): Estado indexado por identificador de la web.
+        path (str): Ruta del estado.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+        json.dump(states, file, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
@@ -0,0 +1,311 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: matching.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-25
+# · Descripción: Módulo con el emparejamiento de títulos entre webs: el mismo anime aparece
+# con títulos algo distintos en cada web y aquí se agrupan en una única entrada con la URL
+# de cada una.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import re
+
+from math import log, sqrt
+from typing import Dict, FrozenSet, Iterable, List, Pattern, Sequence, Set, Tuple
+
+from lib.config.schema import MatchConfig
+from lib.core.catalog import normalize_title, title_grams
+
+
+# ---- VARIABLES ---- #
+_NUMBER:Pattern = re.compile(r"\d+")
+
+
+# ---- CLASES ---- #
+class TitleGroup:
+    """
+    Grupo de resultados de distintas webs que corresponden al mismo anime.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, site:str, title:str, url:str):
+        """
+        Inicializa la instancia.
+
+        Args:
+            site (str): Web del primer resultado del grupo.
+            title (str): Título del primer resultado (el nombre canónico del grupo).
+            url (str): URL del primer resultado.
+        """
+        # Inicializa las propiedades.
+        self.__name:str = title
+        self.__titles:Dict[str, str] = {site: title}
+        self.__urls:Dict[str, str] = {site: url}
+        self.__score:float = 1.0
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        return f"{self.Name} ({', '.join(self.Urls)}; {self.Score:.2f})"
+
+
+    # -- Propiedades -- #
+    @property
+    def Name(self) -> str:
+        """
+        Devuelve el nombre canónico del grupo.
+
+        Returns:
+            str: Título en la primera web en la que aparece.
+        """
+        return self.__name
+
+    @property
+    def Titles(self) -> Dict[str, str]:
+        """
+        Devuelve el título en cada web.
+
+        Returns:
+            Dict[str, str]: Web -> título.
+        """
+        return dict(self.__titles)
+
+    @property
+    def Urls(self) -> Dict[str, str]:
+        """
+        Devuelve la URL en cada web.
+
+        Returns:
+            Dict[str, str]: Web -> URL.
+        """
+        return dict(self.__urls)
+
+    @property
+    def Score(self) -> float:
+        """
+        Devuelve la menor similitud entre el nombre canónico y los títulos del grupo.
+
+        Returns:
+            float: Similitud (0-1); 1 si el grupo tiene un solo resultado.
+        """
+        return self.__score
+
+
+    # -- Métodos -- #
+    def add(self, site:str, title:str, url:str, score:float) -> None:
+        """
+        Añade al grupo el resultado de otra web.
+
+        Args:
+            site (str): Web del resultado.
+            title (str): Título del resultado.
+            url (str): URL del resultado.
+            score (float): Similitud con el nombre canónico.
+        """
+        self.__titles[site] = title
+        self.__urls[site] = url
+        self.__score = min(self.__score, score)
+
+
+class TitleMatcher:
+    """
+    Compara títulos como vectores dispersos de trigramas (los de `lib.core.catalog`)
+    ponderados por TF-IDF, con similitud coseno. Los trigramas frecuentes ("the", " no", ...)
+    pesan poco y los que distinguen un título mucho. Además, dos títulos con números distintos
+    (temporadas, partes, películas) nunca se consideran iguales.
+
+    La similitud de dos listados se calcula de una vez como el producto disperso de sus
+    matrices, con un índice invertido del segundo listado, y con un filtro de prefijos: de
+    cada título se apartan sus trigramas más frecuentes mientras su norma no llegue al umbral
+    (por la desigualdad de Cauchy-Schwarz, es lo máximo que pueden aportar) y solo los raros
+    generan candidatos, que después se puntúan con el vector completo. Así cada título solo
+    toca unos pocos candidatos y el resultado es exacto.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, min_similarity:float=MatchConfig.min_similarity, ignored_words:Iterable[str]=MatchConfig.ignored_words):
+        """
+        Inicializa la instancia.
+
+        Args:
+            min_similarity (float): Similitud mínima (0-1) para considerar dos títulos iguales.
+            ignored_words (Iterable[str]): Palabras (normalizadas) que no se comparan.
+        """
+        # Inicializa las propiedades.
+        self.__minSimilarity:float = min_similarity
+        self.__ignoredWords:FrozenSet[str] = frozenset(ignored_words)
+
+
+    # -- Métodos -- #
+    def similarities(self, left:Sequence[str], right:Sequence[str]) -> List[Tuple[int, int, float]]:
+        """
+        Calcula todos los pares de títulos con similitud mínima `min_similarity`.
+
+        Args:
+            left (Sequence[str]): Primer listado de títulos.
+            right (Sequence[str]): Segundo listado de títulos.
+
+        Returns:
+            List[Tuple[int, int, float]]: Pares (posición en `left`, posición en `right`,
+                similitud), de mayor a menor similitud.
+        """
+        # Genera los vectores con los pesos de ambos listados.
+        left_keys:List[Tuple[Set[int], Tuple[str, ...]]] = [self.__key(title=title) for title in left]
+        right_keys:List[Tuple[Set[int], Tuple[str, ...]]] = [self.__key(title=title) for title in right]
+        idf:Dict[int, float] = _idf(grams=[grams for grams, _ in left_keys + right_keys])
+        right_vectors:List[Dict[int, float]] = [_vector(grams=grams, idf=idf) for grams, _ in right_keys]
+
+        # Genera el índice invertido del segundo listado.
+        postings:Dict[int, List[Tuple[int, float]]] = {}
+        for row, vector in enumerate(right_vectors):
+            for gram, weight in vector.items():
+                postings.setdefault(gram, []).append((row, weight))
+
+        # Calcula la similitud de cada título con sus candidatos.
+        threshold:float = self.__minSimilarity
+        pairs:List[Tuple[int, int, float]] = []
+        for index, (grams, numbers) in enumerate(left_keys):
+            # Aparta los trigramas más frecuentes mientras no puedan llegar solos al umbral.
+            shared:List[Tuple[int, int, float]] = sorted(
+                ((len(postings[gram]), gram, weight) for gram, weight in _vector(grams=grams, idf=idf).items() if gram in postings),
+                reverse=True)
+            frequent:List[Tuple[int, float]] = []
+            bound:float = 0.0
+            for _, gram, weight in shared:
+                if bound + weight * weight >= threshold * threshold:
+                    break
+                bound += weight * weight
+                frequent.append((gram, weight))
+            bound = sqrt(bound)
+
+            # Acumula el producto escalar con los trigramas raros.
+            scores:Dict[int, float] = {}
+            for _, gram, weight in shared[len(frequent):]:
+                for row, other in postings[gram]:
+                    scores[row] = scores.get(row, 0.0) + weight * other
+
+            # Completa la similitud de los candidatos que pueden llegar al umbral.
+            for row, score in scores.items():
+                if score + bound < threshold or right_keys[row][1] != numbers:
+                    continue
+                other_vector:Dict[int, float] = right_vectors[row]
+                for gram, weight in frequent:
+                    score += weight * other_vector.get(gram, 0.0)
+                if score >= threshold:
+                    pairs.append((index, row, min(score, 1.0)))
+
+        # Retorna los pares ordenados.
+        pairs.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+        return pairs
+
+    def match(self, left:Sequence[str], right:Sequence[str]) -> List[Tuple[int, int, float]]:
+        """
+        Empareja los títulos de dos listados uno a uno: cada título se empareja como mucho con
+        uno del otro listado, empezando por los pares más parecidos.
+
+        Args:
+            left (Sequence[str]): Primer listado de títulos.
+            right (Sequence[str]): Segundo listado de títulos.
+
+        Returns:
+            List[Tuple[int, int, float]]: Pares (posición en `left`, posición en `right`,
+                similitud), de mayor a menor similitud.
+        """
+        # Variables.
+        used_left:Set[int] = set()
+        used_right:Set[int] = set()
+        matches:List[Tuple[int, int, float]] = []
+
+        # Toma los pares de mayor similitud cuyos títulos siguen libres.
+        for index, row, score in self.similarities(left=left, right=right):
+            if index not in used_left and row not in used_right:
+                used_left.add(index)
+                used_right.add(row)
+                matches.append((index, row, score))
+
+        # Retorna los pares.
+        return matches
+
+    def group(self, results:Dict[str, List[Tuple[str, str]]]) -> List[TitleGroup]:
+        """
+        Agrupa los resultados de varias webs (por ejemplo, de `find_animes` en cada una) en una
+        entrada por anime. Las webs se procesan en orden: los resultados de la primera son los
+        grupos iniciales y los de cada web siguiente se emparejan uno a uno con los nombres
+        canónicos de los grupos o forman grupos nuevos.
+
+        Args:
+            results (Dict[str, List[Tuple[str, str]]]): Web -> resultados (título, URL).
+
+        Returns:
+            List[TitleGroup]: Grupos, en orden de aparición.
+        """
+        groups:List[TitleGroup] = []
+        for site, site_results in results.items():
+            # Empareja los resultados con los grupos existentes.
+            matched:Set[int] = set()
+            if groups:
+                for index, row, score in self.match(left=[group.Name for group in groups], right=[title for title, _ in site_results]):
+                    title, url = site_results[row]
+                    groups[index].add(site=site, title=title, url=url, score=score)
+                    matched.add(row)
+
+            # El resto de resultados forman grupos nuevos.
+            groups.extend(TitleGroup(site=site, title=title, url=url)
+                          for row, (title, url) in enumerate(site_results) if row not in matched)
+
+        # Retorna los grupos.
+        return groups
+
+
+    # -- Métodos privados -- #
+    def __key(self, title:str) -> Tuple[Set[int], Tuple[str, ...]]:
+        """
+        Genera la clave de comparación de un título.
+
+        Args:
+            title (str): Título.
+
+        Returns:
+            Tuple[Set[int], Tuple[str, ...]]: Trigramas del título sin las palabras ignoradas y
+                números que contiene.
+        """
+        words:List[str] = [word for word in normalize_title(title=title).split() if word not in self.__ignoredWords]
+        return title_grams(title=" ".join(words)), tuple(sorted(number.lstrip("0") for number in _NUMBER.findall(" ".join(words))))
+
+
+# ---- FUNCIONES ---- #
+def _idf(grams:List[Set[int]]) -> Dict[int, float]:
+    """
+    Calcula la frecuencia inversa (suavizada) de cada trigrama en un conjunto de títulos.
+
+    Args:
+        grams (List[Set[int]]): Trigramas de cada título.
+
+    Returns:
+        Dict[int, float]: Trigrama -> peso IDF.
+    """
+    counts:Dict[int, int] = {}
+    for title in grams:
+        for gram in title:
+            counts[gram] = counts.get(gram, 0) + 1
+    total:int = len(grams) + 1
+    return {gram: log(total / (count + 1)) + 1.0 for gram, count in counts.items()}
+
+
+def _vector(grams:Set[int], idf:Dict[int, float]) -> Dict[int, float]:
+    """
+    Genera el vector normalizado (norma 1) de un título.
+
+    Args:
+        grams (Set[int]): Trigramas del título.
+        idf (Dict[int, float]): Peso IDF de cada trigrama.
+
+    Returns:
+        Dict[int, float]: Trigrama -> peso.
+    """
+    norm:float = sqrt(sum(idf[gram] ** 2 for gram in grams)) or 1.0
+    return {gram: idf[gram] / norm for gram in grams}
@@ -0,0 +1,336 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: resolver.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-28
+# · Descripción: Módulo con la caché de las URLs de vídeo resueltas de los episodios: guarda
+# cada URL con su caducidad, resuelve episodios por adelantado y, cuando una URL caduca o
+# falla, solo repite el último salto de la resolución.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Dict, Iterable, Optional
+from time import time
+from calendar import timegm
+from threading import Lock
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+from datetime import datetime
+
+from lib.config.schema import ResolverConfig
+from lib.common.metrics import count_cache
+from lib.common.network import forget_cached
+from lib.core.anime import AnimeManager, Episode, EpisodeSourceError
+
+
+# ---- VARIABLES ---- #
+_EXPIRY_PARAMS:tuple = ("expires", "expire", "expiry", "exp", "e", "validto", "valid_to", "deadline", "token_expires")   # Parámetros con la caducidad (epoch).
+_SIGNED_PARAMS:tuple = (("x-amz-date", "x-amz-expires"), ("x-goog-date", "x-goog-expires"))     # Fecha de firma y segundos de validez.
+
+
+# ---- CLASES ---- #
+class ResolvedSource:
+    """
+    URL de vídeo resuelta de un episodio, con la página que la enlaza y su caducidad.
+    """
+    __slots__ = ("__url", "__page", "__expires")
+
+
+    # -- Métodos por defecto -- #
+    def __init__(self, url:str, page:str, expires:float):
+        """
+        Inicializa la instancia.
+
+        Args:
+            url (str): URL del fichero de vídeo.
+            page (str): URL de la página que la enlaza (último salto de la resolución).
+            expires (float): Momento (epoch) en el que caduca.
+        """
+        # Inicializa las propiedades.
+        self.__url:str = url
+        self.__page:str = page
+        self.__expires:float = expires
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        return f"ResolvedSource({self.Url}, {self.Page}, {self.Expires - time():.0f}s)"
+
+
+    # -- Propiedades -- #
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL del fichero de vídeo.
+
+        Returns:
+            str: URL del fichero de vídeo.
+        """
+        return self.__url
+
+    @property
+    def Page(self) -> str:
+        """
+        Devuelve la página que enlaza el fichero de vídeo.
+
+        Returns:
+            str: URL del último salto de la resolución.
+        """
+        return self.__page
+
+    @property
+    def Expires(self) -> float:
+        """
+        Devuelve el momento en el que caduca la URL.
+
+        Returns:
+            float: Epoch (0 si se ha marcado como fallida).
+        """
+        return self.__expires
+
+
+class SourceResolver:
+    """
+    Caché de las URLs de vídeo resueltas (`AnimeManager.resolve_link`) indexada por la
+    página del episodio. Cada URL se guarda con su caducidad, deducida de los parámetros de
+    las URLs firmadas (`expires`, `X-Amz-Expires`, ...) o `default_ttl` si no lleva. Mientras
+    está vigente se devuelve sin descargar ninguna página; cuando caduca o se marca como
+    fallida (`fail`) solo se vuelve a pedir la página del último salto (sin caché HTTP), y la
+    resolución completa solo se repite si esa página ya no lleva a ningún vídeo.
+
+    Con `prefetch` los episodios se resuelven por adelantado en segundo plano; una llamada a
+    `resolve` de un episodio en curso espera a esa resolución en lugar de repetirla.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, cfg:ResolverConfig=ResolverConfig()):
+        """
+        Inicializa la instancia.
+
+        Args:
+            cfg (ResolverConfig): Configuración de la resolución.
+        """
+        # Inicializa las propiedades.
+        self.__cfg:ResolverConfig = cfg
+        self.__entries:"OrderedDict[str, ResolvedSource]" = OrderedDict()
+        self.__pending:Dict[str, Future] = {}
+        self.__lock:Lock = Lock()
+        self.__executor:Optional[ThreadPoolExecutor] = None
+
+
+    # -- Métodos -- #
+    def resolve(self, manager:AnimeManager, episode:Episode) -> str:
+        """
+        Obtiene la URL del fichero de vídeo de un episodio (misma firma que el `resolver` de
+        `DownloadScheduler`).
+
+        Args:
+            manager (AnimeManager): Manager de la web del episodio.
+            episode (Episode): Episodio a resolver.
+
+        Raises:
+            EpisodeSourceError: Si la página no lleva a ningún fichero de vídeo.
+
+        Returns:
+            str: URL del fichero de vídeo.
+        """
+        return self.source(manager=manager, episode=episode).Url
+
+    def source(self, manager:AnimeManager, episode:Episode) -> ResolvedSource:
+        """
+        Obtiene la URL resuelta de un episodio, desde la caché si sigue vigente.
+
+        Args:
+            manager (AnimeManager): Manager de la web del episodio.
+            episode (Episode): Episodio a resolver.
+
+        Raises:
+            EpisodeSourceError: Si la página no lleva a ningún fichero de vídeo.
+
+        Returns:
+            ResolvedSource: La URL resuelta.
+        """
+        with self.__lock:
+            # Espera a la resolución por adelantado del episodio si está en curso.
+            future:Optional[Future] = self.__pending.get(episode.Url)
+        if future is not None:
+            future.result()
+
+        # Comprueba si la URL está en la caché y sigue vigente.
+        entry:Optional[ResolvedSource] = self.get(url=episode.Url)
+        if entry is not None and entry.Expires - self.__cfg.expiry_margin > time():
+            count_cache(layer="resolver", result="hit")
+            return entry
+        return self.__resolve(manager=manager, episode=episode, entry=entry)
+
+    def get(self, url:str) -> Optional[ResolvedSource]:
+        """
+        Devuelve la URL resuelta guardada de un episodio (vigente o no).
+
+        Args:
+            url (str): URL de la página del episodio.
+
+        Returns:
+            Optional[ResolvedSource]: La URL resuelta o `None` si no está guardada.
+        """
+        with self.__lock:
+            entry:Optional[ResolvedSource] = self.__entries.get(url)
+            if entry is not None:
+                self.__entries.move_to_end(url)
+            return entry
+
+    def fail(self, url:str) -> None:
+        """
+        Marca como fallida la URL resuelta de un episodio (por ejemplo, si su descarga
+        responde 403 o 410): la siguiente resolución repetirá el último salto.
+
+        Args:
+            url (str): URL de la página del episodio.
+        """
+        with self.__lock:
+            entry:Optional[ResolvedSource] = self.__entries.get(url)
+            if entry is not None:
+                self.__entries[url] = ResolvedSource(url=entry.Url, page=entry.Page, expires=0.0)
+
+    def prefetch(self, manager:AnimeManager, episodes:Iterable[Episode]) -> None:
+        """
+        Resuelve episodios en segundo plano, salvo los que ya tienen una URL vigente o ya se
+        están resolviendo. Los errores se ignoran (se repetirán al llamar a `resolve`).
+
+        Args:
+            manager (AnimeManager): Manager de la web de los episodios.
+            episodes (Iterable[Episode]): Episodios a resolver.
+        """
+        with self.__lock:
+            for episode in episodes:
+                entry:Optional[ResolvedSource] = self.__entries.get(episode.Url)
+                if episode.Url in self.__pending or (entry is not None and entry.Expires - self.__cfg.expiry_margin > time()):
+                    continue
+                if self.__executor is None:
+                    self.__executor = ThreadPoolExecutor(max_workers=max(1, self.__cfg.workers), thread_name_prefix="resolver")
+                future:Future = self.__executor.submit(self.__prefetch_one, manager, episode)
+                self.__pending[episode.Url] = future
+
+    def close(self) -> None:
+        """
+        Detiene los hilos de resolución por adelantado (sin esperar a las pendientes).
+        """
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False, cancel_futures=True)
+                self.__executor = None
+            self.__pending.clear()
+
+
+    # -- Métodos privados -- #
+    def __resolve(self, manager:AnimeManager, episode:Episode, entry:Optional[ResolvedSource]) -> ResolvedSource:
+        """
+        Resuelve un episodio: si había una URL caducada, repite solo su último salto y, si no
+        funciona, la resolución completa.
+
+        Args:
+            manager (AnimeManager): Manager de la web del episodio.
+            episode (Episode): Episodio a resolver.
+            entry (Optional[ResolvedSource]): URL caducada o fallida del episodio.
+
+        Raises:
+            EpisodeSourceError: Si la página no lleva a ningún fichero de vídeo.
+
+        Returns:
+            ResolvedSource: La URL resuelta.
+        """
+        # Repite el último salto sin la caché HTTP (su página enlazaba la URL caducada).
+        if entry is not None:
+            try:
+                forget_cached(url=entry.Page)
+                url, page = manager.resolve_link(url=entry.Page, hops=0)
+                count_cache(layer="resolver", result="refreshed")
+                return self.__save(episode=episode, url=url, page=page)
+            except Exception:
+                pass
+
+        # Resuelve el episodio desde su página.
+        count_cache(layer="resolver", result="miss")
+        if entry is not None:
+            forget_cached(url=episode.Url)
+        try:
+            url, page = manager.resolve_link(url=episode.Url, hops=self.__cfg.max_hops)
+        except EpisodeSourceError:
+            raise EpisodeSourceError(f"No video source found for episode {episode.Number} ({episode.Url}).") from None
+        return self.__save(episode=episode, url=url, page=page)
+
+    def __save(self, episode:Episode, url:str, page:str) -> ResolvedSource:
+        """
+        Guarda la URL resuelta de un episodio con su caducidad.
+
+        Args:
+            episode (Episode): Episodio resuelto.
+            url (str): URL del fichero de vídeo.
+            page (str): URL de la página que la enlaza.
+
+        Returns:
+            ResolvedSource: La URL resuelta.
+        """
+        entry:ResolvedSource = ResolvedSource(url=url, page=page, expires=url_expiry(url=url) or time() + self.__cfg.default_ttl)
+        with self.__lock:
+            self.__entries[episode.Url] = entry
+            self.__entries.move_to_end(episode.Url)
+            while len(self.__entries) > self.__cfg.max_entries:
+                self.__entries.popitem(last=False)
+        return entry
+
+    def __prefetch_one(self, manager:AnimeManager, episode:Episode) -> None:
+        """
+        Resuelve un episodio en segundo plano.
+
+        Args:
+            manager (AnimeManager): Manager de la web del episodio.
+            episode (Episode): Episodio a resolver.
+        """
+        try:
+            entry:Optional[ResolvedSource] = self.get(url=episode.Url)
+            self.__resolve(manager=manager, episode=episode, entry=entry)
+        except Exception:
+            pass
+        finally:
+            with self.__lock:
+                self.__pending.pop(episode.Url, None)
+
+
+# ---- FUNCIONES ---- #
+def url_expiry(url:str) -> Optional[float]:
+    """
+    Deduce la caducidad de una URL firmada a partir de sus parámetros: un epoch (en segundos
+    o milisegundos) en `expires`, `exp`, `e`, ... o la fecha de firma y los segundos de
+    validez de las URLs de S3 y Google Cloud Storage (`X-Amz-Date` + `X-Amz-Expires`).
+
+    Args:
+        url (str): URL del fichero de vídeo.
+
+    Returns:
+        Optional[float]: Momento (epoch) en el que caduca o `None` si no se puede deducir.
+    """
+    params:Dict[str, str] = {key.lower(): value for key, value in parse_qsl(urlsplit(url).query)}
+
+    # Fecha de firma y segundos de validez.
+    for date_key, expires_key in _SIGNED_PARAMS:
+        if params.get(date_key) and params.get(expires_key, "").isdigit():
+            try:
+                signed:float = timegm(datetime.strptime(params[date_key], "%Y%m%dT%H%M%SZ").timetuple())
+            except ValueError:
+                continue
+            return signed + float(params[expires_key])
+
+    # Epoch de caducidad (se descartan los valores que no parecen fechas).
+    for key in _EXPIRY_PARAMS:
+        value:str = params.get(key, "")
+        if value.isdigit():
+            expires:float = int(value) / 1000 if len(value) >= 13 else int(value)
+            if 1e9 <= expires <= 1e10:
+                return float(expires)
+    return None
@@ -0,0 +1,620 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: scheduler.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-19
+# · Descripción: Módulo con la cola persistente de descargas de episodios y su pool de
+# trabajadores.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import re
+import sqlite3
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from time import time
+from threading import Condition, Thread
+from urllib.parse import urlsplit
+
+from lib.config.schema import DownloadConfig, HlsConfig, SchedulerConfig
+from lib.common.download import download_file
+from lib.common.hls import download_hls
+from lib.common.throttle import BandwidthLimiter
+from lib.core.anime import Anime, AnimeManager, Episode
+from lib.core.resolver import SourceResolver
+
+
+# ---- CLASES ---- #
+class DownloadJob:
+    """
+    Estado de un trabajo de la cola: los episodios `[First, Last]` de un anime de una web.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, id:int, site:str, url:str, first:int, last:Optional[int], priority:int, status:str,
+                 name:Optional[str], error:Optional[str], done:int, failed:int, total:int):
+        """
+        Inicializa la instancia.
+
+        Args:
+            id (int): Identificador del trabajo.
+            site (str): Identificador de la web.
+            url (str): URL de la página inicial del anime.
+            first (int): Primer episodio.
+            last (Optional[int]): Último episodio (`None` = hasta el último publicado).
+            priority (int): Prioridad (mayor antes).
+            status (str): `queued`, `active`, `done`, `failed` o `cancelled`.
+            name (Optional[str]): Nombre del anime (una vez cargado).
+            error (Optional[str]): Error del trabajo.
+            done (int): Episodios descargados.
+            failed (int): Episodios fallidos.
+            total (int): Episodios del trabajo (0 hasta que se carga el anime).
+        """
+        # Inicializa las propiedades.
+        self.__id:int = id
+        self.__site:str = site
+        self.__url:str = url
+        self.__first:int = first
+        self.__last:Optional[int] = last
+        self.__priority:int = priority
+        self.__status:str = status
+        self.__name:Optional[str] = name
+        self.__error:Optional[str] = error
+        self.__done:int = done
+        self.__failed:int = failed
+        self.__total:int = total
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación del trabajo.
+
+        Returns:
+            str: Representación del trabajo.
+        """
+        return (f"#{self.__id} [{self.__status}] {self.__name or self.__url} ({self.__site}) · "
+                f"{self.__done}/{self.__total} · P{self.__priority}")
+
+
+    # -- Propiedades -- #
+    @property
+    def Id(self) -> int:
+        """
+        Devuelve el identificador del trabajo.
+
+        Returns:
+            int: Identificador del trabajo.
+        """
+        return self.__id
+
+    @property
+    def Site(self) -> str:
+        """
+        Devuelve el identificador de la web.
+
+        Returns:
+            str: Identificador de la web.
+        """
+        return self.__site
+
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL de la página inicial del anime.
+
+        Returns:
+            str: URL de la página inicial del anime.
+        """
+        return self.__url
+
+    @property
+    def Range(self) -> Tuple[int, Optional[int]]:
+        """
+        Devuelve el rango de episodios del trabajo.
+
+        Returns:
+            Tuple[int, Optional[int]]: Primer y último episodio.
+        """
+        return self.__first, self.__last
+
+    @property
+    def Priority(self) -> int:
+        """
+        Devuelve la prioridad del trabajo.
+
+        Returns:
+            int: Prioridad del trabajo.
+        """
+        return self.__priority
+
+    @property
+    def Status(self) -> str:
+        """
+        Devuelve el estado del trabajo.
+
+        Returns:
+            str: Estado del trabajo.
+        """
+        return self.__status
+
+    @property
+    def Name(self) -> Optional[str]:
+        """
+        Devuelve el nombre del anime.
+
+        Returns:
+            Optional[str]: Nombre del anime.
+        """
+        return self.__name
+
+    @property
+    def Error(self) -> Optional[str]:
+        """
+        Devuelve el error del trabajo.
+
+        Returns:
+            Optional[str]: Error del trabajo.
+        """
+        return self.__error
+
+    @property
+    def Done(self) -> int:
+        """
+        Devuelve el número de episodios descargados.
+
+        Returns:
+            int: Episodios descargados.
+        """
+        return self.__done
+
+    @property
+    def Failed(self) -> int:
+        """
+        Devuelve el número de episodios fallidos.
+
+        Returns:
+            int: Episodios fallidos.
+        """
+        return self.__failed
+
+    @property
+    def Total(self) -> int:
+        """
+        Devuelve el número de episodios del trabajo.
+
+        Returns:
+            int: Episodios del trabajo.
+        """
+        return self.__total
+
+
+class DownloadScheduler:
+    """
+    Cola persistente (SQLite) de descargas de episodios. Cada trabajo es un rango de episodios
+    de un anime de una web; un pool de hilos lo expande a episodios (con `load_anime`), resuelve
+    el fichero de vídeo de cada uno (con un `SourceResolver`, que resuelve por adelantado los
+    siguientes `prefetch` episodios de la cola y, si una descarga falla, solo repite el último
+    salto de la resolución) y lo descarga con `download_file` (o con `download_hls` si es
+    una lista `m3u8`), respetando la prioridad de los trabajos y los límites de ancho de banda
+    global y por host.
+
+    Los trabajos y episodios pendientes o en curso sobreviven a un reinicio: al abrir la cola los
+    episodios que estaban descargándose vuelven a la cola y la descarga reanuda sus ficheros
+    parciales.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, managers:Iterable[AnimeManager], cfg:SchedulerConfig=SchedulerConfig(),
+                 download_cfg:DownloadConfig=DownloadConfig(), hls_cfg:HlsConfig=HlsConfig(),
+                 resolver:Optional[Callable[[AnimeManager, Episode], str]]=None):
+        """
+        Inicializa la instancia.
+
+        Args:
+            managers (Iterable[AnimeManager]): Managers de las webs, indexados por su `Site`.
+            cfg (SchedulerConfig): Configuración de la cola.
+            download_cfg (DownloadConfig): Configuración de cada descarga.
+            hls_cfg (HlsConfig): Configuración de cada descarga de un stream HLS.
+            resolver (Optional[Callable[[AnimeManager, Episode], str]]): Función que obtiene la URL del
+                fichero de vídeo de un episodio (por defecto `SourceResolver.resolve`, con caché
+                y resolución por adelantado).
+        """
+        # Inicializa las propiedades.
+        self.__managers:Dict[str, AnimeManager] = {manager.Site: manager for manager in managers}
+        self.__cfg:SchedulerConfig = cfg
+        self.__downloadCfg:DownloadConfig = download_cfg
+        self.__hlsCfg:HlsConfig = hls_cfg
+        self.__sources:Optional[SourceResolver] = SourceResolver() if resolver is None else None
+        self.__resolver:Callable[[AnimeManager, Episode], str] = resolver or self.__sources.resolve
+        self.__condition:Condition = Condition()
+        self.__workers:List[Thread] = []
+        self.__running:bool = False
+        self.__busy:int = 0
+        self.__bandwidth:Optional[BandwidthLimiter] = BandwidthLimiter(rate=cfg.bandwidth) if cfg.bandwidth else None
+        self.__hostBandwidth:Dict[str, BandwidthLimiter] = {}
+
+        # Abre (o crea) la cola.
+        if os.path.dirname(cfg.path):
+            os.makedirs(os.path.dirname(cfg.path), exist_ok=True)
+        self.__db:sqlite3.Connection = sqlite3.connect(cfg.path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                site        TEXT NOT NULL,
+                url         TEXT NOT NULL,
+                first       INTEGER NOT NULL,
+                last        INTEGER,
+                priority    INTEGER NOT NULL,
+                status      TEXT NOT NULL,
+                name        TEXT,
+                error       TEXT,
+                created_at  REAL NOT NULL
+            )""")
+        self.__db.execute("""
+            CREATE TABLE IF NOT EXISTS episodes (
+                job_id      INTEGER NOT NULL,
+                number      INTEGER NOT NULL,
+                url         TEXT NOT NULL,
+                status      TEXT NOT NULL,
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                path        TEXT,
+                error       TEXT,
+                PRIMARY KEY (job_id, number)
+            )""")
+        # Devuelve a la cola lo que estaba en curso cuando se cerró el proceso.
+        self.__db.execute("UPDATE jobs SET status = 'queued' WHERE status = 'expanding'")
+        self.__db.execute("UPDATE episodes SET status = 'queued' WHERE status = 'running'")
+        self.__db.commit()
+
+    def __enter__(self) -> "DownloadScheduler":
+        """
+        Arranca los trabajadores al entrar en el contexto.
+
+        Returns:
+            DownloadScheduler: La propia instancia.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Detiene los trabajadores y cierra la cola al salir del contexto.
+        """
+        self.close()
+
+
+    # -- Propiedades -- #
+    @property
+    def Pending(self) -> int:
+        """
+        Devuelve el número de trabajos y episodios pendientes o en curso.
+
+        Returns:
+            int: Elementos pendientes.
+        """
+        with self.__condition:
+            return self.__pending()
+
+
+    # -- Métodos -- #
+    def enqueue(self, site:str, url:str, first:int=1, last:Optional[int]=None, priority:int=0) -> int:
+        """
+        Añade a la cola los episodios `[first, last]` de un anime.
+
+        Args:
+            site (str): Identificador de la web (`AnimeManager.Site`).
+            url (str): URL de la página inicial del anime.
+            first (int): Primer episodio.
+            last (Optional[int]): Último episodio (`None` = hasta el último publicado).
+            priority (int): Prioridad (los trabajos con mayor prioridad se descargan antes).
+
+        Raises:
+            KeyError: Si no hay ningún manager para la web.
+
+        Returns:
+            int: Identificador del trabajo.
+        """
+        if site not in self.__managers:
+            raise KeyError(f"No manager registered for site '{site}'.")
+        with self.__condition:
+            job_id:int = self.__db.execute(
+                "INSERT INTO jobs (site, url, first, last, priority, status, created_at) VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+                (site, url, first, last, priority, time())).lastrowid
+            self.__db.commit()
+            self.__condition.notify_all()
+        return job_id
+
+    def set_priority(self, job_id:int, priority:int) -> None:
+        """
+        Cambia la prioridad de un trabajo (afecta a sus episodios aún no iniciados).
+
+        Args:
+            job_id (int): Identificador del trabajo.
+            priority (int): Nueva prioridad.
+        """
+        with self.__condition:
+            self.__db.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, job_id))
+            self.__db.commit()
+
+    def cancel(self, job_id:int) -> None:
+        """
+        Cancela un trabajo. Los episodios en curso terminan, pero no se inicia ninguno más.
+
+        Args:
+            job_id (int): Identificador del trabajo.
+        """
+        with self.__condition:
+            self.__db.execute("UPDATE jobs SET status = 'cancelled' WHERE id = ? AND status NOT IN ('done', 'failed')", (job_id,))
+            self.__db.execute("UPDATE episodes SET status = 'cancelled' WHERE job_id = ? AND status = 'queued'", (job_id,))
+            self.__db.commit()
+            self.__condition.notify_all()
+
+    def jobs(self) -> List[DownloadJob]:
+        """
+        Devuelve el estado de todos los trabajos.
+
+        Returns:
+            List[DownloadJob]: Trabajos, del más reciente al más antiguo.
+        """
+        with self.__condition:
+            rows = self.__db.execute("""
+                SELECT j.id, j.site, j.url, j.first, j.last, j.priority, j.status, j.name, j.error,
+                       COUNT(CASE WHEN e.status = 'done' THEN 1 END), COUNT(CASE WHEN e.status = 'failed' THEN 1 END), COUNT(e.number)
+                FROM jobs j LEFT JOIN episodes e ON e.job_id = j.id
+                GROUP BY j.id ORDER BY j.id DESC""").fetchall()
+        return [DownloadJob(*row) for row in rows]
+
+    def start(self) -> None:
+        """
+        Arranca los trabajadores.
+        """
+        with self.__condition:
+            if self.__running:
+                return
+            self.__running = True
+        self.__workers = [Thread(target=self.__work, name=f"download-{index}", daemon=True) for index in range(max(1, self.__cfg.workers))]
+        for worker in self.__workers:
+            worker.start()
+
+    def join(self, timeout:Optional[float]=None) -> bool:
+        """
+        Espera a que la cola se vacíe.
+
+        Args:
+            timeout (Optional[float]): Segundos máximos de espera (`None` = sin límite).
+
+        Returns:
+            bool: `True` si la cola se vació.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not self.__pending() and not self.__busy, timeout=timeout)
+
+    def stop(self) -> None:
+        """
+        Detiene los trabajadores cuando terminen el episodio en curso. Lo que queda en la cola
+        se conserva para el siguiente arranque.
+        """
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify_all()
+        for worker in self.__workers:
+            worker.join()
+        self.__workers = []
+
+    def close(self) -> None:
+        """
+        Detiene los trabajadores y cierra la cola.
+        """
+        self.stop()
+        if self.__sources is not None:
+            self.__sources.close()
+        with self.__condition:
+            self.__db.close()
+
+
+    # -- Métodos privados -- #
+    def __pending(self) -> int:
+        """
+        Cuenta los trabajos y episodios pendientes o en curso. Debe llamarse con el bloqueo adquirido.
+
+        Returns:
+            int: Elementos pendientes.
+        """
+        return (self.__db.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'expanding')").fetchone()[0]
+                + self.__db.execute("SELECT COUNT(*) FROM episodes WHERE status IN ('queued', 'running')").fetchone()[0])
+
+    def __claim(self) -> Optional[Tuple]:
+        """
+        Reserva el siguiente elemento de la cola. Debe llamarse con el bloqueo adquirido. Los
+        trabajos sin expandir van antes que los episodios de igual prioridad, para que la cola
+        siempre tenga episodios que descargar.
+
+        Returns:
+            Optional[Tuple]: `("job", id, site, url, first, last)`, `("episode", job_id, número,
+                url, site, nombre)` o `None` si no hay nada pendiente.
+        """
+        job = self.__db.execute("SELECT id, site, url, first, last, priority FROM jobs WHERE status = 'queued' "
+                                "ORDER BY priority DESC, id LIMIT 1").fetchone()
+        episode = self.__db.execute("""
+            SELECT e.job_id, e.number, e.url, j.site, j.name, j.priority FROM episodes e JOIN jobs j ON j.id = e.job_id
+            WHERE e.status = 'queued' AND j.status != 'cancelled' ORDER BY j.priority DESC, e.attempts, j.id, e.number LIMIT 1""").fetchone()
+        if job is not None and (episode is None or job[5] >= episode[5]):
+            self.__db.execute("UPDATE jobs SET status = 'expanding' WHERE id = ?", (job[0],))
+            self.__db.commit()
+            return ("job", *job[:5])
+        if episode is not None:
+            self.__db.execute("UPDATE episodes SET status = 'running' WHERE job_id = ? AND number = ?", (episode[0], episode[1]))
+            self.__db.commit()
+            self.__prefetch()
+            return ("episode", *episode[:5])
+        return None
+
+    def __prefetch(self) -> None:
+        """
+        Resuelve por adelantado los siguientes episodios de la cola (en el orden en el que se
+        reservarán). Debe llamarse con el bloqueo adquirido.
+        """
+        if self.__sources is None or self.__cfg.prefetch <= 0:
+            return
+        rows = self.__db.execute("""
+            SELECT e.number, e.url, j.site FROM episodes e JOIN jobs j ON j.id = e.job_id
+            WHERE e.status = 'queued' AND j.status != 'cancelled' ORDER BY j.priority DESC, e.attempts, j.id, e.number LIMIT ?""",
+                                 (self.__cfg.prefetch,)).fetchall()
+        for number, url, site in rows:
+            if site in self.__managers:
+                self.__sources.prefetch(manager=self.__managers[site], episodes=[Episode(number=number, url=url)])
+
+    def __work(self) -> None:
+        """
+        Bucle de cada trabajador: reserva elementos de la cola y los procesa hasta que se detiene.
+        """
+        while True:
+            # Espera a que haya algo que hacer.
+            with self.__condition:
+                item:Optional[Tuple] = None
+                while self.__running and item is None:
+                    item = self.__claim()
+                    if item is None:
+                        self.__condition.wait()
+                if item is None:
+                    return
+                self.__busy += 1
+
+            # Procesa el elemento.
+            try:
+                if item[0] == "job":
+                    self.__expand(*item[1:])
+                else:
+                    self.__download(*item[1:])
+            finally:
+                with self.__condition:
+                    self.__busy -= 1
+                    self.__condition.notify_all()
+
+    def __expand(self, job_id:int, site:str, url:str, first:int, last:Optional[int]) -> None:
+        """
+        Carga el anime de un trabajo y añade a la cola los episodios de su rango.
+
+        Args:
+            job_id (int): Identificador del trabajo.
+            site (str): Identificador de la web.
+            url (str): URL de la página inicial del anime.
+            first (int): Primer episodio.
+            last (Optional[int]): Último episodio.
+        """
+        try:
+            anime:Anime = self.__managers[site].load_anime(url=url)
+        except Exception as ex:
+            with self.__condition:
+                self.__db.execute("UPDATE jobs SET status = 'failed', error = ? WHERE id = ? AND status != 'cancelled'", (repr(ex), job_id))
+                self.__db.commit()
+            return
+
+        # Añade los episodios del rango.
+        episodes:List[Episode] = [episode for episode in anime.Episodes
+                                  if episode.Number >= first and (last is None or episode.Number <= last)]
+        with self.__condition:
+            # El trabajo puede haberse cancelado mientras se cargaba el anime.
+            if self.__db.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()[0] != "expanding":
+                return
+            self.__db.executemany("INSERT OR IGNORE INTO episodes (job_id, number, url, status) VALUES (?, ?, ?, 'queued')",
+                                  [(job_id, episode.Number, episode.Url) for episode in episodes])
+            self.__db.execute("UPDATE jobs SET status = ?, name = ? WHERE id = ?",
+                              ("active" if episodes else "done", anime.Name, job_id))
+            self.__db.commit()
+
+    def __download(self, job_id:int, number:int, url:str, site:str, name:Optional[str]) -> None:
+        """
+        Resuelve y descarga un episodio, y actualiza su estado y el de su trabajo.
+
+        Args:
+            job_id (int): Identificador del trabajo.
+            number (int): Número del episodio.
+            url (str): URL de la página del episodio.
+            site (str): Identificador de la web.
+            name (Optional[str]): Nombre del anime.
+        """
+        path:Optional[str] = None
+        error:Optional[str] = None
+        try:
+            # Resuelve el fichero de vídeo y lo descarga.
+            media_url:str = self.__resolver(self.__managers[site], Episode(number=number, url=url))
+            path = self.__path(name=name or site, number=number, media_url=media_url)
+            if _is_hls(url=media_url):
+                download_hls(url=media_url, path=path, cfg=self.__hlsCfg, limiters=self.__limiters(url=media_url))
+            else:
+                download_file(url=media_url, path=path, cfg=self.__downloadCfg, limiters=self.__limiters(url=media_url))
+        except Exception as ex:
+            error = repr(ex)
+            # El siguiente intento vuelve a resolver la URL (solo el último salto).
+            if self.__sources is not None:
+                self.__sources.fail(url=url)
+
+        # Actualiza el estado del episodio y, si era el último, el del trabajo.
+        with self.__condition:
+            if error is None:
+                self.__db.execute("UPDATE episodes SET status = 'done', path = ?, error = NULL WHERE job_id = ? AND number = ?",
+                                  (path, job_id, number))
+            else:
+                # Si el trabajo se ha cancelado mientras tanto, el episodio no vuelve a la cola.
+                self.__db.execute("UPDATE episodes SET attempts = attempts + 1, error = ?, status = CASE "
+                                  "WHEN (SELECT status FROM jobs WHERE id = ?) = 'cancelled' THEN 'cancelled' "
+                                  "WHEN attempts + 1 >= ? THEN 'failed' ELSE 'queued' END WHERE job_id = ? AND number = ?",
+                                  (error, job_id, self.__cfg.max_attempts, job_id, number))
+            remaining:int = self.__db.execute("SELECT COUNT(*) FROM episodes WHERE job_id = ? AND status IN ('queued', 'running')",
+                                              (job_id,)).fetchone()[0]
+            if not remaining:
+                failed:int = self.__db.execute("SELECT COUNT(*) FROM episodes WHERE job_id = ? AND status = 'failed'", (job_id,)).fetchone()[0]
+                self.__db.execute("UPDATE jobs SET status = ?, error = ? WHERE id = ? AND status = 'active'",
+                                  ("failed" if failed else "done", f"{failed} episode(s) failed" if failed else None, job_id))
+            self.__db.commit()
+
+    def __path(self, name:str, number:int, media_url:str) -> str:
+        """
+        Genera la ruta de destino de un episodio: `output_dir/<anime>/<anime> - <número>.<ext>`.
+
+        Args:
+            name (str): Nombre del anime.
+            number (int): Número del episodio.
+            media_url (str): URL del fichero de vídeo (de la que se toma la extensión; los streams
+                HLS se guardan como `.ts`).
+
+        Returns:
+            str: Ruta de destino.
+        """
+        folder:str = re.sub(r'[\\/:*?"<>|]+', "", name).strip() or "anime"
+        extension:str = ".ts" if _is_hls(url=media_url) else os.path.splitext(urlsplit(media_url).path)[1] or ".mp4"
+        return os.path.join(self.__cfg.output_dir, folder, f"{folder} - {number:03d}{extension}")
+
+    def __limiters(self, url:str) -> List[BandwidthLimiter]:
+        """
+        Devuelve los límites de ancho de banda que se aplican a una descarga.
+
+        Args:
+            url (str): URL del fichero.
+
+        Returns:
+            List[BandwidthLimiter]: Límite global y del host (los que estén configurados).
+        """
+        limiters:List[BandwidthLimiter] = [self.__bandwidth] if self.__bandwidth is not None else []
+        if self.__cfg.host_bandwidth:
+            host:str = urlsplit(url).netloc
+            with self.__condition:
+                if host not in self.__hostBandwidth:
+                    self.__hostBandwidth[host] = BandwidthLimiter(rate=self.__cfg.host_bandwidth)
+                limiters.append(self.__hostBandwidth[host])
+        return limiters
+
+
+# ---- FUNCIONES ---- #
+def _is_hls(url:str) -> bool:
+    """
+    Indica si la URL de un fichero de vídeo es una lista HLS.
+
+    Args:
+        url (str): URL del fichero de vídeo.
+
+    Returns:
+        bool: `True` si la ruta acaba en `.m3u8`.
+    """
+    return urlsplit(url).path.lower().endswith(".m3u8")
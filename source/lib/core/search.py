@@ -0,0 +1,321 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: search.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-02
+# · Descripción: Módulo con el buscador federado que consulta todas las webs a la vez.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Set, Tuple
+from time import perf_counter
+from asyncio import CancelledError, Task, as_completed, create_task, run, wait_for
+
+from lib.common.network import close_async_session
+from lib.core.anime import AnimeManager
+from lib.core.matching import TitleGroup, TitleMatcher
+
+
+# ---- CLASES ---- #
+class SiteResult:
+    """
+    Resultado de la búsqueda en una web concreta.
+
+    Attributes:
+        Site (str): Nombre de la web.
+        Results (List[Tuple[str, str]]): Resultados obtenidos (nombre, URL).
+        Error (Optional[BaseException]): Error producido o `None` si la búsqueda fue correcta.
+        Elapsed (float): Tiempo (en segundos) que tardó la web en responder.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, site:str, results:List[Tuple[str, str]], error:Optional[BaseException], elapsed:float):
+        """
+        Inicializa la instancia.
+
+        Args:
+            site (str): Nombre de la web.
+            results (List[Tuple[str, str]]): Resultados obtenidos (nombre, URL).
+            error (Optional[BaseException]): Error producido o `None` si la búsqueda fue correcta.
+            elapsed (float): Tiempo (en segundos) que tardó la web en responder.
+        """
+        # Inicializa las propiedades.
+        self.__site:str = site
+        self.__results:List[Tuple[str, str]] = results
+        self.__error:Optional[BaseException] = error
+        self.__elapsed:float = elapsed
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        state:str = f"{len(self.Results)} animes" if self.Ok else f"ERROR: {self.Error!r}"
+        return f"{self.Site} -> {state} ({self.Elapsed:.2f}s)"
+
+
+    # -- Propiedades -- #
+    @property
+    def Site(self) -> str:
+        """
+        Devuelve el nombre de la web.
+
+        Returns:
+            str: Nombre de la web.
+        """
+        return self.__site
+
+    @property
+    def Results(self) -> List[Tuple[str, str]]:
+        """
+        Devuelve los resultados obtenidos.
+
+        Returns:
+            List[Tuple[str, str]]: Resultados obtenidos (nombre, URL).
+        """
+        return self.__results
+
+    @property
+    def Error(self) -> Optional[BaseException]:
+        """
+        Devuelve el error producido.
+
+        Returns:
+            Optional[BaseException]: Error producido o `None` si la búsqueda fue correcta.
+        """
+        return self.__error
+
+    @property
+    def Elapsed(self) -> float:
+        """
+        Devuelve el tiempo que tardó la web en responder.
+
+        Returns:
+            float: Tiempo en segundos.
+        """
+        return self.__elapsed
+
+    @property
+    def Ok(self) -> bool:
+        """
+        Indica si la búsqueda terminó correctamente.
+
+        Returns:
+            bool: `True` si no hubo error.
+        """
+        return self.__error is None
+
+
+class FederatedSearch:
+    """
+    Buscador que envía la misma consulta a todos los managers registrados a la vez. Cada web
+    tiene su propio tiempo límite, de forma que una web lenta o caída no retrasa al resto:
+    los resultados se entregan según va respondiendo cada una.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, timeout:float=10.0):
+        """
+        Inicializa la instancia.
+
+        Args:
+            timeout (float): Tiempo límite (en segundos) por defecto de cada web.
+        """
+        # Inicializa las propiedades.
+        self.__timeout:float = timeout
+        self.__sites:Dict[str, Tuple[AnimeManager, float]] = {}
+
+
+    # -- Propiedades -- #
+    @property
+    def Sites(self) -> List[str]:
+        """
+        Devuelve los nombres de las webs registradas.
+
+        Returns:
+            List[str]: Nombres de las webs registradas.
+        """
+        return list(self.__sites)
+
+
+    # -- Métodos -- #
+    def register(self, site:str, manager:AnimeManager, timeout:Optional[float]=None) -> None:
+        """
+        Registra un manager en el buscador.
+
+        Args:
+            site (str): Nombre de la web.
+            manager (AnimeManager): Manager de la web.
+            timeout (Optional[float]): Tiempo límite (en segundos) de la web. Si es `None` se
+                usa el tiempo límite por defecto.
+        """
+        self.__sites[site] = (manager, self.__timeout if timeout is None else timeout)
+
+    def unregister(self, site:str) -> None:
+        """
+        Elimina un manager del buscador.
+
+        Args:
+            site (str): Nombre de la web.
+        """
+        self.__sites.pop(site, None)
+
+    async def stream(self, name:str) -> AsyncIterator[SiteResult]:
+        """
+        Busca el anime en todas las webs a la vez y devuelve el resultado de cada una en
+        cuanto responde. Las webs que fallan o superan su tiempo límite devuelven un
+        `SiteResult` con el error en lugar de interrumpir la búsqueda.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+
+        Yields:
+            SiteResult: Resultado de cada web, en orden de llegada.
+        """
+        # Lanza todas las búsquedas.
+        tasks:List[Task] = [create_task(self.__query(site, manager, timeout, name))
+                            for site, (manager, timeout) in self.__sites.items()]
+        try:
+            # Entrega los resultados según terminan.
+            for task in as_completed(tasks):
+                yield await task
+        finally:
+            # Cancela las búsquedas pendientes si el consumidor deja de iterar.
+            for task in tasks:
+                task.cancel()
+
+    async def async_search(self, name:str) -> List[Tuple[str, str]]:
+        """
+        Busca el anime en todas las webs a la vez y une los resultados en un único listado,
+        eliminando las URLs repetidas.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+
+        Returns:
+            List[Tuple[str, str]]: El listado con la información encontrada.
+        """
+        # Variables.
+        results:List[Tuple[str, str]] = []
+        seen:Set[str] = set()
+
+        # Une los resultados de cada web.
+        async for site_result in self.stream(name=name):
+            for title, url in site_result.Results:
+                key:str = normalize_url(url=url)
+                if key not in seen:
+                    seen.add(key)
+                    results.append((title, url))
+
+        # Retorna el resultado.
+        return results
+
+    def search(self, name:str) -> List[Tuple[str, str]]:
+        """
+        Versión síncrona de `async_search`. No debe llamarse desde un bucle de eventos.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+
+        Returns:
+            List[Tuple[str, str]]: El listado con la información encontrada.
+        """
+        return run(self.__closing(self.async_search(name=name)))
+
+    async def async_search_groups(self, name:str, matcher:Optional[TitleMatcher]=None) -> List[TitleGroup]:
+        """
+        Busca el anime en todas las webs a la vez y agrupa los resultados que corresponden al
+        mismo anime en una única entrada con la URL de cada web.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+            matcher (Optional[TitleMatcher]): Emparejador de títulos (por defecto, el de `MatchConfig`).
+
+        Returns:
+            List[TitleGroup]: Grupos, empezando por los de la primera web registrada.
+        """
+        # Reúne los resultados en el orden de registro de las webs (no en el de llegada).
+        results:Dict[str, List[Tuple[str, str]]] = {site: [] for site in self.__sites}
+        async for site_result in self.stream(name=name):
+            results[site_result.Site] = site_result.Results
+
+        # Retorna los grupos.
+        return (matcher or TitleMatcher()).group(results=results)
+
+    def search_groups(self, name:str, matcher:Optional[TitleMatcher]=None) -> List[TitleGroup]:
+        """
+        Versión síncrona de `async_search_groups`. No debe llamarse desde un bucle de eventos.
+
+        Args:
+            name (str): El nombre del anime a buscar.
+            matcher (Optional[TitleMatcher]): Emparejador de títulos.
+
+        Returns:
+            List[TitleGroup]: Grupos de resultados.
+        """
+        return run(self.__closing(self.async_search_groups(name=name, matcher=matcher)))
+
+
+    # -- Métodos privados -- #
+    @staticmethod
+    async def __closing(coroutine:Awaitable[Any]) -> Any:
+        """
+        Ejecuta una corrutina y después cierra el cliente asíncrono compartido, que queda
+        ligado al bucle de eventos que `asyncio.run` cierra al terminar.
+
+        Args:
+            coroutine (Awaitable[Any]): Corrutina a ejecutar.
+
+        Returns:
+            Any: El resultado de la corrutina.
+        """
+        try:
+            return await coroutine
+        finally:
+            await close_async_session()
+
+    @staticmethod
+    async def __query(site:str, manager:AnimeManager, timeout:float, name:str) -> SiteResult:
+        """
+        Realiza la búsqueda en una web respetando su tiempo límite.
+
+        Args:
+            site (str): Nombre de la web.
+            manager (AnimeManager): Manager de la web.
+            timeout (float): Tiempo límite en segundos.
+            name (str): El nombre del anime a buscar.
+
+        Returns:
+            SiteResult: Resultado de la web.
+        """
+        start:float = perf_counter()
+        try:
+            results:List[Tuple[str, str]] = await wait_for(manager.async_find_animes(name), timeout=timeout)
+            return SiteResult(site=site, results=results, error=None, elapsed=perf_counter() - start)
+        except CancelledError:
+            raise
+        except Exception as ex:
+            return SiteResult(site=site, results=[], error=ex, elapsed=perf_counter() - start)
+
+
+# ---- FUNCIONES ---- #
+def normalize_url(url:str) -> str:
+    """
+    Normaliza una URL para poder comparar resultados de distintas webs.
+
+    Args:
+        url (str): URL a normalizar.
+
+    Returns:
+        str: URL normalizada.
+
+    Examples:
+        - 'HTTPS://www3.AnimeFlv.net/anime/dragon-ball/' -> 'https://www3.animeflv.net/anime/dragon-ball'.
+    """
+    # Separa el esquema y el host (no distinguen mayúsculas) del resto de la URL.
+    scheme, _, rest = url.strip().partition("://")
+    host, _, path = rest.partition("/")
+
+    # Genera la URL normalizada.
+    return f"{scheme.lower()}://{host.lower()}/{path}".rstrip("/")
@@ -0,0 +1,183 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: sites.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-22
+# · Descripción: Módulo con el registro de webs. Cada web se registra con la ruta de su
+# manager y de su configuración, que solo se importan cuando se usa la web (así el arranque
+# no carga la pila de red y de análisis del HTML).
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from importlib import import_module
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from lib.core.anime import AnimeManager
+
+
+# ---- VARIABLES ---- #
+ENTRY_POINT_GROUP:str = "anime_downloader.sites"        # Grupo de entry points de las webs externas.
+_sites:Dict[str, Tuple[str, Optional[str]]] = {         # Web -> (manager, configuración) como "módulo:nombre".
+    "animeflv": ("lib.core.anime_flv.anime:AnimeFlvManager", "lib.config.schema:AnimeFlvConfig"),
+    "animefenix": ("lib.core.anime_fenix.anime:AnimeFenixManager", "lib.config.schema:AnimeFenixConfig"),
+}
+_discovered:bool = False
+
+
+# ---- CLASES ---- #
+class UnknownSiteError(Exception):
+    """
+    Excepción lanzada cuando se pide una web que no está registrada.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, *args):
+        """
+        Inicializa la instancia.
+        """
+        super().__init__(*args)
+
+
+# ---- FUNCIONES ---- #
+def register_site(site:str, manager:str, config:Optional[str]=None) -> None:
+    """
+    Registra (o reemplaza) una web.
+
+    Args:
+        site (str): Identificador de la web.
+        manager (str): Clase del manager como "módulo:Clase". Se construye con `cfg=` si se
+            indica una configuración.
+        config (Optional[str]): Clase de configuración como "módulo:Clase" (con `base_url`).
+    """
+    _sites[site] = (manager, config)
+
+
+def available_sites() -> List[str]:
+    """
+    Devuelve las webs registradas, incluidas las de los paquetes instalados que declaran un
+    entry point en `ENTRY_POINT_GROUP`.
+
+    Returns:
+        List[str]: Identificadores de las webs.
+    """
+    _discover()
+    return list(_sites)
+
+
+def site_config(site:str) -> Optional[Any]:
+    """
+    Devuelve la configuración de una web sin importar su manager.
+
+    Args:
+        site (str): Identificador de la web.
+
+    Raises:
+        UnknownSiteError: Si la web no está registrada.
+
+    Returns:
+        Optional[Any]: Instancia de la configuración o `None` si la web no tiene.
+    """
+    config:Optional[str] = _entry(site=site)[1]
+    return _load(target=config)() if config else None
+
+
+def site_for_url(url:str) -> Optional[str]:
+    """
+    Devuelve la web a la que pertenece una URL comparando su host con el `base_url` y los
+    `mirrors` de la configuración de cada web.
+
+    Args:
+        url (str): URL de una página de la web.
+
+    Returns:
+        Optional[str]: Identificador de la web o `None` si ninguna coincide.
+    """
+    host:str = urlsplit(url).netloc.lower()
+    while True:
+        # Busca primero entre las webs ya registradas y solo después en los entry points.
+        for site in list(_sites):
+            cfg:Optional[Any] = site_config(site=site)
+            if cfg is not None and host in (urlsplit(base).netloc.lower() for base in (cfg.base_url,) + tuple(getattr(cfg, "mirrors", ()))):
+                return site
+        if _discovered:
+            return None
+        _discover()
+
+
+def create_manager(site:str, **kwargs) -> "AnimeManager":
+    """
+    Importa el manager de una web y crea una instancia con su configuración.
+
+    Args:
+        site (str): Identificador de la web.
+        kwargs: Argumentos adicionales del manager (`store`, `catalog`, ...).
+
+    Raises:
+        UnknownSiteError: Si la web no está registrada.
+
+    Returns:
+        AnimeManager: Manager de la web.
+    """
+    manager, config = _entry(site=site)
+    if config:
+        kwargs.setdefault("cfg", _load(target=config)())
+    return _load(target=manager)(**kwargs)
+
+
+def _entry(site:str) -> Tuple[str, Optional[str]]:
+    """
+    Devuelve el registro de una web, buscando en los entry points si no es una web propia.
+
+    Args:
+        site (str): Identificador de la web.
+
+    Raises:
+        UnknownSiteError: Si la web no está registrada.
+
+    Returns:
+        Tuple[str, Optional[str]]: Manager y configuración como "módulo:nombre".
+    """
+    if site not in _sites:
+        _discover()
+    if site not in _sites:
+        raise UnknownSiteError(f"Unknown site '{site}'. Available: {', '.join(_sites)}.")
+    return _sites[site]
+
+
+def _discover() -> None:
+    """
+    Registra (una sola vez) las webs declaradas como entry points. Cada entry point apunta a
+    la clase del manager, que se construye con su configuración por defecto.
+    """
+    global _discovered
+    if _discovered:
+        return
+    _discovered = True
+
+    # Importa `importlib.metadata` solo si hace falta: es lento de cargar.
+    from importlib.metadata import entry_points
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:
+        found = entry_points().get(ENTRY_POINT_GROUP, [])
+    for entry_point in found:
+        _sites.setdefault(entry_point.name, (entry_point.value, None))
+
+
+def _load(target:str) -> Any:
+    """
+    Importa un objeto a partir de su ruta "módulo:nombre" (el nombre puede contener puntos).
+
+    Args:
+        target (str): Ruta del objeto.
+
+    Returns:
+        Any: El objeto importado.
+    """
+    module, _, name = target.partition(":")
+    value:Any = import_module(module)
+    for attribute in name.split("."):
+        value = getattr(value, attribute)
+    return value
@@ -0,0 +1,233 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: store.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-06
+# · Descripción: Módulo con el almacén local de animes y búsquedas ya procesados.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import json
+import sqlite3
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from time import time
+from threading import Lock
+
+from lib.config.schema import StoreConfig
+from lib.core.anime import Anime, Episode
+
+
+# ---- CLASES ---- #
+class AnimeStore:
+    """
+    Almacén local (SQLite) de los animes cargados con `load_anime` y de los listados
+    obtenidos con `find_animes`. Las entradas se identifican por la web y la URL, de forma
+    que un proceso puede responder a animes ya conocidos sin volver a descargar ni procesar
+    la página, incluso después de reiniciarse.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, path:str=StoreConfig.path):
+        """
+        Inicializa la instancia.
+
+        Args:
+            path (str): Ruta del fichero del almacén.
+        """
+        # Inicializa las propiedades.
+        self.__lock:Lock = Lock()
+
+        # Abre (o crea) la base de datos.
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.__db:sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("""
+            CREATE TABLE IF NOT EXISTS animes (
+                site        TEXT NOT NULL,
+                url         TEXT NOT NULL,
+                name        TEXT NOT NULL,
+                description TEXT NOT NULL,
+                themes      TEXT NOT NULL,
+                stored_at   REAL NOT NULL,
+                episodes    TEXT NOT NULL DEFAULT '[]',
+                PRIMARY KEY (site, url)
+            )""")
+        # Añade la columna de episodios a los almacenes creados antes de que existiera.
+        if "episodes" not in [row[1] for row in self.__db.execute("PRAGMA table_info(animes)")]:
+            self.__db.execute("ALTER TABLE animes ADD COLUMN episodes TEXT NOT NULL DEFAULT '[]'")
+        self.__db.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                site        TEXT NOT NULL,
+                url         TEXT NOT NULL,
+                results     TEXT NOT NULL,
+                stored_at   REAL NOT NULL,
+                PRIMARY KEY (site, url)
+            )""")
+        self.__db.commit()
+
+
+    # -- Métodos de animes -- #
+    def get_anime(self, site:str, url:str, max_age:Optional[float]=None) -> Optional[Anime]:
+        """
+        Obtiene un anime almacenado.
+
+        Args:
+            site (str): Identificador de la web.
+            url (str): URL de la página inicial del Anime.
+            max_age (Optional[float]): Antigüedad máxima (en segundos). Si es `None` no se comprueba.
+
+        Returns:
+            Optional[Anime]: El anime o `None` si no existe o es demasiado antiguo.
+        """
+        return self.get_animes(site=site, urls=[url], max_age=max_age).get(url)
+
+    def get_animes(self, site:str, urls:Iterable[str], max_age:Optional[float]=None) -> Dict[str, Anime]:
+        """
+        Obtiene varios animes almacenados con una única consulta.
+
+        Args:
+            site (str): Identificador de la web.
+            urls (Iterable[str]): URLs de las páginas iniciales de los animes.
+            max_age (Optional[float]): Antigüedad máxima (en segundos). Si es `None` no se comprueba.
+
+        Returns:
+            Dict[str, Anime]: Animes encontrados indexados por URL. Las URLs que no existen o son
+                demasiado antiguas no aparecen.
+        """
+        # Variable a devolver.
+        animes:Dict[str, Anime] = {}
+
+        # Consulta las URLs por bloques (SQLite limita el número de parámetros).
+        urls = list(urls)
+        min_stored_at:float = time() - max_age if max_age is not None else float("-inf")
+        with self.__lock:
+            for start in range(0, len(urls), 500):
+                chunk:List[str] = urls[start:start + 500]
+                rows = self.__db.execute(
+                    f"SELECT url, name, description, themes, episodes FROM animes WHERE site = ? AND stored_at >= ? "
+                    f"AND url IN ({','.join('?' * len(chunk))})", (site, min_stored_at, *chunk)).fetchall()
+                for url, name, description, themes, episodes in rows:
+                    animes[url] = Anime(name=name, description=description, themes=json.loads(themes),
+                                        episodes=[Episode(number=number, url=episode_url) for number, episode_url in json.loads(episodes)])
+
+        # Retorna los animes.
+        return animes
+
+    def put_anime(self, site:str, url:str, anime:Anime) -> None:
+        """
+        Almacena un anime.
+
+        Args:
+            site (str): Identificador de la web.
+            url (str): URL de la página inicial del Anime.
+            anime (Anime): Anime a almacenar.
+        """
+        self.put_animes(site=site, animes=[(url, anime)])
+
+    def put_animes(self, site:str, animes:Iterable[Tuple[str, Anime]]) -> None:
+        """
+        Almacena varios animes en una única transacción.
+
+        Args:
+            site (str): Identificador de la web.
+            animes (Iterable[Tuple[str, Anime]]): Pares (URL, anime) a almacenar.
+        """
+        now:float = time()
+        rows = [(site, url, anime.Name, anime.Description, json.dumps(anime.Themes), now,
+                 json.dumps([(episode.Number, episode.Url) for episode in anime.Episodes])) for url, anime in animes]
+        with self.__lock:
+            self.__db.executemany("INSERT OR REPLACE INTO animes (site, url, name, description, themes, stored_at, episodes) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.__db.commit()
+
+    def stale_urls(self, site:str, urls:Iterable[str], max_age:float) -> List[str]:
+        """
+        Devuelve las URLs que no están almacenadas o cuyo anime es demasiado antiguo.
+
+        Args:
+            site (str): Identificador de la web.
+            urls (Iterable[str]): URLs a comprobar.
+            max_age (float): Antigüedad máxima en segundos.
+
+        Returns:
+            List[str]: URLs que hay que volver a cargar, en el orden recibido.
+        """
+        urls = list(urls)
+        fresh:Dict[str, Anime] = self.get_animes(site=site, urls=urls, max_age=max_age)
+        return [url for url in urls if url not in fresh]
+
+    def is_stale(self, site:str, url:str, max_age:float) -> bool:
+        """
+        Indica si un anime no está almacenado o es demasiado antiguo.
+
+        Args:
+            site (str): Identificador de la web.
+            url (str): URL de la página inicial del Anime.
+            max_age (float): Antigüedad máxima en segundos.
+
+        Returns:
+            bool: `True` si hay que volver a cargarlo.
+        """
+        return bool(self.stale_urls(site=site, urls=[url], max_age=max_age))
+
+
+    # -- Métodos de búsquedas -- #
+    def get_search(self, site:str, url:str, max_age:Optional[float]=None) -> Optional[List[Tuple[str, str]]]:
+        """
+        Obtiene el listado almacenado de una búsqueda.
+
+        Args:
+            site (str): Identificador de la web.
+            url (str): URL de la búsqueda.
+            max_age (Optional[float]): Antigüedad máxima (en segundos). Si es `None` no se comprueba.
+
+        Returns:
+            Optional[List[Tuple[str, str]]]: El listado o `None` si no existe o es demasiado antiguo.
+        """
+        min_stored_at:float = time() - max_age if max_age is not None else float("-inf")
+        with self.__lock:
+            row = self.__db.execute("SELECT results FROM searches WHERE site = ? AND url = ? AND stored_at >= ?",
+                                    (site, url, min_stored_at)).fetchone()
+        return [tuple(result) for result in json.loads(row[0])] if row is not None else None
+
+    def put_search(self, site:str, url:str, results:List[Tuple[str, str]]) -> None:
+        """
+        Almacena el listado de una búsqueda.
+
+        Args:
+            site (str): Identificador de la web.
+            url (str): URL de la búsqueda.
+            results (List[Tuple[str, str]]): Listado obtenido.
+        """
+        with self.__lock:
+            self.__db.execute("INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?)", (site, url, json.dumps(results), time()))
+            self.__db.commit()
+
+
+    # -- Métodos -- #
+    def purge(self, max_age:float) -> int:
+        """
+        Elimina las entradas más antiguas que la antigüedad dada.
+
+        Args:
+            max_age (float): Antigüedad máxima en segundos.
+
+        Returns:
+            int: Número de entradas eliminadas.
+        """
+        min_stored_at:float = time() - max_age
+        with self.__lock:
+            removed:int = self.__db.execute("DELETE FROM animes WHERE stored_at < ?", (min_stored_at,)).rowcount
+            removed += self.__db.execute("DELETE FROM searches WHERE stored_at < ?", (min_stored_at,)).rowcount
+            self.__db.commit()
+        return removed
+
+    def close(self) -> None:
+        """
+        Cierra la base de datos.
+        """
+        with self.__lock:
+            self.__db.close()
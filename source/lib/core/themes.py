@@ -0,0 +1,302 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: themes.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-21
+# · Descripción: Módulo con el registro de temas (cada tema es un bit) y el índice por temas
+# que permite filtrar catálogos enteros con operaciones de bits.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import sys
+
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+from threading import Lock
+
+
+# ---- VARIABLES ---- #
+T = TypeVar("T")
+_BYTE_BITS:Tuple[Tuple[int, ...], ...] = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+# ---- CLASES ---- #
+class ThemeRegistry:
+    """
+    Asigna a cada tema un identificador (su bit), de forma que el conjunto de temas de un anime
+    se guarda como un único entero (bitset) y el nombre de cada tema existe una sola vez en
+    memoria, sea cual sea el número de animes que lo tengan.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self):
+        """
+        Inicializa la instancia.
+        """
+        # Inicializa las propiedades.
+        self.__ids:Dict[str, int] = {}
+        self.__names:List[str] = []
+        self.__lock:Lock = Lock()
+
+    def __len__(self) -> int:
+        """
+        Devuelve el número de temas registrados.
+
+        Returns:
+            int: Número de temas.
+        """
+        return len(self.__names)
+
+
+    # -- Propiedades -- #
+    @property
+    def Names(self) -> List[str]:
+        """
+        Devuelve los temas registrados.
+
+        Returns:
+            List[str]: Temas, en orden de identificador.
+        """
+        return list(self.__names)
+
+
+    # -- Métodos -- #
+    def id(self, name:str) -> int:
+        """
+        Devuelve el identificador de un tema, registrándolo si es nuevo.
+
+        Args:
+            name (str): Nombre del tema.
+
+        Returns:
+            int: Identificador (posición del bit) del tema.
+        """
+        theme_id:Optional[int] = self.__ids.get(name)
+        if theme_id is None:
+            with self.__lock:
+                theme_id = self.__ids.get(name)
+                if theme_id is None:
+                    theme_id = len(self.__names)
+                    name = sys.intern(name)
+                    self.__names.append(name)
+                    self.__ids[name] = theme_id
+        return theme_id
+
+    def ids(self, names:Iterable[str]) -> Tuple[int, ...]:
+        """
+        Devuelve los identificadores de unos temas en el orden dado (sin repetir ninguno),
+        registrando los nuevos.
+
+        Args:
+            names (Iterable[str]): Nombres de los temas.
+
+        Returns:
+            Tuple[int, ...]: Identificadores de los temas.
+        """
+        return tuple(dict.fromkeys(self.id(name=name) for name in names))
+
+    def name(self, theme_id:int) -> str:
+        """
+        Devuelve el nombre de un tema registrado.
+
+        Args:
+            theme_id (int): Identificador del tema.
+
+        Returns:
+            str: Nombre del tema.
+        """
+        return self.__names[theme_id]
+
+    def find(self, name:str) -> Optional[int]:
+        """
+        Devuelve el identificador de un tema sin registrarlo.
+
+        Args:
+            name (str): Nombre del tema.
+
+        Returns:
+            Optional[int]: Identificador o `None` si el tema no está registrado.
+        """
+        return self.__ids.get(name)
+
+    def mask(self, names:Iterable[str]) -> int:
+        """
+        Genera el bitset de un conjunto de temas, registrando los nuevos.
+
+        Args:
+            names (Iterable[str]): Nombres de los temas.
+
+        Returns:
+            int: Bitset con un bit por tema.
+        """
+        mask:int = 0
+        for name in names:
+            mask |= 1 << self.id(name=name)
+        return mask
+
+    def names(self, mask:int) -> List[str]:
+        """
+        Devuelve los nombres de los temas de un bitset.
+
+        Args:
+            mask (int): Bitset de temas.
+
+        Returns:
+            List[str]: Nombres de los temas, en orden de identificador.
+        """
+        names:List[str] = []
+        while mask:
+            low:int = mask & -mask
+            names.append(self.__names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+
+class ThemeIndex(Generic[T]):
+    """
+    Índice por temas de un catálogo. Guarda una columna de bits por tema (el bit `i` indica si
+    el elemento `i` tiene el tema), por lo que un filtro como "Acción y Comedia pero no Terror"
+    sobre todo el catálogo se resuelve con unas pocas operaciones AND/OR/NOT entre enteros,
+    en lugar de recorrer los elementos uno a uno.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, registry:Optional[ThemeRegistry]=None):
+        """
+        Inicializa la instancia.
+
+        Args:
+            registry (Optional[ThemeRegistry]): Registro de temas (por defecto el global `THEMES`).
+        """
+        # Inicializa las propiedades.
+        self.__registry:ThemeRegistry = registry if registry is not None else THEMES
+        self.__items:List[T] = []
+        self.__columns:List[bytearray] = []         # Bits de cada tema (se convierten a entero al filtrar).
+        self.__cache:Dict[int, int] = {}            # Columnas ya convertidas a entero.
+
+    def __len__(self) -> int:
+        """
+        Devuelve el número de elementos indexados.
+
+        Returns:
+            int: Número de elementos.
+        """
+        return len(self.__items)
+
+
+    # -- Métodos -- #
+    def add(self, item:T, mask:int) -> int:
+        """
+        Añade un elemento al índice.
+
+        Args:
+            item (T): Elemento (por ejemplo, un `Anime` o su URL).
+            mask (int): Bitset de temas del elemento (`Anime.ThemeMask`).
+
+        Returns:
+            int: Posición del elemento en el índice.
+        """
+        row:int = len(self.__items)
+        self.__items.append(item)
+        self.__cache.clear()
+        while mask:
+            low:int = mask & -mask
+            theme_id:int = low.bit_length() - 1
+            while len(self.__columns) <= theme_id:
+                self.__columns.append(bytearray())
+            column:bytearray = self.__columns[theme_id]
+            if len(column) <= row >> 3:
+                column.extend(bytes((row >> 3) + 1 - len(column)))
+            column[row >> 3] |= 1 << (row & 7)
+            mask ^= low
+        return row
+
+    def extend(self, items:Iterable[Tuple[T, int]]) -> None:
+        """
+        Añade varios elementos al índice.
+
+        Args:
+            items (Iterable[Tuple[T, int]]): Pares (elemento, bitset de temas).
+        """
+        for item, mask in items:
+            self.add(item=item, mask=mask)
+
+    def filter(self, all_of:Iterable[str]=(), any_of:Iterable[str]=(), none_of:Iterable[str]=()) -> List[T]:
+        """
+        Devuelve los elementos que cumplen un filtro de temas.
+
+        Args:
+            all_of (Iterable[str]): Temas que deben tener todos.
+            any_of (Iterable[str]): Temas de los que deben tener al menos uno (si se indica alguno).
+            none_of (Iterable[str]): Temas que no deben tener.
+
+        Returns:
+            List[T]: Elementos que cumplen el filtro, en orden de inserción.
+        """
+        bits:int = self.__match(all_of=all_of, any_of=any_of, none_of=none_of)
+        rows:List[int] = []
+        for index, value in enumerate(bits.to_bytes((len(self.__items) + 7) // 8, "little")):
+            if value:
+                rows.extend((index << 3) + bit for bit in _BYTE_BITS[value])
+        return [self.__items[row] for row in rows]
+
+    def count(self, all_of:Iterable[str]=(), any_of:Iterable[str]=(), none_of:Iterable[str]=()) -> int:
+        """
+        Cuenta los elementos que cumplen un filtro de temas (ver `filter`).
+
+        Args:
+            all_of (Iterable[str]): Temas que deben tener todos.
+            any_of (Iterable[str]): Temas de los que deben tener al menos uno.
+            none_of (Iterable[str]): Temas que no deben tener.
+
+        Returns:
+            int: Número de elementos.
+        """
+        return bin(self.__match(all_of=all_of, any_of=any_of, none_of=none_of)).count("1")
+
+
+    # -- Métodos privados -- #
+    def __column(self, name:str) -> int:
+        """
+        Devuelve la columna de un tema como entero.
+
+        Args:
+            name (str): Nombre del tema.
+
+        Returns:
+            int: Bits de los elementos con el tema (0 si el tema no existe).
+        """
+        theme_id:Optional[int] = self.__registry.find(name=name)
+        if theme_id is None or theme_id >= len(self.__columns):
+            return 0
+        column:Optional[int] = self.__cache.get(theme_id)
+        if column is None:
+            column = self.__cache[theme_id] = int.from_bytes(self.__columns[theme_id], "little")
+        return column
+
+    def __match(self, all_of:Iterable[str], any_of:Iterable[str], none_of:Iterable[str]) -> int:
+        """
+        Calcula los bits de los elementos que cumplen un filtro de temas.
+
+        Args:
+            all_of (Iterable[str]): Temas que deben tener todos.
+            any_of (Iterable[str]): Temas de los que deben tener al menos uno.
+            none_of (Iterable[str]): Temas que no deben tener.
+
+        Returns:
+            int: Bit `i` a 1 si el elemento `i` cumple el filtro.
+        """
+        bits:int = (1 << len(self.__items)) - 1
+        for name in all_of:
+            bits &= self.__column(name=name)
+        any_of = list(any_of)
+        if any_of:
+            union:int = 0
+            for name in any_of:
+                union |= self.__column(name=name)
+            bits &= union
+        for name in none_of:
+            bits &= ~self.__column(name=name)
+        return bits
+
+
+# ---- VARIABLES ---- #
+THEMES:ThemeRegistry = ThemeRegistry()      # Registro de temas compartido por todos los animes.
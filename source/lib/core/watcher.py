@@ -0,0 +1,383 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: watcher.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-06-29
+# · Descripción: Módulo con la vigilancia de nuevos episodios de los animes seguidos: cada
+# anime se comprueba con una petición condicional a su página cuando le toca según su ritmo
+# de estrenos, y los episodios se comparan con los últimos conocidos (guardados en local).
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import json
+import sqlite3
+
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from time import time
+from random import random, uniform
+from threading import Lock
+from asyncio import Event, Semaphore, TimeoutError as AsyncTimeoutError, gather, wait_for
+
+from lib.config.schema import WatchConfig
+from lib.core.anime import Anime, AnimeManager, Episode
+
+
+# ---- CLASES ---- #
+class NewEpisodes:
+    """
+    Episodios nuevos de un anime seguido.
+
+    Attributes:
+        Site (str): Identificador de la web.
+        Url (str): URL de la página del anime.
+        Name (str): Nombre del anime.
+        Episodes (Tuple[Episode, ...]): Episodios nuevos, ordenados por número.
+    """
+    __slots__ = ("__site", "__url", "__name", "__episodes")
+
+
+    # -- Métodos por defecto -- #
+    def __init__(self, site:str, url:str, name:str, episodes:Iterable[Episode]):
+        """
+        Inicializa la instancia.
+
+        Args:
+            site (str): Identificador de la web.
+            url (str): URL de la página del anime.
+            name (str): Nombre del anime.
+            episodes (Iterable[Episode]): Episodios nuevos.
+        """
+        # Inicializa las propiedades.
+        self.__site:str = site
+        self.__url:str = url
+        self.__name:str = name
+        self.__episodes:Tuple[Episode, ...] = tuple(sorted(episodes, key=lambda episode: episode.Number))
+
+    def __repr__(self) -> str:
+        """
+        Devuelve la representación en cadena del objeto.
+
+        Returns:
+            str: Representación en cadena del objeto.
+        """
+        return f"{self.Name} ({self.Site}): {', '.join(str(episode.Number) for episode in self.Episodes)}"
+
+
+    # -- Propiedades -- #
+    @property
+    def Site(self) -> str:
+        """
+        Devuelve la web del anime.
+
+        Returns:
+            str: Identificador de la web.
+        """
+        return self.__site
+
+    @property
+    def Url(self) -> str:
+        """
+        Devuelve la URL de la página del anime.
+
+        Returns:
+            str: URL de la página del anime.
+        """
+        return self.__url
+
+    @property
+    def Name(self) -> str:
+        """
+        Devuelve el nombre del anime.
+
+        Returns:
+            str: Nombre del anime.
+        """
+        return self.__name
+
+    @property
+    def Episodes(self) -> Tuple[Episode, ...]:
+        """
+        Devuelve los episodios nuevos.
+
+        Returns:
+            Tuple[Episode, ...]: Episodios, ordenados por número.
+        """
+        return self.__episodes
+
+
+class EpisodeWatcher:
+    """
+    Vigila los nuevos episodios de los animes seguidos. Los animes, sus episodios conocidos,
+    los validadores de su página (`ETag`/`Last-Modified`) y su calendario se guardan en
+    SQLite, de forma que la vigilancia continúa tras reiniciar el proceso.
+
+    En cada pasada (`check`) solo se comprueban los animes a los que les toca (índice por
+    fecha de la siguiente comprobación), con `async_poll_anime`: una página sin cambios
+    cuesta una respuesta 304 sin cuerpo y no se procesa. El intervalo de cada anime se adapta
+    a su ritmo de estrenos (media exponencial del tiempo entre episodios nuevos): lejos del
+    siguiente estreno esperado se espera hasta que se acerca, alrededor de él se comprueba
+    cada `min_interval` y, si se retrasa, el intervalo crece poco a poco hasta `max_interval`.
+    Los intervalos llevan una variación aleatoria para que las comprobaciones no se
+    concentren.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, managers:Iterable[AnimeManager], cfg:WatchConfig=WatchConfig()):
+        """
+        Inicializa la instancia.
+
+        Args:
+            managers (Iterable[AnimeManager]): Managers de las webs, indexados por su `Site`.
+            cfg (WatchConfig): Configuración de la vigilancia.
+        """
+        # Inicializa las propiedades.
+        self.__managers:Dict[str, AnimeManager] = {manager.Site: manager for manager in managers}
+        self.__cfg:WatchConfig = cfg
+        self.__lock:Lock = Lock()
+
+        # Abre (o crea) la base de datos.
+        if os.path.dirname(cfg.path):
+            os.makedirs(os.path.dirname(cfg.path), exist_ok=True)
+        self.__db:sqlite3.Connection = sqlite3.connect(cfg.path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("""
+            CREATE TABLE IF NOT EXISTS series (
+                site        TEXT NOT NULL,
+                url         TEXT NOT NULL,
+                name        TEXT,
+                episodes    TEXT,
+                validators  TEXT NOT NULL DEFAULT '{}',
+                interval    REAL NOT NULL,
+                cadence     REAL,
+                last_change REAL,
+                next_check  REAL NOT NULL,
+                checked_at  REAL,
+                errors      INTEGER NOT NULL DEFAULT 0,
+                error       TEXT,
+                PRIMARY KEY (site, url)
+            )""")
+        self.__db.execute("CREATE INDEX IF NOT EXISTS series_next_check ON series (next_check)")
+        self.__db.commit()
+
+    def __enter__(self) -> "EpisodeWatcher":
+        """
+        Devuelve la propia instancia al entrar en el contexto.
+
+        Returns:
+            EpisodeWatcher: La propia instancia.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Cierra la base de datos al salir del contexto.
+        """
+        self.close()
+
+
+    # -- Métodos -- #
+    def follow(self, site:str, url:str) -> None:
+        """
+        Sigue un anime. La primera comprobación, repartida al azar en el primer
+        `min_interval`, guarda sus episodios sin avisar de ellos.
+
+        Args:
+            site (str): Identificador de la web (`AnimeManager.Site`).
+            url (str): URL de la página del anime.
+
+        Raises:
+            KeyError: Si no hay manager para la web.
+        """
+        if site not in self.__managers:
+            raise KeyError(f"No manager for site '{site}'.")
+        with self.__lock:
+            self.__db.execute("INSERT OR IGNORE INTO series (site, url, interval, next_check) VALUES (?, ?, ?, ?)",
+                              (site, url, self.__cfg.initial_interval, time() + random() * self.__cfg.min_interval))
+            self.__db.commit()
+
+    def unfollow(self, site:str, url:str) -> None:
+        """
+        Deja de seguir un anime.
+
+        Args:
+            site (str): Identificador de la web.
+            url (str): URL de la página del anime.
+        """
+        with self.__lock:
+            self.__db.execute("DELETE FROM series WHERE site = ? AND url = ?", (site, url))
+            self.__db.commit()
+
+    def followed(self) -> List[Tuple[str, str, Optional[str], float]]:
+        """
+        Devuelve los animes seguidos.
+
+        Returns:
+            List[Tuple[str, str, Optional[str], float]]: Web, URL, nombre (si ya se ha
+                comprobado) y momento (epoch) de la siguiente comprobación, por web y nombre.
+        """
+        with self.__lock:
+            return self.__db.execute("SELECT site, url, name, next_check FROM series ORDER BY site, name, url").fetchall()
+
+    def next_check(self) -> Optional[float]:
+        """
+        Devuelve el momento de la siguiente comprobación.
+
+        Returns:
+            Optional[float]: Epoch o `None` si no se sigue ningún anime.
+        """
+        with self.__lock:
+            return self.__db.execute("SELECT MIN(next_check) FROM series").fetchone()[0]
+
+    async def check(self, now:Optional[float]=None) -> List[NewEpisodes]:
+        """
+        Comprueba los animes a los que les toca (como mucho `batch`, los más atrasados primero),
+        con `concurrency` peticiones a la vez.
+
+        Args:
+            now (Optional[float]): Momento de la comprobación (por defecto, el actual).
+
+        Returns:
+            List[NewEpisodes]: Animes con episodios nuevos.
+        """
+        # Obtiene los animes a comprobar.
+        now = time() if now is None else now
+        with self.__lock:
+            rows = self.__db.execute("SELECT site, url, name, episodes, validators, interval, cadence, last_change, errors "
+                                     "FROM series WHERE next_check <= ? ORDER BY next_check LIMIT ?",
+                                     (now, self.__cfg.batch)).fetchall()
+
+        # Los comprueba.
+        semaphore:Semaphore = Semaphore(max(1, self.__cfg.concurrency))
+
+        async def check_one(row:tuple) -> Optional[NewEpisodes]:
+            async with semaphore:
+                return await self.__check(row=row, now=now)
+
+        results:List[Optional[NewEpisodes]] = await gather(*[check_one(row) for row in rows])
+        return [result for result in results if result is not None]
+
+    async def run(self, on_new:Callable[[NewEpisodes], Union[None, Awaitable[None]]], stop:Optional[Event]=None) -> None:
+        """
+        Comprueba los animes indefinidamente, esperando entre pasadas hasta la siguiente
+        comprobación, y llama a `on_new` con cada anime con episodios nuevos.
+
+        Args:
+            on_new (Callable[[NewEpisodes], Union[None, Awaitable[None]]]): Función (o corrutina)
+                llamada con los episodios nuevos.
+            stop (Optional[Event]): Evento que detiene la vigilancia.
+        """
+        stop = stop or Event()
+        while not stop.is_set():
+            # Comprueba los animes a los que les toca.
+            for new in await self.check():
+                result = on_new(new)
+                if result is not None:
+                    await result
+
+            # Espera a la siguiente comprobación (o a que se siga un anime nuevo).
+            due:Optional[float] = self.next_check()
+            delay:float = self.__cfg.min_interval if due is None else min(max(0.0, due - time()), self.__cfg.min_interval)
+            try:
+                await wait_for(stop.wait(), timeout=delay)
+            except AsyncTimeoutError:
+                pass
+
+    def close(self) -> None:
+        """
+        Cierra la base de datos.
+        """
+        with self.__lock:
+            self.__db.close()
+
+
+    # -- Métodos privados -- #
+    async def __check(self, row:tuple, now:float) -> Optional[NewEpisodes]:
+        """
+        Comprueba un anime y actualiza su estado y su calendario.
+
+        Args:
+            row (tuple): Fila del anime (web, URL, nombre, episodios, validadores, intervalo,
+                ritmo, último cambio, errores).
+            now (float): Momento de la comprobación.
+
+        Returns:
+            Optional[NewEpisodes]: Los episodios nuevos o `None` si no hay.
+        """
+        site, url, name, episodes, validators, interval, cadence, last_change, errors = row
+        manager:Optional[AnimeManager] = self.__managers.get(site)
+        if manager is None:
+            return None
+
+        # Hace la petición condicional. Tras un error se reintenta con espera exponencial.
+        try:
+            anime:Optional[Anime]
+            anime, new_validators = await manager.async_poll_anime(url=url, validators=json.loads(validators))
+        except Exception as ex:
+            with self.__lock:
+                self.__db.execute("UPDATE series SET checked_at = ?, errors = errors + 1, error = ?, next_check = ? WHERE site = ? AND url = ?",
+                                  (now, repr(ex), now + min(self.__cfg.min_interval * 2 ** errors, self.__cfg.max_interval), site, url))
+                self.__db.commit()
+            return None
+
+        # Compara los episodios con los conocidos (la primera vez solo se guardan).
+        known:Optional[Dict[int, str]] = {number: episode_url for number, episode_url in json.loads(episodes)} if episodes is not None else None
+        new:List[Episode] = []
+        if anime is not None:
+            name = anime.Name
+            if known is not None:
+                new = [episode for episode in anime.Episodes if episode.Number not in known]
+            known = {**(known or {}), **{episode.Number: episode.Url for episode in anime.Episodes}}
+
+        # Recalcula el calendario.
+        if new:
+            if last_change is not None:
+                gap:float = now - last_change
+                cadence = gap if cadence is None else (1 - self.__cfg.alpha) * cadence + self.__cfg.alpha * gap
+            last_change = now
+        interval = self.__interval(interval=interval, cadence=cadence, last_change=last_change, changed=bool(new), now=now)
+
+        # Guarda el estado.
+        with self.__lock:
+            self.__db.execute("""
+                UPDATE series SET name = ?, episodes = ?, validators = ?, interval = ?, cadence = ?, last_change = ?,
+                next_check = ?, checked_at = ?, errors = 0, error = NULL WHERE site = ? AND url = ?""",
+                              (name, json.dumps(sorted(known.items())) if known is not None else None, json.dumps(new_validators),
+                               interval, cadence, last_change, now + interval * uniform(1 - self.__cfg.jitter, 1 + self.__cfg.jitter),
+                               now, site, url))
+            self.__db.commit()
+
+        # Retorna los episodios nuevos.
+        return NewEpisodes(site=site, url=url, name=name or url, episodes=new) if new else None
+
+    def __interval(self, interval:float, cadence:Optional[float], last_change:Optional[float], changed:bool, now:float) -> float:
+        """
+        Calcula los segundos hasta la siguiente comprobación de un anime.
+
+        Args:
+            interval (float): Intervalo actual.
+            cadence (Optional[float]): Tiempo medio entre estrenos (`None` si aún no se conoce).
+            last_change (Optional[float]): Momento del último episodio nuevo.
+            changed (bool): Si esta comprobación ha encontrado episodios nuevos.
+            now (float): Momento de la comprobación.
+
+        Returns:
+            float: Segundos hasta la siguiente comprobación.
+        """
+        cfg:WatchConfig = self.__cfg
+        if cadence is None or last_change is None:
+            # Sin ritmo conocido: intervalo inicial tras un cambio y cada vez más espaciado sin él.
+            interval = cfg.initial_interval if changed else interval * cfg.backoff
+        else:
+            window:float = cadence * cfg.release_window
+            expected:float = last_change + cadence
+            if now < expected - window:
+                # Espera a que se acerque el siguiente estreno.
+                interval = expected - window - now
+            elif now <= expected + window:
+                # Alrededor del estreno se comprueba a menudo.
+                interval = cfg.min_interval
+            else:
+                # El estreno se retrasa: se espacian las comprobaciones.
+                interval = max(interval, cfg.min_interval) * cfg.backoff
+        return min(max(interval, cfg.min_interval), cfg.max_interval)
@@ -3,32 +3,386 @@
 # · Author: Pablo González García.
 # · Copyright (c) 2025 Pablo González García. All rights reserved.
 # · Created on: 2025-05-07
-# · Descripción: Módulo que contiene la lógica principal del programa.
+# · Descripción: Módulo que contiene la lógica principal del programa: la línea de comandos
+# (`sites`, `search`, `info`, `batch`, `download` y `watch`).
+#
+# Uso (desde `source/`):
+#   python main.py search "dragon ball"
+#   python main.py search "dragon ball" --group
+#   python main.py info https://www3.animeflv.net/anime/dragon-ball --json
+#   python main.py batch titles.txt --concurrency 16 > animes.jsonl
+#   python main.py download https://www3.animeflv.net/anime/dragon-ball --first 1 --last 3
+#   python main.py watch add https://www3.animeflv.net/anime/one-piece-tv
+#   python main.py watch run
+#
+# El arranque solo importa `argparse`: la pila de red y de análisis del HTML y los managers
+# de las webs se importan dentro de cada comando (`benchmarks.run --only startup` lo mide).
 # ----------------------------------------------------------------------------------------
 
 
 # ---- MÓDULOS ---- #
-from lib.common.label import print_header
+import sys
 
+from typing import Dict, List, Optional, TYPE_CHECKING
+from argparse import ArgumentParser, Namespace
 
-# ---- LÓGICA PRINCIPAL ---- #
-if __name__ == "__main__":
+if TYPE_CHECKING:
+    from lib.core.anime import AnimeManager
+
+
+# ---- FUNCIONES ---- #
+def build_parser() -> ArgumentParser:
+    """
+    Genera el analizador de la línea de comandos.
+
+    Returns:
+        ArgumentParser: Analizador con los subcomandos.
+    """
+    parser:ArgumentParser = ArgumentParser(prog="anime-downloader", description="Search, inspect and download anime.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the HTTP cache nor the local store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sites:ArgumentParser = commands.add_parser("sites", help="List the available sites.")
+    sites.set_defaults(handler=command_sites)
+
+    search:ArgumentParser = commands.add_parser("search", help="Search an anime in every site at once.")
+    search.add_argument("name", help="Name of the anime.")
+    search.add_argument("--site", action="append", help="Only search this site (repeatable).")
+    search.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for each site.")
+    search.add_argument("--json", action="store_true", help="Print one JSON object per result.")
+    search.add_argument("--group", action="store_true", help="Merge the results of the same anime on different sites.")
+    search.set_defaults(handler=command_search)
+
+    info:ArgumentParser = commands.add_parser("info", help="Show the details of an anime.")
+    info.add_argument("url", help="URL of the anime page.")
+    info.add_argument("--site", help="Site of the URL (default: guessed from the host).")
+    info.add_argument("--json", action="store_true", help="Print the anime as JSON.")
+    info.set_defaults(handler=command_info)
+
+    batch:ArgumentParser = commands.add_parser("batch", help="Load many animes (titles or URLs, one per line) as JSON lines.")
+    batch.add_argument("input", nargs="?", default="-", help="File with one title or URL per line (default: stdin).")
+    batch.add_argument("--site", action="append", help="Only search titles in this site (repeatable, in order).")
+    batch.add_argument("--concurrency", type=int, default=8, help="Items processed at once.")
+    batch.add_argument("--output", default="-", help="Output JSONL file (default: stdout).")
+    batch.set_defaults(handler=command_batch)
+
+    download:ArgumentParser = commands.add_parser("download", help="Download episodes of an anime.")
+    download.add_argument("url", help="URL of the anime page.")
+    download.add_argument("--site", help="Site of the URL (default: guessed from the host).")
+    download.add_argument("--first", type=int, default=1, help="First episode.")
+    download.add_argument("--last", type=int, default=None, help="Last episode (default: the last published).")
+    download.add_argument("--output", default=None, help="Output directory.")
+    download.add_argument("--workers", type=int, default=None, help="Episodes downloaded at once.")
+    download.add_argument("--priority", type=int, default=0, help="Priority in the persistent queue.")
+    download.set_defaults(handler=command_download)
+
+    watch:ArgumentParser = commands.add_parser("watch", help="Follow animes and report new episodes.")
+    watch.add_argument("action", choices=["add", "remove", "list", "run"], help="Follow, unfollow, list or watch the followed animes.")
+    watch.add_argument("url", nargs="*", help="URLs of the anime pages (add/remove).")
+    watch.add_argument("--site", help="Site of the URLs (default: guessed from the host).")
+    watch.add_argument("--once", action="store_true", help="Check the animes that are due once and exit (run).")
+    watch.add_argument("--json", action="store_true", help="Print one JSON object per new episode (run).")
+    watch.set_defaults(handler=command_watch)
+
+    return parser
+
+
+def create_managers(sites:List[str], cache:bool=True) -> Dict[str, "AnimeManager"]:
+    """
+    Crea los managers de las webs indicadas (importando solo sus módulos) y activa la caché
+    HTTP y el almacén local.
+
+    Args:
+        sites (List[str]): Identificadores de las webs.
+        cache (bool): Si se usan la caché HTTP y el almacén local.
+
+    Returns:
+        Dict[str, AnimeManager]: Managers indexados por web.
+    """
+    from lib.core.sites import create_manager, site_config
+
+    if not cache:
+        return {site: create_manager(site=site) for site in sites}
+
+    from lib.common.cache import HttpCache, ttl_rules_for
+    from lib.common.network import configure_cache
+    from lib.core.store import AnimeStore
+
+    # Activa la caché HTTP persistente.
+    configs:list = [cfg for cfg in (site_config(site=site) for site in sites) if cfg is not None]
+    configure_cache(HttpCache(ttl_rules=ttl_rules_for(*configs)))
+
+    # Crea los managers con el almacén compartido.
+    store:AnimeStore = AnimeStore()
+    return {site: create_manager(site=site, store=store) for site in sites}
+
+
+def resolve_site(url:str, site:Optional[str]) -> str:
+    """
+    Devuelve la web de una URL (la indicada o la deducida de su host).
+
+    Args:
+        url (str): URL de la página del anime.
+        site (Optional[str]): Web indicada por el usuario.
+
+    Raises:
+        SystemExit: Si no se indicó la web y no se puede deducir.
+
+    Returns:
+        str: Identificador de la web.
+    """
+    from lib.core.sites import site_for_url
+
+    site = site or site_for_url(url=url)
+    if site is None:
+        raise SystemExit(f"error: cannot guess the site of {url}; use --site.")
+    return site
+
+
+def command_sites(args:Namespace) -> int:
+    """
+    Imprime las webs disponibles.
+
+    Args:
+        args (Namespace): Argumentos de la línea de comandos.
+
+    Returns:
+        int: Código de salida.
+    """
+    from lib.core.sites import available_sites
+
+    for site in available_sites():
+        print(site)
+    return 0
+
+
+def command_search(args:Namespace) -> int:
+    """
+    Busca un anime en las webs seleccionadas e imprime los resultados según responde cada una
+    o, con `--group`, un resultado por anime con la URL de cada web.
+
+    Args:
+        args (Namespace): Argumentos de la línea de comandos.
 
-    # -- Flujo principal -- #
-    print_header("Anime-Downloader")            # Imprime el título.
+    Returns:
+        int: Código de salida (1 si todas las webs fallaron).
+    """
+    from asyncio import run
+    from lib.core.sites import available_sites
 
+    async def search() -> int:
+        import json
+        from lib.common.network import close_async_session
+        from lib.core.search import FederatedSearch
 
-    from lib.core.anime_fenix.anime import AnimeFenixManager
-    from lib.core.anime_flv.anime import AnimeFlvManager
+        # Registra las webs en el buscador.
+        federated:FederatedSearch = FederatedSearch(timeout=args.timeout)
+        for site, manager in create_managers(sites=args.site or available_sites(), cache=not args.no_cache).items():
+            federated.register(site, manager)
 
+        try:
+            # Imprime los resultados según responde cada web (o los reúne para agruparlos).
+            failed:int = 0
+            results:Dict[str, list] = {site: [] for site in federated.Sites}
+            async for result in federated.stream(args.name):
+                if not result.Ok:
+                    failed += 1
+                    print(f"{result.Site}: {result.Error!r}", file=sys.stderr)
+                    continue
+                results[result.Site] = result.Results
+                if args.group:
+                    continue
+                for title, url in result.Results:
+                    if args.json:
+                        print(json.dumps({"site": result.Site, "name": title, "url": url}, ensure_ascii=False))
+                    else:
+                        print(f"{result.Site}\t{title}\t{url}")
 
-    flv = AnimeFlvManager().find_animes("dragon ball")
-    fenix = AnimeFenixManager().find_animes("dragon ball")
+            # Imprime un resultado por anime con la URL de cada web.
+            if args.group:
+                from lib.core.matching import TitleMatcher
+                for group in TitleMatcher().group(results=results):
+                    if args.json:
+                        print(json.dumps({"name": group.Name, "urls": group.Urls, "titles": group.Titles, "score": round(group.Score, 3)}, ensure_ascii=False))
+                    else:
+                        print("\t".join([group.Name] + [f"{site}={url}" for site, url in group.Urls.items()]))
+            return 1 if results and failed == len(results) else 0
+        finally:
+            await close_async_session()
 
-    print(f"AnimeFlv -> Found: {len(flv)} animes.")
-    print(f"- NAME: {flv[0][0]} URL: {flv[0][1]}")
-    print(f"AnimeFenix -> Found: {len(fenix)} animes.")
-    print(f"- NAME: {fenix[0][0]} URL: {fenix[0][1]}")
+    return run(search())
 
-    print(AnimeFlvManager().load_anime(flv[0][1]))
-    print(AnimeFenixManager().load_anime(fenix[0][1]))
\ No newline at end of file
+
+def command_info(args:Namespace) -> int:
+    """
+    Carga un anime e imprime sus datos.
+
+    Args:
+        args (Namespace): Argumentos de la línea de comandos.
+
+    Returns:
+        int: Código de salida.
+    """
+    site:str = resolve_site(url=args.url, site=args.site)
+    anime = create_managers(sites=[site], cache=not args.no_cache)[site].load_anime(args.url)
+    if args.json:
+        import json
+        from lib.core.batch import anime_record
+        print(json.dumps(anime_record(site=site, url=args.url, anime=anime), ensure_ascii=False))
+    else:
+        print(anime)
+    return 0
+
+
+def command_batch(args:Namespace) -> int:
+    """
+    Procesa un lote de títulos o URLs (uno por línea) y escribe una línea JSON por elemento
+    en cuanto termina, con su índice en la entrada. Los errores se escriben como registros
+    con `error` sin interrumpir el lote.
+
+    Args:
+        args (Namespace): Argumentos de la línea de comandos.
+
+    Returns:
+        int: Código de salida (1 si falló algún elemento).
+    """
+    import json
+    from lib.core.batch import BatchRunner, read_items
+    from lib.core.sites import available_sites
+
+    # Crea los managers de todas las webs (las URLs pueden ser de cualquiera) con las
+    # seleccionadas primero, que son en las que se buscan los títulos.
+    selected:List[str] = args.site or available_sites()
+    managers = create_managers(sites=selected + [site for site in available_sites() if site not in selected], cache=not args.no_cache)
+    runner:BatchRunner = BatchRunner(managers=managers, concurrency=args.concurrency)
+
+    # Procesa la entrada.
+    failed:int = 0
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for record in runner.run(read_items(file=source)):
+            failed += "error" in record
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failed else 0
+
+
+def command_download(args:Namespace) -> int:
+    """
+    Añade los episodios de un anime a la cola persistente de descargas y espera a que se
+    descarguen. Si se interrumpe, lo pendiente se reanuda en la siguiente ejecución.
+
+    Args:
+        args (Namespace): Argumentos de la línea de comandos.
+
+    Returns:
+        int: Código de salida (1 si falló algún episodio).
+    """
+    from lib.config.schema import SchedulerConfig
+    from lib.core.scheduler import DownloadJob, DownloadScheduler
+    from lib.core.sites import available_sites
+
+    # Configura la cola.
+    cfg:SchedulerConfig = SchedulerConfig()
+    if args.output is not None:
+        cfg.output_dir = args.output
+    if args.workers is not None:
+        cfg.workers = args.workers
+
+    # La cola puede tener trabajos pendientes de otras webs, así que se crean todos los managers.
+    site:str = resolve_site(url=args.url, site=args.site)
+    with DownloadScheduler(managers=create_managers(sites=available_sites(), cache=not args.no_cache).values(), cfg=cfg) as scheduler:
+        job_id:int = scheduler.enqueue(site=site, url=args.url, first=args.first, last=args.last, priority=args.priority)
+        scheduler.join()
+        job:DownloadJob = next(job for job in scheduler.jobs() if job.Id == job_id)
+
+    # Imprime el resultado.
+    print(f"{job.Name or job.Url}: {job.Done}/{job.Total} episodes downloaded ({job.Status})")
+    if job.Error:
+        print(job.Error, file=sys.stderr)
+    return 1 if job.Failed or job.Status == "failed" else 0
+
+
+def command_watch(args:Namespace) -> int:
+    """
+    Sigue o deja de seguir animes, los lista o los vigila imprimiendo una línea por cada
+    episodio nuevo según aparecen.
+
+    Args:
+        args (Namespace): Argumentos de la línea de comandos.
+
+    Returns:
+        int: Código de salida.
+    """
+    from lib.core.sites import available_sites
+    from lib.core.watcher import EpisodeWatcher
+
+    with EpisodeWatcher(managers=create_managers(sites=available_sites(), cache=not args.no_cache).values()) as watcher:
+        # Sigue, deja de seguir o lista los animes.
+        if args.action in ("add", "remove"):
+            for url in args.url:
+                site:str = resolve_site(url=url, site=args.site)
+                if args.action == "add":
+                    watcher.follow(site=site, url=url)
+                else:
+                    watcher.unfollow(site=site, url=url)
+            return 0
+        if args.action == "list":
+            from datetime import datetime
+            for site, url, name, next_check in watcher.followed():
+                print(f"{site}\t{name or '?'}\t{url}\t{datetime.fromtimestamp(next_check):%Y-%m-%d %H:%M}")
+            return 0
+
+        # Vigila los animes.
+        from asyncio import run
+        from lib.common.network import close_async_session
+
+        def report(new) -> None:
+            import json
+            for episode in new.Episodes:
+                if args.json:
+                    print(json.dumps({"site": new.Site, "name": new.Name, "number": episode.Number, "url": episode.Url}, ensure_ascii=False))
+                else:
+                    print(f"{new.Site}\t{new.Name}\t{episode.Number}\t{episode.Url}")
+            sys.stdout.flush()
+
+        async def watch() -> None:
+            try:
+                if args.once:
+                    for new in await watcher.check():
+                        report(new)
+                else:
+                    await watcher.run(on_new=report)
+            finally:
+                await close_async_session()
+
+        run(watch())
+    return 0
+
+
+def main(argv:Optional[List[str]]=None) -> int:
+    """
+    Ejecuta el comando indicado en la línea de comandos.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos (por defecto los del proceso).
+
+    Returns:
+        int: Código de salida.
+    """
+    args:Namespace = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return 130
+
+
+# ---- LÓGICA PRINCIPAL ---- #
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: conftest.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Fixtures compartidas de las pruebas.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import pytest
+
+from typing import Iterator
+
+from lib.config.schema import ThrottleConfig
+from lib.common.network import close_session, configure_throttle
+
+from benchmarks.server import FixtureServer
+
+
+# ---- FUNCIONES ---- #
+@pytest.fixture(autouse=True)
+def network() -> Iterator[None]:
+    """
+    Desactiva el control de ritmo por host (el servidor local no lo necesita) y cierra la
+    sesión compartida al terminar cada prueba.
+    """
+    configure_throttle(cfg=None)
+    yield
+    close_session()
+    configure_throttle(cfg=ThrottleConfig())
+
+
+@pytest.fixture
+def server() -> Iterator[FixtureServer]:
+    """
+    Arranca un servidor local de fixtures (con rangos y un fichero binario de 1 MiB).
+    """
+    with FixtureServer(file_size=1024 * 1024) as server:
+        yield server
@@ -0,0 +1,36 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_anime.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la representación compacta de los animes.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from lib.core.anime import Anime
+from lib.core.batch import anime_record
+from lib.core.store import AnimeStore
+from lib.core.themes import THEMES
+
+
+# ---- FUNCIONES ---- #
+def test_themes_keep_page_order() -> None:
+    first:Anime = Anime(name="A", description="", themes=["Acción", "Comedia", "Drama"])
+    second:Anime = Anime(name="B", description="", themes=["Drama", "Tema sin registrar", "Acción", "Drama"])
+
+    assert first.Themes == ["Acción", "Comedia", "Drama"]
+    assert second.Themes == ["Drama", "Tema sin registrar", "Acción"]
+    assert second.has_themes("Acción", "Tema sin registrar")
+    assert second.ThemeMask == THEMES.mask(names=["Acción", "Drama", "Tema sin registrar"])
+    assert anime_record(site="animeflv", url="/anime/b", anime=second)["themes"] == second.Themes
+
+
+def test_store_round_trip_keeps_theme_order(tmp_path) -> None:
+    anime:Anime = Anime(name="A", description="D", themes=["Seinen", "Acción", "Misterio"])
+    store:AnimeStore = AnimeStore(path=str(tmp_path / "store.sqlite"))
+    try:
+        store.put_anime(site="animeflv", url="/anime/a", anime=anime)
+        assert store.get_anime(site="animeflv", url="/anime/a").Themes == ["Seinen", "Acción", "Misterio"]
+    finally:
+        store.close()
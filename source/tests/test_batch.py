@@ -0,0 +1,112 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_batch.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas del procesado por lotes.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import io
+import pytest
+
+from typing import Dict, Iterator, List, Tuple
+from threading import Lock
+
+from lib.config.schema import AnimeFlvConfig
+from lib.core.anime import Anime
+from lib.core.anime_flv.anime import AnimeFlvManager
+from lib.core.batch import BatchRunner, read_items
+
+from benchmarks.server import FixtureServer
+
+
+# ---- CLASES ---- #
+class _Counting:
+    """
+    Envoltorio de un manager que cuenta las búsquedas y las cargas en vuelo.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, manager:AnimeFlvManager):
+        """
+        Inicializa la instancia.
+
+        Args:
+            manager (AnimeFlvManager): Manager real.
+        """
+        self.searches:List[str] = []
+        self.in_flight:int = 0
+        self.max_in_flight:int = 0
+        self.__manager:AnimeFlvManager = manager
+        self.__lock:Lock = Lock()
+
+
+    # -- Métodos -- #
+    def find_animes(self, name:str) -> List[Tuple[str, str]]:
+        """
+        Busca un anime con el manager real.
+        """
+        self.searches.append(name)
+        return self.__manager.find_animes(name)
+
+    def load_anime(self, url:str) -> Anime:
+        """
+        Carga un anime con el manager real contando las cargas simultáneas.
+        """
+        with self.__lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return self.__manager.load_anime(url)
+        finally:
+            with self.__lock:
+                self.in_flight -= 1
+
+
+# ---- FUNCIONES ---- #
+@pytest.fixture
+def manager(server:FixtureServer, monkeypatch) -> _Counting:
+    """
+    Genera un manager de AnimeFlv contra el servidor local, cuyas URLs se reconocen como de
+    AnimeFlv.
+    """
+    flv, _ = server.configs()
+    monkeypatch.setattr(AnimeFlvConfig, "base_url", flv.base_url)
+    return _Counting(manager=AnimeFlvManager(cfg=flv))
+
+
+def test_records_keep_their_line_index_and_errors_do_not_stop_the_batch(server:FixtureServer, manager:_Counting) -> None:
+    lines:str = "\n".join(["Dragon Ball Z", "", f"{server.Url}/flv/anime/naruto", "   ",
+                           "https://example.invalid/anime/naruto", f"{server.Url}/flv/missing/naruto"])
+    records:List[Dict] = sorted(BatchRunner(managers={"animeflv": manager}, concurrency=2).run(read_items(io.StringIO(lines))),
+                                key=lambda record: record["index"])
+
+    # Los títulos se buscan y las URLs se cargan directamente.
+    assert [record["index"] for record in records] == [0, 2, 4, 5]
+    assert (records[0]["input"], records[0]["site"], records[0]["url"]) == ("Dragon Ball Z", "animeflv", f"{server.Url}/flv/anime/dragon-ball-z")
+    assert (records[1]["site"], records[1]["url"]) == ("animeflv", f"{server.Url}/flv/anime/naruto")
+    assert records[0]["name"] == records[1]["name"] and records[1]["episodes"]
+    assert manager.searches == ["Dragon Ball Z"]
+
+    # Los errores se registran y el lote continúa.
+    assert (records[2]["error"], records[2]["input"]) == ("LookupError", "https://example.invalid/anime/naruto")
+    assert records[3]["error"] == "NetworkBadResponseError"
+
+
+def test_concurrency_is_bounded_and_input_is_read_lazily(server:FixtureServer, manager:_Counting) -> None:
+    server.latency = 0.05
+    read:List[int] = []
+
+    def items() -> Iterator[Tuple[int, str]]:
+        for index in range(12):
+            read.append(index)
+            yield index, f"{server.Url}/flv/anime/anime-{index}"
+
+    # Nunca hay más de `concurrency` elementos leídos sin entregar.
+    records:List[Dict] = []
+    for record in BatchRunner(managers={"animeflv": manager}, concurrency=3).run(items()):
+        records.append(record)
+        assert len(read) - len(records) <= 3
+    assert sorted(record["index"] for record in records) == list(range(12))
+    assert manager.max_in_flight == 3
@@ -0,0 +1,88 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_cache.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la caché HTTP persistente.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import hashlib
+
+from time import sleep
+
+from lib.config.schema import CacheConfig
+from lib.common.cache import CacheEntry, HttpCache, ttl_rules_for
+from lib.common.network import configure_cache, get_response
+
+from benchmarks.server import FixtureServer
+
+
+# ---- FUNCIONES ---- #
+def test_not_modified_serves_the_cached_body(server:FixtureServer, tmp_path) -> None:
+    url:str = f"{server.Url}/flv/anime/dragon-ball"
+    etag:str = f'"{hashlib.md5(server.page("/flv/anime/dragon-ball")).hexdigest()}"'
+    cache:HttpCache = HttpCache(path=str(tmp_path / "http.sqlite3"), default_ttl=0.5)
+    configure_cache(cache=cache)
+    try:
+        # Entrada caducada con el ETag vigente: el servidor responde 304 y se usa el cuerpo guardado.
+        cache.put(url=url, content=b"cached body", headers={"ETag": etag})
+        sleep(0.6)
+        stale:CacheEntry = cache.get(url=url)
+        assert not stale.Fresh
+        assert get_response(url=url).content == b"cached body"
+        assert server.requests == 1
+
+        # La revalidación renueva la vigencia: la siguiente petición no llega al servidor.
+        refreshed:CacheEntry = cache.get(url=url)
+        assert refreshed.Fresh and refreshed.FetchedAt > stale.FetchedAt
+        assert get_response(url=url).content == b"cached body"
+        assert server.requests == 1
+    finally:
+        configure_cache(cache=None)
+        cache.close()
+
+
+def test_ttl_rules_match_url_patterns(server:FixtureServer, tmp_path) -> None:
+    flv, fenix = server.configs()
+    cfg:CacheConfig = CacheConfig()
+    cfg.search_ttl, cfg.detail_ttl = 0.0, 60.0
+    cache:HttpCache = HttpCache(path=str(tmp_path / "http.sqlite3"), ttl_rules=ttl_rules_for(flv, fenix, cfg=cfg), default_ttl=5.0)
+    configure_cache(cache=cache)
+    try:
+        assert cache.ttl_for(url=f"{flv.query_url}dragon") == 0.0
+        assert cache.ttl_for(url=f"{fenix.base_url}/dragon-ball") == 60.0
+        assert cache.ttl_for(url=f"{server.Url}/files/video.mp4") == 5.0
+
+        # Las búsquedas se revalidan siempre y las fichas se sirven desde la caché.
+        for _ in range(3):
+            get_response(url=f"{flv.query_url}dragon")
+            get_response(url=f"{flv.base_url}/anime/dragon-ball")
+        assert server.requests == 4
+    finally:
+        configure_cache(cache=None)
+        cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(server:FixtureServer, tmp_path) -> None:
+    server.hls_segments = 4
+    cache:HttpCache = HttpCache(path=str(tmp_path / "http.sqlite3"), max_bytes=3 * server.hls_segment_size, default_ttl=60.0)
+    configure_cache(cache=cache)
+    try:
+        urls = [f"{server.Url}/hls/low/{index}.ts" for index in range(4)]
+        for url in urls[:3]:
+            get_response(url=url)
+            sleep(0.01)
+
+        # El primer segmento se vuelve a usar, así que el expulsado es el segundo.
+        get_response(url=urls[0])
+        sleep(0.01)
+        get_response(url=urls[3])
+        assert server.requests == 4
+        assert cache.size() == 3 * server.hls_segment_size
+        assert cache.get(url=urls[1]) is None
+        assert all(cache.get(url=url) is not None for url in (urls[0], urls[2], urls[3]))
+    finally:
+        configure_cache(cache=None)
+        cache.close()
@@ -0,0 +1,63 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_catalog.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas del catálogo local y de su rastreo incremental.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Dict, List
+
+from lib.core.anime_flv.anime import AnimeFlvManager
+from lib.core.catalog import CatalogCrawler, CatalogIndex, build_catalog, load_states, save_states
+
+from benchmarks.server import FixtureServer
+
+
+# ---- FUNCIONES ---- #
+def _urls(state:Dict) -> List[str]:
+    """
+    Devuelve las URLs de un estado de rastreo en orden.
+    """
+    return [url for page in state["pages"] for _, url in page["entries"]]
+
+
+def test_index_roundtrip(tmp_path) -> None:
+    states:Dict[str, Dict] = {
+        "animeflv": {"pages": [{"entries": [["Dragon Ball", "https://flv/dragon-ball"], ["Naruto Shippuden", "https://flv/naruto"]]}]},
+        "animefenix": {"pages": [{"entries": [["Dragon Ball Súper", "https://fenix/dbs"], ["Naruto", "https://flv/naruto"]]}]},
+    }
+    save_states(states=states, path=str(tmp_path / "catalog.json"))
+    built:CatalogIndex = build_catalog(states=load_states(path=str(tmp_path / "catalog.json")))
+    built.save(path=str(tmp_path / "catalog.idx"))
+
+    # El índice mapeado responde igual que el construido en memoria.
+    loaded:CatalogIndex = CatalogIndex.load(path=str(tmp_path / "catalog.idx"))
+    try:
+        assert len(loaded) == len(built) == 3
+        for query in ("dragon ball", "naruto", "dragon ball super"):
+            assert loaded.search(name=query) == built.search(name=query)
+        assert loaded.search(name="Dragon Ball Super")[0] == ("Dragon Ball Súper", "https://fenix/dbs")
+        assert loaded.search(name="dragon", site="animefenix") == [("Dragon Ball Súper", "https://fenix/dbs")]
+        assert loaded.has_site("animeflv") and not loaded.has_site("other")
+    finally:
+        loaded.close()
+
+
+def test_incremental_crawl_stops_at_known_titles(server:FixtureServer) -> None:
+    server.catalog = [f"Anime {number}" for number in range(200, 0, -1)]
+    flv, _ = server.configs()
+    crawler:CatalogCrawler = CatalogCrawler(manager=AnimeFlvManager(cfg=flv), cfg=flv)
+
+    # El primer rastreo recorre todo el directorio (10 páginas y el 404 final).
+    state:Dict = crawler.crawl()
+    assert len(_urls(state)) == 200 and server.requests == 11
+
+    # Un título nuevo desplaza todas las entradas, pero solo se vuelven a pedir dos páginas.
+    server.catalog.insert(0, "Anime 201")
+    server.requests = 0
+    refreshed:Dict = crawler.crawl(state=state, stop_after_unchanged=2)
+    assert server.requests == 2
+    assert _urls(refreshed) == [f"{server.Url}/flv/anime/anime-{number}" for number in range(201, 0, -1)]
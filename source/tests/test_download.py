@@ -0,0 +1,104 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_download.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la descarga de ficheros por rangos y su reanudación.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import json
+import pytest
+
+from typing import List, Optional
+
+from lib.config.schema import DownloadConfig
+from lib.common.download import download_file
+
+from benchmarks.server import FixtureServer
+
+
+# ---- CLASES ---- #
+class _Interrupted(Exception):
+    """
+    Excepción que simula la interrupción del proceso durante una descarga.
+    """
+
+
+# ---- FUNCIONES ---- #
+def _config() -> DownloadConfig:
+    """
+    Genera una configuración que divide el fichero de 1 MiB en 4 rangos.
+    """
+    cfg:DownloadConfig = DownloadConfig()
+    cfg.connections = 4
+    cfg.chunk_size = 16 * 1024
+    cfg.min_segment_size = 64 * 1024
+    cfg.state_interval = 0.0
+    return cfg
+
+
+def test_ranged_download(server:FixtureServer, tmp_path) -> None:
+    path:str = str(tmp_path / "video.mp4")
+    download_file(url=f"{server.Url}/files/video.mp4", path=path, cfg=_config())
+
+    with open(path, "rb") as file:
+        assert file.read() == server.file
+    assert not os.path.exists(f"{path}.part")
+    assert not os.path.exists(f"{path}.part.json")
+    # Sondeo del tamaño y una petición por rango.
+    assert server.requests == 1 + 4
+
+
+def test_interrupted_connection_is_resumed(server:FixtureServer, tmp_path) -> None:
+    path:str = str(tmp_path / "video.mp4")
+    server.drops = 3
+    download_file(url=f"{server.Url}/files/video.mp4", path=path, cfg=_config())
+
+    with open(path, "rb") as file:
+        assert file.read() == server.file
+    # Cada corte obliga a pedir el resto de su rango.
+    assert server.drops == 0
+    assert server.requests == 1 + 4 + 3
+
+
+def test_interrupted_download_resumes_from_state(server:FixtureServer, tmp_path) -> None:
+    path:str = str(tmp_path / "video.mp4")
+    url:str = f"{server.Url}/files/video.mp4"
+
+    # Interrumpe la descarga tras recibir 256 KiB.
+    def interrupt(downloaded:int, size:Optional[int]) -> None:
+        if downloaded >= 256 * 1024:
+            raise _Interrupted()
+
+    with pytest.raises(_Interrupted):
+        download_file(url=url, path=path, cfg=_config(), progress=interrupt)
+    with open(f"{path}.part.json", "r", encoding="utf-8") as file:
+        saved:int = sum(segment[2] for segment in json.load(file)["segments"])
+    assert 0 < saved < len(server.file)
+    assert not os.path.exists(path)
+
+    # La siguiente llamada continúa desde lo guardado.
+    seen:List[int] = []
+    download_file(url=url, path=path, cfg=_config(), progress=lambda downloaded, size: seen.append(downloaded))
+    with open(path, "rb") as file:
+        assert file.read() == server.file
+    assert seen[0] > saved
+    assert not os.path.exists(f"{path}.part.json")
+
+
+def test_server_without_ranges_uses_one_connection(tmp_path) -> None:
+    path:str = str(tmp_path / "video.mp4")
+    with FixtureServer(file_size=1024 * 1024, ranges=False) as server:
+        sizes:List[Optional[int]] = []
+        download_file(url=f"{server.Url}/files/video.mp4", path=path, cfg=_config(),
+                      progress=lambda downloaded, size: sizes.append(size))
+
+        with open(path, "rb") as file:
+            assert file.read() == server.file
+        # Sondeo del tamaño y una única descarga completa.
+        assert server.requests == 2
+        assert set(sizes) == {len(server.file)}
+        assert not os.path.exists(f"{path}.part.json")
@@ -0,0 +1,61 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_extract.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de los esquemas de extracción con cada motor de HTML.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import pytest
+
+from lib.config.schema import AnimeFlvSchema
+from lib.common import parser
+from lib.common.parser import AUTO, ParserError, available_backends, parse_html
+from lib.common.extract import Extractor
+
+from benchmarks.server import FIXTURES_DIR
+
+
+# ---- VARIABLES ---- #
+_DEEP:str = (
+    "<html><body><h1 class='Title'>Deep</h1>"
+    + "<p><b>" * 1500
+    + "<nav class='Nvgnrs'><a>Acción</a><a>Drama</a></nav>"
+    + "<div class='Description'><p>Texto</p></div></body></html>"
+)
+
+
+# ---- FUNCIONES ---- #
+@pytest.mark.parametrize("backend", available_backends())
+def test_deeply_nested_page(backend:str) -> None:
+    record:dict = Extractor(fields=AnimeFlvSchema.anime).extract(html=parse_html(_DEEP, backend=backend))
+    assert record["name"] == "Deep"
+    assert record["themes"] == ["Acción", "Drama"]
+    assert record["description"] == "Texto"
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_extract_the_same_records(backend:str) -> None:
+    with open(f"{FIXTURES_DIR}/animeflv/search.html", "rb") as file:
+        markup:bytes = file.read()
+    schema:Extractor = Extractor(fields=AnimeFlvSchema.search, item=AnimeFlvSchema.search_item)
+    expected:list = schema.extract_items(html=parse_html(markup, backend="html.parser"))
+    assert expected
+    assert schema.extract_items(html=parse_html(markup, backend=backend)) == expected
+
+
+def test_installed_backends_are_looked_up_once(monkeypatch) -> None:
+    available_backends()
+
+    def find_spec(module:str):
+        raise AssertionError(f"find_spec({module!r}) called again")
+
+    # Las páginas siguientes (y la comprobación de `configure_parser`) usan el resultado guardado.
+    monkeypatch.setattr(parser, "find_spec", find_spec)
+    assert parse_html("<ul class='ListAnimes'><li>a</li></ul>", backend=AUTO) is not None
+    parser.configure_parser(backend=available_backends()[-1])
+    parser.configure_parser(backend=AUTO)
+    with pytest.raises(ParserError):
+        parser.configure_parser(backend="missing")
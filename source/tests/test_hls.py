@@ -0,0 +1,156 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_hls.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la descarga de streams HLS contra el servidor local.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import json
+import pytest
+
+from typing import Iterator, List, Optional
+from time import sleep
+
+from lib.config.schema import HlsConfig
+from lib.common.download import DownloadError
+from lib.common.hls import download_hls, parse_media
+
+from benchmarks.server import FixtureServer
+
+
+# ---- CLASES ---- #
+class _Interrupted(Exception):
+    """
+    Excepción que simula la interrupción del proceso durante una descarga.
+    """
+
+
+# ---- FUNCIONES ---- #
+@pytest.fixture
+def hls_server() -> Iterator[FixtureServer]:
+    """
+    Arranca un servidor local con un stream HLS de 20 segmentos de 32 KiB.
+    """
+    with FixtureServer(hls_segments=20, hls_segment_size=32 * 1024) as server:
+        yield server
+
+
+def _config() -> HlsConfig:
+    """
+    Genera una configuración con varios segmentos en curso a la vez.
+    """
+    cfg:HlsConfig = HlsConfig()
+    cfg.workers = 4
+    cfg.window = 8
+    cfg.state_interval = 0.0
+    return cfg
+
+
+def _expected(server:FixtureServer) -> bytes:
+    """
+    Genera el contenido esperado de la variante de mayor calidad.
+    """
+    return b"".join(server.hls_segment(variant="high", index=index) for index in range(server.hls_segments))
+
+
+def _segment_requests(server:FixtureServer) -> List[str]:
+    """
+    Registra las rutas de los segmentos pedidos al servidor, retrasando los pares para que
+    los segmentos terminen de descargarse desordenados.
+    """
+    paths:List[str] = []
+    page = server.page
+
+    def delayed(path:str) -> Optional[bytes]:
+        if path.endswith(".ts"):
+            paths.append(path)
+            if int(path.rsplit("/", 1)[1][:-len(".ts")]) % 2 == 0:
+                sleep(0.02)
+        return page(path=path)
+
+    server.page = delayed
+    return paths
+
+
+def test_segments_are_written_in_order(hls_server:FixtureServer, tmp_path) -> None:
+    path:str = str(tmp_path / "episode.ts")
+    paths:List[str] = _segment_requests(server=hls_server)
+    written:List[int] = []
+    download_hls(url=f"{hls_server.Url}/hls/master.m3u8", path=path, cfg=_config(),
+                 progress=lambda done, total: written.append(done))
+
+    with open(path, "rb") as file:
+        assert file.read() == _expected(server=hls_server)
+    assert written == list(range(1, hls_server.hls_segments + 1))
+    assert len(paths) == hls_server.hls_segments
+    assert not os.path.exists(f"{path}.part.json")
+
+
+def test_interrupted_download_resumes_after_last_segment(hls_server:FixtureServer, tmp_path) -> None:
+    path:str = str(tmp_path / "episode.ts")
+    url:str = f"{hls_server.Url}/hls/master.m3u8"
+
+    # Interrumpe la descarga tras escribir 5 segmentos.
+    def interrupt(done:int, total:Optional[int]) -> None:
+        if done == 5:
+            raise _Interrupted()
+
+    with pytest.raises(_Interrupted):
+        download_hls(url=url, path=path, cfg=_config(), progress=interrupt)
+    with open(f"{path}.part.json", "r", encoding="utf-8") as file:
+        assert json.load(file)["done"] == 5
+
+    # La siguiente llamada solo pide los segmentos que faltan.
+    paths:List[str] = _segment_requests(server=hls_server)
+    written:List[int] = []
+    download_hls(url=url, path=path, cfg=_config(), progress=lambda done, total: written.append(done))
+    with open(path, "rb") as file:
+        assert file.read() == _expected(server=hls_server)
+    assert written[0] == 6
+    assert sorted(paths) == sorted(f"/hls/high/{index}.ts" for index in range(5, hls_server.hls_segments))
+
+
+def test_playlist_is_retried_after_a_transient_error(hls_server:FixtureServer, tmp_path) -> None:
+    path:str = str(tmp_path / "episode.ts")
+    hls_server.drops = 1
+    download_hls(url=f"{hls_server.Url}/hls/master.m3u8", path=path, cfg=_config())
+
+    with open(path, "rb") as file:
+        assert file.read() == _expected(server=hls_server)
+    assert hls_server.drops == 0
+
+
+def test_encrypted_segments_are_decrypted(tmp_path) -> None:
+    pytest.importorskip("cryptography")
+    path:str = str(tmp_path / "episode.ts")
+    with FixtureServer(hls_segments=12, hls_segment_size=10000, hls_key=bytes(range(16))) as server:
+        download_hls(url=f"{server.Url}/hls/master.m3u8", path=path, cfg=_config())
+
+        with open(path, "rb") as file:
+            assert file.read() == _expected(server=server)
+
+
+def test_parse_media_reads_keys_and_ivs() -> None:
+    text:str = "\n".join([
+        "#EXTM3U", "#EXT-X-MEDIA-SEQUENCE:7",
+        "#EXTINF:4,", "plain.ts",
+        '#EXT-X-KEY:METHOD=AES-128,URI="k1.bin"', "#EXTINF:4,", "a.ts",
+        '#EXT-X-KEY:METHOD=AES-128,URI="/k2.bin",IV=0x0000000000000000000000000000ABCD', "#EXTINF:4,", "b.ts",
+        "#EXT-X-KEY:METHOD=NONE", "#EXTINF:4,", "c.ts",
+    ])
+    plain, first, second, last = parse_media(text=text, url="http://host/hls/index.m3u8")
+    assert plain.Key is None and plain.Iv is None
+    assert first.Key == "http://host/hls/k1.bin"
+    assert first.Iv == (8).to_bytes(16, "big")
+    assert second.Key == "http://host/k2.bin"
+    assert second.Iv == bytes.fromhex("abcd").rjust(16, b"\x00")
+    assert last.Key is None
+
+
+def test_parse_media_rejects_other_encryptions() -> None:
+    with pytest.raises(DownloadError):
+        parse_media(text='#EXTM3U\n#EXT-X-KEY:METHOD=SAMPLE-AES,URI="k.bin"\n#EXTINF:4,\na.ts\n', url="http://host/index.m3u8")
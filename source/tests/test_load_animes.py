@@ -0,0 +1,144 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_load_animes.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la carga por lotes de animes (`load_animes`).
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import asyncio
+
+from typing import List, Tuple, Union
+from time import sleep
+from threading import Lock
+
+from lib.common.network import NetworkBadResponseError, close_async_session
+from lib.core.anime import Anime
+from lib.core.anime_flv.anime import AnimeFlvManager
+
+from benchmarks.server import FixtureServer
+
+
+# ---- CLASES ---- #
+class _SlowManager(AnimeFlvManager):
+    """
+    Manager de AnimeFlv en el que las primeras URLs tardan más (para que terminen en orden
+    inverso) y que cuenta las cargas en vuelo.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, *args, **kwargs):
+        """
+        Inicializa la instancia.
+        """
+        super().__init__(*args, **kwargs)
+        self.in_flight:int = 0
+        self.max_in_flight:int = 0
+        self.__lock:Lock = Lock()
+
+
+    # -- Métodos -- #
+    def load_anime(self, url:str) -> Anime:
+        """
+        Carga un anime tras una espera que depende de su URL.
+        """
+        self.__enter()
+        try:
+            sleep(self.__delay(url=url))
+            return super().load_anime(url)
+        finally:
+            self.__exit()
+
+    async def async_load_anime(self, url:str) -> Anime:
+        """
+        Versión asíncrona de `load_anime`.
+        """
+        self.__enter()
+        try:
+            await asyncio.sleep(self.__delay(url=url))
+            return await super().async_load_anime(url)
+        finally:
+            self.__exit()
+
+
+    # -- Métodos privados -- #
+    def __delay(self, url:str) -> float:
+        """
+        Devuelve la espera de una URL (`.../anime-<n>` espera menos cuanto mayor es `n`).
+        """
+        return max(0, 6 - int(url.rsplit("-", 1)[-1])) * 0.02
+
+    def __enter(self) -> None:
+        """
+        Cuenta una carga en vuelo.
+        """
+        with self.__lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def __exit(self) -> None:
+        """
+        Descuenta una carga en vuelo.
+        """
+        with self.__lock:
+            self.in_flight -= 1
+
+
+# ---- FUNCIONES ---- #
+def _urls(server:FixtureServer) -> List[str]:
+    """
+    Genera las URLs de prueba; la tercera no existe.
+    """
+    return [f"{server.Url}/flv/{'missing' if index == 2 else 'anime'}/anime-{index}" for index in range(6)]
+
+
+def _manager(server:FixtureServer) -> _SlowManager:
+    """
+    Genera el manager contra el servidor local.
+    """
+    return _SlowManager(cfg=server.configs()[0])
+
+
+def _check(server:FixtureServer, results:List[Tuple[str, Union[Anime, Exception]]]) -> None:
+    """
+    Comprueba que todas las URLs se han cargado salvo la que no existe.
+    """
+    assert sorted(url for url, _ in results) == sorted(_urls(server))
+    for url, result in results:
+        if "/missing/" in url:
+            assert isinstance(result, NetworkBadResponseError) and result.StatusCode == 404
+        else:
+            assert isinstance(result, Anime) and result.Name
+
+
+def test_load_animes_streams_and_bounds_concurrency(server:FixtureServer) -> None:
+    manager:_SlowManager = _manager(server)
+    results = list(manager.load_animes(_urls(server), concurrency=3, return_exceptions=True))
+    _check(server, results)
+    assert [url for url, _ in results] != _urls(server)
+    assert manager.max_in_flight == 3
+
+
+def test_load_animes_can_keep_input_order(server:FixtureServer) -> None:
+    manager:_SlowManager = _manager(server)
+    results = list(manager.load_animes(_urls(server), concurrency=3, return_exceptions=True, ordered=True))
+    _check(server, results)
+    assert [url for url, _ in results] == _urls(server)
+    assert manager.max_in_flight == 3
+
+
+def test_async_load_animes(server:FixtureServer) -> None:
+    async def load(manager:_SlowManager, ordered:bool) -> List[Tuple[str, Union[Anime, Exception]]]:
+        try:
+            return [result async for result in manager.async_load_animes(_urls(server), concurrency=2, return_exceptions=True, ordered=ordered)]
+        finally:
+            await close_async_session()
+
+    # Según terminan y en el orden de entrada; el error no cancela el resto de cargas.
+    for ordered in (False, True):
+        manager:_SlowManager = _manager(server)
+        results = asyncio.run(load(manager=manager, ordered=ordered))
+        _check(server, results)
+        assert ([url for url, _ in results] == _urls(server)) == ordered
+        assert manager.max_in_flight == 2
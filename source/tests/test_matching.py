@@ -0,0 +1,64 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_matching.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas del emparejamiento de títulos entre webs.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Dict, List, Tuple
+
+from lib.core.matching import TitleGroup, TitleMatcher
+
+
+# ---- VARIABLES ---- #
+_RESULTS:Dict[str, List[Tuple[str, str]]] = {
+    "animeflv": [("Shingeki no Kyojin", "flv/snk"), ("Shingeki no Kyojin Season 2", "flv/snk-2"),
+                 ("Dragon Ball Super", "flv/dbs"), ("One Piece Film: Red", "flv/red")],
+    "animefenix": [("Dragon Ball Súper (TV)", "fenix/dbs"), ("Shingeki no Kyojin Season 3", "fenix/snk-3"),
+                   ("Shingeki no Kyojin - Sub", "fenix/snk"), ("Boku no Hero Academia", "fenix/bnha")],
+}
+
+
+# ---- FUNCIONES ---- #
+def _groups() -> Dict[str, TitleGroup]:
+    """
+    Agrupa los resultados de prueba e indexa los grupos por nombre canónico.
+    """
+    return {group.Name: group for group in TitleMatcher().group(results=_RESULTS)}
+
+
+def test_near_duplicates_from_different_sites_are_merged() -> None:
+    groups:Dict[str, TitleGroup] = _groups()
+    assert groups["Dragon Ball Super"].Urls == {"animeflv": "flv/dbs", "animefenix": "fenix/dbs"}
+    assert groups["Shingeki no Kyojin"].Titles == {"animeflv": "Shingeki no Kyojin", "animefenix": "Shingeki no Kyojin - Sub"}
+    assert list(groups) == ["Shingeki no Kyojin", "Shingeki no Kyojin Season 2", "Dragon Ball Super", "One Piece Film: Red",
+                            "Shingeki no Kyojin Season 3", "Boku no Hero Academia"]
+
+
+def test_different_numbers_are_never_merged() -> None:
+    groups:Dict[str, TitleGroup] = _groups()
+    assert groups["Shingeki no Kyojin Season 2"].Urls == {"animeflv": "flv/snk-2"}
+    assert groups["Shingeki no Kyojin Season 3"].Urls == {"animefenix": "fenix/snk-3"}
+    pairs = TitleMatcher(min_similarity=0.0).similarities(left=["Naruto 1", "Naruto"], right=["Naruto 2", "Naruto 01", "Naruto"])
+    assert sorted((index, row) for index, row, _ in pairs) == [(0, 1), (1, 2)]
+
+
+def test_scores_reach_the_threshold() -> None:
+    for min_similarity in (0.6, 0.85, 0.95):
+        matcher:TitleMatcher = TitleMatcher(min_similarity=min_similarity)
+        for group in matcher.group(results=_RESULTS):
+            assert group.Score >= min_similarity
+    merged:TitleGroup = _groups()["Dragon Ball Super"]
+    assert 0.85 <= merged.Score < 1.0
+
+
+def test_prefix_filter_finds_every_pair_above_the_threshold() -> None:
+    titles:List[str] = [title for results in _RESULTS.values() for title, _ in results]
+    everything = TitleMatcher(min_similarity=0.0).similarities(left=titles, right=titles)
+    for min_similarity in (0.3, 0.5, 0.85):
+        expected = [(index, row) for index, row, score in everything if score >= min_similarity]
+        found = TitleMatcher(min_similarity=min_similarity).similarities(left=titles, right=titles)
+        assert sorted((index, row) for index, row, _ in found) == sorted(expected)
@@ -0,0 +1,100 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_mirrors.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de los mirrors de las webs y de la conmutación entre ellos.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import socket
+
+from time import sleep
+
+from lib.config.schema import MirrorConfig, RetryConfig
+from lib.common import mirrors
+from lib.common.cache import HttpCache
+from lib.common.mirrors import MirrorGroup, canonical_url, register_mirrors
+from lib.common.network import configure_cache, get_response, url_join
+
+from benchmarks.server import FixtureServer
+
+
+# ---- VARIABLES ---- #
+_PAGE:str = "/flv/anime/dragon-ball"
+
+
+# ---- FUNCIONES ---- #
+def _config(failures_to_down:int=MirrorConfig.failures_to_down) -> MirrorConfig:
+    """
+    Genera una configuración sin sonda y con un tiempo de espera corto.
+    """
+    cfg:MirrorConfig = MirrorConfig()
+    cfg.probe_interval = 0
+    cfg.cooldown = 0.5
+    cfg.failures_to_down = failures_to_down
+    return cfg
+
+
+def _retry() -> RetryConfig:
+    """
+    Genera una política de reintentos con esperas cortas.
+    """
+    cfg:RetryConfig = RetryConfig()
+    cfg.backoff_base = 0.01
+    return cfg
+
+
+def _dead_origin() -> str:
+    """
+    Devuelve un origen local en el que no escucha nadie.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_server_errors_fail_over_and_recover_after_the_cooldown(server:FixtureServer, monkeypatch) -> None:
+    monkeypatch.setattr(mirrors, "_groups", {})
+    with FixtureServer() as backup:
+        server.status = 503
+        register_mirrors(canonical=server.Url, mirrors=[backup.Url], cfg=_config(failures_to_down=1))
+
+        # El primer mirror responde 503: el reintento va al segundo sin esperar.
+        assert get_response(url=f"{server.Url}{_PAGE}", retry=_retry()).content == backup.page(path=_PAGE)
+        assert (server.requests, backup.requests) == (1, 1)
+
+        # Mientras dura la espera, el mirror caído no recibe peticiones aunque se haya recuperado.
+        server.status = None
+        get_response(url=f"{server.Url}{_PAGE}", retry=_retry())
+        assert (server.requests, backup.requests) == (1, 2)
+
+        # Pasada la espera vuelve a usarse.
+        sleep(0.6)
+        get_response(url=f"{server.Url}{_PAGE}", retry=_retry())
+        assert (server.requests, backup.requests) == (2, 2)
+
+
+def test_refused_connections_fail_over_and_keep_canonical_urls(server:FixtureServer, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(mirrors, "_groups", {})
+    canonical:str = _dead_origin()
+    group:MirrorGroup = register_mirrors(canonical=canonical, mirrors=[server.Url], cfg=_config())
+    cache:HttpCache = HttpCache(path=str(tmp_path / "http.sqlite3"), default_ttl=60.0)
+    configure_cache(cache=cache)
+    try:
+        # Un fallo de conexión aparta el mirror a la primera.
+        assert get_response(url=f"{canonical}{_PAGE}", retry=_retry()).content == server.page(path=_PAGE)
+        assert server.requests == 1
+        assert [mirror.Healthy for mirror in group.Mirrors] == [False, True]
+        assert group.route(url=f"{canonical}{_PAGE}") == f"{server.Url}{_PAGE}"
+
+        # Las URLs de cualquier mirror se guardan y se comparan con el dominio canónico.
+        assert canonical_url(url=f"{server.Url}{_PAGE}") == f"{canonical}{_PAGE}"
+        assert url_join(server.Url, _PAGE) == f"{canonical}{_PAGE}"
+        assert cache.get(url=f"{canonical}{_PAGE}") is not None
+        assert get_response(url=f"{server.Url}{_PAGE}").content == server.page(path=_PAGE)
+        assert server.requests == 1
+    finally:
+        configure_cache(cache=None)
+        cache.close()
@@ -0,0 +1,64 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_partial.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la descarga parcial de páginas (`get_html(until=...)`).
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from lib.common.cache import HttpCache
+from lib.common.network import _PARTIAL_HEADER, _StopScanner, configure_cache, get_response
+
+from benchmarks.server import FixtureServer
+
+
+# ---- VARIABLES ---- #
+_PAGE:str = "/flv/browse?q=dragon"
+_UNTIL:tuple = ('class="ListAnimes', "</ul>")
+
+
+# ---- FUNCIONES ---- #
+def test_body_is_cut_after_the_last_marker(server:FixtureServer) -> None:
+    full:bytes = server.page(path=_PAGE)
+    response = get_response(url=f"{server.Url}{_PAGE}", until=_UNTIL)
+    end:int = full.index(b"</ul>", full.index(b'class="ListAnimes')) + len(b"</ul>")
+    assert response.content == full[:end] and len(response.content) < len(full)
+    assert _PARTIAL_HEADER in response.headers
+
+
+def test_markers_split_across_chunks_are_found() -> None:
+    body:bytes = b"<html><ul class='list'><li>a</li></ul><footer>long footer</footer></html>"
+    end:int = body.index(b"</ul>") + len(b"</ul>")
+    for split in range(1, len(body)):
+        scanner:_StopScanner = _StopScanner(until=("<ul", "</ul>"))
+        done:bool = scanner.feed(chunk=body[:split]) or scanner.feed(chunk=body[split:])
+        assert done and scanner.Body == body[:end]
+
+
+def test_missing_markers_return_the_full_body(server:FixtureServer) -> None:
+    response = get_response(url=f"{server.Url}{_PAGE}", until=('class="ListAnimes', "<not-in-the-page>"))
+    assert response.content == server.page(path=_PAGE)
+    assert _PARTIAL_HEADER not in response.headers
+
+
+def test_partial_bodies_are_not_served_for_full_pages(server:FixtureServer, tmp_path) -> None:
+    cache:HttpCache = HttpCache(path=str(tmp_path / "http.sqlite3"), default_ttl=60.0)
+    configure_cache(cache=cache)
+    try:
+        url:str = f"{server.Url}{_PAGE}"
+        partial:bytes = get_response(url=url, until=_UNTIL).content
+
+        # Con los mismos marcadores se reutiliza el cuerpo cortado.
+        assert get_response(url=url, until=_UNTIL).content == partial
+        assert server.requests == 1
+
+        # La página completa vuelve al servidor y sustituye al cuerpo cortado.
+        assert get_response(url=url).content == server.page(path=_PAGE)
+        assert server.requests == 2
+        assert get_response(url=url).content == server.page(path=_PAGE)
+        assert server.requests == 2
+    finally:
+        configure_cache(cache=None)
+        cache.close()
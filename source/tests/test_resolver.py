@@ -0,0 +1,120 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_resolver.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la caché de URLs de vídeo resueltas.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import pytest
+
+from typing import List, Optional, Tuple
+from time import time
+from threading import Event
+
+from lib.config.schema import ResolverConfig
+from lib.core.anime import Episode, EpisodeSourceError
+from lib.core.resolver import SourceResolver, url_expiry
+
+
+# ---- CLASES ---- #
+class _Manager:
+    """
+    Manager de pruebas: la página de cada episodio enlaza un reproductor (`/player`) que
+    enlaza una URL firmada que caduca a los `ttl` segundos.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, ttl:float=3600):
+        """
+        Inicializa la instancia.
+
+        Args:
+            ttl (float): Segundos de validez de cada URL firmada.
+        """
+        self.ttl:float = ttl
+        self.calls:List[Tuple[str, int]] = []
+        self.broken:bool = False
+        self.gate:Optional[Event] = None
+
+
+    # -- Métodos -- #
+    def resolve_link(self, url:str, hops:int) -> Tuple[str, str]:
+        """
+        Resuelve una página hasta la URL del vídeo.
+        """
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.calls.append((url, hops))
+        if url.endswith("/player"):
+            if self.broken:
+                raise EpisodeSourceError("gone")
+            return f"https://cdn.test/video.mp4?expires={int(time() + self.ttl)}&n={len(self.calls)}", url
+        if hops <= 0:
+            raise EpisodeSourceError("no video")
+        return self.resolve_link(url=f"{url}/player", hops=hops - 1)
+
+
+# ---- FUNCIONES ---- #
+def test_url_expiry_reads_signed_urls() -> None:
+    assert url_expiry(url="https://cdn/v.mp4?Expires=1893456000") == 1893456000
+    assert url_expiry(url="https://cdn/v.mp4?exp=1893456000000") == 1893456000
+    assert url_expiry(url="https://cdn/v.mp4?X-Amz-Date=20300101T000000Z&X-Amz-Expires=600") == 1893456000 + 600
+    assert url_expiry(url="https://cdn/v.mp4?e=42&token=abc") is None
+    assert url_expiry(url="https://cdn/v.mp4") is None
+
+
+def test_fresh_urls_are_served_from_cache() -> None:
+    manager:_Manager = _Manager()
+    resolver:SourceResolver = SourceResolver()
+    episode:Episode = Episode(number=1, url="/ep/1")
+    first:str = resolver.resolve(manager=manager, episode=episode)
+    assert resolver.resolve(manager=manager, episode=episode) == first
+    assert manager.calls == [("/ep/1", 3), ("/ep/1/player", 2)]
+    assert resolver.get(url="/ep/1").Page == "/ep/1/player"
+
+
+def test_expired_urls_only_repeat_the_last_hop() -> None:
+    manager:_Manager = _Manager(ttl=30)
+    resolver:SourceResolver = SourceResolver()
+    episode:Episode = Episode(number=1, url="/ep/1")
+    first:str = resolver.resolve(manager=manager, episode=episode)
+
+    # Caduca dentro del margen: se vuelve a pedir solo el reproductor.
+    manager.calls.clear()
+    assert resolver.resolve(manager=manager, episode=episode) != first
+    assert manager.calls == [("/ep/1/player", 0)]
+
+
+def test_failed_urls_fall_back_to_a_full_resolution() -> None:
+    manager:_Manager = _Manager()
+    resolver:SourceResolver = SourceResolver()
+    episode:Episode = Episode(number=1, url="/ep/1")
+    resolver.resolve(manager=manager, episode=episode)
+
+    # El reproductor ya no lleva al vídeo: se repite la resolución completa.
+    resolver.fail(url="/ep/1")
+    manager.calls.clear()
+    manager.broken = True
+    with pytest.raises(EpisodeSourceError):
+        resolver.resolve(manager=manager, episode=episode)
+    assert manager.calls == [("/ep/1/player", 0), ("/ep/1", 3), ("/ep/1/player", 2)]
+
+
+def test_prefetched_episodes_are_resolved_once() -> None:
+    manager:_Manager = _Manager()
+    manager.gate = Event()
+    resolver:SourceResolver = SourceResolver(cfg=ResolverConfig())
+    episodes:List[Episode] = [Episode(number=number, url=f"/ep/{number}") for number in (1, 2)]
+    try:
+        resolver.prefetch(manager=manager, episodes=episodes)
+        resolver.prefetch(manager=manager, episodes=episodes)
+        manager.gate.set()
+
+        # La llamada espera a la resolución en curso en lugar de repetirla.
+        urls:List[str] = [resolver.resolve(manager=manager, episode=episode) for episode in episodes]
+    finally:
+        resolver.close()
+    assert len(set(urls)) == 2
+    assert sorted(manager.calls) == [("/ep/1", 3), ("/ep/1/player", 2), ("/ep/2", 3), ("/ep/2/player", 2)]
@@ -0,0 +1,118 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_retry.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la política de reintentos y de las peticiones duplicadas.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import pytest
+
+from typing import List, Optional
+from time import monotonic, sleep
+
+from requests import RequestException
+
+from lib.config.schema import RetryConfig
+from lib.common.network import NetworkBadResponseError, get_response
+from lib.common.retry import LatencyWindow, RetryPolicy
+
+from benchmarks.server import FixtureServer
+
+
+# ---- FUNCIONES ---- #
+def _config(**values) -> RetryConfig:
+    """
+    Genera una política de reintentos con esperas cortas.
+    """
+    cfg:RetryConfig = RetryConfig()
+    cfg.backoff_base = 0.01
+    cfg.backoff_max = 0.05
+    for key, value in values.items():
+        setattr(cfg, key, value)
+    return cfg
+
+
+def _stall_once(server:FixtureServer, seconds:float) -> None:
+    """
+    Hace que la siguiente petición al servidor tarde los segundos indicados.
+    """
+    page = server.page
+    stalled:List[bool] = []
+
+    def slow(path:str) -> Optional[bytes]:
+        if not stalled:
+            stalled.append(True)
+            sleep(seconds)
+        return page(path=path)
+
+    server.page = slow
+
+
+def test_rules_use_the_most_specific_status() -> None:
+    policy:RetryPolicy = RetryPolicy(cfg=_config(rules={"503": 5, "5xx": 2, "error": 1}))
+    assert policy.retries_for(status=503) == 5
+    assert policy.retries_for(status=502) == 2
+    assert policy.retries_for(status=None) == 1
+    assert policy.retries_for(status=404) == 0
+
+
+def test_backoff_is_jittered_and_capped() -> None:
+    policy:RetryPolicy = RetryPolicy(cfg=_config())
+    delays:List[float] = [policy.backoff(attempt=10) for _ in range(200)]
+    assert all(0 <= delay <= 0.05 for delay in delays)
+    assert len(set(delays)) > 1
+    assert policy.backoff(attempt=0, retry_after=2.0) == 2.0
+
+
+def test_latency_window_quantile() -> None:
+    window:LatencyWindow = LatencyWindow(size=100)
+    assert window.quantile(q=0.95) is None
+    for latency in range(1, 101):
+        window.add(latency=latency / 100)
+    assert window.quantile(q=0.95, min_samples=20) == 0.96
+
+
+def test_connection_errors_are_retried(server:FixtureServer) -> None:
+    server.drops = 2
+    response = get_response(url=f"{server.Url}/flv/browse?q=one", retry=_config())
+    assert response.status_code == 200
+    assert server.requests == 3
+
+
+def test_client_errors_are_not_retried(server:FixtureServer) -> None:
+    with pytest.raises(NetworkBadResponseError):
+        get_response(url=f"{server.Url}/missing", retry=_config())
+    assert server.requests == 1
+
+
+def test_deadline_stops_retries(server:FixtureServer) -> None:
+    server.drops = 1000
+    start:float = monotonic()
+    with pytest.raises(RequestException):
+        get_response(url=f"{server.Url}/flv/browse?q=one", retry=_config(rules={"error": 1000}, deadline=0.3))
+    assert monotonic() - start < 1.0
+
+
+def test_slow_request_is_hedged(server:FixtureServer) -> None:
+    url:str = f"{server.Url}/flv/browse?q=one"
+    cfg:RetryConfig = _config(hedge=True, hedge_min_samples=5)
+    for _ in range(5):
+        get_response(url=url, retry=cfg)
+
+    # La petición atascada se duplica tras el percentil 95 y responde la copia.
+    _stall_once(server=server, seconds=1.0)
+    start:float = monotonic()
+    assert get_response(url=url, retry=cfg).status_code == 200
+    assert monotonic() - start < 0.5
+    assert server.requests == 5 + 2
+
+
+def test_requests_are_not_hedged_without_samples(server:FixtureServer) -> None:
+    _stall_once(server=server, seconds=0.3)
+    start:float = monotonic()
+    get_response(url=f"{server.Url}/flv/browse?q=one", retry=_config(hedge=True, hedge_min_samples=5))
+    assert monotonic() - start >= 0.3
+    assert server.requests == 1
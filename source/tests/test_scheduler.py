@@ -0,0 +1,191 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_scheduler.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la cola persistente de descargas.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import os
+import sqlite3
+
+from typing import Callable, Dict, List, Optional
+from threading import Event
+
+from lib.config.schema import SchedulerConfig
+from lib.core.anime import Anime, Episode
+from lib.core.scheduler import DownloadJob, DownloadScheduler
+
+from benchmarks.server import FixtureServer
+
+
+# ---- CLASES ---- #
+class _Manager:
+    """
+    Manager de pruebas: cada anime de `animes` tiene los episodios indicados.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, animes:Dict[str, int]):
+        """
+        Inicializa la instancia.
+
+        Args:
+            animes (Dict[str, int]): Número de episodios de cada URL de anime.
+        """
+        self.Site:str = "test"
+        self.__animes:Dict[str, int] = animes
+
+
+    # -- Métodos -- #
+    def load_anime(self, url:str) -> Anime:
+        """
+        Genera el anime de una URL.
+
+        Args:
+            url (str): URL de la página del anime.
+
+        Returns:
+            Anime: El anime con sus episodios.
+        """
+        episodes:List[Episode] = [Episode(number=number, url=f"{url}/{number}") for number in range(1, self.__animes[url] + 1)]
+        return Anime(name=url.strip("/").replace("/", " "), description="", themes=[], episodes=episodes)
+
+
+# ---- FUNCIONES ---- #
+def _config(tmp_path, workers:int=2) -> SchedulerConfig:
+    """
+    Genera una configuración con la cola y las descargas en el directorio temporal.
+    """
+    cfg:SchedulerConfig = SchedulerConfig()
+    cfg.path = str(tmp_path / "queue.sqlite3")
+    cfg.output_dir = str(tmp_path / "downloads")
+    cfg.workers = workers
+    cfg.max_attempts = 2
+    return cfg
+
+
+def _resolver(server:FixtureServer, calls:List[str], fail:Optional[str]=None) -> Callable[[object, Episode], str]:
+    """
+    Genera un resolvedor que registra los episodios resueltos y falla con el indicado.
+    """
+    def resolve(manager, episode:Episode) -> str:
+        calls.append(episode.Url)
+        if episode.Url == fail:
+            raise RuntimeError("expired")
+        if episode.Number == 2:
+            return f"{server.Url}/hls/low/index.m3u8"
+        return f"{server.Url}/files/video.mp4"
+    return resolve
+
+
+def _job(scheduler:DownloadScheduler, job_id:int) -> DownloadJob:
+    """
+    Devuelve el estado de un trabajo.
+    """
+    return next(job for job in scheduler.jobs() if job.Id == job_id)
+
+
+def test_jobs_are_expanded_and_downloaded(server:FixtureServer, tmp_path) -> None:
+    server.hls_segments = 4
+    calls:List[str] = []
+    with DownloadScheduler(managers=[_Manager({"/a": 3})], cfg=_config(tmp_path), resolver=_resolver(server, calls)) as scheduler:
+        job_id:int = scheduler.enqueue(site="test", url="/a")
+        assert scheduler.join(timeout=30)
+        job:DownloadJob = _job(scheduler, job_id)
+
+    assert (job.Status, job.Done, job.Total, job.Name) == ("done", 3, 3, "a")
+    folder:str = str(tmp_path / "downloads" / "a")
+    with open(os.path.join(folder, "a - 001.mp4"), "rb") as file:
+        assert file.read() == server.file
+    with open(os.path.join(folder, "a - 002.ts"), "rb") as file:
+        assert file.read() == b"".join(server.hls_segment(variant="low", index=index) for index in range(4))
+    assert os.path.exists(os.path.join(folder, "a - 003.mp4"))
+
+
+def test_higher_priority_jobs_go_first(server:FixtureServer, tmp_path) -> None:
+    calls:List[str] = []
+    scheduler:DownloadScheduler = DownloadScheduler(managers=[_Manager({"/low": 2, "/high": 2, "/late": 1})],
+                                                    cfg=_config(tmp_path, workers=1), resolver=_resolver(server, calls))
+    try:
+        scheduler.enqueue(site="test", url="/low", last=1, priority=0)
+        scheduler.enqueue(site="test", url="/high", priority=5)
+        late:int = scheduler.enqueue(site="test", url="/late", priority=0)
+        scheduler.set_priority(job_id=late, priority=9)
+        scheduler.start()
+        assert scheduler.join(timeout=30)
+    finally:
+        scheduler.close()
+    assert calls == ["/late/1", "/high/1", "/high/2", "/low/1"]
+
+
+def test_queue_survives_a_restart(server:FixtureServer, tmp_path) -> None:
+    cfg:SchedulerConfig = _config(tmp_path)
+    calls:List[str] = []
+
+    # Expande el trabajo sin descargar nada y simula un cierre a mitad de un episodio.
+    scheduler:DownloadScheduler = DownloadScheduler(managers=[_Manager({"/a": 2, "/b": 1})], cfg=cfg, resolver=_resolver(server, calls))
+    first:int = scheduler.enqueue(site="test", url="/a")
+    second:int = scheduler.enqueue(site="test", url="/b")
+    scheduler.close()
+    with sqlite3.connect(cfg.path) as db:
+        db.execute("UPDATE jobs SET status = 'expanding' WHERE id = ?", (second,))
+        db.execute("UPDATE jobs SET status = 'active', name = 'a' WHERE id = ?", (first,))
+        db.executemany("INSERT INTO episodes (job_id, number, url, status) VALUES (?, ?, ?, ?)",
+                       [(first, 1, "/a/1", "done"), (first, 2, "/a/2", "running")])
+    assert not calls
+
+    # Al reabrir la cola, lo que estaba en curso vuelve a la cola y se completa.
+    with DownloadScheduler(managers=[_Manager({"/a": 2, "/b": 1})], cfg=cfg, resolver=_resolver(server, calls)) as scheduler:
+        assert scheduler.Pending == 2
+        assert scheduler.join(timeout=30)
+        assert [(job.Status, job.Done) for job in scheduler.jobs()] == [("done", 1), ("done", 2)]
+    assert sorted(calls) == ["/a/2", "/b/1"]
+
+
+def test_failed_episodes_are_retried_then_given_up(server:FixtureServer, tmp_path) -> None:
+    calls:List[str] = []
+    with DownloadScheduler(managers=[_Manager({"/a": 3})], cfg=_config(tmp_path),
+                           resolver=_resolver(server, calls, fail="/a/3")) as scheduler:
+        job_id:int = scheduler.enqueue(site="test", url="/a", first=3)
+        assert scheduler.join(timeout=30)
+        job:DownloadJob = _job(scheduler, job_id)
+    assert (job.Status, job.Done, job.Failed, job.Error) == ("failed", 0, 1, "1 episode(s) failed")
+    assert calls == ["/a/3", "/a/3"]
+
+
+def test_cancelled_jobs_are_not_downloaded(server:FixtureServer, tmp_path) -> None:
+    calls:List[str] = []
+    with DownloadScheduler(managers=[_Manager({"/a": 2})], cfg=_config(tmp_path), resolver=_resolver(server, calls)) as scheduler:
+        scheduler.stop()
+        job_id:int = scheduler.enqueue(site="test", url="/a")
+        scheduler.cancel(job_id=job_id)
+        assert scheduler.Pending == 0
+        assert _job(scheduler, job_id).Status == "cancelled"
+    assert not calls
+
+
+def test_cancelled_jobs_do_not_retry_running_episodes(server:FixtureServer, tmp_path) -> None:
+    calls:List[str] = []
+    started:Event = Event()
+    release:Event = Event()
+
+    def resolve(manager, episode:Episode) -> str:
+        calls.append(episode.Url)
+        started.set()
+        release.wait(timeout=10)
+        raise RuntimeError("expired")
+
+    # El trabajo se cancela mientras su primer episodio está fallando.
+    with DownloadScheduler(managers=[_Manager({"/a": 2})], cfg=_config(tmp_path, workers=1), resolver=resolve) as scheduler:
+        job_id:int = scheduler.enqueue(site="test", url="/a")
+        assert started.wait(timeout=10)
+        scheduler.cancel(job_id=job_id)
+        release.set()
+        assert scheduler.join(timeout=30)
+        job:DownloadJob = _job(scheduler, job_id)
+    assert calls == ["/a/1"]
+    assert (job.Status, job.Done, job.Failed) == ("cancelled", 0, 0)
+    with sqlite3.connect(str(tmp_path / "queue.sqlite3")) as db:
+        assert db.execute("SELECT number, status FROM episodes ORDER BY number").fetchall() == [(1, "cancelled"), (2, "cancelled")]
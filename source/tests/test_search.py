@@ -0,0 +1,38 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_search.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas del buscador federado contra el servidor local.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+import gc
+import warnings
+
+from lib.common import network
+from lib.core.search import FederatedSearch
+from lib.core.anime_flv.anime import AnimeFlvManager
+from lib.core.anime_fenix.anime import AnimeFenixManager
+
+from benchmarks.server import FixtureServer
+
+
+# ---- FUNCIONES ---- #
+def test_sync_search_closes_the_async_session(server:FixtureServer) -> None:
+    flv_cfg, fenix_cfg = server.configs()
+    search:FederatedSearch = FederatedSearch()
+    search.register(site="animeflv", manager=AnimeFlvManager(flv_cfg))
+    search.register(site="animefenix", manager=AnimeFenixManager(fenix_cfg))
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        # Cada llamada usa un bucle de eventos nuevo y no deja clientes abiertos.
+        for _ in range(2):
+            assert search.search(name="one piece")
+            assert network._async_session is None or network._async_session.closed
+            assert search.search_groups(name="one piece")
+            assert network._async_session is None or network._async_session.closed
+        gc.collect()
+    assert not [warning for warning in caught if "Unclosed" in str(warning.message)]
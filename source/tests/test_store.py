@@ -0,0 +1,44 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_store.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas del almacén persistente de animes y búsquedas.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Dict
+
+from lib.core.anime import Anime, Episode
+from lib.core.store import AnimeStore
+
+
+# ---- FUNCIONES ---- #
+def test_animes_and_searches_survive_a_reopen(tmp_path) -> None:
+    path:str = str(tmp_path / "store.sqlite3")
+    first:Anime = Anime(name="Dragon Ball", description="Goku", themes=["Acción", "Comedia"],
+                        episodes=[Episode(number=1, url="/ver/dragon-ball-1"), Episode(number=2, url="/ver/dragon-ball-2")])
+    second:Anime = Anime(name="Naruto", description="Ninjas", themes=[])
+    store:AnimeStore = AnimeStore(path=path)
+    try:
+        store.put_animes(site="animeflv", animes=[("/anime/dragon-ball", first), ("/anime/naruto", second)])
+        store.put_search(site="animeflv", url="/browse?q=dragon", results=[("Dragon Ball", "/anime/dragon-ball")])
+    finally:
+        store.close()
+
+    # Al reabrir el almacén se recuperan los mismos datos.
+    store = AnimeStore(path=path)
+    try:
+        animes:Dict[str, Anime] = store.get_animes(site="animeflv", urls=["/anime/dragon-ball", "/anime/naruto", "/anime/other"])
+        assert sorted(animes) == ["/anime/dragon-ball", "/anime/naruto"]
+        loaded:Anime = animes["/anime/dragon-ball"]
+        assert (loaded.Name, loaded.Description, loaded.Themes) == ("Dragon Ball", "Goku", ["Acción", "Comedia"])
+        assert [(episode.Number, episode.Url) for episode in loaded.Episodes] == [(1, "/ver/dragon-ball-1"), (2, "/ver/dragon-ball-2")]
+        assert store.get_anime(site="animefenix", url="/anime/naruto") is None
+        assert store.get_search(site="animeflv", url="/browse?q=dragon") == [("Dragon Ball", "/anime/dragon-ball")]
+        assert store.stale_urls(site="animeflv", urls=["/anime/other", "/anime/naruto"], max_age=60) == ["/anime/other"]
+        assert store.purge(max_age=-1) == 3
+        assert store.get_anime(site="animeflv", url="/anime/naruto") is None
+    finally:
+        store.close()
@@ -0,0 +1,110 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_throttle.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas del control de ritmo y concurrencia por host.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from time import monotonic, sleep
+from threading import Event, Thread
+
+from lib.config.schema import ThrottleConfig
+from lib.common.throttle import BandwidthLimiter, HostLimiter
+
+
+# ---- FUNCIONES ---- #
+def _config(window:float=4.0, rate:float=1000.0, burst:int=1000) -> ThrottleConfig:
+    """
+    Genera una configuración con una ventana inicial y un token bucket dados.
+    """
+    cfg:ThrottleConfig = ThrottleConfig()
+    cfg.initial_window = window
+    cfg.rate = rate
+    cfg.burst = burst
+    return cfg
+
+
+def _request(limiter:HostLimiter, status:int=200, latency:float=0.01, retry_after:str=None) -> None:
+    """
+    Adquiere y libera una petición con el resultado indicado.
+    """
+    limiter.acquire()
+    limiter.release(status=status, latency=latency, retry_after=retry_after)
+
+
+def test_window_grows_additively_with_successes() -> None:
+    limiter:HostLimiter = HostLimiter(host="host", cfg=_config(window=4.0))
+    for _ in range(4):
+        _request(limiter=limiter)
+    assert 4.9 < limiter.Window < 5.0
+    for _ in range(50):
+        _request(limiter=limiter)
+    assert 11 < limiter.Window < 12
+
+
+def test_throttled_responses_halve_the_window_once_per_latency() -> None:
+    limiter:HostLimiter = HostLimiter(host="host", cfg=_config(window=16.0))
+    _request(limiter=limiter, latency=0.2)
+    window:float = limiter.Window
+
+    # Las respuestas 429 de peticiones que ya estaban en vuelo no vuelven a reducirla.
+    _request(limiter=limiter, status=429)
+    _request(limiter=limiter, status=503)
+    assert limiter.Window == window / 2
+    sleep(0.2)
+    _request(limiter=limiter, status=429)
+    assert limiter.Window == window / 4
+
+
+def test_latency_spike_shrinks_the_window() -> None:
+    limiter:HostLimiter = HostLimiter(host="host", cfg=_config(window=8.0))
+    for _ in range(5):
+        _request(limiter=limiter, latency=0.001)
+    window:float = limiter.Window
+    for _ in range(5):
+        _request(limiter=limiter, latency=0.05)
+    assert limiter.Window < window
+
+
+def test_window_caps_requests_in_flight() -> None:
+    limiter:HostLimiter = HostLimiter(host="host", cfg=_config(window=2.0))
+    limiter.acquire()
+    limiter.acquire()
+    acquired:Event = Event()
+    waiter:Thread = Thread(target=lambda: (limiter.acquire(), acquired.set()), daemon=True)
+    waiter.start()
+
+    # La tercera petición espera a que se libere una de las dos en vuelo.
+    assert not acquired.wait(timeout=0.1)
+    limiter.release(status=200, latency=0.01)
+    assert acquired.wait(timeout=1.0)
+    assert limiter.InFlight == 2
+
+
+def test_retry_after_blocks_the_host() -> None:
+    limiter:HostLimiter = HostLimiter(host="host", cfg=_config())
+    _request(limiter=limiter, status=429, retry_after="0.2")
+    start:float = monotonic()
+    limiter.acquire()
+    assert monotonic() - start >= 0.19
+
+
+def test_token_bucket_limits_the_rate() -> None:
+    limiter:HostLimiter = HostLimiter(host="host", cfg=_config(rate=50.0, burst=1))
+    start:float = monotonic()
+    for _ in range(6):
+        _request(limiter=limiter)
+    # La primera sale del bucket; las otras cinco esperan 1/50 s cada una.
+    assert monotonic() - start >= 0.09
+
+
+def test_bandwidth_limiter_paces_consumers() -> None:
+    limiter:BandwidthLimiter = BandwidthLimiter(rate=1_000_000, burst=100_000)
+    start:float = monotonic()
+    for _ in range(5):
+        limiter.consume(amount=100_000)
+    # El primer bloque cabe en la ráfaga; los otros cuatro pagan 0,1 s cada uno.
+    assert 0.35 <= monotonic() - start < 1.0
@@ -0,0 +1,158 @@
+# ----------------------------------------------------------------------------------------
+# · Filename: test_watcher.py
+# · Author: Pablo González García.
+# · Copyright (c) 2025 Pablo González García. All rights reserved.
+# · Created on: 2025-07-02
+# · Descripción: Pruebas de la vigilancia de nuevos episodios.
+# ----------------------------------------------------------------------------------------
+
+
+# ---- MÓDULOS ---- #
+from typing import Dict, List, Optional, Tuple
+from time import time
+from asyncio import run
+
+from lib.config.schema import WatchConfig
+from lib.common.network import close_async_session
+from lib.core.anime import Anime, Episode
+from lib.core.watcher import EpisodeWatcher, NewEpisodes
+from lib.core.anime_flv.anime import AnimeFlvManager
+
+from benchmarks.server import FixtureServer
+
+
+# ---- VARIABLES ---- #
+_WEEK:float = 7 * 24 * 60 * 60
+
+
+# ---- CLASES ---- #
+class _Manager:
+    """
+    Manager de pruebas con un anime que estrena un episodio cada semana (desde `release`) y
+    responde como una página sin cambios (304) si los validadores son los del último episodio.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self):
+        """
+        Inicializa la instancia.
+        """
+        self.Site:str = "test"
+        self.now:float = 0.0
+        self.polls:int = 0
+        self.error:Optional[Exception] = None
+
+
+    # -- Métodos -- #
+    async def async_poll_anime(self, url:str, validators:Optional[Dict[str, str]]=None) -> Tuple[Optional[Anime], Dict[str, str]]:
+        """
+        Comprueba el anime en el momento `now`.
+        """
+        self.polls += 1
+        if self.error is not None:
+            raise self.error
+        count:int = 1 + int(self.now // _WEEK)
+        if validators and validators.get("If-None-Match") == str(count):
+            return None, validators
+        episodes:List[Episode] = [Episode(number=number, url=f"{url}/{number}") for number in range(1, count + 1)]
+        return Anime(name="Show", description="", themes=[], episodes=episodes), {"If-None-Match": str(count)}
+
+
+# ---- FUNCIONES ---- #
+def _config(tmp_path) -> WatchConfig:
+    """
+    Genera una configuración sin variación aleatoria en el directorio temporal.
+    """
+    cfg:WatchConfig = WatchConfig()
+    cfg.path = str(tmp_path / "watch.sqlite3")
+    cfg.jitter = 0.0
+    return cfg
+
+
+def test_new_episodes_are_reported_once(tmp_path) -> None:
+    cfg:WatchConfig = _config(tmp_path)
+    manager:_Manager = _Manager()
+    start:float = time() + cfg.min_interval
+
+    async def main() -> List[List[NewEpisodes]]:
+        results:List[List[NewEpisodes]] = []
+        with EpisodeWatcher(managers=[manager], cfg=cfg) as watcher:
+            watcher.follow(site="test", url="/show")
+            # La primera comprobación solo guarda los episodios conocidos.
+            results.append(await watcher.check(now=start))
+            # Sin cambios: la página responde 304.
+            results.append(await watcher.check(now=start + cfg.max_interval))
+        # Tras reabrir la vigilancia, el episodio 2 es nuevo.
+        manager.now = _WEEK
+        with EpisodeWatcher(managers=[manager], cfg=cfg) as watcher:
+            results.append(await watcher.check(now=start + 2 * cfg.max_interval))
+            assert watcher.followed()[0][:3] == ("test", "/show", "Show")
+        return results
+
+    first, unchanged, after = run(main())
+    assert first == [] and unchanged == []
+    assert [(new.Name, [episode.Number for episode in new.Episodes]) for new in after] == [("Show", [2])]
+    assert manager.polls == 3
+
+
+def test_interval_follows_the_release_cadence(tmp_path) -> None:
+    cfg:WatchConfig = _config(tmp_path)
+    manager:_Manager = _Manager()
+    start:float = time() + cfg.min_interval
+
+    async def main() -> List[Tuple[int, float]]:
+        delays:List[Tuple[int, float]] = []
+        with EpisodeWatcher(managers=[manager], cfg=cfg) as watcher:
+            watcher.follow(site="test", url="/show")
+            elapsed:float = 0.0
+            while elapsed < 10 * _WEEK:
+                manager.now = elapsed
+                for new in await watcher.check(now=start + elapsed):
+                    number:int = new.Episodes[0].Number
+                    delays.append((number, elapsed - (number - 1) * _WEEK))
+                elapsed = max(elapsed + 60, watcher.next_check() - start)
+        return delays
+
+    delays:List[Tuple[int, float]] = run(main())
+    assert [number for number, _ in delays] == list(range(2, 11))
+    # Una vez aprendido el ritmo, cada estreno se detecta en menos de dos `min_interval`.
+    assert all(delay <= 2 * cfg.min_interval for number, delay in delays if number >= 4)
+    # Y cuesta menos de una décima parte de las comprobaciones que harían falta cada `min_interval`.
+    assert manager.polls < 10 * _WEEK / cfg.min_interval / 10
+
+
+def test_errors_back_off_exponentially(tmp_path) -> None:
+    cfg:WatchConfig = _config(tmp_path)
+    manager:_Manager = _Manager()
+    manager.error = RuntimeError("down")
+    start:float = time() + cfg.min_interval
+
+    async def main() -> List[float]:
+        waits:List[float] = []
+        with EpisodeWatcher(managers=[manager], cfg=cfg) as watcher:
+            watcher.follow(site="test", url="/show")
+            now:float = start
+            for _ in range(4):
+                assert await watcher.check(now=now) == []
+                waits.append(watcher.next_check() - now)
+                now = watcher.next_check()
+        return waits
+
+    assert run(main()) == [cfg.min_interval * 2 ** errors for errors in range(4)]
+
+
+def test_unchanged_page_is_a_conditional_hit(server:FixtureServer) -> None:
+    manager:AnimeFlvManager = AnimeFlvManager(server.configs()[0])
+    url:str = f"{server.Url}/flv/anime/show"
+
+    async def main() -> Tuple[Optional[Anime], Optional[Anime], Dict[str, str]]:
+        try:
+            anime, validators = await manager.async_poll_anime(url=url)
+            unchanged, same = await manager.async_poll_anime(url=url, validators=validators)
+            return anime, unchanged, validators if same == validators else {}
+        finally:
+            await close_async_session()
+
+    anime, unchanged, validators = run(main())
+    assert anime is not None and anime.Episodes
+    assert unchanged is None
+    assert validators